@@ -1,15 +1,74 @@
-# Cấu trúc đề xuất
+# src/core/config_loader.py
+import json
+import os
+import re
+from typing import Any, Dict, Optional, Union
+
+import yaml
+
+_SIZE = re.compile(r'^\s*(\d+(?:\.\d+)?)\s*([kmgt]?)(i?b)?\s*$', re.IGNORECASE)
+
+def parse_bytes(value: Union[int, float, str, None]) -> Optional[int]:
+    """Dung lượng dạng số byte hoặc chuỗi '512MB', '2GiB', '64k' (cơ số 1024) -> số byte."""
+    if value is None or isinstance(value, (int, float)):
+        return None if value is None else int(value)
+    match = _SIZE.match(str(value))
+    if match is None:
+        raise ValueError(f"Invalid size: {value!r}")
+    number, unit = float(match.group(1)), match.group(2).lower()
+    return int(number * 1024 ** ' kmgt'.index(unit or ' '))
+
 class ConfigLoader:
-    def __init__(self, config_path):
+    """
+    Đọc và kiểm tra file cấu hình pipeline (YAML hoặc JSON, xem config/mvp_config.yaml).
+
+    Cấu trúc:
+        pipelines:
+          - name: ...
+            reader: {type: FileReader, params: {...}}        # bắt buộc
+            decoder: {type: WitMotionDecoder, params: {...}}  # tùy chọn
+            processors: [{type: ..., params: {...}}, ...]
+            visualizers: [...]
+            offline: {chunk_samples: 4096, memory_limit: 512MB}  # tùy chọn, xem Pipeline
+    """
+    def __init__(self, config_path: str):
         self.config_path = config_path
-        
-    def load(self):
-        # Đọc file YAML/JSON
-        # Xác thực schema
-        # Trả về dict cấu hình
-        pass
-    
-    def validate(self, config_dict):
-        # Xác thực cấu hình
-        # TODO: Implement validation logic
-        pass
\ No newline at end of file
+
+    def load(self) -> Dict[str, Any]:
+        with open(self.config_path, 'r', encoding='utf-8') as f:
+            if os.path.splitext(self.config_path)[1].lower() == '.json':
+                config = json.load(f)
+            else:
+                config = yaml.safe_load(f)
+        self.validate(config)
+        return config
+
+    def validate(self, config_dict: Any) -> None:
+        """Kiểm tra cấu trúc; ValueError mô tả mục sai đầu tiên."""
+        if not isinstance(config_dict, dict) or not isinstance(config_dict.get('pipelines'), list) \
+                or not config_dict['pipelines']:
+            raise ValueError(f"{self.config_path}: 'pipelines' must be a non-empty list")
+        for index, pipeline in enumerate(config_dict['pipelines']):
+            where = f"{self.config_path}: pipelines[{index}]"
+            if not isinstance(pipeline, dict):
+                raise ValueError(f"{where} must be a mapping")
+            self._check_plugin(pipeline.get('reader'), f"{where}.reader")
+            if pipeline.get('decoder') is not None:
+                self._check_plugin(pipeline['decoder'], f"{where}.decoder")
+            for kind in ('processors', 'visualizers'):
+                entries = pipeline.get(kind) or []
+                if not isinstance(entries, list):
+                    raise ValueError(f"{where}.{kind} must be a list")
+                for i, entry in enumerate(entries):
+                    self._check_plugin(entry, f"{where}.{kind}[{i}]")
+            offline = pipeline.get('offline') or {}
+            if not isinstance(offline, dict):
+                raise ValueError(f"{where}.offline must be a mapping")
+            parse_bytes(offline.get('memory_limit'))
+
+    @staticmethod
+    def _check_plugin(entry: Any, where: str) -> None:
+        if not isinstance(entry, dict) or not isinstance(entry.get('type'), str):
+            raise ValueError(f"{where} must be a mapping with a 'type'")
+        if not isinstance(entry.get('params') or {}, dict):
+            raise ValueError(f"{where}.params must be a mapping")
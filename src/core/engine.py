@@ -1,21 +1,92 @@
-# Cấu trúc đề xuất
+# src/core/engine.py
+from typing import Any, Dict, List, Optional
+
+from src.core.config_loader import ConfigLoader, parse_bytes
+from src.core.pipeline import Pipeline
+from src.core.plugin_manager import PluginManager
+from src.core.stage_cache import StageCache
+from src.io.readers.cached_reader import CachedRecordingReader
+
 class Engine:
-    def __init__(self, config_path):
+    """
+    Tạo các Pipeline từ file cấu hình (ConfigLoader + PluginManager) và chạy chúng lần lượt.
+
+    Mục `offline` của mỗi pipeline (hoặc `offline` truyền vào Engine, ghi đè cho mọi pipeline)
+    bật chế độ chunk cho post-processing file dài:
+        chunk_samples (int): Số mẫu tối đa của mỗi lát đi qua các processor.
+        memory_limit (int | str): Giới hạn bộ nhớ cho dữ liệu đang xử lý, ví dụ '512MB'.
+        cache_dir (str): (Tùy chọn) Thư mục StageCache để chạy lại nhanh.
+
+    `set_recording` (dùng cho kết nối file của giao diện) thay reader + decoder trong cấu hình
+    bằng CachedRecordingReader trên file ghi đã chọn, nên file chỉ phải giải mã ở lần mở đầu.
+    """
+    def __init__(self, config_path: Optional[str] = None, plugin_manager: Optional[PluginManager] = None,
+                 offline: Optional[Dict[str, Any]] = None):
         self.config_path = config_path
-        self.config = None
-        self.plugin_manager = None
-        self.pipelines = []
-        
-    def setup(self):
-        # Tải cấu hình
-        # Khởi tạo plugin manager
-        # Tạo các pipeline dựa trên cấu hình
-        pass
+        self.config: Optional[Dict[str, Any]] = None
+        self.plugin_manager = plugin_manager
+        self.offline = dict(offline or {})
+        self.pipelines: List[Pipeline] = []
+        self.recording: Optional[Dict[str, Any]] = None
+        self.running = False
+
+    def set_recording(self, path: Optional[str], use_cache: bool = True) -> None:
+        """Chạy các pipeline (tạo ở `setup` sau đó) trên file ghi `path`; None để dùng lại reader của cấu hình."""
+        self.recording = None if path is None else {'file_path': path, 'use_cache': use_cache}
+
+    def setup(self, config_path: Optional[str] = None) -> List[Pipeline]:
+        if config_path is not None:
+            self.config_path = config_path
+        if self.config_path is None:
+            raise ValueError("No configuration file given")
+        self.config = ConfigLoader(self.config_path).load()
+        if self.plugin_manager is None:
+            self.plugin_manager = PluginManager()
+        self.pipelines = [self.build_pipeline(spec) for spec in self.config['pipelines']]
+        return self.pipelines
+
+    def build_pipeline(self, spec: Dict[str, Any]) -> Pipeline:
+        """Tạo một Pipeline từ mục cấu hình (đã kiểm tra bởi ConfigLoader)."""
+        if self.plugin_manager is None:
+            self.plugin_manager = PluginManager()
+        create = self.plugin_manager.create_plugin_instance
+        if self.recording is not None:
+            reader, decoder = self._recording_reader(spec), None
+        else:
+            reader = create('reader', spec['reader']['type'], spec['reader'].get('params'))
+            decoder = None
+            if spec.get('decoder') is not None:
+                decoder = create('decoder', spec['decoder']['type'], spec['decoder'].get('params'))
+        processors = [create('processor', p['type'], p.get('params')) for p in spec.get('processors') or []]
+        visualizers = [create('visualizer', v['type'], v.get('params')) for v in spec.get('visualizers') or []]
+        offline = dict(spec.get('offline') or {}, **self.offline)
+        cache = StageCache(offline['cache_dir']) if offline.get('cache_dir') else None
+        return Pipeline(reader, decoder, processors, visualizers, name=spec.get('name'),
+                        batch_mode=bool(spec.get('batch_mode', True)), cache=cache,
+                        chunk_samples=offline.get('chunk_samples'),
+                        memory_limit=parse_bytes(offline.get('memory_limit')))
+
+    def _recording_reader(self, spec: Dict[str, Any]) -> CachedRecordingReader:
+        """CachedRecordingReader cho `self.recording` với decoder (mặc định WitMotionDecoder) của cấu hình."""
+        decoder_spec = spec.get('decoder') or {'type': 'WitMotionDecoder'}
+        config = dict(self.recording, decoder_params=dict(decoder_spec.get('params') or {}))
+        chunk_size = (spec['reader'].get('params') or {}).get('chunk_size')
+        if chunk_size is not None:
+            config['chunk_size'] = chunk_size
+        return CachedRecordingReader(config, self.plugin_manager.load_plugin('decoder', decoder_spec['type']))
 
     def run(self):
-        # Chạy tất cả các pipeline
-        pass
+        """Chạy từng pipeline tới khi hết dữ liệu (hoặc tới khi `stop`)."""
+        self.running = True
+        try:
+            for pipeline in self.pipelines:
+                if not self.running:
+                    break
+                pipeline.run()
+        finally:
+            self.running = False
 
     def stop(self):
-        # Dừng tất cả các pipeline
-        pass
\ No newline at end of file
+        self.running = False
+        for pipeline in self.pipelines:
+            pipeline.stop()
@@ -1,20 +1,319 @@
-# Cấu trúc đề xuất
+# src/core/pipeline.py
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from src.core.stage_cache import StageCache, source_fingerprint, stage_key
+from src.data.models import SensorData, SensorDataBatch
+
+# Ước lượng ban đầu (byte/mẫu, gồm đầu vào và đầu ra của một tầng) trước khi đo được thực tế
+INITIAL_BYTES_PER_SAMPLE = 1024
+
+def footprint(items: Iterable[Any]) -> int:
+    """Số byte (ước lượng) của timestamp và các kênh trong danh sách SensorData/SensorDataBatch."""
+    total = 0
+    for item in items:
+        if isinstance(item, SensorDataBatch):
+            total += item.timestamps_ns.nbytes + sum(np.asarray(v).nbytes for v in item.values.values())
+        elif isinstance(item, SensorData):
+            total += 8 + sum(np.asarray(v).nbytes for v in item.values.values())
+    return total
+
+def _samples(items: Iterable[Any]) -> int:
+    return sum(len(item) if isinstance(item, SensorDataBatch) else 1 for item in items)
+
 class Pipeline:
-    def __init__(self, reader, decoder, processors=None, visualizers=None):
+    """
+    Một luồng xử lý: Reader -> Decoder -> Processors -> Visualizers/Writers.
+
+    Nếu `decoder` là None, Reader được xem là nguồn dữ liệu đã giải mã
+    (ví dụ MergedRecordingReader) và dữ liệu của nó đi thẳng vào các Processor.
+    Ở chế độ batch (mặc định) Pipeline dùng `decoder.decode_batch` để dữ liệu
+    chảy qua các Processor dưới dạng SensorDataBatch.
+
+    Nếu có `cache` (StageCache) và reader đọc từ file, đầu ra của từng tầng (decoder và mỗi
+    processor) được lưu lại khi chạy hết dữ liệu; lần chạy sau với cùng file và cùng config
+    các tầng phía trước sẽ đọc tiếp từ tầng sâu nhất đã có trong cache, bỏ qua đọc/giải mã
+    và các processor đó. Processor phía sau đẩy phản hồi về một processor phía trước
+    (`bind_upstream`, ví dụ TimeOffsetProcessor -> ResamplingProcessor) làm đầu ra của processor
+    đó phụ thuộc vào config của mình, nên config này được tính vào khóa từ tầng đó trở đi.
+    Chỉ số `get_metrics` của các processor bị bỏ qua được đọc lại từ cache.
+
+    Chế độ chunk (post-processing file dài, ví dụ ghi 24 giờ): với `chunk_samples` và/hoặc
+    `memory_limit` (byte), dữ liệu giải mã được chia thành các lát tối đa N mẫu (view, không
+    sao chép) và mỗi lát đi qua mọi processor trước khi đọc tiếp, nên bộ nhớ không phụ thuộc
+    độ dài file. Với `memory_limit`, N được điều chỉnh theo số byte/mẫu đo được (đầu vào +
+    đầu ra lớn nhất của một tầng, xem `metrics['peak_bytes']`) và chunk đọc của reader
+    (`chunk_size`) được giới hạn theo. Giới hạn áp dụng cho dữ liệu đang chảy qua pipeline;
+    trạng thái của processor (bộ lọc, cửa sổ, phần đuôi chưa đủ đoạn) đã bị chặn theo độ dài
+    cửa sổ. Các processor giữ trạng thái giữa các batch nên kết quả giống chạy toàn bộ dữ liệu
+    một lần (tests/core/test_pipeline.py kiểm tra chuỗi lọc, thống kê, chất lượng, sự kiện,
+    tích phân, STFT, fusion, decimation, rung động và đặc trưng), với các ngoại lệ đã biết:
+    - bộ lọc SOS theo block (SOSFilter, ví dụ thông cao của IntegrationProcessor) chỉ bằng
+      nhau tới sai số làm tròn số thực;
+    - các processor phát kết quả theo nhịp batch (WelchPSDProcessor `update_rate`,
+      DistributionProcessor `emit_interval`) phát kết quả trung gian vào thời điểm khác, kết
+      quả cuối vẫn như nhau;
+    - DataQualityProcessor `outlier_action: replace` giữ tối đa `outlier_window` mẫu chờ mẫu
+      tốt kế tiếp; chuỗi outlier dài hơn bị cắt theo ranh giới lát.
+    """
+    def __init__(self, reader, decoder=None, processors=None, visualizers=None,
+                 writers=None, name: Optional[str] = None, batch_mode: bool = True,
+                 cache: Optional[StageCache] = None, chunk_samples: Optional[int] = None,
+                 memory_limit: Optional[int] = None):
         self.reader = reader
         self.decoder = decoder
         self.processors = processors or []
         self.visualizers = visualizers or []
+        self.writers = writers or []
+        self.name = name or 'pipeline'
+        self.batch_mode = batch_mode
+        self.cache = cache
+        self.chunk_samples = int(chunk_samples) if chunk_samples else None
+        self.memory_limit = int(memory_limit) if memory_limit else None
+        self._max_samples: Optional[int] = None   # số mẫu tối đa của một lát (None: không chia)
+        self._bytes_per_sample = 0.0
         self.running = False
-        
+        self._source = None
+        self._start = 0            # processor đầu tiên cần chạy (> 0 khi đọc tiếp từ cache)
+        self._resumed = False
+        self._exhausted = False
+        self._stage_writers: Dict[int, Any] = {}
+        self._cached_metrics: Dict[str, Any] = {}
+        # Chỉ số processor -> các processor phía sau đẩy phản hồi về nó
+        self._feedback: Dict[int, List[Any]] = {}
+        self.metrics: Dict[str, Any] = {}
+        self._reset_metrics()
+        # Processor cần tham chiếu tới các processor phía trước (ví dụ vòng phản hồi)
+        for index, processor in enumerate(self.processors):
+            bind_upstream = getattr(processor, 'bind_upstream', None)
+            if bind_upstream is not None:
+                for target in bind_upstream(self.processors[:index]) or ():
+                    upstream = next(i for i, p in enumerate(self.processors) if p is target)
+                    self._feedback.setdefault(upstream, []).append(processor)
+
+    def _reset_metrics(self):
+        self.metrics = {
+            'chunks': 0,       # số lần đọc từ reader
+            'bytes': 0,        # tổng số byte thô đã đọc
+            'outputs': 0,      # số đơn vị dữ liệu tới visualizers/writers
+            'samples': 0,      # số mẫu (tính theo độ dài batch) tới visualizers/writers
+            'elapsed': 0.0,    # thời gian chạy (giây)
+            'cached_stage': None,  # tầng được đọc lại từ cache (0 = decoder, i = processor thứ i)
+            'peak_bytes': 0,   # byte lớn nhất của một lát trong một tầng (chỉ đo khi có memory_limit)
+        }
+
+    def _stage_descriptions(self) -> List[Dict[str, Any]]:
+        """Mô tả (lớp + config) của các tầng: decoder rồi từng processor."""
+        stages = [{'decoder': type(self.decoder).__name__ if self.decoder is not None else None,
+                   'config': getattr(self.decoder, 'config', None), 'batch_mode': self.batch_mode}]
+        for index, processor in enumerate(self.processors):
+            stage = {'processor': type(processor).__name__, 'config': getattr(processor, 'config', None)}
+            if index in self._feedback:
+                stage['feedback'] = [{'processor': type(p).__name__, 'config': getattr(p, 'config', None)}
+                                     for p in self._feedback[index]]
+            stages.append(stage)
+        return stages
+
+    def _open_cache(self) -> bool:
+        """Chọn tầng sâu nhất có trong cache và tạo writer cho các tầng sau đó. True nếu đọc từ cache."""
+        self._start, self._resumed, self._stage_writers = 0, False, {}
+        self._cached_metrics = {}
+        fingerprint = source_fingerprint(self.reader) if self.cache is not None else None
+        if fingerprint is None:
+            return False
+        stages = self._stage_descriptions()
+        keys = [stage_key(fingerprint, stages[:i + 1]) for i in range(len(stages))]
+        deepest = next((i for i in reversed(range(len(keys))) if self.cache.has(keys[i])), None)
+        if deepest is not None:
+            self._source = iter(self.cache.read(keys[deepest]))
+            self._cached_metrics = self.cache.metrics(keys[deepest])
+            self._start, self._resumed = deepest, True
+            self.metrics['cached_stage'] = deepest
+        first = 0 if deepest is None else deepest + 1
+        self._stage_writers = {i: self.cache.writer(keys[i]) for i in range(first, len(keys))}
+        return self._resumed
+
+    def _record(self, stage: int, items: List[Any]) -> None:
+        writer = self._stage_writers.get(stage)
+        if writer is not None:
+            writer.append(items)
+
+    def _close_cache(self) -> None:
+        for stage, writer in self._stage_writers.items():
+            if self._exhausted:
+                # Tầng `stage` là đầu ra của processor thứ stage - 1
+                writer.commit(self._processor_metrics(stage))
+            else:
+                writer.abort()
+        self._stage_writers = {}
+
+    def _decode(self, raw: Any) -> Iterable[Any]:
+        if self.decoder is None:
+            return (raw,)
+        if isinstance(raw, (bytes, bytearray, memoryview)):
+            self.metrics['bytes'] += len(raw)
+        if self.batch_mode:
+            return self.decoder.decode_batch(raw)
+        return self.decoder.decode(raw)
+
+    def _process(self, items: Iterable[Any], start: int = 0) -> List[Any]:
+        """Đưa dữ liệu qua các processor từ vị trí `start` trở đi."""
+        items = list(items)
+        measure = self.memory_limit is not None and bool(items)
+        if measure:
+            samples, size, peak = _samples(items), footprint(items), 0
+        for index, processor in enumerate(self.processors[start:], start):
+            if not items:
+                break
+            items = [out for item in items for out in processor.process(item)]
+            self._record(index + 1, items)
+            if measure:
+                produced = footprint(items)
+                peak, size = max(peak, size + produced), produced
+        if measure:
+            self._observe(samples, max(peak, size))
+        return items
+
+    def _observe(self, samples: int, peak: int) -> None:
+        """Cập nhật số byte/mẫu (lớn nhất đã gặp) và độ dài lát tương ứng với memory_limit."""
+        self.metrics['peak_bytes'] = max(self.metrics['peak_bytes'], peak)
+        self._bytes_per_sample = max(self._bytes_per_sample, peak / samples)
+        if self._bytes_per_sample <= 0:
+            return
+        limit = max(1, int(self.memory_limit // self._bytes_per_sample))
+        self._max_samples = min(limit, self.chunk_samples) if self.chunk_samples else limit
+
+    def _partition(self, items: List[Any]) -> Iterator[List[Any]]:
+        """Chia một chunk thành các lát tối đa `_max_samples` mẫu (batch lớn được cắt thành view)."""
+        if self._max_samples is None:
+            yield items
+            return
+        limit = self._max_samples
+        part: List[Any] = []
+        size = 0
+        for item in items:
+            if isinstance(item, SensorDataBatch) and len(item) > limit:
+                pieces = [item.slice(begin, begin + limit) for begin in range(0, len(item), limit)]
+            else:
+                pieces = [item]
+            for piece in pieces:
+                n = len(piece) if isinstance(piece, SensorDataBatch) else 1
+                if part and size + n > limit:
+                    yield part
+                    part, size = [], 0
+                part.append(piece)
+                size += n
+        if part:
+            yield part
+
+    def _processor_metrics(self, stop: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Chỉ số (`get_metrics`) của các processor trước vị trí `stop`; chỉ số của các processor
+        bị bỏ qua khi đọc tiếp từ cache lấy từ manifest của tầng đó.
+        """
+        metrics = dict(self._cached_metrics)
+        for processor in self.processors[self._start:stop]:
+            get_metrics = getattr(processor, 'get_metrics', None)
+            if get_metrics is not None:
+                metrics.update(get_metrics())
+        return metrics
+
+    def _collect_metrics(self) -> None:
+        """Gộp các chỉ số do processor cung cấp (`get_metrics`) vào `self.metrics`."""
+        self.metrics.update(self._processor_metrics())
+
+    def _output(self, items: Iterable[Any]) -> None:
+        for item in items:
+            self.metrics['outputs'] += 1
+            self.metrics['samples'] += len(item) if hasattr(item, '__len__') else 1
+            for visualizer in self.visualizers:
+                visualizer.visualize(item)
+            for writer in self.writers:
+                writer.write(item)
+
+    def open(self):
+        """Mở reader/writers và khởi tạo visualizers."""
+        self._reset_metrics()
+        self._exhausted = False
+        self._bytes_per_sample = 0.0
+        self._max_samples = self.chunk_samples
+        if self.memory_limit is not None:
+            initial = max(1, self.memory_limit // INITIAL_BYTES_PER_SAMPLE)
+            self._max_samples = min(initial, self.chunk_samples) if self.chunk_samples else initial
+            if self.decoder is not None and getattr(self.reader, 'chunk_size', None):
+                # Dữ liệu giải mã lớn hơn dữ liệu thô nhiều lần (timestamp + kênh float64 cho mỗi gói)
+                self.reader.chunk_size = max(1024, min(int(self.reader.chunk_size), self.memory_limit // 16))
+        if not self._open_cache():
+            self.reader.open()
+            self._source = iter(self.reader.read())
+        for writer in self.writers:
+            writer.open()
+        for visualizer in self.visualizers:
+            visualizer.setup()
+
+    def close(self):
+        """Xả dữ liệu còn lại trong các processor rồi đóng mọi tài nguyên."""
+        self.flush()
+        self._close_cache()
+        for visualizer in self.visualizers:
+            visualizer.teardown()
+        for writer in self.writers:
+            writer.close()
+        self.reader.close()
+        self._source = None
+
+    def flush(self):
+        """Xả bộ đệm của từng processor theo thứ tự, đưa kết quả qua các processor phía sau."""
+        for index, processor in enumerate(self.processors[self._start:], self._start):
+            flush = getattr(processor, 'flush', None)
+            if flush is None:
+                continue
+            items = list(flush())
+            self._record(index + 1, items)
+            self._output(self._process(items, index + 1))
+        self._collect_metrics()
+
     def run(self):
         # Chạy toàn bộ pipeline cho đến khi hết dữ liệu
-        pass
+        self.running = True
+        start = time.perf_counter()
+        self.open()
+        try:
+            while self.running and self.run_step():
+                pass
+        finally:
+            self.close()
+            self.running = False
+            self.metrics['elapsed'] = time.perf_counter() - start
+
+    def run_step(self) -> bool:
+        """
+        Thực hiện một bước (đọc → giải mã → xử lý → hiển thị).
 
-    def run_step(self):
-        # Thực hiện một bước (đọc → giải mã → xử lý → hiển thị)
-        pass
+        Returns:
+            bool: False khi reader đã hết dữ liệu.
+        """
+        if self._source is None:
+            self.open()
+        try:
+            raw = next(self._source)
+        except StopIteration:
+            self._exhausted = True
+            return False
+        self.metrics['chunks'] += 1
+        if self._resumed:
+            # Chunk từ cache đã là đầu ra của tầng `_start`
+            for part in self._partition(list(raw)):
+                self._output(self._process(part, self._start))
+        else:
+            for part in self._partition(list(self._decode(raw))):
+                self._record(0, part)
+                self._output(self._process(part))
+        self._collect_metrics()
+        return True
 
     def stop(self):
-        # Dừng pipeline
-        pass
\ No newline at end of file
+        # Dừng pipeline (vòng lặp run() kết thúc sau bước hiện tại)
+        self.running = False
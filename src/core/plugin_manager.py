@@ -1,20 +1,85 @@
-# Cấu trúc đề xuất
+# src/core/plugin_manager.py
+import importlib
+import inspect
+import os
+from typing import Any, Dict, List, Optional
+
+from src.io.readers.base_reader import BaseReader
+from src.plugins.decoders.base_decoder import BaseDecoder
+from src.plugins.processors.base_processor import BaseProcessor
+from src.plugins.visualizers.base_visualizer import BaseVisualizer
+
+BASE_CLASSES = {
+    'reader': BaseReader,
+    'decoder': BaseDecoder,
+    'processor': BaseProcessor,
+    'visualizer': BaseVisualizer,
+}
+
+# Thư mục gốc của dự án (chứa 'src')
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
 class PluginManager:
-    def __init__(self, plugin_dirs=None):
-        self.plugin_dirs = plugin_dirs or ["src/plugins"]
-        self.discovered_plugins = {}
-        
-    def discover_plugins(self):
-        # Quét thư mục plugin để tìm các lớp plugin
-        pass
-    
-    def load_plugin(self, plugin_type, plugin_name):
-        # Tìm và tải plugin dựa trên loại và tên
-        # Trả về lớp plugin (chưa khởi tạo)
-        print(f"Loading plugin: type={plugin_type}, name={plugin_name}")
-        # Add actual implementation here
-        pass
-        
-    def create_plugin_instance(self, plugin_type, plugin_name, config):
-        # Tạo instance của plugin với cấu hình
-        pass 
\ No newline at end of file
+    """
+    Tìm và tạo các plugin (reader, decoder, processor, visualizer) theo tên lớp trong file cấu hình.
+
+    `discover_plugins` import mọi module trong `plugin_dirs` (đường dẫn tính từ thư mục gốc dự
+    án) và ghi lại các lớp con không trừu tượng của lớp cơ sở tương ứng. Module không import
+    được (ví dụ thiếu PyQt6) được bỏ qua và lỗi được giữ trong `errors`. Tên dạng
+    'module.Class' được import trực tiếp, không cần discover.
+    """
+    def __init__(self, plugin_dirs: Optional[List[str]] = None):
+        self.plugin_dirs = plugin_dirs or ["src/io/readers", "src/plugins"]
+        self.discovered_plugins: Dict[str, Dict[str, type]] = {kind: {} for kind in BASE_CLASSES}
+        self.errors: Dict[str, str] = {}
+        self._discovered = False
+
+    def discover_plugins(self) -> Dict[str, Dict[str, type]]:
+        for plugin_dir in self.plugin_dirs:
+            top = os.path.join(PROJECT_ROOT, plugin_dir)
+            for folder, _, files in os.walk(top):
+                for file_name in sorted(files):
+                    if not file_name.endswith('.py') or file_name == '__init__.py':
+                        continue
+                    relative = os.path.relpath(os.path.join(folder, file_name[:-3]), PROJECT_ROOT)
+                    self._register_module(relative.replace(os.sep, '.'))
+        self._discovered = True
+        return self.discovered_plugins
+
+    def _register_module(self, module_name: str) -> None:
+        try:
+            module = importlib.import_module(module_name)
+        except Exception as e:
+            self.errors[module_name] = f"{type(e).__name__}: {e}"
+            return
+        for name, cls in vars(module).items():
+            if not inspect.isclass(cls) or cls.__module__ != module_name or name.startswith('_') \
+                    or inspect.isabstract(cls):
+                continue
+            for kind, base in BASE_CLASSES.items():
+                if issubclass(cls, base) and cls is not base:
+                    self.discovered_plugins[kind][name] = cls
+
+    @staticmethod
+    def _kind(plugin_type: str) -> str:
+        kind = plugin_type[:-1] if plugin_type.endswith('s') else plugin_type
+        if kind not in BASE_CLASSES:
+            raise ValueError(f"Unknown plugin type '{plugin_type}' (expected one of {sorted(BASE_CLASSES)})")
+        return kind
+
+    def load_plugin(self, plugin_type: str, plugin_name: str) -> type:
+        """Trả về lớp plugin (chưa khởi tạo); ValueError nếu không tìm thấy."""
+        kind = self._kind(plugin_type)
+        if '.' in plugin_name:
+            module_name, _, class_name = plugin_name.rpartition('.')
+            return getattr(importlib.import_module(module_name), class_name)
+        if not self._discovered:
+            self.discover_plugins()
+        cls = self.discovered_plugins[kind].get(plugin_name)
+        if cls is None:
+            hint = f" (modules not importable: {', '.join(sorted(self.errors))})" if self.errors else ""
+            raise ValueError(f"{kind} plugin '{plugin_name}' not found{hint}")
+        return cls
+
+    def create_plugin_instance(self, plugin_type: str, plugin_name: str, config: Optional[Dict[str, Any]]) -> Any:
+        return self.load_plugin(plugin_type, plugin_name)(dict(config or {}))
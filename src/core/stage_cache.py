@@ -0,0 +1,228 @@
+# src/core/stage_cache.py
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Any, Dict, Generator, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch
+
+MANIFEST = 'manifest.json'
+
+class UncacheableError(ValueError):
+    """Dữ liệu của một tầng không lưu được dạng cột (ví dụ kiểu đối tượng tùy ý)."""
+
+def source_fingerprint(reader: Any) -> Optional[Dict[str, Any]]:
+    """
+    Dấu vân tay của nguồn dữ liệu: lớp reader, config và (đường dẫn, mtime, kích thước) của file.
+
+    Trả về None nếu reader không đọc từ file (ví dụ cổng serial) - khi đó không dùng cache.
+    """
+    config = getattr(reader, 'config', None) or {}
+    paths = config.get('files') or getattr(reader, 'files', None)
+    if paths is None and config.get('file_path'):
+        paths = [config['file_path']]
+    if not paths:
+        return None
+    files = []
+    for path in paths:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        files.append([os.path.abspath(path), stat.st_mtime_ns, stat.st_size])
+    return {'reader': type(reader).__name__, 'config': config, 'files': files}
+
+def stage_key(fingerprint: Dict[str, Any], stages: Sequence[Any]) -> str:
+    """Khóa nội dung (sha256) của đầu ra sau các tầng `stages` (mô tả JSON của từng tầng)."""
+    text = json.dumps({'source': fingerprint, 'stages': list(stages)}, sort_keys=True, default=repr)
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+def _encode(value: Any, arrays: Dict[str, np.ndarray], prefix: str) -> Any:
+    """Chuyển metadata thành JSON; mảng NumPy được tách ra lưu trong file .npz."""
+    if isinstance(value, np.ndarray):
+        if value.dtype.kind == 'O':
+            raise UncacheableError(f"object array in metadata '{prefix}'")
+        arrays[prefix] = value
+        return {'__array__': prefix}
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        if not all(isinstance(k, str) for k in value):
+            raise UncacheableError(f"non-string keys in metadata '{prefix}'")
+        return {k: _encode(v, arrays, f"{prefix}.{k}") for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_encode(v, arrays, f"{prefix}.{i}") for i, v in enumerate(value)]
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    raise UncacheableError(f"{type(value).__name__} in metadata '{prefix}'")
+
+def _json_default(value: Any) -> Any:
+    """Chuyển giá trị NumPy trong metrics sang kiểu JSON."""
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return repr(value)
+
+def _decode(value: Any, arrays: Any) -> Any:
+    if isinstance(value, dict):
+        if set(value) == {'__array__'}:
+            return arrays[value['__array__']]
+        return {k: _decode(v, arrays) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_decode(v, arrays) for v in value]
+    return value
+
+class StageWriter:
+    """Ghi đầu ra của một tầng thành các chunk dạng cột (.npz) trong một thư mục tạm."""
+
+    def __init__(self, cache: "StageCache", key: str):
+        self.cache = cache
+        self.key = key
+        self.directory = tempfile.mkdtemp(prefix=f".{key[:16]}-", dir=cache.directory)
+        self.chunks: List[Dict[str, Any]] = []
+        self.failed: Optional[str] = None
+
+    def append(self, items: Iterable[Any]) -> None:
+        """Ghi một chunk (danh sách SensorData/SensorDataBatch); chunk rỗng được bỏ qua."""
+        if self.failed is not None:
+            return
+        items = list(items)
+        if not items:
+            return
+        arrays: Dict[str, np.ndarray] = {}
+        records = []
+        try:
+            for i, item in enumerate(items):
+                if isinstance(item, SensorDataBatch):
+                    batch, kind = item, 'batch'
+                elif isinstance(item, SensorData):
+                    batch, kind = SensorDataBatch.from_samples([item]), 'sample'
+                else:
+                    raise UncacheableError(f"unsupported item type {type(item).__name__}")
+                arrays[f"{i}"] = batch.timestamps_ns
+                for c, (name, column) in enumerate(batch.values.items()):
+                    column = np.asarray(column)
+                    if column.dtype.kind == 'O':
+                        raise UncacheableError(f"object channel '{name}'")
+                    arrays[f"{i}.{c}"] = column
+                records.append({
+                    'kind': kind, 'sensor_id': batch.sensor_id, 'data_type': batch.data_type,
+                    'channels': batch.channels, 'units': dict(batch.units),
+                    'metadata': _encode(batch.metadata, arrays, f"{i}.meta"),
+                })
+        except UncacheableError as e:
+            self.failed = str(e)
+            return
+        name = f"chunk_{len(self.chunks):06d}.npz"
+        np.savez(os.path.join(self.directory, name), **arrays)
+        self.chunks.append({'file': name, 'items': records})
+
+    def commit(self, metrics: Optional[Dict[str, Any]] = None) -> bool:
+        """
+        Hoàn tất: đổi tên thư mục tạm thành thư mục của khóa. Trả về False nếu không lưu được.
+
+        `metrics` (chỉ số `get_metrics` của các processor tới tầng này) được lưu trong manifest
+        để lần chạy đọc tiếp từ tầng này vẫn có đủ chỉ số của các processor bị bỏ qua.
+        """
+        if self.failed is not None:
+            print(f"Warning: stage output not cached ({self.failed})")
+            self.abort()
+            return False
+        with open(os.path.join(self.directory, MANIFEST), 'w') as f:
+            json.dump({'key': self.key, 'created': time.time(), 'chunks': self.chunks,
+                       'metrics': metrics or {}}, f, default=_json_default)
+        target = self.cache.path(self.key)
+        if os.path.isdir(target):
+            shutil.rmtree(target, ignore_errors=True)
+        os.replace(self.directory, target)
+        self.cache.evict()
+        return True
+
+    def abort(self) -> None:
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+class StageCache:
+    """
+    Cache theo nội dung cho đầu ra từng tầng của Pipeline (post-processing lặp lại).
+
+    Mỗi mục là một thư mục đặt tên theo khóa sha256 của nguồn dữ liệu (đường dẫn, mtime, kích
+    thước file) và config của mọi tầng từ decoder tới tầng đó (xem `stage_key`); đổi tham số
+    một processor chỉ làm mất hiệu lực các tầng từ processor đó trở đi. Manifest còn lưu chỉ
+    số (`get_metrics`) của các processor tới tầng đó. Dữ liệu lưu dạng cột:
+    mỗi chunk là một file .npz chứa timestamp và các kênh của từng batch, kèm manifest JSON.
+    Mục chỉ xuất hiện sau khi được ghi trọn vẹn (đổi tên nguyên tử từ thư mục tạm).
+
+    Dung lượng được giới hạn bởi `max_bytes`: khi vượt, các mục ít được dùng gần đây nhất
+    (theo mtime của manifest, cập nhật mỗi lần đọc) bị xóa trước.
+    """
+    def __init__(self, directory: str, max_bytes: int = 2 * 1024 ** 3):
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, key)
+
+    def has(self, key: str) -> bool:
+        return os.path.isfile(os.path.join(self.path(key), MANIFEST))
+
+    def writer(self, key: str) -> StageWriter:
+        return StageWriter(self, key)
+
+    def metrics(self, key: str) -> Dict[str, Any]:
+        """Chỉ số processor đã lưu cùng mục (rỗng với mục không có metrics)."""
+        with open(os.path.join(self.path(key), MANIFEST)) as f:
+            return json.load(f).get('metrics', {})
+
+    def read(self, key: str) -> Generator[List[Any], None, None]:
+        """Đọc lại từng chunk (danh sách SensorData/SensorDataBatch) theo đúng thứ tự đã ghi."""
+        manifest_path = os.path.join(self.path(key), MANIFEST)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        os.utime(manifest_path)          # đánh dấu vừa dùng (LRU)
+        for chunk in manifest['chunks']:
+            with np.load(os.path.join(self.path(key), chunk['file'])) as arrays:
+                items = []
+                for i, record in enumerate(chunk['items']):
+                    batch = SensorDataBatch(
+                        timestamps_ns=arrays[f"{i}"],
+                        sensor_id=record['sensor_id'],
+                        data_type=record['data_type'],
+                        values={name: arrays[f"{i}.{c}"] for c, name in enumerate(record['channels'])},
+                        units=record['units'],
+                        metadata=_decode(record['metadata'], arrays),
+                    )
+                    items.extend(batch.iter_samples() if record['kind'] == 'sample' else [batch])
+            yield items
+
+    def entries(self) -> List[Dict[str, Any]]:
+        """Các mục hiện có: khóa, dung lượng (byte) và thời điểm dùng gần nhất."""
+        result = []
+        for name in os.listdir(self.directory):
+            manifest = os.path.join(self.directory, name, MANIFEST)
+            if name.startswith('.') or not os.path.isfile(manifest):
+                continue
+            folder = os.path.join(self.directory, name)
+            size = sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder))
+            result.append({'key': name, 'bytes': size, 'used': os.path.getmtime(manifest)})
+        return result
+
+    def evict(self) -> None:
+        """Xóa các mục dùng lâu nhất cho tới khi tổng dung lượng <= max_bytes."""
+        entries = sorted(self.entries(), key=lambda e: e['used'])
+        total = sum(e['bytes'] for e in entries)
+        for entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(self.path(entry['key']), ignore_errors=True)
+            total -= entry['bytes']
+
+    def clear(self) -> None:
+        for entry in self.entries():
+            shutil.rmtree(self.path(entry['key']), ignore_errors=True)
@@ -1,7 +1,11 @@
 # src/data/models.py
 from dataclasses import dataclass, field
-from typing import Dict, Any, Optional
-import time
+import numbers
+from typing import Dict, Any, Optional, Sequence, Iterator, List
+
+import numpy as np
+
+from src.utils.timestamp_utils import NS_PER_SECOND, seconds_to_ns, ns_to_seconds
 
 @dataclass
 class SensorData:
@@ -9,8 +13,10 @@ class SensorData:
     Cấu trúc dữ liệu chuẩn cho dữ liệu cảm biến sau khi được giải mã.
 
     Attributes:
-        timestamp (float): Dấu thời gian chuẩn hóa dưới dạng UNIX timestamp (số giây float kể từ epoch).
-                           Đây là trường thời gian chính được sử dụng bên trong hệ thống.
+        timestamp_ns (int): Dấu thời gian chuẩn hóa dưới dạng số nguyên nanosecond kể từ epoch (UNIX).
+                            Đây là trường thời gian chính được sử dụng bên trong hệ thống;
+                            so sánh/ghép thời gian giữa các cảm biến là phép so sánh số nguyên chính xác.
+                            Giá trị giây dạng float có thể lấy qua thuộc tính `timestamp`.
         sensor_id (str): Định danh duy nhất cho cảm biến hoặc nguồn dữ liệu.
         data_type (str): Loại dữ liệu chính (ví dụ: 'imu', 'gps', 'image', 'temperature').
         values (Dict[str, Any]): Từ điển chứa các giá trị dữ liệu thực tế.
@@ -25,25 +31,36 @@ class SensorData:
                                 Quan trọng cho việc xử lý và hiển thị nhất quán.
         metadata (Dict[str, Any]): (Tùy chọn) Từ điển chứa các siêu dữ liệu bổ sung nếu cần.
     """
-    timestamp: float
+    timestamp_ns: int
     sensor_id: str
     data_type: str
     values: Dict[str, Any] = field(default_factory=dict)
     raw_timestamp: Optional[Any] = None
     units: Dict[str, str] = field(default_factory=dict)
-    metadata: Dict[str, Any] = field(default_factory=dict) 
+    metadata: Dict[str, Any] = field(default_factory=dict)
 
     def __post_init__(self):
-        # Thực hiện kiểm tra hoặc chuyển đổi cơ bản nếu cần sau khi khởi tạo
-        # Ví dụ: đảm bảo timestamp là float
-        if not isinstance(self.timestamp, float):
-            try:
-                # Cố gắng chuyển đổi timestamp sang float
-                self.timestamp = float(self.timestamp)
-            except (ValueError, TypeError):
-                print(f"Warning: Could not convert timestamp {self.timestamp} for sensor {self.sensor_id} to float. Using current time.")
-                # Cung cấp giá trị mặc định hoặc ghi log lỗi nghiêm trọng hơn
-                self.timestamp = time.time()
+        # Chỉ chuyển đổi khi cần: đường đi thông thường (int từ decoder) không tốn chi phí ép kiểu.
+        if type(self.timestamp_ns) is not int:
+            # Chỉ chấp nhận số nguyên (np.int64...): giây dạng float ép sang int sẽ lệch 1e9 lần
+            if isinstance(self.timestamp_ns, (numbers.Integral, np.integer)) and not isinstance(self.timestamp_ns, bool):
+                self.timestamp_ns = int(self.timestamp_ns)
+            elif isinstance(self.timestamp_ns, (numbers.Real, np.floating)):
+                raise TypeError(f"timestamp_ns must be integer nanoseconds, got float {self.timestamp_ns!r} "
+                                f"for sensor {self.sensor_id}; use SensorData.from_seconds() for seconds")
+            else:
+                raise TypeError(f"timestamp_ns must be integer nanoseconds, got "
+                                f"{type(self.timestamp_ns).__name__} for sensor {self.sensor_id}")
+
+    @classmethod
+    def from_seconds(cls, timestamp: float, sensor_id: str, data_type: str, **kwargs) -> "SensorData":
+        """Tạo SensorData từ UNIX timestamp dạng giây float (tương thích với mã cũ)."""
+        return cls(seconds_to_ns(timestamp), sensor_id, data_type, **kwargs)
+
+    @property
+    def timestamp(self) -> float:
+        """UNIX timestamp dạng giây float, được suy ra từ `timestamp_ns` (chỉ dùng để hiển thị)."""
+        return self.timestamp_ns / NS_PER_SECOND
 
     def get_value(self, key: str, default: Any = None) -> Any:
         """Lấy giá trị từ trường 'values' một cách an toàn."""
@@ -51,4 +68,152 @@ class SensorData:
 
     def get_unit(self, key: str, default: str = "") -> str:
         """Lấy đơn vị cho một giá trị cụ thể."""
-        return self.units.get(key, default)
\ No newline at end of file
+        return self.units.get(key, default)
+
+
+@dataclass
+class SensorDataBatch:
+    """
+    Khối dữ liệu dạng cột (columnar) gồm nhiều mẫu liên tiếp của cùng một cảm biến và cùng data_type.
+
+    Dùng cho các đường xử lý vector hóa: thay vì một đối tượng SensorData cho mỗi mẫu,
+    mỗi kênh là một mảng NumPy có cùng độ dài với `timestamps_ns`.
+
+    Attributes:
+        timestamps_ns (np.ndarray): Mảng int64 (n,) chứa timestamp nanosecond kể từ epoch, tăng dần.
+        sensor_id (str): Định danh cảm biến.
+        data_type (str): Loại dữ liệu (giống SensorData.data_type).
+        values (Dict[str, np.ndarray]): Tên kênh -> mảng (n,) giá trị.
+        units (Dict[str, str]): Đơn vị cho từng kênh.
+        metadata (Dict[str, Any]): Siêu dữ liệu bổ sung chung cho cả khối.
+    """
+    timestamps_ns: np.ndarray
+    sensor_id: str
+    data_type: str
+    values: Dict[str, np.ndarray] = field(default_factory=dict)
+    units: Dict[str, str] = field(default_factory=dict)
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    def __post_init__(self):
+        # np.asarray không sao chép nếu mảng đã là int64
+        self.timestamps_ns = np.asarray(self.timestamps_ns, dtype=np.int64)
+
+    def __len__(self) -> int:
+        return int(self.timestamps_ns.shape[0])
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Timestamp dạng giây float64, được suy ra từ `timestamps_ns`."""
+        return ns_to_seconds(self.timestamps_ns)
+
+    @property
+    def channels(self) -> List[str]:
+        """Danh sách tên kênh theo thứ tự chèn."""
+        return list(self.values.keys())
+
+    def to_array(self, channels: Optional[Sequence[str]] = None, dtype=np.float64) -> np.ndarray:
+        """
+        Ghép các kênh thành một mảng 2-D (n, k) để xử lý vector hóa nhiều kênh cùng lúc.
+
+        Args:
+            channels: Danh sách kênh cần lấy (mặc định: tất cả các kênh).
+            dtype: Kiểu dữ liệu của mảng kết quả.
+        """
+        if channels is None:
+            channels = self.channels
+        out = np.empty((len(self), len(channels)), dtype=dtype)
+        for i, name in enumerate(channels):
+            out[:, i] = self.values[name]
+        return out
+
+    def slice(self, start: Optional[int] = None, stop: Optional[int] = None) -> "SensorDataBatch":
+        """Trả về khối con [start:stop] (các mảng là view, không sao chép)."""
+        sl = slice(start, stop)
+        return SensorDataBatch(
+            timestamps_ns=self.timestamps_ns[sl],
+            sensor_id=self.sensor_id,
+            data_type=self.data_type,
+            values={name: arr[sl] for name, arr in self.values.items()},
+            units=dict(self.units),
+            metadata=dict(self.metadata),
+        )
+
+    def take(self, index) -> "SensorDataBatch":
+        """Trả về khối con theo mảng chỉ số hoặc mặt nạ boolean."""
+        return SensorDataBatch(
+            timestamps_ns=self.timestamps_ns[index],
+            sensor_id=self.sensor_id,
+            data_type=self.data_type,
+            values={name: arr[index] for name, arr in self.values.items()},
+            units=dict(self.units),
+            metadata=dict(self.metadata),
+        )
+
+    def iter_samples(self) -> Iterator[SensorData]:
+        """Sinh lần lượt từng SensorData (dành cho các thành phần chưa hỗ trợ batch)."""
+        names = self.channels
+        columns = [self.values[name].tolist() for name in names]
+        for i, ts in enumerate(self.timestamps_ns.tolist()):
+            yield SensorData(
+                timestamp_ns=ts,
+                sensor_id=self.sensor_id,
+                data_type=self.data_type,
+                values={name: col[i] for name, col in zip(names, columns)},
+                units=dict(self.units),
+                metadata=dict(self.metadata),
+            )
+
+    @classmethod
+    def from_samples(cls, samples: Sequence[SensorData]) -> "SensorDataBatch":
+        """
+        Tạo một khối từ danh sách SensorData cùng sensor_id và data_type.
+
+        Raises:
+            ValueError: Nếu danh sách rỗng hoặc chứa nhiều sensor_id/data_type.
+        """
+        if not samples:
+            raise ValueError("Cannot build a SensorDataBatch from an empty sample list")
+        first = samples[0]
+        for sample in samples:
+            if sample.sensor_id != first.sensor_id or sample.data_type != first.data_type:
+                raise ValueError("All samples in a batch must share sensor_id and data_type")
+        names = list(first.values.keys())
+        return cls(
+            timestamps_ns=np.fromiter((s.timestamp_ns for s in samples), dtype=np.int64, count=len(samples)),
+            sensor_id=first.sensor_id,
+            data_type=first.data_type,
+            values={name: np.array([s.values.get(name, np.nan) for s in samples]) for name in names},
+            units=dict(first.units),
+            metadata=dict(first.metadata),
+        )
+
+    @classmethod
+    def concatenate(cls, batches: Sequence["SensorDataBatch"]) -> "SensorDataBatch":
+        """Nối nhiều khối cùng sensor_id/data_type theo thứ tự thời gian đã cho."""
+        if not batches:
+            raise ValueError("Cannot concatenate an empty list of batches")
+        first = batches[0]
+        if len(batches) == 1:
+            return first
+        return cls(
+            timestamps_ns=np.concatenate([b.timestamps_ns for b in batches]),
+            sensor_id=first.sensor_id,
+            data_type=first.data_type,
+            values={name: np.concatenate([b.values[name] for b in batches]) for name in first.values},
+            units=dict(first.units),
+            metadata=dict(first.metadata),
+        )
+
+
+def as_batch(data: Any) -> Optional[SensorDataBatch]:
+    """
+    Chuẩn hóa đầu vào của Processor thành SensorDataBatch.
+
+    SensorData được chuyển thành khối một mẫu; SensorDataBatch được trả về nguyên vẹn;
+    các kiểu khác trả về None.
+    """
+    if isinstance(data, SensorDataBatch):
+        return data
+    if isinstance(data, SensorData):
+        return SensorDataBatch.from_samples([data])
+    return None
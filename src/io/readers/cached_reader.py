@@ -0,0 +1,241 @@
+# src/io/readers/cached_reader.py
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+from typing import Any, BinaryIO, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.models import SensorDataBatch
+from src.io.readers.base_reader import BaseReader
+from src.io.readers.file_reader import FileReader
+from src.plugins.decoders.witmotion_hwt905_decoder import WitMotionDecoder
+
+MANIFEST = 'manifest.json'
+SEGMENTS = 'segments.bin'
+
+def recording_key(path: str, decoder_class: type, decoder_params: Dict[str, Any]) -> str:
+    """Khóa sha256 từ danh tính file (đường dẫn, kích thước, mtime) và decoder (lớp + tham số)."""
+    stat = os.stat(path)
+    identity = {
+        'path': os.path.abspath(path), 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns,
+        'decoder': decoder_class.__name__, 'params': decoder_params,
+    }
+    return hashlib.sha256(json.dumps(identity, sort_keys=True, default=repr).encode('utf-8')).hexdigest()
+
+class _CacheWriter:
+    """Ghi các cột của từng luồng (sensor_id, data_type) thành file nhị phân thô để memory-map."""
+
+    def __init__(self, target: str):
+        self.target = target
+        parent = os.path.dirname(target)
+        os.makedirs(parent, exist_ok=True)
+        self.directory = tempfile.mkdtemp(prefix='.tmp-', dir=parent)
+        self.streams: List[Dict[str, Any]] = []
+        self.index: Dict[Tuple[str, str], int] = {}
+        self.files: Dict[str, BinaryIO] = {}
+        self.segments = open(os.path.join(self.directory, SEGMENTS), 'wb')
+        self.failed = False
+
+    def _write(self, name: str, array: np.ndarray) -> None:
+        f = self.files.get(name)
+        if f is None:
+            f = self.files[name] = open(os.path.join(self.directory, name), 'wb')
+        f.write(np.ascontiguousarray(array).tobytes())
+
+    def append(self, batch: SensorDataBatch) -> None:
+        if self.failed:
+            return
+        key = (batch.sensor_id, batch.data_type)
+        s = self.index.get(key)
+        if s is None:
+            channels = [{'name': n, 'dtype': np.asarray(v).dtype.str} for n, v in batch.values.items()]
+            if any(np.dtype(c['dtype']).kind == 'O' for c in channels):
+                self.failed = True
+                return
+            s = self.index[key] = len(self.streams)
+            self.streams.append({'sensor_id': batch.sensor_id, 'data_type': batch.data_type,
+                                 'channels': channels, 'units': dict(batch.units), 'length': 0})
+        stream = self.streams[s]
+        names = [c['name'] for c in stream['channels']]
+        if list(batch.values) != names or batch.metadata:
+            # Bố cục kênh thay đổi hoặc có metadata theo batch: không lưu được dạng cột cố định
+            self.failed = True
+            return
+        start = stream['length']
+        self._write(f"{s}_t.bin", batch.timestamps_ns.astype('<i8', copy=False))
+        for c, column in enumerate(stream['channels']):
+            self._write(f"{s}_{c}.bin", np.asarray(batch.values[column['name']]).astype(column['dtype'], copy=False))
+        stream['length'] = start + len(batch)
+        self.segments.write(np.array([s, start, stream['length']], dtype='<i8').tobytes())
+
+    def commit(self, extra: Dict[str, Any]) -> bool:
+        self._close_files()
+        if self.failed:
+            self.abort()
+            return False
+        with open(os.path.join(self.directory, MANIFEST), 'w') as f:
+            json.dump(dict(extra, streams=self.streams), f, default=repr)
+        if os.path.isdir(self.target):
+            shutil.rmtree(self.target, ignore_errors=True)
+        os.replace(self.directory, self.target)
+        return True
+
+    def abort(self) -> None:
+        self._close_files()
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def _close_files(self) -> None:
+        for f in self.files.values():
+            f.close()
+        self.files = {}
+        self.segments.close()
+
+class CachedRecordingReader(BaseReader):
+    """
+    Reader đọc file ghi HWT905 đã giải mã, lưu kết quả giải mã để lần mở sau không phải giải mã lại.
+
+    Lần đầu: file được đọc (FileReader) và giải mã theo batch như bình thường, đồng thời mỗi
+    cột của từng luồng (sensor_id, data_type) được ghi nối tiếp vào một file nhị phân thô, kèm
+    danh sách đoạn (luồng, đầu, cuối) theo đúng thứ tự các batch. Cache chỉ được công bố khi
+    đọc hết file (đổi tên nguyên tử từ thư mục tạm). Các lần sau: các cột được memory-map
+    (np.memmap, chỉ đọc) và các batch được phát lại dưới dạng view - không giải mã, không sao
+    chép, hệ điều hành chỉ nạp các trang thực sự được dùng.
+
+    Khóa cache gồm đường dẫn, kích thước, mtime của file và lớp + tham số decoder; file thay
+    đổi hoặc đổi tham số decoder sẽ tạo cache mới. Mặc định cache nằm cạnh file ghi
+    ('<file>.decoded/<khóa>'); với `cache_dir`, mọi cache nằm chung một thư mục và được giới
+    hạn bởi `max_bytes` (xóa mục dùng lâu nhất trước).
+
+    Timestamp lấy từ đồng hồ host lúc giải mã (`timestamp_mode` 'realtime', hoặc 'unix' không
+    có `start_time`) không được cache: phát lại sẽ trả về thời gian cũ như thể vừa giải mã, nên
+    các chế độ này luôn giải mã lại (có cảnh báo). Kênh `host_time_ns` của luồng chip_time ở
+    các chế độ khác là thời điểm giải mã lần đầu khi đọc từ cache.
+
+    Reader này trả về SensorDataBatch đã giải mã, nên dùng với Pipeline(decoder=None).
+
+    Config:
+        file_path (str): Đường dẫn tới file ghi. Bắt buộc.
+        decoder_params (Dict): Tham số cho decoder.
+        chunk_size (int): Số byte mỗi lần đọc khi giải mã (mặc định 65536).
+        cache_dir (str): (Tùy chọn) Thư mục cache chung thay vì cạnh file ghi.
+        max_bytes (int): Dung lượng tối đa của `cache_dir` (mặc định 10 GiB).
+        use_cache (bool): Tắt để luôn giải mã (mặc định True).
+    """
+    def __init__(self, config: Dict[str, Any], decoder_class=WitMotionDecoder):
+        super().__init__(config)
+        self.file_path = config['file_path']
+        self.decoder_class = decoder_class
+        self.decoder_params = dict(config.get('decoder_params', {}))
+        self.chunk_size = int(config.get('chunk_size', 65536))
+        self.cache_dir: Optional[str] = config.get('cache_dir')
+        self.max_bytes = int(config.get('max_bytes', 10 * 1024 ** 3))
+        self.use_cache = bool(config.get('use_cache', True))
+        self.from_cache = False
+        self._reader: Optional[FileReader] = None
+
+    def wall_clock_timestamps(self) -> bool:
+        """True nếu timestamp do decoder sinh từ đồng hồ host lúc giải mã (không cache được)."""
+        mode = self.decoder_params.get('timestamp_mode', 'packet')
+        return mode == 'realtime' or (mode == 'unix' and self.decoder_params.get('start_time') is None)
+
+    def cache_path(self) -> str:
+        key = recording_key(self.file_path, self.decoder_class, self.decoder_params)
+        if self.cache_dir:
+            return os.path.join(self.cache_dir, key)
+        return os.path.join(self.file_path + '.decoded', key[:32])
+
+    def close(self):
+        if self._reader is not None:
+            self._reader.close()
+            self._reader = None
+
+    def read(self) -> Generator[SensorDataBatch, None, None]:
+        target = None
+        if self.use_cache:
+            if self.wall_clock_timestamps():
+                print(f"Warning: {self.__class__.__name__} does not cache {self.file_path}: timestamp_mode "
+                      f"'{self.decoder_params.get('timestamp_mode')}' uses the host clock at decode time")
+            else:
+                target = self.cache_path()
+        if target is not None and os.path.isfile(os.path.join(target, MANIFEST)):
+            self.from_cache = True
+            yield from self._replay(target)
+            return
+        self.from_cache = False
+        if target is not None and not self.cache_dir:
+            # Cache cạnh file chỉ giữ phiên bản mới nhất
+            shutil.rmtree(os.path.dirname(target), ignore_errors=True)
+        writer = None
+        if target is not None:
+            try:
+                writer = _CacheWriter(target)
+            except OSError as e:
+                print(f"Warning: {self.__class__.__name__} cannot create cache for {self.file_path} ({e}); "
+                      f"decoding without cache")
+        self._reader = FileReader({'file_path': self.file_path, 'chunk_size': self.chunk_size})
+        decoder = self.decoder_class(dict(self.decoder_params))
+        completed = False
+        try:
+            for raw in self._reader.read():
+                for batch in decoder.decode_batch(raw):
+                    if len(batch) == 0:
+                        continue
+                    if writer is not None:
+                        writer.append(batch)
+                    yield batch
+            completed = True
+        finally:
+            self.close()
+            if writer is not None:
+                if completed and writer.commit({'file_path': os.path.abspath(self.file_path)}):
+                    self._evict()
+                else:
+                    writer.abort()
+
+    def _replay(self, directory: str) -> Generator[SensorDataBatch, None, None]:
+        manifest_path = os.path.join(directory, MANIFEST)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        os.utime(manifest_path)          # đánh dấu vừa dùng (LRU)
+        columns = []
+        for s, stream in enumerate(manifest['streams']):
+            length = stream['length']
+            timestamps = np.memmap(os.path.join(directory, f"{s}_t.bin"), dtype='<i8', mode='r', shape=(length,))
+            values = {c['name']: np.memmap(os.path.join(directory, f"{s}_{i}.bin"), dtype=c['dtype'],
+                                           mode='r', shape=(length,))
+                      for i, c in enumerate(stream['channels'])}
+            columns.append((stream, timestamps, values))
+        segments = np.fromfile(os.path.join(directory, SEGMENTS), dtype='<i8').reshape(-1, 3)
+        for s, start, stop in segments.tolist():
+            stream, timestamps, values = columns[s]
+            yield SensorDataBatch(
+                timestamps_ns=timestamps[start:stop],
+                sensor_id=stream['sensor_id'],
+                data_type=stream['data_type'],
+                values={name: column[start:stop] for name, column in values.items()},
+                units=dict(stream['units']),
+            )
+
+    def _evict(self) -> None:
+        if not self.cache_dir:
+            return
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            folder = os.path.join(self.cache_dir, name)
+            manifest = os.path.join(folder, MANIFEST)
+            if os.path.isfile(manifest):
+                size = sum(os.path.getsize(os.path.join(folder, f)) for f in os.listdir(folder))
+                entries.append((os.path.getmtime(manifest), size, folder))
+        total = sum(size for _, size, _ in entries)
+        for _, size, folder in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(folder, ignore_errors=True)
+            total -= size
+
+    def get_status(self) -> Dict[str, Any]:
+        return {"status": "open" if self._reader is not None else "closed",
+                "file_path": self.file_path, "from_cache": self.from_cache}
@@ -0,0 +1,57 @@
+# src/io/readers/file_reader.py
+import os
+import time
+from typing import Any, Generator, Dict, Optional
+
+from src.io.readers.base_reader import BaseReader
+
+class FileReader(BaseReader):
+    """
+    Reader đọc dữ liệu thô từ file nhị phân theo từng chunk (dùng cho post-processing).
+
+    Config:
+        file_path (str): Đường dẫn tới file dữ liệu (ví dụ: file .bin ghi từ HWT905).
+        chunk_size (int): Số byte mỗi lần đọc (mặc định 4096).
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.file_path = config['file_path']
+        self.chunk_size = int(config.get('chunk_size', 4096))
+        self._file = None
+        self.bytes_read = 0
+        # Thời điểm host (ns kể từ epoch) khi đọc được chunk gần nhất
+        self.last_read_ns: Optional[int] = None
+
+    def open(self):
+        if self._file is None:
+            self._file = open(self.file_path, 'rb')
+            self.bytes_read = 0
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def read(self) -> Generator[bytes, None, None]:
+        # Cho phép dùng read() mà không cần gọi open() trước
+        opened_here = self._file is None
+        if opened_here:
+            self.open()
+        try:
+            while chunk := self._file.read(self.chunk_size):
+                self.bytes_read += len(chunk)
+                self.last_read_ns = time.time_ns()
+                yield chunk
+        finally:
+            if opened_here:
+                self.close()
+
+    def get_status(self) -> Dict[str, Any]:
+        size = os.path.getsize(self.file_path) if os.path.exists(self.file_path) else None
+        return {
+            "status": "open" if self._file is not None else "closed",
+            "file_path": self.file_path,
+            "bytes_read": self.bytes_read,
+            "file_size": size,
+            "last_read_ns": self.last_read_ns,
+        }
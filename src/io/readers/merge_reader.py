@@ -0,0 +1,174 @@
+# src/io/readers/merge_reader.py
+import glob
+import heapq
+import os
+from collections import deque
+from typing import Any, Deque, Dict, Generator, List
+
+import numpy as np
+
+from src.data.models import SensorDataBatch
+from src.io.readers.base_reader import BaseReader
+from src.io.readers.file_reader import FileReader
+from src.plugins.decoders.witmotion_hwt905_decoder import WitMotionDecoder
+from src.utils.timestamp_utils import NS_PER_SECOND
+
+class _RecordingInput:
+    """Một file ghi: FileReader + Decoder riêng, giải mã lười theo từng chunk."""
+
+    def __init__(self, path: str, decoder, chunk_size: int):
+        self.path = path
+        self.reader = FileReader({'file_path': path, 'chunk_size': chunk_size})
+        self.decoder = decoder
+        self.source = None
+        # data_type -> các batch đã giải mã nhưng chưa phát
+        self.lanes: Dict[str, Deque[SensorDataBatch]] = {}
+        # Mọi dữ liệu giải mã sau này của file này có timestamp >= watermark
+        self.watermark = np.iinfo(np.int64).min
+        self.exhausted = False
+
+    def open(self):
+        self.reader.open()
+        self.source = iter(self.reader.read())
+
+    def close(self):
+        self.reader.close()
+        self.source = None
+
+    def pull(self) -> None:
+        """Đọc và giải mã thêm một chunk."""
+        if self.source is None:
+            self.open()
+        try:
+            raw = next(self.source)
+        except StopIteration:
+            self.exhausted = True
+            self.close()
+            return
+        for batch in self.decoder.decode_batch(raw):
+            if len(batch) == 0:
+                continue
+            self.lanes.setdefault(batch.data_type, deque()).append(batch)
+            self.watermark = max(self.watermark, int(batch.timestamps_ns[-1]))
+
+class MergedRecordingReader(BaseReader):
+    """
+    Gộp nhiều file ghi (ví dụ mỗi cảm biến một file) thành một luồng duy nhất theo thứ tự thời gian.
+
+    Mỗi file được mở qua FileReader và giải mã lười bằng decoder riêng; chỉ file đang
+    "tụt lại" (watermark nhỏ nhất) được đọc thêm, nên bộ nhớ cho mỗi file chỉ khoảng một chunk.
+    Việc gộp là k-way merge bằng heap trên các batch (không phải từng mẫu): mỗi lần lấy
+    luồng có timestamp đầu nhỏ nhất và phát cả đoạn đầu của batch cho tới timestamp đầu
+    của luồng kế tiếp (cộng `merge_window`).
+
+    Reader này trả về SensorDataBatch đã giải mã thay vì bytes, nên dùng với Pipeline
+    có `decoder=None`.
+
+    Việc gộp chỉ có nghĩa khi timestamp của các file cùng một gốc thời gian, nên
+    `timestamp_mode` của decoder mặc định là 'chiptime' (giờ trên chip, từ gói 0x50).
+    Với 'packet' mọi file đều bắt đầu từ 0 ns (trừ khi có `start_time`), với 'unix' và
+    'realtime' timestamp là giờ host lúc giải mã từng file; các chế độ này vẫn chạy được
+    nhưng có cảnh báo vì thứ tự xen kẽ giữa các file không phản ánh thời gian thực.
+
+    Config:
+        files (List[str]): Danh sách file ghi. Có thể thay bằng `pattern`.
+        pattern (str): Glob chọn file (ví dụ 'session/*.bin'), sắp xếp theo tên.
+        sensor_ids (List[str]): (Tùy chọn) sensor_id cho từng file; mặc định là tên file không có đuôi.
+        decoder_params (Dict): Tham số chung cho decoder của mọi file (`timestamp_mode` mặc định 'chiptime').
+        chunk_size (int): Số byte mỗi lần đọc (mặc định 65536).
+        merge_window (float): Độ lệch thứ tự tối đa (giây) cho phép để giữ batch lớn; 0 cho thứ tự
+                              tuyệt đối theo từng mẫu (mặc định 0.05). Timestamp bắt đầu của các
+                              batch phát ra luôn không giảm.
+    """
+    def __init__(self, config: Dict[str, Any], decoder_class=WitMotionDecoder):
+        super().__init__(config)
+        files = config.get('files')
+        if files is None and config.get('pattern'):
+            files = sorted(glob.glob(config['pattern']))
+        if not files:
+            raise ValueError("MergedRecordingReader requires 'files' or a matching 'pattern'")
+        self.files: List[str] = list(files)
+        sensor_ids = config.get('sensor_ids')
+        if sensor_ids is None:
+            sensor_ids = [os.path.splitext(os.path.basename(path))[0] for path in self.files]
+        if len(sensor_ids) != len(self.files):
+            raise ValueError("'sensor_ids' must have one entry per file")
+        self.sensor_ids: List[str] = list(sensor_ids)
+        self.decoder_class = decoder_class
+        self.decoder_params = dict(config.get('decoder_params', {}))
+        self.decoder_params.setdefault('timestamp_mode', 'chiptime')
+        mode = self.decoder_params['timestamp_mode']
+        if len(self.files) > 1 and mode != 'chiptime' \
+                and not (mode == 'packet' and self.decoder_params.get('start_time') is not None):
+            print(f"Warning: {self.__class__.__name__} timestamp_mode '{mode}' does not give the files a "
+                  f"common time base; merged order between files is not meaningful (use 'chiptime')")
+        self.chunk_size = int(config.get('chunk_size', 65536))
+        self.merge_window_ns = int(float(config.get('merge_window', 0.05)) * NS_PER_SECOND)
+        self.inputs: List[_RecordingInput] = []
+
+    def open(self):
+        if self.inputs:
+            return
+        for path, sensor_id in zip(self.files, self.sensor_ids):
+            params = dict(self.decoder_params, sensor_id=sensor_id)
+            self.inputs.append(_RecordingInput(path, self.decoder_class(params), self.chunk_size))
+
+    def close(self):
+        for recording in self.inputs:
+            recording.close()
+        self.inputs = []
+
+    def read(self) -> Generator[SensorDataBatch, None, None]:
+        opened_here = not self.inputs
+        if opened_here:
+            self.open()
+        try:
+            # Heap các file còn dữ liệu theo watermark: luôn đọc thêm từ file tụt lại nhất
+            pending = [(recording.watermark, index) for index, recording in enumerate(self.inputs)]
+            heapq.heapify(pending)
+            while pending:
+                _, index = heapq.heappop(pending)
+                recording = self.inputs[index]
+                recording.pull()
+                if not recording.exhausted:
+                    heapq.heappush(pending, (recording.watermark, index))
+                safe = pending[0][0] if pending else np.iinfo(np.int64).max
+                yield from self._drain(safe)
+        finally:
+            if opened_here:
+                self.close()
+
+    def _drain(self, safe_ns: int) -> Generator[SensorDataBatch, None, None]:
+        """Phát theo thứ tự thời gian mọi dữ liệu đang chờ có timestamp <= safe_ns."""
+        heap = []
+        for index, recording in enumerate(self.inputs):
+            for data_type, lane in recording.lanes.items():
+                if lane:
+                    heap.append((int(lane[0].timestamps_ns[0]), index, data_type))
+        heapq.heapify(heap)
+        while heap:
+            head, index, data_type = heapq.heappop(heap)
+            if head > safe_ns:
+                break
+            lane = self.inputs[index].lanes[data_type]
+            batch = lane[0]
+            limit = safe_ns
+            if heap:
+                limit = min(limit, heap[0][0] + self.merge_window_ns)
+            cut = int(np.searchsorted(batch.timestamps_ns, limit, side='right'))
+            if cut >= len(batch):
+                lane.popleft()
+                yield batch
+            else:
+                lane[0] = batch.slice(cut, None)
+                yield batch.slice(0, cut)
+            if lane:
+                heapq.heappush(heap, (int(lane[0].timestamps_ns[0]), index, data_type))
+
+    def get_status(self) -> Dict[str, Any]:
+        return {
+            "status": "open" if self.inputs else "closed",
+            "files": len(self.files),
+            "inputs": [recording.reader.get_status() | {"exhausted": recording.exhausted}
+                       for recording in self.inputs],
+        }
@@ -0,0 +1,49 @@
+# src/io/writers/base_writer.py
+from abc import ABC, abstractmethod
+from typing import Any, Dict
+
+class BaseWriter(ABC):
+    """
+    Lớp cơ sở trừu tượng cho tất cả các bộ ghi dữ liệu (Writers).
+
+    Writers nhận dữ liệu đã giải mã/xử lý (SensorData hoặc SensorDataBatch)
+    và lưu trữ nó ra một đích cụ thể (ví dụ: file CSV, cơ sở dữ liệu).
+    Timestamp luôn được ghi dưới dạng số nguyên nanosecond (`timestamp_ns`)
+    để không mất độ chính xác khi đọc lại.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        """
+        Khởi tạo Writer với cấu hình cụ thể.
+
+        Args:
+            config (Dict[str, Any]): Dictionary chứa các tham số cấu hình
+                                     cho Writer này (ví dụ: 'file_path', 'fields').
+        """
+        self.config = config
+        print(f"Initializing {self.__class__.__name__} with config: {config}")
+
+    @abstractmethod
+    def write(self, data: Any) -> None:
+        """
+        Ghi một đơn vị dữ liệu (SensorData hoặc SensorDataBatch).
+
+        Phương thức này PHẢI được triển khai bởi các lớp con.
+        """
+        pass
+
+    def open(self):
+        """(Tùy chọn) Mở file/kết nối đích."""
+        pass
+
+    def close(self):
+        """(Tùy chọn) Flush và đóng file/kết nối đích."""
+        pass
+
+    def __enter__(self):
+        """Hỗ trợ context manager (câu lệnh `with`)."""
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Hỗ trợ context manager (câu lệnh `with`). Đảm bảo close được gọi."""
+        self.close()
@@ -0,0 +1,70 @@
+# src/io/writers/csv_writer.py
+import csv
+from typing import Any, Dict, List, Optional
+
+from src.data.models import SensorData, SensorDataBatch
+from src.io.writers.base_writer import BaseWriter
+
+class CsvWriter(BaseWriter):
+    """
+    Ghi SensorData / SensorDataBatch ra file CSV.
+
+    Cột đầu tiên luôn là `timestamp_ns` (int64 nanosecond kể từ epoch), tiếp theo là
+    `sensor_id`, `data_type` và các kênh dữ liệu. Giây dạng float chỉ được ghi thêm
+    khi bật `include_seconds` (để tiện đọc bằng mắt).
+
+    Config:
+        file_path (str): Đường dẫn file CSV đầu ra.
+        fields (List[str]): (Tùy chọn) Danh sách kênh cần ghi. Mặc định lấy theo dữ liệu đầu tiên.
+        include_seconds (bool): Ghi thêm cột `timestamp` dạng giây float (mặc định False).
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.file_path = config['file_path']
+        self.fields: Optional[List[str]] = config.get('fields')
+        self.include_seconds = bool(config.get('include_seconds', False))
+        self._file = None
+        self._writer = None
+
+    def open(self):
+        if self._file is None:
+            self._file = open(self.file_path, 'w', newline='')
+            self._writer = csv.writer(self._file)
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._writer = None
+
+    def _write_header(self, channels: List[str]):
+        self.fields = list(channels)
+        header = ['timestamp_ns']
+        if self.include_seconds:
+            header.append('timestamp')
+        header += ['sensor_id', 'data_type'] + self.fields
+        self._writer.writerow(header)
+
+    def write(self, data: Any) -> None:
+        if self._writer is None:
+            self.open()
+        if isinstance(data, SensorData):
+            if self._file.tell() == 0:
+                self._write_header(self.fields or list(data.values.keys()))
+            row = [data.timestamp_ns]
+            if self.include_seconds:
+                row.append(repr(data.timestamp))
+            row += [data.sensor_id, data.data_type]
+            row += [data.values.get(name, '') for name in self.fields]
+            self._writer.writerow(row)
+        elif isinstance(data, SensorDataBatch):
+            if self._file.tell() == 0:
+                self._write_header(self.fields or data.channels)
+            n = len(data)
+            columns = [data.timestamps_ns.tolist()]
+            if self.include_seconds:
+                columns.append([repr(t) for t in data.timestamps.tolist()])
+            columns += [[data.sensor_id] * n, [data.data_type] * n]
+            columns += [data.values[name].tolist() if name in data.values else [''] * n
+                        for name in self.fields]
+            self._writer.writerows(zip(*columns))
@@ -1 +1,194 @@
+# src/main.py
+"""
+Chạy post-processing hàng loạt (không giao diện) cho một thư mục hoặc glob các file ghi.
 
+Mỗi file được đưa qua một pipeline của file cấu hình (xem config/mvp_config.yaml): reader
+của pipeline được trỏ tới file đó (`params.file_path`), các visualizer bị bỏ qua trừ khi có
+--keep-visualizers. Các file chạy song song trong một process pool (mỗi tiến trình tự tạo
+pipeline riêng qua Engine). Tiến độ và thông lượng từng file được in ngay khi file xong;
+cuối cùng in và (tùy chọn) ghi bảng tổng kết: mỗi file một hàng với kích thước, số mẫu,
+thời gian, MB/s, mẫu/s, các chỉ số của processor (ví dụ 'quality.<sensor>.<type>.gaps') và
+lỗi nếu có. Mã thoát khác 0 nếu có file lỗi.
+
+Ví dụ:
+    python -m src.main config/batch.yaml captures/ --workers 16 --memory-limit 512MB \\
+        --summary nightly.csv
+    python -m src.main config/batch.yaml 'captures/2024-*/*.bin' --pipeline vibration
+"""
+import argparse
+import contextlib
+import copy
+import glob
+import io
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from src.core.config_loader import ConfigLoader, parse_bytes
+from src.core.engine import Engine
+
+# Chỉ số của Pipeline được đưa thành cột riêng trong bảng tổng kết
+PIPELINE_METRICS = ('chunks', 'samples', 'outputs', 'peak_bytes', 'cached_stage')
+
+def find_recordings(inputs: Iterable[str], pattern: str = '*.bin') -> List[str]:
+    """Danh sách file (theo thứ tự, không trùng) từ các thư mục (tìm đệ quy theo `pattern`), glob hoặc file."""
+    found: List[str] = []
+    for entry in inputs:
+        if os.path.isdir(entry):
+            matches = sorted(glob.glob(os.path.join(entry, '**', pattern), recursive=True))
+        elif glob.has_magic(entry):
+            matches = sorted(glob.glob(entry, recursive=True))
+        else:
+            matches = [entry]
+        found.extend(path for path in matches if os.path.isfile(path) or path == entry)
+    return list(dict.fromkeys(found))
+
+def select_pipeline(config: Dict[str, Any], name: Optional[str] = None) -> Dict[str, Any]:
+    """Mục cấu hình của pipeline tên `name` (mặc định pipeline đầu tiên)."""
+    pipelines = config['pipelines']
+    if name is None:
+        return pipelines[0]
+    for spec in pipelines:
+        if spec.get('name') == name:
+            return spec
+    raise ValueError(f"Pipeline '{name}' not found (available: {[p.get('name') for p in pipelines]})")
+
+def _flatten(prefix: str, value: Any, out: Dict[str, Any]) -> None:
+    if isinstance(value, dict):
+        for key, item in value.items():
+            _flatten(f"{prefix}.{key}" if prefix else str(key), item, out)
+    elif value is None or isinstance(value, (bool, int, float, str)):
+        out[prefix] = value
+
+def process_file(spec: Dict[str, Any], path: str, offline: Optional[Dict[str, Any]] = None,
+                 keep_visualizers: bool = False, verbose: bool = False) -> Dict[str, Any]:
+    """
+    Chạy pipeline `spec` trên một file; lỗi được ghi vào hàng kết quả thay vì ném ra.
+
+    Returns:
+        Hàng tổng kết: file, status ('ok'/'error'), bytes, elapsed, mb_per_s, samples_per_s,
+        các chỉ số Pipeline và processor, error.
+    """
+    spec = copy.deepcopy(spec)
+    spec['reader']['params'] = dict(spec['reader'].get('params') or {}, file_path=path)
+    if not keep_visualizers:
+        spec['visualizers'] = []
+    row: Dict[str, Any] = {'file': path, 'status': 'ok', 'bytes': os.path.getsize(path) if os.path.isfile(path) else 0}
+    start = time.perf_counter()
+    log = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with log:
+            pipeline = Engine(offline=offline).build_pipeline(spec)
+            pipeline.run()
+        metrics = dict(pipeline.metrics)
+    except Exception as e:
+        row.update(status='error', error=f"{type(e).__name__}: {e}")
+        metrics = {}
+    elapsed = time.perf_counter() - start
+    row['elapsed'] = elapsed
+    row['mb_per_s'] = row['bytes'] / 1e6 / elapsed if elapsed > 0 else float('nan')
+    row['samples_per_s'] = metrics.get('samples', 0) / elapsed if elapsed > 0 else float('nan')
+    for key in PIPELINE_METRICS:
+        if key in metrics:
+            row[key] = metrics[key]
+    extra: Dict[str, Any] = {}
+    for key, value in metrics.items():
+        if key not in PIPELINE_METRICS and key not in ('bytes', 'elapsed'):
+            _flatten(key, value, extra)
+    row.update(extra)
+    row.setdefault('error', '')
+    return row
+
+def _progress(done: int, total: int, row: Dict[str, Any]) -> None:
+    name = os.path.basename(row['file'])
+    if row['status'] == 'ok':
+        print(f"[{done}/{total}] {name}: {row['bytes'] / 1e6:.1f} MB in {row['elapsed']:.2f} s "
+              f"({row['mb_per_s']:.1f} MB/s, {row['samples_per_s']:.0f} samples/s)", flush=True)
+    else:
+        print(f"[{done}/{total}] {name}: FAILED {row['error']}", flush=True)
+
+def run_batch(spec: Dict[str, Any], paths: Sequence[str], workers: Optional[int] = None,
+              offline: Optional[Dict[str, Any]] = None, keep_visualizers: bool = False,
+              verbose: bool = False, progress: bool = True) -> pd.DataFrame:
+    """
+    Chạy pipeline trên mọi file; `workers` mặc định os.cpu_count(), 0 chạy tuần tự trong tiến trình này.
+
+    Returns:
+        Bảng tổng kết (mỗi file một hàng, theo thứ tự `paths`).
+    """
+    rows: Dict[str, Dict[str, Any]] = {}
+    if workers == 0:
+        for path in paths:
+            rows[path] = process_file(spec, path, offline, keep_visualizers, verbose)
+            if progress:
+                _progress(len(rows), len(paths), rows[path])
+    elif paths:
+        workers = min(workers or os.cpu_count() or 1, len(paths))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(process_file, spec, path, offline, keep_visualizers, verbose): path
+                       for path in paths}
+            for future in as_completed(futures):
+                path = futures[future]
+                try:
+                    rows[path] = future.result()
+                except Exception as e:       # tiến trình con chết (ví dụ hết bộ nhớ)
+                    rows[path] = {'file': path, 'status': 'error', 'error': f"{type(e).__name__}: {e}"}
+                if progress:
+                    _progress(len(rows), len(paths), rows[path])
+    return pd.DataFrame([rows[path] for path in paths])
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Headless batch post-processing of HWT905 recordings")
+    parser.add_argument("config", help="Pipeline configuration (YAML/JSON)")
+    parser.add_argument("inputs", nargs="+", help="Recording files, directories or glob patterns")
+    parser.add_argument("--pattern", default="*.bin", help="File pattern inside directories (default: *.bin)")
+    parser.add_argument("--pipeline", help="Name of the pipeline in the config (default: the first one)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count, 0: run in-process)")
+    parser.add_argument("--memory-limit", help="Memory cap per file for chunked processing, e.g. 512MB")
+    parser.add_argument("--chunk-samples", type=int, help="Maximum samples per slice through the processors")
+    parser.add_argument("--cache-dir", help="Stage cache directory for fast re-runs")
+    parser.add_argument("--summary", "-o", help="Write the per-file summary table (.csv or .json)")
+    parser.add_argument("--keep-visualizers", action="store_true", help="Keep visualizers from the config")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show plugin output of each file")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_arguments(argv)
+    try:
+        spec = select_pipeline(ConfigLoader(args.config).load(), args.pipeline)
+        offline = {'memory_limit': parse_bytes(args.memory_limit), 'chunk_samples': args.chunk_samples,
+                   'cache_dir': args.cache_dir}
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        return 2
+    offline = {key: value for key, value in offline.items() if value is not None}
+    paths = find_recordings(args.inputs, args.pattern)
+    if not paths:
+        print("No recordings found")
+        return 1
+    print(f"Processing {len(paths)} recordings with pipeline '{spec.get('name', 'pipeline')}'")
+    start = time.perf_counter()
+    summary = run_batch(spec, paths, args.workers, offline, args.keep_visualizers, args.verbose)
+    elapsed = time.perf_counter() - start
+
+    columns = [c for c in ('file', 'status', 'bytes', 'samples', 'elapsed', 'mb_per_s', 'error') if c in summary]
+    print(summary[columns].to_string(index=False))
+    failed = int((summary['status'] != 'ok').sum())
+    total_mb = summary['bytes'].fillna(0).sum() / 1e6
+    print(f"{len(paths) - failed}/{len(paths)} files ok, {total_mb:.1f} MB in {elapsed:.1f} s "
+          f"({total_mb / elapsed if elapsed > 0 else 0.0:.1f} MB/s overall)")
+    if args.summary:
+        if args.summary.endswith('.json'):
+            summary.to_json(args.summary, orient='records', indent=2)
+        else:
+            summary.to_csv(args.summary, index=False)
+        print(f"Saved summary to {args.summary}")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,8 @@
 # src/plugins/decoders/base_decoder.py
 from abc import ABC, abstractmethod
-from typing import Any, Generator, Dict
+from typing import Any, Generator, Dict, List, Tuple
 # Quan trọng: Import lớp SensorData chuẩn
-from src.data.models import SensorData
+from src.data.models import SensorData, SensorDataBatch
 
 class BaseDecoder(ABC):
     """
@@ -47,13 +47,31 @@ class BaseDecoder(ABC):
         # self.internal_buffer.extend(raw_data)
         # while complete_packet := self._find_complete_packet_in_buffer():
         #     parsed_values, timestamp_info = self._parse_packet(complete_packet)
-        #     unix_timestamp = self._calculate_unix_timestamp(timestamp_info)
+        #     timestamp_ns = self._calculate_timestamp_ns(timestamp_info)
         #     yield SensorData(
-        #         timestamp=unix_timestamp,
+        #         timestamp_ns=timestamp_ns,
         #         sensor_id=self.sensor_id,
         #         data_type='imu', # Hoặc lấy từ config
         #         values=parsed_values,
         #         raw_timestamp=timestamp_info.get('raw'),
         #         units=self._get_units() # Lấy đơn vị từ config hoặc hardcode
         #     )
-        #     self._remove_packet_from_buffer()
\ No newline at end of file
+        #     self._remove_packet_from_buffer()
+
+    def decode_batch(self, raw_data: bytes) -> Generator[SensorDataBatch, None, None]:
+        """
+        (Tùy chọn) Giải mã dữ liệu thô thành các khối SensorDataBatch dạng cột.
+
+        Mặc định gom các SensorData từ `decode()` theo (sensor_id, data_type), giữ nguyên thứ tự.
+        Các Decoder có thể ghi đè phương thức này bằng cách giải mã vector hóa
+        trực tiếp ra mảng NumPy để tránh tạo một đối tượng cho mỗi gói tin.
+
+        Returns:
+            Generator[SensorDataBatch, None, None]: Mỗi khối chứa các mẫu liên tiếp
+            của cùng một cảm biến và cùng data_type.
+        """
+        groups: Dict[Tuple[str, str], List[SensorData]] = {}
+        for sample in self.decode(raw_data):
+            groups.setdefault((sample.sensor_id, sample.data_type), []).append(sample)
+        for samples in groups.values():
+            yield SensorDataBatch.from_samples(samples)
@@ -0,0 +1,250 @@
+# src/plugins/decoders/witmotion_hwt905_decoder.py
+import time
+from typing import Any, Dict, Generator, List, Tuple
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch
+from src.plugins.decoders.base_decoder import BaseDecoder
+from src.utils.timestamp_utils import NS_PER_SECOND, seconds_to_ns
+
+PACKET_HEADER = 0x55
+PACKET_LENGTH = 11
+
+TIME_PACKET = 0x50
+ACCEL_PACKET = 0x51
+GYRO_PACKET = 0x52
+ANGLE_PACKET = 0x53
+MAGNETIC_PACKET = 0x54
+
+# Loại gói tin -> data_type (khớp với DataBridge)
+DATA_TYPES = {
+    TIME_PACKET: 'time',
+    ACCEL_PACKET: 'accelerometer',
+    GYRO_PACKET: 'gyroscope',
+    ANGLE_PACKET: 'angle',
+    MAGNETIC_PACKET: 'magnetometer',
+}
+
+TIMESTAMP_MODES = ('packet', 'chiptime', 'realtime', 'unix')
+
+def find_packets(buffer: np.ndarray) -> np.ndarray:
+    """
+    Tìm vị trí bắt đầu của các gói tin WitMotion hợp lệ (header + checksum) trong buffer.
+
+    Các ứng viên bị chồng lấn (byte 0x55 nằm trong payload của gói trước) được loại bỏ,
+    ưu tiên gói xuất hiện trước.
+
+    Args:
+        buffer: Mảng uint8 dữ liệu thô.
+
+    Returns:
+        np.ndarray: Mảng vị trí (int64) tăng dần.
+    """
+    n = buffer.shape[0] - PACKET_LENGTH + 1
+    if n <= 0:
+        return np.empty(0, dtype=np.int64)
+    pos = np.flatnonzero((buffer[:n] == PACKET_HEADER) & ((buffer[1:n + 1] & 0xF0) == 0x50))
+    if pos.shape[0] == 0:
+        return pos
+    packets = buffer[pos[:, None] + np.arange(PACKET_LENGTH)]
+    checksum = packets[:, :10].sum(axis=1, dtype=np.uint32) & 0xFF
+    pos = pos[checksum == packets[:, 10]]
+    # Loại ứng viên chồng lấn lên gói hợp lệ đứng trước
+    while pos.shape[0] > 1:
+        overlap = np.flatnonzero(np.diff(pos) < PACKET_LENGTH)
+        if overlap.shape[0] == 0:
+            break
+        # Chỉ xóa phần tử sau của cặp mà phần tử trước không bị xóa
+        drop = overlap[np.concatenate(([True], np.diff(overlap) > 1))] + 1
+        pos = np.delete(pos, drop)
+    return pos
+
+def chip_time_to_ns(fields: np.ndarray, utc_offset: float = 0.0) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Chuyển payload gói thời gian (YY MM DD hh mm ss msL msH) sang ns kể từ epoch.
+
+    Args:
+        fields: Mảng uint8 (n, 8) payload của các gói 0x50.
+        utc_offset: Múi giờ (giờ) của đồng hồ chip; 0 nghĩa là chip chạy theo UTC.
+
+    Returns:
+        Tuple (timestamps_ns int64 (n,), valid bool (n,)).
+    """
+    year = fields[:, 0].astype(np.int64) + 2000
+    month = fields[:, 1].astype(np.int64)
+    day = fields[:, 2].astype(np.int64)
+    hour = fields[:, 3].astype(np.int64)
+    minute = fields[:, 4].astype(np.int64)
+    second = fields[:, 5].astype(np.int64)
+    millis = fields[:, 6].astype(np.int64) | (fields[:, 7].astype(np.int64) << 8)
+    valid = ((month >= 1) & (month <= 12) & (day >= 1) & (day <= 31) & (hour < 24)
+             & (minute < 60) & (second < 60) & (millis < 1000))
+    month_c = np.where(valid, month, 1)
+    day_c = np.where(valid, day, 1)
+    dates = ((year - 1970).astype('datetime64[Y]') + (month_c - 1).astype('timedelta64[M]')).astype('datetime64[D]')
+    dates = dates + (day_c - 1).astype('timedelta64[D]')
+    days = dates.astype(np.int64)
+    seconds = days * 86400 + hour * 3600 + minute * 60 + second - int(round(utc_offset * 3600))
+    return seconds * NS_PER_SECOND + millis * 1_000_000, valid
+
+def build_packet(packet_type: int, payload: bytes) -> bytes:
+    """
+    Tạo một gói tin WitMotion hoàn chỉnh (header, loại, 8 byte payload, checksum).
+
+    Dùng cho mô phỏng cảm biến và kiểm thử.
+    """
+    if len(payload) != 8:
+        raise ValueError("WitMotion payload must be exactly 8 bytes")
+    body = bytes([PACKET_HEADER, packet_type]) + bytes(payload)
+    return body + bytes([sum(body) & 0xFF])
+
+class WitMotionDecoder(BaseDecoder):
+    """
+    Decoder cho giao thức nhị phân của cảm biến WitMotion HWT905 (gói 11 byte: 0x55, loại, 8 byte dữ liệu, checksum).
+
+    Việc tìm gói tin, kiểm tra checksum và chuyển đổi giá trị đều được vector hóa bằng NumPy
+    trên toàn bộ chunk; `decode_batch` trả trực tiếp các SensorDataBatch dạng cột
+    cho mỗi loại gói (accelerometer, gyroscope, angle, magnetometer, time).
+
+    Config:
+        sensor_id (str): Định danh cảm biến.
+        acc_range (float): Dải đo gia tốc (g), mặc định 16.0.
+        gyro_range (float): Dải đo vận tốc góc (deg/s), mặc định 2000.0.
+        timestamp_mode (str): 'packet' | 'chiptime' | 'realtime' | 'unix' (mặc định 'packet').
+            - packet: start_time + chỉ số gói * (1 / data_rate), tính riêng cho từng loại gói.
+            - unix: như 'packet' nhưng mặc định start_time là thời điểm giải mã đầu tiên.
+            - chiptime: thời gian của gói 0x50 gần nhất đứng trước (giờ trên chip).
+            - realtime: thời gian host lúc giải mã, lùi dần theo 1 / data_rate cho các gói cũ hơn.
+        data_rate (float): Tần số xuất dữ liệu của cảm biến (Hz), mặc định 100.0.
+        start_time (float): (Tùy chọn) UNIX timestamp (giây) của gói đầu tiên cho chế độ packet/unix.
+        utc_offset (float): (Tùy chọn) Múi giờ của đồng hồ chip (giờ), mặc định 0.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.acc_range = float(config.get('acc_range', 16.0))
+        self.gyro_range = float(config.get('gyro_range', 2000.0))
+        self.timestamp_mode = config.get('timestamp_mode', 'packet')
+        if self.timestamp_mode not in TIMESTAMP_MODES:
+            raise ValueError(f"Unsupported timestamp_mode: {self.timestamp_mode}")
+        self.data_rate = float(config.get('data_rate', 100.0))
+        self.period_ns = int(round(NS_PER_SECOND / self.data_rate))
+        self.utc_offset = float(config.get('utc_offset', 0) or 0)
+        start_time = config.get('start_time')
+        self.start_ns = seconds_to_ns(start_time) if start_time is not None else None
+        self.reset()
+
+    def reset(self):
+        """Xóa buffer và bộ đếm để giải mã một luồng mới."""
+        self._buffer = b''
+        self._counts: Dict[int, int] = {}
+        self._last_chip_ns = None
+        self.packets_decoded = 0
+
+    def _packet_timestamps(self, ptype: int, n: int, order: np.ndarray,
+                           chip_ns: np.ndarray, chip_order: np.ndarray, now_ns: int) -> np.ndarray:
+        count = self._counts.get(ptype, 0)
+        self._counts[ptype] = count + n
+        index = np.arange(count, count + n, dtype=np.int64)
+        if self.timestamp_mode in ('packet', 'unix'):
+            if self.start_ns is None:
+                self.start_ns = now_ns if self.timestamp_mode == 'unix' else 0
+            return self.start_ns + index * self.period_ns
+        if self.timestamp_mode == 'realtime':
+            return now_ns - np.arange(n - 1, -1, -1, dtype=np.int64) * self.period_ns
+        # chiptime: gói thời gian gần nhất đứng trước trong chunk, hoặc từ chunk trước
+        prev = np.searchsorted(chip_order, order, side='right') - 1
+        if self._last_chip_ns is not None:
+            fallback = self._last_chip_ns
+        elif chip_ns.shape[0]:
+            fallback = chip_ns[0]
+        else:
+            # Chưa từng nhận gói thời gian: tạm dùng bộ đếm gói
+            fallback = (self.start_ns or 0) + index * self.period_ns
+        lookup = chip_ns[np.maximum(prev, 0)] if chip_ns.shape[0] else 0
+        return np.where(prev >= 0, lookup, fallback).astype(np.int64)
+
+    def _decode_chunk(self, raw_data: bytes) -> List[Tuple[np.ndarray, SensorDataBatch]]:
+        """Giải mã một chunk; trả về danh sách (thứ tự gói trong chunk, batch) cho mỗi loại gói."""
+        data = self._buffer + bytes(raw_data)
+        buffer = np.frombuffer(data, dtype=np.uint8)
+        pos = find_packets(buffer)
+        tail_start = max(int(pos[-1]) + PACKET_LENGTH if pos.shape[0] else 0,
+                         buffer.shape[0] - PACKET_LENGTH + 1, 0)
+        self._buffer = data[tail_start:]
+        if pos.shape[0] == 0:
+            return []
+
+        now_ns = time.time_ns()
+        packets = buffer[pos[:, None] + np.arange(PACKET_LENGTH)]
+        types = packets[:, 1]
+        payload = np.ascontiguousarray(packets[:, 2:10])
+        words = payload.view('<i2').reshape(-1, 4).astype(np.float64)
+        uwords = payload.view('<u2').reshape(-1, 4)
+        self.packets_decoded += int(pos.shape[0])
+
+        chip_order = np.flatnonzero(types == TIME_PACKET)
+        chip_ns, chip_valid = chip_time_to_ns(payload[chip_order], self.utc_offset)
+        chip_order, chip_ns = chip_order[chip_valid], chip_ns[chip_valid]
+
+        results = []
+        for ptype, data_type in DATA_TYPES.items():
+            order = np.flatnonzero(types == ptype)
+            n = order.shape[0]
+            if n == 0:
+                continue
+            timestamps = self._packet_timestamps(ptype, n, order, chip_ns, chip_order, now_ns)
+            w = words[order]
+            if ptype == ACCEL_PACKET:
+                scale = self.acc_range / 32768.0
+                values = {'accX': w[:, 0] * scale, 'accY': w[:, 1] * scale, 'accZ': w[:, 2] * scale,
+                          'temperature': w[:, 3] / 100.0}
+                units = {'accX': 'g', 'accY': 'g', 'accZ': 'g', 'temperature': '°C'}
+            elif ptype == GYRO_PACKET:
+                scale = self.gyro_range / 32768.0
+                values = {'gyroX': w[:, 0] * scale, 'gyroY': w[:, 1] * scale, 'gyroZ': w[:, 2] * scale,
+                          'voltage': uwords[order, 3] / 100.0}
+                units = {'gyroX': 'deg/s', 'gyroY': 'deg/s', 'gyroZ': 'deg/s', 'voltage': 'V'}
+            elif ptype == ANGLE_PACKET:
+                scale = 180.0 / 32768.0
+                values = {'roll': w[:, 0] * scale, 'pitch': w[:, 1] * scale, 'yaw': w[:, 2] * scale,
+                          'version': uwords[order, 3].astype(np.float64)}
+                units = {'roll': 'deg', 'pitch': 'deg', 'yaw': 'deg', 'version': ''}
+            elif ptype == MAGNETIC_PACKET:
+                values = {'magX': w[:, 0], 'magY': w[:, 1], 'magZ': w[:, 2],
+                          'temperature': w[:, 3] / 100.0}
+                units = {'magX': 'LSB', 'magY': 'LSB', 'magZ': 'LSB', 'temperature': '°C'}
+            else:
+                device_ns, valid = chip_time_to_ns(payload[order], self.utc_offset)
+                keep = np.flatnonzero(valid)
+                order, timestamps = order[keep], timestamps[keep]
+                if order.shape[0] == 0:
+                    continue
+                # Cặp (chip time, host time) dùng cho ClockSynchronizer
+                values = {'chip_time_ns': device_ns[keep],
+                          'host_time_ns': np.full(order.shape[0], now_ns, dtype=np.int64)}
+                units = {'chip_time_ns': 'ns', 'host_time_ns': 'ns'}
+            results.append((order, SensorDataBatch(
+                timestamps_ns=timestamps,
+                sensor_id=self.sensor_id,
+                data_type=data_type,
+                values=values,
+                units=units,
+            )))
+
+        if chip_ns.shape[0]:
+            self._last_chip_ns = int(chip_ns[-1])
+        return results
+
+    def decode_batch(self, raw_data: bytes) -> Generator[SensorDataBatch, None, None]:
+        for _, batch in self._decode_chunk(raw_data):
+            yield batch
+
+    def decode(self, raw_data: bytes) -> Generator[SensorData, None, None]:
+        # Trả về từng SensorData theo đúng thứ tự gói tin trong luồng
+        items = []
+        for order, batch in self._decode_chunk(raw_data):
+            items.extend(zip(order.tolist(), batch.iter_samples()))
+        items.sort(key=lambda item: item[0])
+        for _, sample in items:
+            yield sample
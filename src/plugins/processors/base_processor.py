@@ -1,7 +1,8 @@
 # src/plugins/processors/base_processor.py
 from abc import ABC, abstractmethod
-from typing import Any, Generator, Dict
-from src.data.models import SensorData # Thường thì processor sẽ xử lý SensorData
+from typing import Any, Generator, Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from src.data.models import SensorData, SensorDataBatch # Thường thì processor sẽ xử lý SensorData
 
 class BaseProcessor(ABC):
     """
@@ -50,4 +51,74 @@ class BaseProcessor(ABC):
         #     processed_value = data.values['accX'] * 2 # Ví dụ xử lý
         #     data.values['processedAccX'] = processed_value
         #     data.units['processedAccX'] = data.get_unit('accX')
-        #     yield data # Trả về đối tượng SensorData đã sửa đổi
\ No newline at end of file
+        #     yield data # Trả về đối tượng SensorData đã sửa đổi
+
+    def flush(self) -> Generator[Any, None, None]:
+        """
+        (Tùy chọn) Xả các kết quả còn giữ trong bộ đệm nội bộ khi luồng dữ liệu kết thúc.
+
+        Các Processor có trạng thái (lọc, cửa sổ trượt, nội suy cần lookahead...)
+        có thể giữ lại một phần dữ liệu giữa các lần gọi `process`. Pipeline gọi
+        `flush` một lần sau khi đã xử lý hết dữ liệu để lấy nốt các kết quả đó.
+        Mặc định không trả về gì.
+
+        Returns:
+            Generator[Any, None, None]: Các kết quả còn lại.
+        """
+        yield from ()
+
+    def reset(self):
+        """
+        (Tùy chọn) Xóa toàn bộ trạng thái nội bộ để xử lý một luồng dữ liệu mới.
+        """
+        pass
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """
+        (Tùy chọn) Các bộ đếm/chỉ số của Processor để Pipeline gộp vào `Pipeline.metrics`.
+
+        Returns:
+            Dict[str, Any]: Khóa cấp cao nhất (ví dụ 'quality') -> giá trị. Mặc định rỗng.
+        """
+        return {}
+
+    def channels_changed(self, key: Tuple[str, str], previous: Optional[List[str]], channels: List[str]) -> bool:
+        """
+        Kiểm tra bố cục kênh của một luồng (sensor_id, data_type) trước khi dùng trạng thái đã lưu.
+
+        Processor giữ trạng thái theo danh sách kênh của batch đầu tiên; nếu batch sau của cùng
+        luồng có bố cục khác (ví dụ thiếu một kênh) thì trạng thái phải được khởi tạo lại cho các
+        kênh hiện có thay vì dừng pipeline với KeyError.
+
+        Args:
+            key: Khóa luồng (sensor_id, data_type).
+            previous: Danh sách kênh của trạng thái hiện tại; None nếu luồng chưa có trạng thái.
+            channels: Danh sách kênh của batch hiện tại (xem `select_channels`).
+
+        Returns:
+            bool: True nếu cần khởi tạo lại trạng thái (luồng mới hoặc bố cục thay đổi; trường hợp
+                  sau có in cảnh báo).
+        """
+        if previous == channels:
+            return False
+        if previous is not None:
+            print(f"Warning: {self.__class__.__name__} channels of {key} changed from {previous} "
+                  f"to {channels}, state reset")
+        return True
+
+
+def select_channels(batch: SensorDataBatch, channels: Optional[Sequence[str]] = None) -> List[str]:
+    """
+    Chọn các kênh mà một Processor số học sẽ xử lý trong batch.
+
+    Args:
+        batch: Khối dữ liệu đầu vào.
+        channels: Danh sách kênh do config chỉ định; None nghĩa là mọi kênh kiểu số thực.
+
+    Returns:
+        List[str]: Các kênh có mặt trong batch, theo thứ tự của `channels` (hoặc của batch).
+    """
+    if channels is None:
+        return [name for name, arr in batch.values.items()
+                if np.issubdtype(np.asarray(arr).dtype, np.floating)]
+    return [name for name in channels if name in batch.values]
@@ -0,0 +1,105 @@
+# src/plugins/processors/calibration_processor.py
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor
+from src.utils.calibration import TRIPLETS, AxisCalibration, load_calibrations, parse_calibrations
+
+class _CalibrationPlan:
+    """Ma trận/offset đã xếp chồng cho mọi bộ ba kênh cần hiệu chuẩn trong một luồng."""
+
+    def __init__(self, names: List[Tuple[str, str, str]], matrices: np.ndarray, offsets: np.ndarray,
+                 units: List[Optional[str]]):
+        self.names = names          # S bộ ba tên kênh
+        self.matrices = matrices    # (S, 3, 3)
+        self.offsets = offsets      # (S, 3)
+        self.units = units
+
+class CalibrationProcessor(BaseProcessor):
+    """
+    Hiệu chuẩn accelerometer/gyroscope/magnetometer: y = M @ (x - offset) cho từng sensor_id.
+
+    Mọi bộ ba kênh (accX/accY/accZ, gyroX/..., magX/...) có hiệu chuẩn trong một batch được
+    xếp thành mảng (n, S, 3) và hiệu chỉnh bằng một lệnh `einsum` với (S, 3, 3) ma trận.
+    Batch 'imu' gộp nhiều cảm biến từ ResamplingProcessor (`group_by: all`, kênh
+    '<sensor_id>.accX') cũng được hỗ trợ: sensor_id lấy từ tiền tố tên kênh.
+
+    File hiệu chuẩn được tạo bởi công cụ `python -m src.tools.calibrate`.
+
+    Config:
+        calibration_file (str): File YAML/JSON {sensor_id: {data_type: {matrix, offset, unit}}}.
+        calibrations (Dict): (Tùy chọn) Hiệu chuẩn khai báo trực tiếp, cùng cấu trúc với file;
+                             ghi đè các mục trùng trong file.
+        data_types (List[str]): Các loại cảm biến cần hiệu chuẩn, mặc định
+                                ['accelerometer', 'gyroscope', 'magnetometer'].
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.calibrations: Dict[str, Dict[str, AxisCalibration]] = {}
+        if config.get('calibration_file'):
+            self.calibrations = load_calibrations(config['calibration_file'])
+        for sensor_id, kinds in parse_calibrations(config.get('calibrations', {})).items():
+            self.calibrations.setdefault(sensor_id, {}).update(kinds)
+        self.data_types: List[str] = list(config.get('data_types', TRIPLETS.keys()))
+        self.plans: Dict[Tuple[str, str, Tuple[str, ...]], Optional[_CalibrationPlan]] = {}
+
+    def reset(self):
+        self.plans = {}
+
+    def _plan(self, batch: SensorDataBatch) -> Optional[_CalibrationPlan]:
+        """Tìm (và cache) các bộ ba kênh trong batch có hiệu chuẩn tương ứng."""
+        key = (batch.sensor_id, batch.data_type, tuple(batch.values))
+        if key in self.plans:
+            return self.plans[key]
+        names, matrices, offsets, units = [], [], [], []
+        for data_type in self.data_types:
+            axes = TRIPLETS[data_type]
+            for name in batch.values:
+                if not name.endswith(axes[0]):
+                    continue
+                prefix = name[:-len(axes[0])]
+                triplet = tuple(prefix + axis for axis in axes)
+                if not all(channel in batch.values for channel in triplet):
+                    continue
+                sensor_id = prefix.rstrip('.') or batch.sensor_id
+                calibration = self.calibrations.get(sensor_id, {}).get(data_type)
+                if calibration is None:
+                    continue
+                names.append(triplet)
+                matrices.append(calibration.matrix)
+                offsets.append(calibration.offset)
+                units.append(calibration.unit)
+        plan = None
+        if names:
+            plan = _CalibrationPlan(names, np.stack(matrices), np.stack(offsets), units)
+        self.plans[key] = plan
+        return plan
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        batch = as_batch(data)
+        if batch is None or len(batch) == 0:
+            yield data
+            return
+        plan = self._plan(batch)
+        if plan is None:
+            yield data
+            return
+
+        raw = np.empty((len(batch), len(plan.names), 3))
+        for s, triplet in enumerate(plan.names):
+            for j, channel in enumerate(triplet):
+                raw[:, s, j] = batch.values[channel]
+        corrected = np.einsum('sij,nsj->nsi', plan.matrices, raw - plan.offsets)
+
+        out = batch.slice()
+        for s, triplet in enumerate(plan.names):
+            for j, channel in enumerate(triplet):
+                out.values[channel] = corrected[:, s, j]
+                if plan.units[s] is not None:
+                    out.units[channel] = plan.units[s]
+        if isinstance(data, SensorData):
+            yield from out.iter_samples()
+        else:
+            yield out
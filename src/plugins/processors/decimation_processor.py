@@ -0,0 +1,112 @@
+# src/plugins/processors/decimation_processor.py
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor, select_channels
+from src.utils.polyphase import PolyphaseResampler, rational_factors
+
+class _DecimationStream:
+    """Trạng thái giảm mẫu của một luồng (sensor_id, data_type)."""
+
+    def __init__(self, template: SensorDataBatch, channels: List[str], resampler: PolyphaseResampler):
+        self.template = template.slice(0, 0)
+        self.channels = channels
+        self.resampler = resampler
+
+class DecimationProcessor(BaseProcessor):
+    """
+    Giảm tần số lấy mẫu có chống aliasing (ví dụ 200 Hz -> 10..50 Hz) cho dashboard và lưu trữ dài hạn.
+
+    Dùng bộ lọc FIR pha tuyến tính (cửa sổ Kaiser) dạng polyphase (xem PolyphaseResampler):
+    chỉ tính các mẫu đầu ra được giữ lại, mọi kênh của batch được lọc cùng lúc, và lịch sử
+    đầu vào được giữ giữa các batch nên kết quả streaming trùng với xử lý offline.
+    Hỗ trợ hệ số nguyên (`factor`) và hữu tỉ (`output_rate` hoặc `up`/`down`, ví dụ 200 -> 80 Hz
+    là 2/5). Độ trễ của bộ lọc được bù: timestamp đầu ra nằm đúng vị trí tương ứng trên tín
+    hiệu gốc; vì vậy đầu ra trễ so với đầu vào khoảng nửa độ dài bộ lọc.
+
+    Batch đầu ra giữ nguyên sensor_id/data_type và chỉ gồm các kênh đã giảm mẫu; metadata
+    'rate' (như ResamplingProcessor) được ghi đè bằng tần số đầu ra.
+
+    Config:
+        sample_rate (float): Tần số lấy mẫu đầu vào (Hz), mặc định 100.0.
+        factor (int): Hệ số giảm mẫu nguyên.
+        output_rate (float): Hoặc tần số đầu ra mong muốn (Hz), quy về tỉ số up/down.
+        up, down (int): Hoặc tỉ số up/down trực tiếp.
+        cutoff (float): Biên dải thông tính theo tỉ lệ tần số Nyquist đầu ra, mặc định 0.8
+                        (dải chặn bắt đầu tại Nyquist đầu ra).
+        attenuation (float): Độ suy giảm dải chặn (dB), mặc định 80.0.
+        channels (List[str]): (Tùy chọn) Các kênh cần xử lý; mặc định mọi kênh số thực.
+        data_types (List[str]): (Tùy chọn) Chỉ giảm mẫu các data_type này; các loại khác đi qua nguyên vẹn.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.sample_rate = float(config.get('sample_rate', 100.0))
+        if 'factor' in config:
+            self.up, self.down = 1, int(config['factor'])
+        elif 'output_rate' in config:
+            self.up, self.down = rational_factors(self.sample_rate, float(config['output_rate']))
+        else:
+            self.up, self.down = int(config.get('up', 1)), int(config.get('down', 1))
+        self.cutoff = float(config.get('cutoff', 0.8))
+        self.attenuation = float(config.get('attenuation', 80.0))
+        # Thiết kế một lần (kiểm tra config), các luồng dùng chung hệ số
+        self.taps = PolyphaseResampler(self.up, self.down, self.cutoff, self.attenuation).taps
+        self.output_rate = self.sample_rate * self.up / self.down
+        self.channels: Optional[List[str]] = config.get('channels')
+        self.data_types: Optional[List[str]] = config.get('data_types')
+        self.streams: Dict[Tuple[str, str], _DecimationStream] = {}
+
+    def reset(self):
+        self.streams = {}
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        batch = as_batch(data)
+        if batch is None or (self.data_types is not None and batch.data_type not in self.data_types):
+            yield data
+            return
+        key = (batch.sensor_id, batch.data_type)
+        stream = self.streams.get(key)
+        channels = select_channels(batch, self.channels)
+        if not channels:
+            yield data
+            return
+        if self.channels_changed(key, stream.channels if stream is not None else None, channels):
+            resampler = PolyphaseResampler(self.up, self.down, taps=self.taps)
+            stream = self.streams[key] = _DecimationStream(batch, channels, resampler)
+        if len(batch) == 0:
+            return
+
+        y, timestamps = stream.resampler.process(batch.to_array(stream.channels), batch.timestamps_ns)
+        out = self._output(stream, y, timestamps)
+        if out is None:
+            return
+        if isinstance(data, SensorData):
+            yield from out.iter_samples()
+        else:
+            yield out
+
+    def flush(self) -> Generator[Any, None, None]:
+        """Xuất nốt các mẫu cuối (kéo dài tín hiệu bằng giá trị cuối cùng)."""
+        for stream in self.streams.values():
+            out = self._output(stream, *stream.resampler.flush())
+            if out is not None:
+                yield out
+        self.streams = {}
+
+    def _output(self, stream: _DecimationStream, y: np.ndarray,
+                timestamps: np.ndarray) -> Optional[SensorDataBatch]:
+        if timestamps.shape[0] == 0:
+            return None
+        template = stream.template
+        metadata = dict(template.metadata)
+        metadata['rate'] = self.output_rate
+        return SensorDataBatch(
+            timestamps_ns=timestamps,
+            sensor_id=template.sensor_id,
+            data_type=template.data_type,
+            values={name: y[:, j] for j, name in enumerate(stream.channels)},
+            units={name: template.units.get(name, '') for name in stream.channels},
+            metadata=metadata,
+        )
@@ -0,0 +1,193 @@
+# src/plugins/processors/distribution_processor.py
+from collections import deque
+from typing import Any, Deque, Dict, Generator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.data.models import SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor, select_channels
+from src.utils.quantiles import FixedHistogram, TDigest
+from src.utils.timestamp_utils import NS_PER_SECOND
+
+class _Bucket:
+    """Tóm tắt phân bố của mọi kênh trong một khoảng thời gian."""
+
+    def __init__(self, start_ns: int, n_channels: int, compression: float,
+                 histogram: Optional[Dict[str, Any]]):
+        self.start_ns = start_ns
+        self.digests = [TDigest(compression) for _ in range(n_channels)]
+        self.histogram = FixedHistogram(float(histogram['low']), float(histogram['high']),
+                                        int(histogram.get('bins', 100)), n_channels) if histogram else None
+
+    def update(self, x: np.ndarray) -> None:
+        for j, digest in enumerate(self.digests):
+            digest.update(x[:, j])
+        if self.histogram is not None:
+            self.histogram.update(x)
+
+    def merge(self, other: "_Bucket") -> None:
+        for digest, theirs in zip(self.digests, other.digests):
+            digest.merge(theirs)
+        if self.histogram is not None and other.histogram is not None:
+            self.histogram.merge(other.histogram)
+
+class _DistributionStream:
+    def __init__(self, channels: List[str], units: Dict[str, str]):
+        self.channels = channels
+        self.units = units
+        self.buckets: Deque[_Bucket] = deque()
+        self.last_emit_ns: Optional[int] = None
+
+class DistributionProcessor(BaseProcessor):
+    """
+    Phân bố giá trị theo thời gian dài với bộ nhớ cố định: quantile xấp xỉ (t-digest) và histogram.
+
+    Mỗi kênh của mỗi luồng (sensor_id, data_type) có một t-digest (quantile xấp xỉ, chính xác
+    ở hai đuôi như p95/p99) và, nếu cấu hình `histogram`, một histogram bin cố định được cập
+    nhật bằng một lần `np.bincount` cho cả batch và mọi kênh (xem src/utils/quantiles.py).
+    Dữ liệu được chia theo khoảng thời gian `bucket`; chỉ giữ `max_buckets` khoảng gần nhất
+    nên bộ nhớ không phụ thuộc độ dài luồng. Quantile xuất ra là của các khoảng này gộp lại
+    (cửa sổ bucket * max_buckets giây); `bucket: 0` cộng dồn từ đầu luồng. Nếu bố cục kênh của
+    một luồng thay đổi, các khoảng của luồng được bắt đầu lại với các kênh hiện có.
+
+    Các tóm tắt gộp được rẻ: `summary()` gộp nhiều cảm biến/data_type, ví dụ để có p99 của
+    cả hệ. Để lấy phân bố của độ lớn rung, đặt ExpressionProcessor phía trước
+    (ví dụ `acc_mag: sqrt(accX**2 + accY**2 + accZ**2)`) và chọn kênh đó qua `channels`.
+
+    Mỗi `emit_interval` giây (theo timestamp dữ liệu) phát ra một SensorDataBatch một mẫu
+    với các kênh '<kênh>_p<phần trăm>' (ví dụ 'acc_mag_p99'); histogram (nếu có) nằm trong
+    metadata 'histogram' ({kênh: counts}, gồm cả underflow/overflow ở hai đầu) và 'edges'.
+
+    Config:
+        quantiles (List[float]): Các quantile cần xuất, mặc định [0.5, 0.95, 0.99].
+        compression (float): Tham số nén t-digest (lớn hơn -> chính xác hơn), mặc định 100.
+        histogram (Dict): (Tùy chọn) {'low': float, 'high': float, 'bins': int (mặc định 100)}.
+        bucket (float): Độ dài mỗi khoảng thời gian (giây), mặc định 60.0; 0 để cộng dồn.
+        max_buckets (int): Số khoảng giữ lại, mặc định 60.
+        emit_interval (float): Chu kỳ phát kết quả (giây), mặc định 1.0.
+        channels (List[str]): (Tùy chọn) Các kênh cần tính; mặc định mọi kênh số thực.
+        data_types (List[str]): (Tùy chọn) Chỉ xử lý các data_type này.
+        output_data_type (str): data_type của kết quả, mặc định 'distribution'.
+        passthrough (bool): Chuyển tiếp dữ liệu đầu vào, mặc định True.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.quantiles = [float(q) for q in config.get('quantiles', [0.5, 0.95, 0.99])]
+        self.labels = [f"p{100.0 * q:g}" for q in self.quantiles]
+        self.compression = float(config.get('compression', 100.0))
+        self.histogram: Optional[Dict[str, Any]] = config.get('histogram')
+        self.bucket_ns = int(float(config.get('bucket', 60.0)) * NS_PER_SECOND)
+        self.max_buckets = max(1, int(config.get('max_buckets', 60)))
+        self.emit_interval_ns = int(float(config.get('emit_interval', 1.0)) * NS_PER_SECOND)
+        self.channels: Optional[List[str]] = config.get('channels')
+        self.data_types: Optional[List[str]] = config.get('data_types')
+        self.output_data_type = config.get('output_data_type', 'distribution')
+        self.passthrough = bool(config.get('passthrough', True))
+        self.streams: Dict[Tuple[str, str], _DistributionStream] = {}
+
+    def reset(self):
+        self.streams = {}
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        if self.passthrough:
+            yield data
+        batch = as_batch(data)
+        if batch is None or len(batch) == 0 or batch.data_type == self.output_data_type:
+            return
+        if self.data_types is not None and batch.data_type not in self.data_types:
+            return
+        key = (batch.sensor_id, batch.data_type)
+        stream = self.streams.get(key)
+        channels = select_channels(batch, self.channels)
+        if not channels:
+            return
+        if self.channels_changed(key, stream.channels if stream is not None else None, channels):
+            stream = self.streams[key] = _DistributionStream(
+                channels, {name: batch.units.get(name, '') for name in channels})
+
+        x = batch.to_array(stream.channels)
+        ts = batch.timestamps_ns
+        if self.bucket_ns > 0:
+            # Tách batch tại các biên khoảng thời gian (chỉ số khoảng tăng dần theo timestamp)
+            ids = ts // self.bucket_ns
+            bounds = np.flatnonzero(np.diff(ids)) + 1
+            for start, stop in zip(np.concatenate([[0], bounds]), np.concatenate([bounds, [len(ts)]])):
+                self._bucket(stream, int(ids[start]) * self.bucket_ns).update(x[start:stop])
+        else:
+            self._bucket(stream, 0).update(x)
+
+        end = int(ts[-1])
+        if stream.last_emit_ns is None or end - stream.last_emit_ns >= self.emit_interval_ns:
+            stream.last_emit_ns = end
+            yield self._emit(batch, stream, end)
+
+    def _bucket(self, stream: _DistributionStream, start_ns: int) -> _Bucket:
+        if not stream.buckets or stream.buckets[-1].start_ns != start_ns:
+            stream.buckets.append(_Bucket(start_ns, len(stream.channels), self.compression, self.histogram))
+            while len(stream.buckets) > self.max_buckets:
+                stream.buckets.popleft()
+        return stream.buckets[-1]
+
+    def _combine(self, buckets: Sequence[_Bucket], n_channels: int) -> _Bucket:
+        combined = _Bucket(0, n_channels, self.compression, self.histogram)
+        for bucket in buckets:
+            combined.merge(bucket)
+        return combined
+
+    def _emit(self, batch: SensorDataBatch, stream: _DistributionStream, end: int) -> SensorDataBatch:
+        combined = self._combine(stream.buckets, len(stream.channels))
+        values: Dict[str, np.ndarray] = {}
+        units: Dict[str, str] = {}
+        for j, name in enumerate(stream.channels):
+            estimates = combined.digests[j].quantile(self.quantiles)
+            for label, value in zip(self.labels, estimates):
+                values[f"{name}_{label}"] = np.array([value])
+                units[f"{name}_{label}"] = stream.units[name]
+        metadata: Dict[str, Any] = {
+            'source_data_type': batch.data_type,
+            'count': {name: combined.digests[j].count for j, name in enumerate(stream.channels)},
+            'horizon_start_ns': stream.buckets[0].start_ns if self.bucket_ns > 0 else None,
+        }
+        if combined.histogram is not None:
+            metadata['edges'] = combined.histogram.edges
+            metadata['histogram'] = {name: combined.histogram.counts[j].copy()
+                                     for j, name in enumerate(stream.channels)}
+        return SensorDataBatch(np.array([end], dtype=np.int64), batch.sensor_id, self.output_data_type,
+                               values=values, units=units, metadata=metadata)
+
+    def summary(self, sensor_ids: Optional[Sequence[str]] = None,
+                data_types: Optional[Sequence[str]] = None) -> Dict[str, Any]:
+        """
+        Gộp phân bố của nhiều luồng (mọi khoảng đang giữ) theo tên kênh.
+
+        Returns:
+            Dict tên kênh -> {'quantiles': {nhãn: giá trị}, 'count': số mẫu,
+            'histogram': counts (nếu có)}.
+        """
+        merged: Dict[str, Tuple[TDigest, Optional[FixedHistogram]]] = {}
+        for (sensor_id, data_type), stream in self.streams.items():
+            if sensor_ids is not None and sensor_id not in sensor_ids:
+                continue
+            if data_types is not None and data_type not in data_types:
+                continue
+            combined = self._combine(stream.buckets, len(stream.channels))
+            for j, name in enumerate(stream.channels):
+                histogram = None
+                if combined.histogram is not None:
+                    histogram = FixedHistogram(combined.histogram.low, combined.histogram.high,
+                                               combined.histogram.bins, 1)
+                    histogram.counts += combined.histogram.counts[j]
+                if name not in merged:
+                    merged[name] = (combined.digests[j], histogram)
+                else:
+                    merged[name][0].merge(combined.digests[j])
+                    if histogram is not None:
+                        merged[name][1].merge(histogram)
+        return {
+            name: {
+                'quantiles': dict(zip(self.labels, digest.quantile(self.quantiles).tolist())),
+                'count': digest.count,
+                'histogram': None if histogram is None else histogram.counts[0],
+            }
+            for name, (digest, histogram) in merged.items()
+        }
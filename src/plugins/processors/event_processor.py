@@ -0,0 +1,264 @@
+# src/plugins/processors/event_processor.py
+from collections import deque
+from typing import Any, Deque, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor, select_channels
+from src.plugins.processors.fusion_processor import ACC_CHANNELS, GYRO_CHANNELS, MAG_CHANNELS
+from src.utils.timestamp_utils import NS_PER_SECOND
+
+def _first(mask: np.ndarray, start: int) -> Optional[int]:
+    """Chỉ số đầu tiên >= start có mask True, hoặc None."""
+    if start >= mask.shape[0]:
+        return None
+    index = int(np.argmax(mask[start:]))
+    return start + index if mask[start + index] else None
+
+class _EventStream:
+    """Trạng thái phát hiện sự kiện của một luồng (sensor_id, data_type)."""
+
+    def __init__(self, channels: List[str]):
+        self.channels = channels
+        # Các đoạn batch gần nhất (view, không sao chép) làm bộ đệm pre-trigger
+        self.history: Deque[SensorDataBatch] = deque()
+        self.active = False
+        self.high = False
+        self.parts: List[SensorDataBatch] = []
+        self.latched = False   # đã cắt do max_duration, chờ mức < reset_threshold
+        self.trigger_ns = 0
+        self.last_high_ns = 0
+
+class EventDetectorProcessor(BaseProcessor):
+    """
+    Phát hiện sự kiện va đập/vượt ngưỡng và ghi lại cửa sổ dữ liệu quanh sự kiện.
+
+    Mỗi batch được so sánh ngưỡng một lần bằng NumPy trên độ lớn vector (`mode: magnitude`)
+    hoặc trị tuyệt đối lớn nhất của các kênh (`mode: channels`). Khi không có sự kiện,
+    chi phí chỉ là phép so sánh đó và việc giữ lại các view của batch gần nhất làm bộ đệm
+    pre-trigger (không sao chép dữ liệu).
+
+    Sự kiện bắt đầu khi mức tín hiệu >= `threshold` và có trễ (hysteresis): trạng thái "cao"
+    chỉ kết thúc khi mức < `reset_threshold`. Sự kiện kết thúc sau `post_trigger` giây kể từ
+    lần cuối ở trạng thái cao (vượt `threshold` lại trong khoảng này sẽ kéo dài sự kiện).
+    Sự kiện không vượt quá `max_duration` giây kể từ lúc kích hoạt: dữ liệu được cắt đúng tại
+    mẫu cuối trong giới hạn (không phụ thuộc kích thước batch) và sự kiện mới chỉ bắt đầu sau
+    khi mức tín hiệu đã xuống dưới `reset_threshold`.
+    Khi kết thúc, processor phát ra:
+    - một SensorData data_type 'event' (peak, duration, samples; metadata có event_id,
+      trigger_ns, start_ns, end_ns);
+    - một SensorDataBatch data_type 'event_capture' chứa dữ liệu đầy đủ từ
+      `pre_trigger` giây trước tới hết post-trigger, để chỉ lưu các đoạn đáng quan tâm.
+    Nếu bố cục kênh của một luồng thay đổi, sự kiện đang ghi được kết thúc tại đó và luồng
+    bắt đầu lại (bộ đệm pre-trigger chỉ gồm dữ liệu với bố cục mới).
+
+    Config:
+        threshold (float): Ngưỡng kích hoạt. Bắt buộc.
+        reset_threshold (float): Ngưỡng nhả (hysteresis), mặc định 0.8 * threshold.
+        mode (str): 'magnitude' (mặc định) hoặc 'channels'.
+        channels (List[str]): (Tùy chọn) Các kênh dùng để phát hiện. Mặc định với 'magnitude':
+                              bộ ba trục đầu tiên có đủ trong batch (accX/accY/accZ,
+                              gyroX/gyroY/gyroZ, magX/magY/magZ) để độ lớn không lẫn kênh
+                              khác như temperature; nếu không có thì (và với 'channels')
+                              mọi kênh số thực.
+        pre_trigger (float): Thời gian lấy trước thời điểm kích hoạt (giây), mặc định 0.5.
+        post_trigger (float): Thời gian lấy sau khi tín hiệu hạ xuống (giây), mặc định 1.0.
+        max_duration (float): Độ dài tối đa của một sự kiện (giây), mặc định 10.0.
+        data_types (List[str]): (Tùy chọn) Chỉ xét các data_type này; mặc định mọi data_type.
+        passthrough (bool): Chuyển tiếp dữ liệu đầu vào, mặc định True.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.threshold = float(config['threshold'])
+        self.reset_threshold = float(config.get('reset_threshold', 0.8 * self.threshold))
+        if self.reset_threshold > self.threshold:
+            raise ValueError("reset_threshold must not exceed threshold")
+        self.mode = config.get('mode', 'magnitude')
+        if self.mode not in ('magnitude', 'channels'):
+            raise ValueError(f"Unsupported event mode: {self.mode}")
+        self.channels: Optional[List[str]] = config.get('channels')
+        self.pre_ns = int(float(config.get('pre_trigger', 0.5)) * NS_PER_SECOND)
+        self.post_ns = int(float(config.get('post_trigger', 1.0)) * NS_PER_SECOND)
+        self.max_duration_ns = int(float(config.get('max_duration', 10.0)) * NS_PER_SECOND)
+        self.data_types: Optional[List[str]] = config.get('data_types')
+        self.passthrough = bool(config.get('passthrough', True))
+        self.streams: Dict[Tuple[str, str], _EventStream] = {}
+        self.event_count = 0
+
+    def reset(self):
+        self.streams = {}
+        self.event_count = 0
+
+    def detection_channels(self, batch: SensorDataBatch) -> List[str]:
+        """Các kênh dùng để tính mức tín hiệu của batch."""
+        if self.channels is None and self.mode == 'magnitude':
+            for axes in (ACC_CHANNELS, GYRO_CHANNELS, MAG_CHANNELS):
+                if all(name in batch.values for name in axes):
+                    return list(axes)
+        return select_channels(batch, self.channels)
+
+    def level(self, batch: SensorDataBatch, channels: List[str]) -> np.ndarray:
+        """Mức tín hiệu dùng để so ngưỡng cho từng mẫu."""
+        x = batch.to_array(channels)
+        if self.mode == 'magnitude':
+            return np.sqrt(np.einsum('ij,ij->i', x, x))
+        return np.abs(x).max(axis=1)
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        if self.passthrough:
+            yield data
+        batch = as_batch(data)
+        if batch is None or len(batch) == 0 or batch.data_type in ('event', 'event_capture'):
+            return
+        if self.data_types is not None and batch.data_type not in self.data_types:
+            return
+        key = (batch.sensor_id, batch.data_type)
+        stream = self.streams.get(key)
+        channels = self.detection_channels(batch)
+        if not channels:
+            return
+        if self.channels_changed(key, stream.channels if stream is not None else None, channels):
+            if stream is not None and stream.active:
+                # Kết thúc sự kiện đang ghi với bố cục cũ trước khi bắt đầu lại
+                yield from self._finish(stream)
+            stream = self.streams[key] = _EventStream(channels)
+
+        level = self.level(batch, stream.channels)
+        ts = batch.timestamps_ns
+        if not stream.active and not stream.latched and level.max() < self.threshold:
+            # Trạng thái rảnh: chỉ cập nhật bộ đệm pre-trigger
+            self._remember(stream, batch, int(ts[-1]))
+            return
+
+        triggers = level >= self.threshold
+        releases = level < self.reset_threshold
+        n = len(batch)
+        pos = 0       # vị trí đang xét trong batch
+        taken = 0     # dữ liệu trước vị trí này đã thuộc một sự kiện hoặc đã vào bộ đệm
+        while pos < n:
+            if stream.latched:
+                # Sự kiện trước bị cắt do max_duration: chờ tín hiệu hạ xuống trước khi kích hoạt lại
+                index = _first(releases, pos)
+                if index is None:
+                    break
+                stream.latched = False
+                pos = index
+                continue
+            if not stream.active:
+                index = _first(triggers, pos)
+                if index is None:
+                    break
+                self._start(stream, batch.slice(taken, index), int(ts[index]))
+                taken = pos = index
+                continue
+            if stream.high:
+                # Trạng thái cao kéo dài tới khi nhả hoặc tới mẫu cuối có timestamp <= trigger + max_duration
+                limit = int(np.searchsorted(ts, stream.trigger_ns + self.max_duration_ns, side='right'))
+                index = _first(releases, pos)
+                if index is not None and index < limit:
+                    if index > pos:
+                        stream.last_high_ns = int(ts[index - 1])
+                    stream.high = False
+                    pos = index
+                    continue
+                end = min(limit, n)
+                if end > pos:
+                    stream.last_high_ns = int(ts[end - 1])
+                if limit >= n:
+                    pos = n
+                    continue
+                # Sự kiện quá dài: cắt đúng tại giới hạn, phần còn lại của batch xét tiếp từ đó
+                stream.parts.append(batch.slice(taken, max(limit, taken)))
+                taken = pos = max(limit, taken)
+                yield from self._finish(stream)
+                stream.latched = True
+            else:
+                deadline = min(stream.last_high_ns + self.post_ns, stream.trigger_ns + self.max_duration_ns)
+                stop = int(np.searchsorted(ts, deadline, side='right'))
+                retrigger = _first(triggers, pos)
+                if retrigger is not None and retrigger < stop:
+                    stream.high = True
+                    pos = retrigger
+                elif stop < n:
+                    stream.parts.append(batch.slice(taken, max(stop, taken)))
+                    taken = pos = max(stop, taken)
+                    yield from self._finish(stream)
+                else:
+                    pos = n
+        if stream.active:
+            if taken < n:
+                stream.parts.append(batch.slice(taken, n))
+        elif taken < n:
+            self._remember(stream, batch.slice(taken, n), int(ts[-1]))
+
+    def flush(self) -> Generator[Any, None, None]:
+        """Kết thúc các sự kiện còn dang dở khi luồng dữ liệu dừng."""
+        for stream in self.streams.values():
+            if stream.active:
+                yield from self._finish(stream)
+
+    def _remember(self, stream: _EventStream, part: SensorDataBatch, now_ns: int) -> None:
+        """Giữ các đoạn gần nhất làm pre-trigger, bỏ các đoạn đã quá cũ."""
+        if len(part):
+            stream.history.append(part)
+        while stream.history and int(stream.history[0].timestamps_ns[-1]) < now_ns - self.pre_ns:
+            stream.history.popleft()
+
+    def _start(self, stream: _EventStream, before: SensorDataBatch, trigger_ns: int) -> None:
+        if len(before):
+            stream.history.append(before)
+        cutoff = trigger_ns - self.pre_ns
+        parts = []
+        for part in stream.history:
+            if int(part.timestamps_ns[-1]) < cutoff:
+                continue
+            first = int(np.searchsorted(part.timestamps_ns, cutoff, side='left'))
+            parts.append(part.slice(first, None))
+        stream.history.clear()
+        stream.parts = parts
+        stream.active = True
+        stream.high = True
+        stream.trigger_ns = trigger_ns
+        stream.last_high_ns = trigger_ns
+
+    def _finish(self, stream: _EventStream) -> Generator[Any, None, None]:
+        stream.active = False
+        stream.high = False
+        parts = [part for part in stream.parts if len(part)]
+        stream.parts = []
+        if not parts:
+            return
+        capture = SensorDataBatch.concatenate(parts)
+        self.event_count += 1
+        level = self.level(capture, stream.channels)
+        in_event = (capture.timestamps_ns >= stream.trigger_ns) & (capture.timestamps_ns <= stream.last_high_ns)
+        peak = float(level[in_event].max()) if in_event.any() else float(level.max())
+        unit = capture.units.get(stream.channels[0], '')
+        metadata = {
+            'event_id': self.event_count,
+            'trigger_ns': stream.trigger_ns,
+            'start_ns': int(capture.timestamps_ns[0]),
+            'end_ns': int(capture.timestamps_ns[-1]),
+            'source_data_type': capture.data_type,
+            'channels': list(stream.channels),
+            'mode': self.mode,
+        }
+        yield SensorData(
+            timestamp_ns=stream.trigger_ns,
+            sensor_id=capture.sensor_id,
+            data_type='event',
+            values={'peak': peak,
+                    'duration': (stream.last_high_ns - stream.trigger_ns) / NS_PER_SECOND,
+                    'samples': len(capture)},
+            units={'peak': unit, 'duration': 's', 'samples': ''},
+            metadata=metadata,
+        )
+        yield SensorDataBatch(
+            timestamps_ns=capture.timestamps_ns,
+            sensor_id=capture.sensor_id,
+            data_type='event_capture',
+            values=dict(capture.values),
+            units=dict(capture.units),
+            metadata=dict(metadata),
+        )
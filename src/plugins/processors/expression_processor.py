@@ -0,0 +1,72 @@
+# src/plugins/processors/expression_processor.py
+from typing import Any, Dict, Generator, List, Optional, Set, Tuple
+
+import numpy as np
+
+from src.data.models import SensorData, as_batch
+from src.plugins.processors.base_processor import BaseProcessor
+from src.utils.expressions import Expression, compile_expression
+
+class ExpressionProcessor(BaseProcessor):
+    """
+    Thêm các kênh dẫn xuất được định nghĩa bằng biểu thức số học trong config.
+
+    Mỗi biểu thức được phân tích và biên dịch một lần khi khởi tạo thành chuỗi lệnh ufunc
+    NumPy (xem src/utils/expressions.py), rồi được tính trên toàn bộ batch với các mảng tạm
+    dùng lại giữa các lần gọi - không cần viết processor riêng cho những kênh như độ lớn
+    gia tốc hay góc nghiêng. Chỉ cho phép số, tên kênh, toán tử số học và các hàm trong
+    danh sách trắng, nên config không thể thực thi mã tùy ý.
+
+    Các biểu thức được tính theo thứ tự khai báo; biểu thức sau có thể dùng kênh do biểu
+    thức trước tạo ra. Biểu thức thiếu kênh đầu vào sẽ bị bỏ qua (cảnh báo một lần).
+
+    Ví dụ:
+        expressions:
+          acc_mag: sqrt(accX**2 + accY**2 + accZ**2)
+          tilt: degrees(arccos(accZ / acc_mag))
+
+    Config:
+        expressions (Dict[str, str]): Tên kênh mới -> biểu thức. Bắt buộc.
+        units (Dict[str, str]): (Tùy chọn) Đơn vị của các kênh mới.
+        data_types (List[str]): (Tùy chọn) Chỉ áp dụng cho các data_type này.
+        keep_inputs (bool): Giữ lại các kênh gốc (mặc định True); False chỉ giữ các kênh mới.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        expressions = config.get('expressions') or {}
+        if not expressions:
+            raise ValueError("ExpressionProcessor requires at least one expression")
+        self.expressions: List[Tuple[str, Expression]] = [
+            (str(name), compile_expression(str(text))) for name, text in expressions.items()]
+        self.units: Dict[str, str] = dict(config.get('units') or {})
+        self.data_types: Optional[List[str]] = config.get('data_types')
+        self.keep_inputs = bool(config.get('keep_inputs', True))
+        self._warned: Set[Tuple[str, str, str]] = set()
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        batch = as_batch(data)
+        if batch is None or (self.data_types is not None and batch.data_type not in self.data_types):
+            yield data
+            return
+
+        out = batch.slice()
+        if not self.keep_inputs:
+            out.values, out.units = {}, {}
+        env = dict(batch.values)
+        for name, expression in self.expressions:
+            missing = [v for v in expression.variables if v not in env]
+            if missing:
+                key = (name, batch.sensor_id, batch.data_type)
+                if key not in self._warned:
+                    self._warned.add(key)
+                    print(f"Warning: {self.__class__.__name__} skipping '{name}' for "
+                          f"{batch.sensor_id}/{batch.data_type}: missing {missing}")
+                continue
+            with np.errstate(invalid='ignore', divide='ignore'):
+                env[name] = expression.evaluate(env, out=np.empty(len(batch)))
+            out.values[name] = env[name]
+            out.units[name] = self.units.get(name, '')
+        if isinstance(data, SensorData):
+            yield from out.iter_samples()
+        else:
+            yield out
@@ -0,0 +1,115 @@
+# src/plugins/processors/feature_processor.py
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.models import SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor, select_channels
+from src.utils.features import FeatureExtractor, TIME_FEATURES, window_view
+
+class _FeatureStream:
+    """Phần đuôi chưa đủ một cửa sổ của một luồng (sensor_id, data_type)."""
+
+    def __init__(self, channels: List[str], units: Dict[str, str]):
+        self.channels = channels
+        self.units = units
+        self.tail = np.empty((0, len(channels)))
+        self.tail_ns = np.empty(0, dtype=np.int64)
+
+class FeatureProcessor(BaseProcessor):
+    """
+    Trích xuất đặc trưng theo cửa sổ trượt (dùng để tạo tập dữ liệu ML).
+
+    Các cửa sổ là view strided không sao chép trên mảng kênh của batch (xem
+    src/utils/features.py); mỗi đặc trưng được tính cho mọi cửa sổ và mọi kênh trong một
+    lệnh NumPy, không lặp Python theo cửa sổ. Các mẫu chưa đủ một cửa sổ được giữ lại và
+    ghép với batch sau, nên kết quả streaming trùng với xử lý toàn bộ tín hiệu một lần.
+
+    Đầu ra là một SensorDataBatch cho mỗi batch đầu vào có ít nhất một cửa sổ hoàn chỉnh,
+    timestamp là mẫu cuối của cửa sổ và các kênh '<kênh>_<đặc trưng>' (ví dụ 'accX_rms',
+    'accZ_band_0.5_3'). Nếu bố cục kênh của một luồng thay đổi, phần đuôi đang giữ bị bỏ và
+    cửa sổ bắt đầu lại từ batch hiện tại.
+
+    Config:
+        window (float): Độ dài cửa sổ (giây), mặc định 2.0.
+        step (float): Khoảng cách giữa hai cửa sổ (giây), mặc định bằng window / 2.
+        sample_rate (float): Tần số lấy mẫu (Hz), mặc định 100.0.
+        features (List[str]): Các đặc trưng, mặc định mọi đặc trưng miền thời gian:
+                              mean, std, rms, min, max, ptp, skewness, kurtosis, zero_crossings,
+                              mean_crossings, energy; thêm được dominant_freq, spectral_centroid.
+        bands (List[List[float]]): (Tùy chọn) Các dải tần [lo, hi) (Hz) để tính công suất dải.
+        channels (List[str]): (Tùy chọn) Các kênh cần tính; mặc định mọi kênh số thực.
+        data_types (List[str]): (Tùy chọn) Chỉ xử lý các data_type này.
+        output_data_type (str): data_type của batch đặc trưng, mặc định 'features'.
+        passthrough (bool): Chuyển tiếp dữ liệu đầu vào, mặc định False.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.sample_rate = float(config.get('sample_rate', 100.0))
+        self.window = float(config.get('window', 2.0))
+        self.step_seconds = float(config.get('step', self.window / 2.0))
+        self.size = max(2, int(round(self.window * self.sample_rate)))
+        self.step = max(1, int(round(self.step_seconds * self.sample_rate)))
+        self.extractor = FeatureExtractor(self.size, self.sample_rate,
+                                          config.get('features', TIME_FEATURES), config.get('bands'))
+        self.channels: Optional[List[str]] = config.get('channels')
+        self.data_types: Optional[List[str]] = config.get('data_types')
+        self.output_data_type = config.get('output_data_type', 'features')
+        self.passthrough = bool(config.get('passthrough', False))
+        self.streams: Dict[Tuple[str, str], _FeatureStream] = {}
+
+    def reset(self):
+        self.streams = {}
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        if self.passthrough:
+            yield data
+        batch = as_batch(data)
+        if batch is None or len(batch) == 0 or batch.data_type == self.output_data_type:
+            return
+        if self.data_types is not None and batch.data_type not in self.data_types:
+            return
+        key = (batch.sensor_id, batch.data_type)
+        stream = self.streams.get(key)
+        channels = select_channels(batch, self.channels)
+        if not channels:
+            return
+        if self.channels_changed(key, stream.channels if stream is not None else None, channels):
+            # Luồng mới hoặc bố cục kênh thay đổi: bỏ phần đuôi của bố cục cũ
+            units = {name: batch.units.get(name, '') for name in channels}
+            stream = self.streams[key] = _FeatureStream(channels, units)
+
+        x = np.concatenate([stream.tail, batch.to_array(stream.channels)])
+        ts = np.concatenate([stream.tail_ns, batch.timestamps_ns])
+        windows = window_view(x, self.size, self.step)
+        count = windows.shape[0]
+        # Giữ lại các mẫu mà cửa sổ kế tiếp (bắt đầu tại count * step) còn cần
+        stream.tail, stream.tail_ns = x[count * self.step:], ts[count * self.step:]
+        if count == 0:
+            return
+
+        features = self.extractor.compute(windows)
+        values: Dict[str, np.ndarray] = {}
+        units: Dict[str, str] = {}
+        for f, feature in enumerate(self.extractor.names):
+            for j, name in enumerate(stream.channels):
+                target = f"{name}_{feature}"
+                values[target] = features[:, j, f]
+                units[target] = _feature_unit(feature, stream.units[name])
+        yield SensorDataBatch(
+            timestamps_ns=ts[self.size - 1:self.size - 1 + count * self.step:self.step],
+            sensor_id=batch.sensor_id,
+            data_type=self.output_data_type,
+            values=values,
+            units=units,
+            metadata={'source_data_type': batch.data_type, 'window': self.window, 'step': self.step_seconds},
+        )
+
+def _feature_unit(feature: str, unit: str) -> str:
+    if feature in ('mean', 'std', 'rms', 'min', 'max', 'ptp'):
+        return unit
+    if feature in ('dominant_freq', 'spectral_centroid'):
+        return 'Hz'
+    if feature == 'energy' or feature.startswith('band_'):
+        return f"{unit}^2" if unit else ''
+    return ''
@@ -0,0 +1,117 @@
+# src/plugins/processors/filter_processor.py
+from abc import abstractmethod
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.models import SensorData, as_batch
+from src.plugins.processors.base_processor import BaseProcessor, select_channels
+from src.utils.sos_filter import SOSFilter, butter_sos, notch_sos
+
+class SOSFilterProcessor(BaseProcessor):
+    """
+    Lớp cơ sở cho các bộ lọc IIR dạng cascaded second-order sections (SOS).
+
+    Lọc toàn bộ batch và mọi kênh cùng lúc bằng SOSFilter (NumPy), giữ trạng thái bộ lọc
+    riêng cho mỗi luồng (sensor_id, data_type) giữa các lần gọi, nên kết quả khi chạy
+    streaming trùng với lọc offline toàn bộ tín hiệu. Nếu bố cục kênh của một luồng thay đổi
+    (ví dụ batch sau thiếu một kênh), chỉ các kênh có mặt được lọc và trạng thái của luồng
+    được khởi tạo lại thay vì dừng pipeline.
+
+    Lớp con chỉ cần triển khai `design()` trả về ma trận SOS.
+
+    Config:
+        sample_rate (float): Tần số lấy mẫu (Hz), mặc định 100.0.
+        order (int): Bậc bộ lọc Butterworth, mặc định 4.
+        channels (List[str]): (Tùy chọn) Các kênh cần lọc; mặc định mọi kênh có trong dữ liệu.
+        output_suffix (str): (Tùy chọn) Nếu có, ghi kết quả vào kênh mới '<kênh><suffix>'
+                             thay vì ghi đè kênh gốc.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.sample_rate = float(config.get('sample_rate', 100.0))
+        self.order = int(config.get('order', 4))
+        self.channels: Optional[List[str]] = config.get('channels')
+        self.output_suffix: Optional[str] = config.get('output_suffix')
+        self.filter = SOSFilter(self.design())
+        # (sensor_id, data_type) -> (danh sách kênh, trạng thái (n_sections, 2, k))
+        self.states: Dict[Tuple[str, str], Tuple[List[str], np.ndarray]] = {}
+
+    @abstractmethod
+    def design(self) -> np.ndarray:
+        """Trả về ma trận SOS (n_sections, 6) của bộ lọc."""
+
+    def reset(self):
+        self.states = {}
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        batch = as_batch(data)
+        if batch is None:
+            yield data
+            return
+        key = (batch.sensor_id, batch.data_type)
+        channels = select_channels(batch, self.channels)
+        previous, zi = self.states.get(key, (None, None))
+        if self.channels_changed(key, previous, channels):
+            # Luồng mới hoặc bố cục kênh thay đổi: bắt đầu lại trạng thái cho các kênh hiện có
+            zi = self.filter.initial_state(len(channels))
+        if not channels or len(batch) == 0:
+            yield data
+            return
+
+        y, zf = self.filter.filter(batch.to_array(channels), zi)
+        self.states[key] = (channels, zf)
+
+        out = batch.slice()
+        for j, name in enumerate(channels):
+            target = name + self.output_suffix if self.output_suffix else name
+            out.values[target] = y[:, j]
+            out.units[target] = batch.units.get(name, '')
+        if isinstance(data, SensorData):
+            yield from out.iter_samples()
+        else:
+            yield out
+
+class LowPassFilterProcessor(SOSFilterProcessor):
+    """
+    Bộ lọc thông thấp Butterworth.
+
+    Config:
+        cutoff_freq (float): Tần số cắt (Hz). Bắt buộc.
+    """
+    def design(self) -> np.ndarray:
+        return butter_sos(self.order, float(self.config['cutoff_freq']), self.sample_rate, 'lowpass')
+
+class HighPassFilterProcessor(SOSFilterProcessor):
+    """
+    Bộ lọc thông cao Butterworth (ví dụ loại bỏ thành phần DC/trôi chậm).
+
+    Config:
+        cutoff_freq (float): Tần số cắt (Hz). Bắt buộc.
+    """
+    def design(self) -> np.ndarray:
+        return butter_sos(self.order, float(self.config['cutoff_freq']), self.sample_rate, 'highpass')
+
+class BandPassFilterProcessor(SOSFilterProcessor):
+    """
+    Bộ lọc thông dải Butterworth (bậc thực tế là 2 * order).
+
+    Config:
+        low_freq (float): Tần số cắt dưới (Hz). Bắt buộc.
+        high_freq (float): Tần số cắt trên (Hz). Bắt buộc.
+    """
+    def design(self) -> np.ndarray:
+        band = (float(self.config['low_freq']), float(self.config['high_freq']))
+        return butter_sos(self.order, band, self.sample_rate, 'bandpass')
+
+class NotchFilterProcessor(SOSFilterProcessor):
+    """
+    Bộ lọc chặn dải hẹp (ví dụ loại bỏ nhiễu điện lưới 50 Hz hoặc tần số quay cố định).
+
+    Config:
+        notch_freq (float): Tần số cần loại bỏ (Hz). Bắt buộc.
+        quality_factor (float): Hệ số phẩm chất Q, mặc định 30.0.
+    """
+    def design(self) -> np.ndarray:
+        return notch_sos(float(self.config['notch_freq']), self.sample_rate,
+                         float(self.config.get('quality_factor', 30.0)))
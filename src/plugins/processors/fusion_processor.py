@@ -0,0 +1,164 @@
+# src/plugins/processors/fusion_processor.py
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.models import SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor
+from src.utils.orientation_fusion import (
+    initial_attitude, madgwick_step, mahony_step, normalize_rows, quat_to_euler)
+from src.utils.timestamp_utils import NS_PER_SECOND
+
+ACC_CHANNELS = ('accX', 'accY', 'accZ')
+GYRO_CHANNELS = ('gyroX', 'gyroY', 'gyroZ')
+MAG_CHANNELS = ('magX', 'magY', 'magZ')
+
+class _FusionGroup:
+    """Trạng thái fusion của một luồng đầu vào chứa S cảm biến."""
+
+    def __init__(self, prefixes: List[str], sensor_ids: List[str], has_mag: List[bool]):
+        self.prefixes = prefixes
+        self.sensor_ids = sensor_ids
+        self.has_mag = has_mag
+        self.q: Optional[np.ndarray] = None  # (S, 4)
+        self.integral = np.zeros((len(prefixes), 3))
+        self.last_ns: Optional[int] = None
+
+class OrientationFusionProcessor(BaseProcessor):
+    """
+    Ước lượng hướng (quaternion + roll/pitch/yaw) từ accelerometer/gyroscope/magnetometer
+    bằng bộ lọc Madgwick hoặc Mahony, vector hóa trên nhiều cảm biến.
+
+    Đầu vào là các batch đã căn thời gian (ví dụ đầu ra 'imu' của ResamplingProcessor):
+    - `group_by: sensor`: kênh accX/accY/accZ, gyroX/..., magX/... của một cảm biến;
+    - `group_by: all`: kênh '<sensor_id>.accX', ... của nhiều cảm biến trong cùng một batch.
+      Khi đó mỗi bước thời gian cập nhật cả mảng (S, 4) quaternion một lần cho mọi cảm biến.
+
+    Chuẩn hóa vector, đổi đơn vị và tính góc Euler được làm cho cả batch; chỉ bước
+    hồi quy trạng thái là vòng lặp theo thời gian. Đầu ra là một SensorDataBatch cho mỗi
+    cảm biến với các kênh roll/pitch/yaw (deg) và qw/qx/qy/qz. Với `passthrough`, batch đầu
+    vào được chuyển tiếp ngay sau các batch hướng của nó, nên processor phía sau (ví dụ
+    IntegrationProcessor) đã có hướng của các mẫu đó khi nhận gia tốc.
+
+    Config:
+        algorithm (str): 'madgwick' (mặc định) hoặc 'mahony'.
+        beta (float): Hệ số gradient của Madgwick, mặc định 0.1.
+        kp (float): Hệ số tỉ lệ của Mahony, mặc định 1.0.
+        ki (float): Hệ số tích phân của Mahony, mặc định 0.0.
+        use_magnetometer (bool): Dùng kênh từ trường nếu có, mặc định True.
+        sample_rate (float): Tần số dùng cho bước đầu tiên khi chưa có timestamp trước đó,
+                             mặc định 100.0.
+        max_dt (float): Bước thời gian tối đa (giây) khi có khoảng trống dữ liệu, mặc định 0.1.
+        input_data_types (List[str]): Các data_type được xử lý, mặc định ['imu'];
+                                      dữ liệu khác được chuyển tiếp nguyên vẹn.
+        output_data_type (str): data_type của đầu ra, mặc định 'orientation'.
+        passthrough (bool): Chuyển tiếp dữ liệu đầu vào, mặc định True.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.algorithm = config.get('algorithm', 'madgwick')
+        if self.algorithm not in ('madgwick', 'mahony'):
+            raise ValueError(f"Unsupported fusion algorithm: {self.algorithm}")
+        self.beta = float(config.get('beta', 0.1))
+        self.kp = float(config.get('kp', 1.0))
+        self.ki = float(config.get('ki', 0.0))
+        self.use_magnetometer = bool(config.get('use_magnetometer', True))
+        self.sample_rate = float(config.get('sample_rate', 100.0))
+        self.max_dt = float(config.get('max_dt', 0.1))
+        self.input_data_types = list(config.get('input_data_types', ['imu']))
+        self.output_data_type = config.get('output_data_type', 'orientation')
+        self.passthrough = bool(config.get('passthrough', True))
+        self.groups: Dict[Tuple[str, str], _FusionGroup] = {}
+
+    def reset(self):
+        self.groups = {}
+
+    def _find_sensors(self, batch: SensorDataBatch) -> Optional[_FusionGroup]:
+        """Tìm các tiền tố kênh ('' hoặc '<sensor_id>.') có đủ accel và gyro."""
+        prefixes, sensor_ids, has_mag = [], [], []
+        for name in batch.values:
+            if not name.endswith(ACC_CHANNELS[0]):
+                continue
+            prefix = name[:-len(ACC_CHANNELS[0])]
+            needed = [prefix + c for c in ACC_CHANNELS + GYRO_CHANNELS]
+            if not all(c in batch.values for c in needed):
+                continue
+            prefixes.append(prefix)
+            sensor_ids.append(prefix.rstrip('.') or batch.sensor_id)
+            has_mag.append(self.use_magnetometer and all(prefix + c in batch.values for c in MAG_CHANNELS))
+        if not prefixes:
+            return None
+        return _FusionGroup(prefixes, sensor_ids, has_mag)
+
+    def _stack(self, batch: SensorDataBatch, group: _FusionGroup, channels: Tuple[str, ...],
+               present: Optional[List[bool]] = None) -> np.ndarray:
+        """Ghép kênh của mọi cảm biến thành mảng (n, S, 3)."""
+        out = np.full((len(batch), len(group.prefixes), 3), np.nan)
+        for s, prefix in enumerate(group.prefixes):
+            if present is not None and not present[s]:
+                continue
+            for j, channel in enumerate(channels):
+                out[:, s, j] = batch.values[prefix + channel]
+        return out
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        batch = as_batch(data)
+        if batch is None or batch.data_type not in self.input_data_types:
+            yield data
+            return
+        key = (batch.sensor_id, batch.data_type)
+        group = self.groups.get(key)
+        if group is None:
+            group = self._find_sensors(batch)
+            if group is None:
+                yield data
+                return
+            self.groups[key] = group
+        n = len(batch)
+        if n == 0:
+            if self.passthrough:
+                yield data
+            return
+
+        # Phần không phụ thuộc trạng thái: tính cho cả batch một lần
+        acc, acc_valid = normalize_rows(self._stack(batch, group, ACC_CHANNELS))
+        mag, mag_valid = normalize_rows(self._stack(batch, group, MAG_CHANNELS, group.has_mag))
+        gyro = np.nan_to_num(self._stack(batch, group, GYRO_CHANNELS))
+        gyro_unit = batch.units.get(group.prefixes[0] + GYRO_CHANNELS[0], 'deg/s')
+        if 'deg' in gyro_unit:
+            gyro = np.radians(gyro)
+        ts = batch.timestamps_ns
+        previous = group.last_ns if group.last_ns is not None else int(ts[0]) - int(NS_PER_SECOND / self.sample_rate)
+        dt = np.diff(ts, prepend=np.int64(previous)) / NS_PER_SECOND
+        dt = np.clip(dt, 0.0, self.max_dt)
+
+        if group.q is None:
+            first = int(np.argmax(acc_valid.all(axis=1))) if acc_valid.any() else 0
+            group.q = initial_attitude(acc[first], np.where(mag_valid[first][:, np.newaxis], mag[first], np.nan))
+
+        # Hồi quy theo thời gian: mỗi bước cập nhật (S, 4) cho mọi cảm biến
+        q, integral = group.q, group.integral
+        history = np.empty((n, len(group.prefixes), 4))
+        for i in range(n):
+            if self.algorithm == 'madgwick':
+                q = madgwick_step(q, gyro[i], acc[i], acc_valid[i], mag[i], mag_valid[i], self.beta, dt[i])
+            else:
+                q, integral = mahony_step(q, integral, gyro[i], acc[i], acc_valid[i], mag[i], mag_valid[i],
+                                          self.kp, self.ki, dt[i])
+            history[i] = q
+        group.q, group.integral, group.last_ns = q, integral, int(ts[-1])
+
+        roll, pitch, yaw = (np.degrees(angle) for angle in quat_to_euler(history))
+        for s, sensor_id in enumerate(group.sensor_ids):
+            yield SensorDataBatch(
+                timestamps_ns=ts,
+                sensor_id=sensor_id,
+                data_type=self.output_data_type,
+                values={'roll': roll[:, s], 'pitch': pitch[:, s], 'yaw': yaw[:, s],
+                        'qw': history[:, s, 0], 'qx': history[:, s, 1],
+                        'qy': history[:, s, 2], 'qz': history[:, s, 3]},
+                units={'roll': 'deg', 'pitch': 'deg', 'yaw': 'deg', 'qw': '', 'qx': '', 'qy': '', 'qz': ''},
+                metadata={'algorithm': self.algorithm},
+            )
+        if self.passthrough:
+            yield data
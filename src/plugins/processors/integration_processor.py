@@ -0,0 +1,256 @@
+# src/plugins/processors/integration_processor.py
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.models import SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor
+from src.plugins.processors.fusion_processor import ACC_CHANNELS, GYRO_CHANNELS
+from src.utils.orientation_fusion import initial_attitude, normalize_rows, quat_from_euler, rotation_matrices
+from src.utils.sos_filter import SOSFilter, butter_sos
+from src.utils.timestamp_utils import NS_PER_SECOND
+
+STANDARD_GRAVITY = 9.80665  # m/s²
+QUAT_CHANNELS = ('qw', 'qx', 'qy', 'qz')
+EULER_CHANNELS = ('roll', 'pitch', 'yaw')
+
+def cumulative_trapezoid(x: np.ndarray, dt: np.ndarray, previous: np.ndarray, initial: np.ndarray) -> np.ndarray:
+    """
+    Tích phân hình thang cộng dồn, nối tiếp từ batch trước.
+
+    Args:
+        x: Giá trị (n, ...) tại các mẫu.
+        dt: Khoảng thời gian (n,) từ mẫu trước tới từng mẫu (giây).
+        previous: Giá trị tại mẫu cuối của batch trước (...), hoặc x[0] nếu là mẫu đầu tiên.
+        initial: Giá trị tích phân tại mẫu cuối của batch trước.
+    """
+    before = np.concatenate([previous[np.newaxis], x[:-1]])
+    shape = (-1,) + (1,) * (x.ndim - 1)
+    return initial + np.cumsum(0.5 * (x + before) * dt.reshape(shape), axis=0)
+
+def orientation_quaternions(batch: SensorDataBatch, prefix: str = '') -> Optional[np.ndarray]:
+    """Quaternion (n, 4) từ kênh qw/qx/qy/qz hoặc roll/pitch/yaw (deg) của batch, nếu có."""
+    if all(prefix + c in batch.values for c in QUAT_CHANNELS):
+        return batch.to_array([prefix + c for c in QUAT_CHANNELS])
+    if all(prefix + c in batch.values for c in EULER_CHANNELS):
+        roll, pitch, yaw = np.radians(batch.to_array([prefix + c for c in EULER_CHANNELS])).T
+        return quat_from_euler(roll, pitch, yaw)
+    return None
+
+class _IntegrationStream:
+    """Trạng thái tích phân của một luồng đầu vào chứa S cảm biến."""
+
+    def __init__(self, prefixes: List[str], sensor_ids: List[str], n_sections: int):
+        size = len(prefixes)
+        self.prefixes = prefixes
+        self.sensor_ids = sensor_ids
+        self.last_ns: Optional[int] = None
+        self.acc = np.zeros((size, 3))        # Gia tốc tuyến tính (đã lọc) tại mẫu cuối
+        self.velocity = np.zeros((size, 3))
+        self.displacement = np.zeros((size, 3))
+        self.velocity_in = np.zeros((size, 3))  # Vận tốc (đã lọc) tại mẫu cuối
+        self.static_q: Optional[np.ndarray] = None
+        # Trạng thái high-pass cho gia tốc, vận tốc, độ dịch chuyển: (n_sections, 2, S*3)
+        self.filter_states = [np.zeros((n_sections, 2, size * 3)) for _ in range(3)]
+
+class IntegrationProcessor(BaseProcessor):
+    """
+    Tích phân gia tốc thành vận tốc và độ dịch chuyển (hệ tọa độ trái đất) để phân tích chuyển động kết cấu.
+
+    Với mỗi batch (mọi cảm biến cùng lúc, mảng (n, S, 3)):
+    1. Xoay gia tốc về hệ trái đất bằng hướng của cảm biến và trừ trọng trường (0, 0, g).
+       Hướng lấy từ kênh qw/qx/qy/qz hoặc roll/pitch/yaw trong cùng batch, hoặc từ batch
+       hướng gần nhất của cùng sensor_id (data_type 'angle' của HWT905 hay 'orientation' của
+       OrientationFusionProcessor đặt trước processor này trong Pipeline), giữ giá trị gần
+       nhất trước mỗi mẫu. Nếu chưa có hướng, dùng tư thế tĩnh ước lượng từ mẫu gia tốc
+       đầu tiên.
+    2. Tích phân hình thang cộng dồn (vector hóa bằng cumsum), trạng thái nối tiếp giữa các batch.
+    3. Chống trôi:
+       - 'highpass': lọc thông cao Butterworth (SOSFilter, giữ trạng thái) gia tốc, vận tốc
+         và độ dịch chuyển, phù hợp với dao động quanh vị trí cân bằng;
+       - 'zupt': đặt vận tốc về 0 tại các mẫu đứng yên (|‖a‖ - g| và ‖ω‖ dưới ngưỡng), tính bằng
+         chỉ số mẫu đứng yên gần nhất (np.maximum.accumulate), không lặp theo mẫu;
+       - 'none'.
+
+    Đầu vào nhóm nhiều cảm biến (kênh '<sensor_id>.accX', `group_by: all`) được hỗ trợ như
+    OrientationFusionProcessor. Đầu ra là một SensorDataBatch cho mỗi cảm biến với các kênh
+    linAccX/Y/Z (m/s²), velX/Y/Z (m/s), dispX/Y/Z (m).
+
+    Config:
+        input_data_types (List[str]): data_type chứa gia tốc, mặc định ['accelerometer', 'imu'].
+        orientation_data_types (List[str]): data_type chứa hướng, mặc định ['angle', 'orientation'].
+        drift_correction (str): 'highpass' (mặc định), 'zupt' hoặc 'none'.
+        highpass_cutoff (float): Tần số cắt của bộ lọc thông cao (Hz), mặc định 0.1.
+        highpass_order (int): Bậc bộ lọc thông cao, mặc định 2.
+        sample_rate (float): Tần số lấy mẫu (Hz) để thiết kế bộ lọc và cho bước đầu tiên, mặc định 100.0.
+        zupt_acc_threshold (float): Ngưỡng |‖a‖ - g| (m/s²) để coi là đứng yên, mặc định 0.3.
+        zupt_gyro_threshold (float): Ngưỡng ‖ω‖ (deg/s) nếu batch có gyroscope, mặc định 5.0.
+        max_dt (float): Bước thời gian tối đa (giây) khi có khoảng trống dữ liệu, mặc định 0.1.
+        output_data_type (str): data_type của đầu ra, mặc định 'motion'.
+        passthrough (bool): Chuyển tiếp dữ liệu đầu vào, mặc định True.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.input_data_types = list(config.get('input_data_types', ['accelerometer', 'imu']))
+        self.orientation_data_types = list(config.get('orientation_data_types', ['angle', 'orientation']))
+        self.drift_correction = config.get('drift_correction', 'highpass')
+        if self.drift_correction not in ('highpass', 'zupt', 'none'):
+            raise ValueError(f"Unsupported drift correction: {self.drift_correction}")
+        self.sample_rate = float(config.get('sample_rate', 100.0))
+        self.filter = None
+        if self.drift_correction == 'highpass':
+            self.filter = SOSFilter(butter_sos(int(config.get('highpass_order', 2)),
+                                               float(config.get('highpass_cutoff', 0.1)),
+                                               self.sample_rate, 'highpass'))
+        self.zupt_acc_threshold = float(config.get('zupt_acc_threshold', 0.3))
+        self.zupt_gyro_threshold = float(config.get('zupt_gyro_threshold', 5.0))
+        self.max_dt = float(config.get('max_dt', 0.1))
+        self.output_data_type = config.get('output_data_type', 'motion')
+        self.passthrough = bool(config.get('passthrough', True))
+        self.streams: Dict[Tuple[str, str], _IntegrationStream] = {}
+        # sensor_id -> (timestamps (m,), quaternion (m, 4)) của batch hướng gần nhất
+        self.orientations: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    def reset(self):
+        self.streams = {}
+        self.orientations = {}
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        batch = as_batch(data)
+        if batch is None or len(batch) == 0:
+            yield data
+            return
+        if batch.data_type in self.orientation_data_types:
+            self._remember_orientation(batch)
+        if self.passthrough or batch.data_type not in self.input_data_types:
+            yield data
+        if batch.data_type not in self.input_data_types:
+            return
+        key = (batch.sensor_id, batch.data_type)
+        stream = self.streams.get(key)
+        if stream is None:
+            stream = self._find_sensors(batch)
+            if stream is None:
+                return
+            self.streams[key] = stream
+        yield from self._integrate(batch, stream)
+
+    def _find_sensors(self, batch: SensorDataBatch) -> Optional[_IntegrationStream]:
+        """Tìm các tiền tố kênh ('' hoặc '<sensor_id>.') có đủ accX/accY/accZ."""
+        prefixes, sensor_ids = [], []
+        for name in batch.values:
+            if not name.endswith(ACC_CHANNELS[0]):
+                continue
+            prefix = name[:-len(ACC_CHANNELS[0])]
+            if all(prefix + c in batch.values for c in ACC_CHANNELS):
+                prefixes.append(prefix)
+                sensor_ids.append(prefix.rstrip('.') or batch.sensor_id)
+        if not prefixes:
+            return None
+        n_sections = self.filter.n_sections if self.filter is not None else 0
+        return _IntegrationStream(prefixes, sensor_ids, n_sections)
+
+    def _remember_orientation(self, batch: SensorDataBatch) -> None:
+        q = orientation_quaternions(batch)
+        if q is None:
+            return
+        previous = self.orientations.get(batch.sensor_id)
+        ts = batch.timestamps_ns
+        if previous is not None and previous[0][-1] < ts[0]:
+            # Giữ mẫu cuối của batch trước cho các mẫu gia tốc nằm giữa hai batch hướng
+            ts = np.concatenate([previous[0][-1:], ts])
+            q = np.concatenate([previous[1][-1:], q])
+        self.orientations[batch.sensor_id] = (ts, q)
+
+    def _quaternions(self, batch: SensorDataBatch, stream: _IntegrationStream, acc: np.ndarray) -> np.ndarray:
+        """Quaternion (n, S, 4) cho từng mẫu và cảm biến."""
+        n, size = len(batch), len(stream.prefixes)
+        out = np.empty((n, size, 4))
+        for s, (prefix, sensor_id) in enumerate(zip(stream.prefixes, stream.sensor_ids)):
+            q = orientation_quaternions(batch, prefix)
+            if q is not None:
+                out[:, s] = q
+                continue
+            known = self.orientations.get(sensor_id)
+            if known is not None:
+                index = np.searchsorted(known[0], batch.timestamps_ns, side='right') - 1
+                out[:, s] = known[1][np.clip(index, 0, known[0].shape[0] - 1)]
+                continue
+            if stream.static_q is None:
+                stream.static_q = initial_attitude(acc[0])
+            out[:, s] = stream.static_q[s]
+        return out
+
+    def _integrate(self, batch: SensorDataBatch, stream: _IntegrationStream) -> Generator[SensorDataBatch, None, None]:
+        n, size = len(batch), len(stream.prefixes)
+        acc = np.empty((n, size, 3))
+        for s, prefix in enumerate(stream.prefixes):
+            for j, channel in enumerate(ACC_CHANNELS):
+                acc[:, s, j] = batch.values[prefix + channel]
+        if batch.units.get(stream.prefixes[0] + ACC_CHANNELS[0], 'g') == 'g':
+            acc *= STANDARD_GRAVITY
+
+        # Gia tốc tuyến tính trong hệ trái đất: R(q) a - (0, 0, g), cho mọi mẫu và cảm biến
+        q, _ = normalize_rows(self._quaternions(batch, stream, acc))
+        rotations = rotation_matrices(q.reshape(-1, 4)).reshape(n, size, 3, 3)
+        linear = np.einsum('nsij,nsj->nsi', rotations, acc)
+        linear[..., 2] -= STANDARD_GRAVITY
+
+        ts = batch.timestamps_ns
+        first = stream.last_ns is None
+        previous = int(ts[0]) - int(NS_PER_SECOND / self.sample_rate) if first else stream.last_ns
+        dt = np.clip(np.diff(ts, prepend=np.int64(previous)) / NS_PER_SECOND, 0.0, self.max_dt)
+        if first:
+            dt[0] = 0.0
+
+        if self.drift_correction == 'highpass':
+            linear = self._highpass(stream, 0, linear)
+        velocity = cumulative_trapezoid(linear, dt, linear[0] if first else stream.acc, stream.velocity)
+        if self.drift_correction == 'zupt':
+            velocity = self._zero_velocity_update(batch, stream, acc, velocity)
+        velocity_in = velocity
+        if self.drift_correction == 'highpass':
+            velocity_in = self._highpass(stream, 1, velocity)
+        displacement = cumulative_trapezoid(velocity_in, dt, velocity_in[0] if first else stream.velocity_in,
+                                            stream.displacement)
+        stream.acc, stream.velocity, stream.velocity_in = linear[-1], velocity[-1], velocity_in[-1]
+        stream.displacement = displacement[-1]
+        if self.drift_correction == 'highpass':
+            displacement = self._highpass(stream, 2, displacement)
+        stream.last_ns = int(ts[-1])
+
+        for s, (prefix, sensor_id) in enumerate(zip(stream.prefixes, stream.sensor_ids)):
+            values, units = {}, {}
+            for name, unit, result in (('linAcc', 'm/s²', linear), ('vel', 'm/s', velocity_in),
+                                       ('disp', 'm', displacement)):
+                for j, axis in enumerate('XYZ'):
+                    values[name + axis] = result[:, s, j]
+                    units[name + axis] = unit
+            yield SensorDataBatch(
+                timestamps_ns=ts,
+                sensor_id=sensor_id,
+                data_type=self.output_data_type,
+                values=values,
+                units=units,
+                metadata={'source_data_type': batch.data_type, 'drift_correction': self.drift_correction},
+            )
+
+    def _highpass(self, stream: _IntegrationStream, stage: int, x: np.ndarray) -> np.ndarray:
+        """Lọc thông cao (n, S, 3) như một mảng (n, S*3) với trạng thái riêng của từng tầng."""
+        y, stream.filter_states[stage] = self.filter.filter(x.reshape(x.shape[0], -1), stream.filter_states[stage])
+        return y.reshape(x.shape)
+
+    def _zero_velocity_update(self, batch: SensorDataBatch, stream: _IntegrationStream, acc: np.ndarray,
+                              velocity: np.ndarray) -> np.ndarray:
+        """Đặt vận tốc về 0 tại các mẫu đứng yên; sau đó chỉ cộng dồn phần tăng từ mẫu đứng yên gần nhất."""
+        n = velocity.shape[0]
+        static = np.abs(np.sqrt(np.einsum('nsj,nsj->ns', acc, acc)) - STANDARD_GRAVITY) < self.zupt_acc_threshold
+        for s, prefix in enumerate(stream.prefixes):
+            if all(prefix + c in batch.values for c in GYRO_CHANNELS):
+                gyro = batch.to_array([prefix + c for c in GYRO_CHANNELS])
+                static[:, s] &= np.sqrt(np.einsum('nj,nj->n', gyro, gyro)) < self.zupt_gyro_threshold
+        # Chỉ số mẫu đứng yên gần nhất tại hoặc trước mỗi mẫu (-1 nếu chưa có trong batch)
+        index = np.where(static, np.arange(n)[:, np.newaxis], -1)
+        last_static = np.maximum.accumulate(index, axis=0)
+        reference = np.take_along_axis(velocity, np.maximum(last_static, 0)[..., np.newaxis], axis=0)
+        return np.where((last_static >= 0)[..., np.newaxis], velocity - reference, velocity)
@@ -0,0 +1,333 @@
+# src/plugins/processors/quality_processor.py
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.data.models import SensorData, SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor, select_channels
+from src.utils.timestamp_utils import NS_PER_SECOND
+
+# Bit của kênh cờ chất lượng
+FLAG_OUTLIER = 1
+FLAG_AFTER_GAP = 2
+FLAG_INTERPOLATED = 4
+FLAG_TIMESTAMP = 8
+
+COUNTERS = ('samples', 'gaps', 'missing', 'filled', 'outliers', 'backwards', 'duplicates')
+
+class _QualityStream:
+    """Trạng thái kiểm tra chất lượng của một luồng (sensor_id, data_type)."""
+
+    def __init__(self, channels: List[str]):
+        self.channels = channels
+        self.history: Optional[np.ndarray] = None    # (W - 1, k) mẫu thô gần nhất cho median trượt
+        self.seen = 0                                # Số mẫu đã qua cửa sổ median (cho giai đoạn khởi động)
+        self.last_ns: Optional[int] = None
+        self.last_values: Dict[str, Any] = {}        # Giá trị (đã sửa) của mẫu cuối đã phát, mọi kênh
+        # outlier_action 'replace': các mẫu cuối chờ mẫu tốt kế tiếp để nội suy (xem DataQualityProcessor)
+        self.pending: Optional[Dict[str, Any]] = None
+        self.counters: Dict[str, Any] = {name: 0 for name in COUNTERS}
+        self.counters['max_gap_s'] = 0.0
+
+_ROW_ARRAYS = ('ts', 'dt', 'flags', 'missing', 'x', 'outlier', 'median')
+
+def _slice(rows: Dict[str, Any], start: Optional[int], stop: Optional[int]) -> Dict[str, Any]:
+    """Cắt các mảng theo hàng của một đoạn chờ (xem DataQualityProcessor._emit)."""
+    out = dict(rows)
+    for name in _ROW_ARRAYS:
+        out[name] = rows[name][start:stop]
+    out['values'] = {name: arr[start:stop] for name, arr in rows['values'].items()}
+    return out
+
+def _join(first: Dict[str, Any], second: Dict[str, Any]) -> Dict[str, Any]:
+    out = dict(second)
+    for name in _ROW_ARRAYS:
+        out[name] = np.concatenate([first[name], second[name]])
+    out['values'] = {name: np.concatenate([first['values'][name], arr]) for name, arr in second['values'].items()}
+    return out
+
+class DataQualityProcessor(BaseProcessor):
+    """
+    Phát hiện khoảng trống (gap), mất mẫu, timestamp bất thường và giá trị đột biến (outlier), có thể sửa chữa.
+
+    Mọi kiểm tra được vector hóa cho cả batch:
+    - Gap: hiệu timestamp liên tiếp (nối tiếp cả giữa các batch) so với chu kỳ 1 / `data_rate`
+      (cùng giá trị với config của decoder); số mẫu mất = round(dt / chu kỳ) - 1. Timestamp lùi
+      hoặc trùng cũng được đếm. Lưu ý: ở `timestamp_mode: packet` decoder tự sinh timestamp
+      đều nên gói bị mất không thể hiện thành gap; dùng chiptime/realtime để phát hiện.
+    - Outlier: bộ lọc Hampel nhân quả - median và MAD trên cửa sổ trượt `outlier_window` mẫu
+      kết thúc tại mỗi mẫu (lịch sử được giữ giữa các batch, tính bằng sliding_window_view);
+      mẫu lệch khỏi median hơn `outlier_threshold` * 1.4826 * MAD là outlier.
+    - Sửa chữa (tùy chọn): thay outlier bằng nội suy từ các mẫu tốt lân cận
+      (`outlier_action: replace`) hoặc NaN,
+      và nội suy tuyến tính các gap ngắn hơn `max_fill_gap` giây.
+      Với 'replace', các outlier ở cuối batch chưa có mẫu tốt phía sau được giữ lại (cùng
+      các mẫu sau chúng) tới batch kế tiếp, nên kết quả không phụ thuộc cách chia batch;
+      `flush` phát phần còn giữ khi luồng kết thúc (giữ giá trị tốt gần nhất). Đoạn giữ lại
+      dài hơn `outlier_window` mẫu được phát ngay theo cách giữ giá trị tốt gần nhất.
+
+    Bộ đếm theo từng cảm biến (samples, gaps, missing, filled, outliers, backwards, duplicates,
+    max_gap_s) được Pipeline gộp vào `Pipeline.metrics['quality'][sensor_id][data_type]`.
+    Nếu bố cục kênh của một luồng thay đổi, phần đang chờ nội suy được phát và cửa sổ median
+    bắt đầu lại cho các kênh hiện có; bộ đếm và kiểm tra timestamp vẫn nối tiếp.
+
+    Config:
+        data_rate (float): Tần số lấy mẫu mong đợi (Hz), mặc định 100.0.
+        gap_tolerance (float): dt lớn hơn gap_tolerance * chu kỳ được coi là gap, mặc định 1.5.
+        outlier_window (int): Số mẫu của cửa sổ median, mặc định 21.
+        outlier_threshold (float): Số lần độ lệch chuẩn ước lượng từ MAD, mặc định 6.0;
+                                   0 để tắt phát hiện outlier.
+        min_deviation (float): Độ lệch chuẩn tối thiểu (đơn vị của kênh), tránh coi mọi thay
+                               đổi là outlier khi tín hiệu gần như hằng số, mặc định 0.0.
+        outlier_action (str): 'flag' (mặc định, chỉ đếm/đánh dấu), 'replace' hoặc 'nan'.
+        max_fill_gap (float): Nội suy các gap có độ dài tới giá trị này (giây); mặc định 0 (không nội suy).
+        flag_channel (str): (Tùy chọn) Thêm kênh uint8 chứa cờ chất lượng của từng mẫu
+                            (1 outlier, 2 sau gap, 4 mẫu nội suy, 8 timestamp lùi/trùng).
+        channels (List[str]): (Tùy chọn) Các kênh kiểm tra outlier/nội suy; mặc định mọi kênh số thực.
+        data_types (List[str]): (Tùy chọn) Chỉ kiểm tra các data_type này; các loại khác đi qua nguyên vẹn.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.data_rate = float(config.get('data_rate', 100.0))
+        self.period_ns = NS_PER_SECOND / self.data_rate
+        self.gap_tolerance = float(config.get('gap_tolerance', 1.5))
+        self.window = max(3, int(config.get('outlier_window', 21)))
+        self.threshold = float(config.get('outlier_threshold', 6.0))
+        self.min_deviation = float(config.get('min_deviation', 0.0))
+        self.outlier_action = config.get('outlier_action', 'flag')
+        if self.outlier_action not in ('flag', 'replace', 'nan'):
+            raise ValueError(f"Unsupported outlier action: {self.outlier_action}")
+        self.max_fill = int(round(float(config.get('max_fill_gap', 0.0)) * self.data_rate))
+        self.flag_channel: Optional[str] = config.get('flag_channel')
+        self.channels: Optional[List[str]] = config.get('channels')
+        self.data_types: Optional[List[str]] = config.get('data_types')
+        self.streams: Dict[Tuple[str, str], _QualityStream] = {}
+
+    def reset(self):
+        self.streams = {}
+
+    def flush(self) -> Generator[Any, None, None]:
+        """Phát các mẫu còn chờ nội suy outlier (outlier_action: replace)."""
+        for stream in self.streams.values():
+            yield from self._release(stream)
+
+    def _release(self, stream: _QualityStream) -> Generator[Any, None, None]:
+        """Phát phần đang chờ của luồng, thay outlier cuối bằng giá trị tốt gần nhất."""
+        if stream.pending is not None:
+            rows, stream.pending = stream.pending, None
+            self._replace(stream, rows['x'], rows['outlier'], rows['median'])
+            yield from self._emit(stream, rows)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        quality: Dict[str, Dict[str, Dict[str, Any]]] = {}
+        for (sensor_id, data_type), stream in self.streams.items():
+            quality.setdefault(sensor_id, {})[data_type] = dict(stream.counters)
+        return {'quality': quality}
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        batch = as_batch(data)
+        if batch is None or len(batch) == 0 or (self.data_types is not None and batch.data_type not in self.data_types):
+            yield data
+            return
+        key = (batch.sensor_id, batch.data_type)
+        stream = self.streams.get(key)
+        channels = select_channels(batch, self.channels)
+        if self.channels_changed(key, stream.channels if stream is not None else None, channels):
+            previous, stream = stream, _QualityStream(channels)
+            if previous is not None:
+                yield from self._release(previous)
+                stream.counters, stream.last_ns, stream.last_values = (
+                    previous.counters, previous.last_ns, previous.last_values)
+            self.streams[key] = stream
+
+        n = len(batch)
+        ts = batch.timestamps_ns
+        counters = stream.counters
+        flags = np.zeros(n, dtype=np.uint8)
+
+        # Timestamp: hiệu liên tiếp, nối với mẫu cuối của batch trước
+        dt = np.diff(ts, prepend=np.int64(ts[0] if stream.last_ns is None else stream.last_ns))
+        bad_order = dt < 0
+        duplicate = dt == 0
+        if stream.last_ns is None:
+            duplicate[0] = False
+        gap = dt > self.gap_tolerance * self.period_ns
+        missing = np.where(gap, np.maximum(np.rint(dt / self.period_ns).astype(np.int64) - 1, 1), 0)
+        flags[bad_order | duplicate] |= FLAG_TIMESTAMP
+        flags[gap] |= FLAG_AFTER_GAP
+        counters['samples'] += n
+        counters['gaps'] += int(gap.sum())
+        counters['missing'] += int(missing.sum())
+        counters['backwards'] += int(bad_order.sum())
+        counters['duplicates'] += int(duplicate.sum())
+        if gap.any():
+            counters['max_gap_s'] = max(counters['max_gap_s'], float(dt[gap].max()) / NS_PER_SECOND)
+
+        values = dict(batch.values)
+        changed = False
+        rows = None
+        if stream.channels and self.threshold > 0:
+            x = batch.to_array(stream.channels)
+            outlier, median = self._outliers(stream, x)
+            if outlier.any():
+                counters['outliers'] += int(outlier.sum())
+                flags[outlier.any(axis=1)] |= FLAG_OUTLIER
+                if self.outlier_action == 'nan':
+                    x[outlier] = np.nan
+                    for j, name in enumerate(stream.channels):
+                        values[name] = x[:, j]
+                    changed = True
+            if self.outlier_action == 'replace' and (outlier.any() or stream.pending is not None):
+                rows = {'ts': ts, 'dt': dt, 'flags': flags, 'missing': missing, 'values': values,
+                        'x': x, 'outlier': outlier, 'median': median}
+        stream.last_ns = int(ts[-1])
+
+        if rows is not None:
+            # Nối phần còn chờ của batch trước, thay outlier, giữ lại đuôi chưa có mẫu tốt phía sau
+            rows.update(key=key, units=batch.units, metadata=batch.metadata, scalar=isinstance(data, SensorData))
+            if stream.pending is not None:
+                pending, stream.pending = stream.pending, None
+                if list(pending['values']) == list(rows['values']):
+                    rows = _join(pending, rows)
+                else:
+                    # Bố cục kênh thay đổi: phát phần đang chờ với giá trị tốt gần nhất
+                    self._replace(stream, pending['x'], pending['outlier'], pending['median'])
+                    yield from self._emit(stream, pending)
+            self._replace(stream, rows['x'], rows['outlier'], rows['median'])
+            hold = self._hold_from(rows['outlier'])
+            if hold < len(rows['ts']):
+                stream.pending = _slice(rows, hold, None)
+                rows = _slice(rows, 0, hold)
+            yield from self._emit(stream, rows)
+            return
+
+        fill = np.where(missing <= self.max_fill, missing, 0)
+        if fill.any():
+            ts, values, flags = self._fill(stream, ts, dt, values, flags, fill)
+            counters['filled'] += int(fill.sum())
+            changed = True
+
+        stream.last_values = {name: arr[-1] for name, arr in values.items()}
+        if self.flag_channel:
+            values[self.flag_channel] = flags
+            changed = True
+        if not changed:
+            yield data
+            return
+        yield from self._output(batch.sensor_id, batch.data_type, ts, values, batch.units, batch.metadata,
+                                isinstance(data, SensorData))
+
+    def _emit(self, stream: _QualityStream, rows: Dict[str, Any]) -> Generator[Any, None, None]:
+        """Nội suy gap và phát các hàng đã sửa outlier (outlier_action: replace)."""
+        ts, dt, flags, missing = rows['ts'], rows['dt'], rows['flags'], rows['missing']
+        if ts.shape[0] == 0:
+            return
+        values = dict(rows['values'])
+        for j, name in enumerate(stream.channels):
+            values[name] = rows['x'][:, j]
+        fill = np.where(missing <= self.max_fill, missing, 0)
+        if fill.any():
+            ts, values, flags = self._fill(stream, ts, dt, values, flags, fill)
+            stream.counters['filled'] += int(fill.sum())
+        stream.last_values = {name: arr[-1] for name, arr in values.items()}
+        if self.flag_channel:
+            values[self.flag_channel] = flags
+        yield from self._output(*rows['key'], ts, values, rows['units'], rows['metadata'], rows['scalar'])
+
+    def _output(self, sensor_id: str, data_type: str, ts: np.ndarray, values: Dict[str, np.ndarray],
+                units: Dict[str, str], metadata: Dict[str, Any], scalar: bool) -> Generator[Any, None, None]:
+        out = SensorDataBatch(
+            timestamps_ns=ts,
+            sensor_id=sensor_id,
+            data_type=data_type,
+            values=values,
+            units=dict(units),
+            metadata=dict(metadata),
+        )
+        if self.flag_channel:
+            out.units[self.flag_channel] = ''
+        if scalar:
+            yield from out.iter_samples()
+        else:
+            yield out
+
+    def _hold_from(self, outlier: np.ndarray) -> int:
+        """Chỉ số hàng đầu tiên phải chờ: sau mẫu tốt cuối của mọi kênh có outlier ở cuối."""
+        n = outlier.shape[0]
+        hold = n
+        for j in np.flatnonzero(outlier[-1]):
+            good = np.flatnonzero(~outlier[:, j])
+            hold = min(hold, int(good[-1]) + 1 if good.shape[0] else 0)
+        return hold if n - hold <= self.window else n
+
+    def _outliers(self, stream: _QualityStream, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Mặt nạ outlier (n, k) theo median/MAD trượt, cùng với median của từng cửa sổ."""
+        if stream.history is None:
+            # Đầu luồng: kéo dài bằng mẫu đầu tiên; các mẫu chưa có đủ cửa sổ thật không bị đánh giá
+            stream.history = np.repeat(x[:1], self.window - 1, axis=0)
+        warmup = max(0, self.window - 1 - stream.seen)
+        stream.seen += x.shape[0]
+        data = np.concatenate([stream.history, x])
+        stream.history = data[-(self.window - 1):].copy()
+        windows = sliding_window_view(data, self.window, axis=0)       # (n, k, W)
+        median = np.median(windows, axis=-1)
+        mad = np.median(np.abs(windows - median[..., np.newaxis]), axis=-1)
+        sigma = np.maximum(1.4826 * mad, self.min_deviation)
+        with np.errstate(invalid='ignore'):
+            outlier = np.abs(x - median) > self.threshold * sigma
+        outlier[:warmup] = False
+        return outlier, median
+
+    def _replace(self, stream: _QualityStream, x: np.ndarray, outlier: np.ndarray, median: np.ndarray) -> None:
+        """
+        Thay outlier bằng nội suy tuyến tính giữa các mẫu tốt lân cận (mẫu tốt cuối của batch trước
+        làm điểm neo đầu; cuối batch thì giữ giá trị tốt gần nhất).
+
+        Median trượt nhân quả trễ khoảng nửa cửa sổ trên tín hiệu có xu hướng nên không dùng làm
+        giá trị thay thế, trừ khi cả kênh không có mẫu tốt nào.
+        """
+        index = np.arange(x.shape[0])
+        for j in np.flatnonzero(outlier.any(axis=0)):
+            good = ~outlier[:, j]
+            xp, fp = index[good], x[good, j]
+            last = stream.last_values.get(stream.channels[j])
+            if last is not None:
+                xp, fp = np.concatenate([[-1], xp]), np.concatenate([[last], fp])
+            if xp.shape[0] == 0:
+                x[~good, j] = median[~good, j]
+            else:
+                x[~good, j] = np.interp(index[~good], xp, fp)
+
+    def _fill(self, stream: _QualityStream, ts: np.ndarray, dt: np.ndarray, values: Dict[str, np.ndarray],
+              flags: np.ndarray, fill: np.ndarray) -> Tuple[np.ndarray, Dict[str, np.ndarray], np.ndarray]:
+        """Chèn `fill[i]` mẫu nội suy tuyến tính trước mẫu i (giữa mẫu trước đó và mẫu i)."""
+        n = ts.shape[0]
+        owner = np.repeat(np.arange(n), fill)                       # Mẫu đứng sau mỗi điểm chèn
+        first = np.cumsum(fill) - fill
+        step = np.arange(owner.shape[0]) - first[owner] + 1          # 1..fill[i]
+        frac = step / (fill[owner] + 1.0)
+        # Vị trí trong mảng kết quả: mẫu gốc i dời đi cumsum(fill)[i]
+        position = np.arange(n) + np.cumsum(fill)
+        inserted = position[owner] - fill[owner] + step - 1
+        total = n + owner.shape[0]
+        original = np.ones(total, dtype=bool)
+        original[inserted] = False
+
+        new_ts = np.empty(total, dtype=np.int64)
+        new_ts[original] = ts
+        new_ts[inserted] = ts[owner] - dt[owner] + np.rint(frac * dt[owner]).astype(np.int64)
+        new_flags = np.zeros(total, dtype=np.uint8)
+        new_flags[original] = flags
+        new_flags[inserted] = FLAG_INTERPOLATED
+        new_values = {}
+        for name, arr in values.items():
+            previous = np.concatenate([[stream.last_values.get(name, arr[0])], arr[:-1]])
+            out = np.empty(total, dtype=arr.dtype)
+            out[original] = arr
+            if name in stream.channels:
+                out[inserted] = previous[owner] + frac * (arr[owner] - previous[owner])
+            else:
+                out[inserted] = previous[owner]
+            new_values[name] = out
+        return new_ts, new_values, new_flags
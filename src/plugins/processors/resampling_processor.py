@@ -0,0 +1,259 @@
+# src/plugins/processors/resampling_processor.py
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.models import SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor
+from src.utils.timestamp_utils import NS_PER_SECOND
+
+def interpolate_columns(ts: np.ndarray, values: np.ndarray, grid: np.ndarray,
+                        method: str = 'linear') -> np.ndarray:
+    """
+    Nội suy nhiều kênh cùng lúc lên các mốc thời gian `grid`.
+
+    Args:
+        ts: int64 (n,) timestamp nanosecond tăng dần của mẫu gốc.
+        values: (n, k) giá trị các kênh.
+        grid: int64 (m,) các mốc thời gian cần nội suy.
+        method: 'linear' hoặc 'nearest'.
+
+    Returns:
+        np.ndarray: (m, k) giá trị nội suy; NaN cho các mốc nằm ngoài [ts[0], ts[-1]].
+    """
+    m, k = grid.shape[0], values.shape[1]
+    if ts.shape[0] == 0:
+        return np.full((m, k), np.nan)
+    last = ts.shape[0] - 1
+    idx = np.searchsorted(ts, grid, side='right') - 1
+    valid = (idx >= 0) & (grid <= ts[-1])
+    i0 = np.clip(idx, 0, last)
+    i1 = np.minimum(i0 + 1, last)
+    span = (ts[i1] - ts[i0]).astype(np.float64)
+    offset = (grid - ts[i0]).astype(np.float64)
+    frac = np.divide(offset, span, out=np.zeros(m), where=span > 0)
+    if method == 'nearest':
+        out = values[np.where(frac >= 0.5, i1, i0)].astype(np.float64)
+    else:
+        v0 = values[i0]
+        out = v0 + frac[:, None] * (values[i1] - v0)
+    out[~valid] = np.nan
+    return out
+
+class _StreamBuffer:
+    """Bộ đệm lookahead có giới hạn cho một luồng (sensor_id, data_type)."""
+
+    def __init__(self, batch: SensorDataBatch, channels: List[str]):
+        self.sensor_id = batch.sensor_id
+        self.data_type = batch.data_type
+        self.channels = channels
+        self.units = {name: batch.units.get(name, '') for name in channels}
+        self.ts = np.empty(0, dtype=np.int64)
+        self.values = np.empty((0, len(channels)))
+        # Tên kênh ở đầu ra, được xác định khi nhóm bắt đầu phát dữ liệu
+        self.output_names: List[str] = []
+
+    @property
+    def first_ts(self) -> int:
+        return int(self.ts[0])
+
+    @property
+    def last_ts(self) -> int:
+        return int(self.ts[-1])
+
+    def append(self, batch: SensorDataBatch, max_samples: int) -> None:
+        ts = batch.timestamps_ns
+        if self.ts.shape[0]:
+            # Bỏ các mẫu đến trễ/không tăng dần
+            keep = ts > self.ts[-1]
+            if not keep.all():
+                batch = batch.take(keep)
+                ts = batch.timestamps_ns
+        if ts.shape[0] == 0:
+            return
+        self.ts = np.concatenate([self.ts, ts])
+        self.values = np.concatenate([self.values, batch.to_array(self.channels)])
+        if self.ts.shape[0] > max_samples:
+            self.ts = self.ts[-max_samples:]
+            self.values = self.values[-max_samples:]
+
+    def trim_before(self, t_ns: int) -> None:
+        # Giữ lại mẫu cuối cùng <= t_ns để còn nội suy cho mốc kế tiếp
+        start = int(np.searchsorted(self.ts, t_ns, side='right')) - 1
+        if start > 0:
+            self.ts = self.ts[start:]
+            self.values = self.values[start:]
+
+class _Group:
+    """Tập các luồng được đưa lên cùng một lưới thời gian và phát chung một khối."""
+
+    def __init__(self, key: str, first_seen_ns: int):
+        self.key = key
+        self.first_seen_ns = first_seen_ns
+        self.streams: Dict[Tuple[str, str], _StreamBuffer] = {}
+        self.started = False
+        self.next_grid_ns: Optional[int] = None
+
+class ResamplingProcessor(BaseProcessor):
+    """
+    Đưa một hoặc nhiều luồng dữ liệu lên một lưới thời gian tần số cố định.
+
+    Lưới thời gian là các bội số nguyên của chu kỳ (tính bằng ns kể từ epoch), nên mọi
+    cảm biến được resample với cùng `rate` đều có timestamp trùng khớp chính xác.
+    Tất cả các data_type của cùng một cảm biến (accelerometer, gyroscope, angle, ...)
+    được gộp thành một SensorDataBatch duy nhất. Nội suy được vector hóa trên toàn
+    bộ khối và mọi kênh; bộ đệm chỉ giữ phần lookahead cần thiết nên có thể chạy
+    real-time cũng như offline.
+
+    Config:
+        rate (float): Tần số lưới đầu ra (Hz). Bắt buộc.
+        method (str): 'linear' (mặc định) hoặc 'nearest'.
+        group_by (str): 'sensor' (mặc định, mỗi cảm biến một khối) hoặc 'all'
+                        (mọi cảm biến trong một khối, kênh đặt tên '<sensor_id>.<kênh>').
+        sensor_ids (List[str]): (Tùy chọn) Chỉ resample các cảm biến này; các cảm biến khác đi qua nguyên vẹn.
+        data_types (List[str]): (Tùy chọn) Chỉ resample các data_type này (ví dụ bỏ qua 'time').
+        channels (List[str]): (Tùy chọn) Chỉ giữ các kênh này.
+        output_data_type (str): data_type của khối đầu ra (mặc định 'imu').
+        warmup (float): Thời gian (giây) chờ các luồng xuất hiện trước khi cố định bố cục kênh (mặc định 0.1).
+        max_latency (float): Độ trễ tối đa (giây) chờ một luồng chậm; quá mức này các mốc
+                             tương ứng được điền NaN (mặc định 0.5).
+        max_buffer (int): Số mẫu tối đa giữ trong bộ đệm của mỗi luồng (mặc định 10000).
+        time_offsets (Dict[str, float]): (Tùy chọn) Độ lệch thời gian (giây) của từng sensor_id,
+                                         được trừ khỏi timestamp trước khi resample. Có thể cập
+                                         nhật lúc chạy qua `set_time_offset` (ví dụ từ TimeOffsetProcessor).
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        rate = float(config['rate'])
+        if rate <= 0:
+            raise ValueError(f"rate must be positive, got {rate}")
+        self.rate = rate
+        self.period_ns = int(round(NS_PER_SECOND / rate))
+        self.method = config.get('method', 'linear')
+        if self.method not in ('linear', 'nearest'):
+            raise ValueError(f"Unsupported interpolation method: {self.method}")
+        self.group_by = config.get('group_by', 'sensor')
+        if self.group_by not in ('sensor', 'all'):
+            raise ValueError(f"Unsupported group_by: {self.group_by}")
+        self.sensor_ids = config.get('sensor_ids')
+        self.data_types = config.get('data_types')
+        self.channels = config.get('channels')
+        self.output_data_type = config.get('output_data_type', 'imu')
+        self.warmup_ns = int(float(config.get('warmup', 0.1)) * NS_PER_SECOND)
+        self.max_latency_ns = int(float(config.get('max_latency', 0.5)) * NS_PER_SECOND)
+        self.max_buffer = int(config.get('max_buffer', 10000))
+        self.groups: Dict[str, _Group] = {}
+        self._ignored_streams = set()
+        self.time_offsets: Dict[str, int] = {
+            str(sid): int(round(float(offset) * NS_PER_SECOND))
+            for sid, offset in (config.get('time_offsets') or {}).items()}
+
+    def set_time_offset(self, sensor_id: str, offset_ns: int) -> None:
+        """Đặt độ lệch thời gian (ns) của một cảm biến; áp dụng cho các batch đến sau."""
+        self.time_offsets[sensor_id] = int(offset_ns)
+
+    def reset(self):
+        self.groups = {}
+        self._ignored_streams = set()
+
+    def _accepts(self, batch: SensorDataBatch) -> bool:
+        if self.sensor_ids is not None and batch.sensor_id not in self.sensor_ids:
+            return False
+        if self.data_types is not None and batch.data_type not in self.data_types:
+            return False
+        return True
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        batch = as_batch(data)
+        if batch is None or not self._accepts(batch):
+            yield data
+            return
+        if len(batch) == 0:
+            return
+        offset = self.time_offsets.get(batch.sensor_id, 0)
+        if offset:
+            batch = SensorDataBatch(batch.timestamps_ns - offset, batch.sensor_id, batch.data_type,
+                                    batch.values, batch.units, batch.metadata)
+
+        key = batch.sensor_id if self.group_by == 'sensor' else 'all'
+        group = self.groups.get(key)
+        if group is None:
+            group = self.groups[key] = _Group(key, int(batch.timestamps_ns[0]))
+
+        stream_key = (batch.sensor_id, batch.data_type)
+        stream = group.streams.get(stream_key)
+        if stream is None:
+            if group.started:
+                # Bố cục kênh đã cố định; luồng xuất hiện muộn bị bỏ qua
+                if stream_key not in self._ignored_streams:
+                    self._ignored_streams.add(stream_key)
+                    print(f"Warning: {self.__class__.__name__} ignoring late stream {stream_key}")
+                return
+            channels = [c for c in batch.channels if self.channels is None or c in self.channels]
+            if not channels:
+                return
+            stream = group.streams[stream_key] = _StreamBuffer(batch, channels)
+        stream.append(batch, self.max_buffer)
+
+        yield from self._emit(group, final=False)
+
+    def flush(self) -> Generator[Any, None, None]:
+        for group in self.groups.values():
+            yield from self._emit(group, final=True)
+        self.groups = {}
+
+    def _start_group(self, group: _Group) -> None:
+        used = set()
+        for stream in group.streams.values():
+            names = []
+            for channel in stream.channels:
+                name = channel if self.group_by == 'sensor' else f"{stream.sensor_id}.{channel}"
+                if name in used:
+                    name = f"{stream.data_type}.{name}"
+                used.add(name)
+                names.append(name)
+            stream.output_names = names
+        start = max(s.first_ts for s in group.streams.values())
+        group.next_grid_ns = -(-start // self.period_ns) * self.period_ns
+        group.started = True
+
+    def _emit(self, group: _Group, final: bool) -> Generator[SensorDataBatch, None, None]:
+        streams = [s for s in group.streams.values() if s.ts.shape[0]]
+        if not streams:
+            return
+        latest = max(s.last_ts for s in streams)
+        if not group.started:
+            if not final and latest - group.first_seen_ns < self.warmup_ns:
+                return
+            self._start_group(group)
+
+        if final:
+            ready = latest
+        else:
+            ready = min(s.last_ts for s in streams)
+            ready = max(ready, latest - self.max_latency_ns)
+        if ready < group.next_grid_ns:
+            return
+
+        n = (ready - group.next_grid_ns) // self.period_ns + 1
+        grid = group.next_grid_ns + np.arange(n, dtype=np.int64) * self.period_ns
+        values: Dict[str, np.ndarray] = {}
+        units: Dict[str, str] = {}
+        for stream in group.streams.values():
+            out = interpolate_columns(stream.ts, stream.values, grid, self.method)
+            for j, (channel, name) in enumerate(zip(stream.channels, stream.output_names)):
+                values[name] = out[:, j]
+                units[name] = stream.units.get(channel, '')
+
+        group.next_grid_ns += int(n) * self.period_ns
+        for stream in group.streams.values():
+            stream.trim_before(group.next_grid_ns)
+
+        yield SensorDataBatch(
+            timestamps_ns=grid,
+            sensor_id=group.key,
+            data_type=self.output_data_type,
+            values=values,
+            units=units,
+            metadata={'rate': self.rate, 'method': self.method},
+        )
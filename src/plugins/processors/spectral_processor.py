@@ -0,0 +1,291 @@
+# src/plugins/processors/spectral_processor.py
+from functools import lru_cache
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.data.models import SensorData, SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor, select_channels
+from src.utils.timestamp_utils import NS_PER_SECOND
+
+# data_type đầu ra của các processor phổ (không phân tích lại)
+SPECTRAL_DATA_TYPES = ('fft', 'spectrogram')
+
+@lru_cache(maxsize=32)
+def cached_window(name: str, length: int) -> np.ndarray:
+    """
+    Cửa sổ tuần hoàn (periodic, giống scipy.signal.get_window) được cache theo (tên, độ dài).
+
+    Mảng trả về là read-only để có thể dùng chung an toàn.
+    """
+    if name in ('hann', 'hanning'):
+        window = np.hanning(length + 1)[:-1]
+    elif name == 'hamming':
+        window = np.hamming(length + 1)[:-1]
+    elif name == 'blackman':
+        window = np.blackman(length + 1)[:-1]
+    elif name in ('boxcar', 'rect', 'rectangular'):
+        window = np.ones(length)
+    else:
+        raise ValueError(f"Unsupported window: {name}")
+    window.flags.writeable = False
+    return window
+
+class SegmentBuffer:
+    """
+    Bộ đệm lịch sử cấp phát trước, cắt luồng mẫu (n, k) thành các đoạn chồng lấn độ dài `nperseg`.
+
+    Giữa các lần gọi chỉ giữ phần đuôi chưa đủ một đoạn (< `nperseg` mẫu, dồn về đầu bộ đệm
+    ở lần gọi kế tiếp). Các đoạn hoàn chỉnh của một batch được trả về dưới dạng view
+    (nseg, k, nperseg) không sao chép để FFT một lần cho tất cả; view chỉ hợp lệ tới lần
+    `push` tiếp theo.
+    """
+
+    def __init__(self, nperseg: int, hop: int, n_channels: int):
+        self.nperseg = nperseg
+        self.hop = hop
+        self.work = np.empty((max(2 * nperseg, 1024), n_channels))
+        self.start = 0  # vị trí bắt đầu của đoạn kế tiếp trong self.work
+        self.end = 0    # số mẫu hợp lệ trong self.work
+
+    def push(self, x: np.ndarray, timestamps_ns: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Thêm các mẫu mới.
+
+        Returns:
+            Tuple (segments (nseg, k, nperseg), end_ts (nseg,) timestamp mẫu cuối của mỗi đoạn).
+        """
+        # Dồn phần đuôi còn giữ về đầu bộ đệm (mở rộng nếu batch lớn)
+        held = self.end - self.start
+        total = held + x.shape[0]
+        if total > self.work.shape[0]:
+            grown = np.empty((max(total, 2 * self.work.shape[0]), self.work.shape[1]))
+            grown[:held] = self.work[self.start:self.end]
+            self.work = grown
+        elif self.start:
+            self.work[:held] = self.work[self.start:self.end]
+        self.work[held:total] = x
+        self.start, self.end = 0, total
+
+        if total < self.nperseg:
+            return np.empty((0, self.work.shape[1], self.nperseg)), np.empty(0, dtype=np.int64)
+        nseg = (total - self.nperseg) // self.hop + 1
+        segments = sliding_window_view(self.work[:total], self.nperseg, axis=0)[::self.hop]
+        ends = np.arange(nseg) * self.hop + self.nperseg - 1 - held
+        self.start = nseg * self.hop
+        return segments, timestamps_ns[ends]
+
+class _WelchStream:
+    """Trạng thái Welch cho một luồng (sensor_id, data_type)."""
+
+    def __init__(self, channels: List[str], units: Dict[str, str], nperseg: int, hop: int,
+                 nfreq: int, averages: int):
+        self.channels = channels
+        self.units = units
+        self.segments = SegmentBuffer(nperseg, hop, len(channels))
+        # Vòng PSD của các đoạn gần nhất, cấp phát trước
+        self.psd_ring = np.zeros((averages, nfreq, len(channels)))
+        self.ring_pos = 0
+        self.ring_filled = 0
+        self.last_emit_ns: Optional[int] = None
+
+class _SegmentSpectrumProcessor(BaseProcessor):
+    """
+    Phần chung của các processor phổ theo đoạn (Welch, STFT): cấu hình đoạn/cửa sổ,
+    hệ số chuẩn hóa one-sided và tính PSD của nhiều đoạn bằng một lệnh `rfft`.
+
+    Config:
+        sample_rate (float): Tần số lấy mẫu (Hz), mặc định 100.0.
+        nperseg (int): Độ dài mỗi đoạn FFT, mặc định 256.
+        overlap (float): Tỉ lệ chồng lấn giữa các đoạn trong [0, 1), mặc định 0.5.
+        window (str): 'hann' (mặc định), 'hamming', 'blackman' hoặc 'boxcar'.
+        scaling (str): 'density' (đơn vị²/Hz, mặc định) hoặc 'spectrum' (đơn vị²).
+        detrend (bool): Trừ giá trị trung bình của mỗi đoạn trước FFT, mặc định True.
+        channels (List[str]): (Tùy chọn) Các kênh cần phân tích; mặc định mọi kênh số thực.
+        data_types (List[str]): (Tùy chọn) Chỉ phân tích các data_type này.
+        passthrough (bool): Chuyển tiếp dữ liệu đầu vào, mặc định True.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.sample_rate = float(config.get('sample_rate', 100.0))
+        self.nperseg = int(config.get('nperseg', 256))
+        overlap = float(config.get('overlap', 0.5))
+        if not 0.0 <= overlap < 1.0:
+            raise ValueError(f"overlap must be in [0, 1), got {overlap}")
+        self.hop = max(1, int(round(self.nperseg * (1.0 - overlap))))
+        self.window_name = config.get('window', 'hann')
+        self.window = cached_window(self.window_name, self.nperseg)
+        self.scaling = config.get('scaling', 'density')
+        if self.scaling not in ('density', 'spectrum'):
+            raise ValueError(f"Unsupported scaling: {self.scaling}")
+        self.detrend = bool(config.get('detrend', True))
+        self.channels: Optional[List[str]] = config.get('channels')
+        self.data_types: Optional[List[str]] = config.get('data_types')
+        self.passthrough = bool(config.get('passthrough', True))
+        self.frequencies = np.fft.rfftfreq(self.nperseg, d=1.0 / self.sample_rate)
+
+        # Hệ số chuẩn hóa one-sided (nhân đôi trừ DC và Nyquist)
+        if self.scaling == 'density':
+            scale = 1.0 / (self.sample_rate * np.sum(self.window ** 2))
+        else:
+            scale = 1.0 / np.sum(self.window) ** 2
+        self.scale = np.full(self.frequencies.shape[0], 2.0 * scale)
+        self.scale[0] = scale
+        if self.nperseg % 2 == 0:
+            self.scale[-1] = scale
+
+    def compute_psd(self, segments: np.ndarray) -> np.ndarray:
+        """
+        PSD của các đoạn (nseg, k, nperseg) -> (nseg, nfreq, k), tính bằng một lệnh rfft.
+        """
+        if self.detrend:
+            segments = segments - segments.mean(axis=-1, keepdims=True)
+        spectrum = np.fft.rfft(segments * self.window, axis=-1)
+        power = spectrum.real ** 2 + spectrum.imag ** 2
+        return (power * self.scale).transpose(0, 2, 1)
+
+    def accepts(self, batch: Optional[SensorDataBatch]) -> bool:
+        """Batch có được phân tích không (bỏ qua đầu ra phổ của các processor phổ phía trước)."""
+        if batch is None or len(batch) == 0 or batch.data_type in SPECTRAL_DATA_TYPES:
+            return False
+        return self.data_types is None or batch.data_type in self.data_types
+
+    def output_unit(self, unit: str) -> str:
+        suffix = '²/Hz' if self.scaling == 'density' else '²'
+        return f"{unit}{suffix}" if unit else suffix
+
+class WelchPSDProcessor(_SegmentSpectrumProcessor):
+    """
+    Ước lượng phổ công suất (Welch PSD) streaming cho nhiều kênh.
+
+    Các đoạn chồng lấn được cắt từ bộ đệm cấp phát trước; mọi đoạn hoàn chỉnh của một batch
+    và mọi kênh được nhân cửa sổ (cache theo độ dài) và biến đổi bằng một lệnh `rfft` 2-D.
+    PSD trung bình của `averages` đoạn gần nhất được phát ra với tần suất `update_rate`
+    dưới dạng SensorData có data_type 'fft', `values` = {kênh: mảng PSD} và
+    `metadata['frequencies']` - đúng định dạng DataBridge/FFTPlot sử dụng.
+
+    Nếu bố cục kênh của một luồng thay đổi (ví dụ batch sau thiếu một kênh), phổ trung bình
+    của luồng được bắt đầu lại với các kênh hiện có.
+
+    Config (ngoài các tham số của _SegmentSpectrumProcessor):
+        averages (int): Số đoạn gần nhất được lấy trung bình, mặc định 8.
+        update_rate (float): Số lần phát phổ mỗi giây (theo timestamp dữ liệu), mặc định 2.0.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.averages = int(config.get('averages', 8))
+        update_rate = float(config.get('update_rate', 2.0))
+        self.update_interval_ns = int(NS_PER_SECOND / update_rate) if update_rate > 0 else 0
+        self.streams: Dict[Tuple[str, str], _WelchStream] = {}
+
+    def reset(self):
+        self.streams = {}
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        if self.passthrough:
+            yield data
+        batch = as_batch(data)
+        if not self.accepts(batch):
+            return
+        key = (batch.sensor_id, batch.data_type)
+        stream = self.streams.get(key)
+        channels = select_channels(batch, self.channels)
+        if not channels:
+            return
+        if self.channels_changed(key, stream.channels if stream is not None else None, channels):
+            units = {name: batch.units.get(name, '') for name in channels}
+            stream = self.streams[key] = _WelchStream(channels, units, self.nperseg, self.hop,
+                                                      self.frequencies.shape[0], self.averages)
+
+        segments, _ = stream.segments.push(batch.to_array(stream.channels), batch.timestamps_ns)
+        if segments.shape[0]:
+            psd = self.compute_psd(segments)[-self.averages:]
+            m = psd.shape[0]
+            idx = (stream.ring_pos + np.arange(m)) % self.averages
+            stream.psd_ring[idx] = psd
+            stream.ring_pos = (stream.ring_pos + m) % self.averages
+            stream.ring_filled = min(self.averages, stream.ring_filled + m)
+
+        now_ns = int(batch.timestamps_ns[-1])
+        if stream.ring_filled == 0:
+            return
+        if stream.last_emit_ns is not None and now_ns - stream.last_emit_ns < self.update_interval_ns:
+            return
+        stream.last_emit_ns = now_ns
+        yield self._make_output(batch.sensor_id, batch.data_type, stream, now_ns)
+
+    def _make_output(self, sensor_id: str, data_type: str, stream: _WelchStream, timestamp_ns: int) -> SensorData:
+        mean_psd = stream.psd_ring[:stream.ring_filled].mean(axis=0)
+        return SensorData(
+            timestamp_ns=timestamp_ns,
+            sensor_id=sensor_id,
+            data_type='fft',
+            values={name: mean_psd[:, j].copy() for j, name in enumerate(stream.channels)},
+            units={name: self.output_unit(unit) for name, unit in stream.units.items()},
+            metadata={
+                'frequencies': self.frequencies,
+                'source_data_type': data_type,
+                'segments': stream.ring_filled,
+                'nperseg': self.nperseg,
+                'scaling': self.scaling,
+            },
+        )
+
+class STFTProcessor(_SegmentSpectrumProcessor):
+    """
+    Spectrogram (STFT) streaming: phát mỗi đoạn hoàn chỉnh thành một cột phổ.
+
+    Với mỗi batch đầu vào, mọi đoạn hoàn chỉnh được tính bằng một lệnh `rfft` và phát ra
+    dưới dạng một SensorDataBatch có data_type 'spectrogram': `timestamps_ns` là timestamp
+    mẫu cuối của từng đoạn, `values[kênh]` là mảng (số cột, số tần số) và
+    `metadata['frequencies']` là trục tần số. Dùng cùng SpectrogramPlot (waterfall).
+    Nếu bố cục kênh của một luồng thay đổi, bộ đệm đoạn được bắt đầu lại với các kênh hiện có.
+
+    Config (ngoài các tham số của _SegmentSpectrumProcessor):
+        decibels (bool): Xuất 10*log10(PSD) thay vì PSD tuyến tính, mặc định False.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.decibels = bool(config.get('decibels', False))
+        # (sensor_id, data_type) -> (danh sách kênh, đơn vị, bộ đệm đoạn)
+        self.streams: Dict[Tuple[str, str], Tuple[List[str], Dict[str, str], SegmentBuffer]] = {}
+
+    def reset(self):
+        self.streams = {}
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        if self.passthrough:
+            yield data
+        batch = as_batch(data)
+        if not self.accepts(batch):
+            return
+        key = (batch.sensor_id, batch.data_type)
+        channels = select_channels(batch, self.channels)
+        if not channels:
+            return
+        previous = self.streams[key][0] if key in self.streams else None
+        if self.channels_changed(key, previous, channels):
+            units = {name: batch.units.get(name, '') for name in channels}
+            self.streams[key] = (channels, units, SegmentBuffer(self.nperseg, self.hop, len(channels)))
+        channels, units, segments = self.streams[key]
+
+        columns, end_ts = segments.push(batch.to_array(channels), batch.timestamps_ns)
+        if columns.shape[0] == 0:
+            return
+        psd = self.compute_psd(columns)
+        if self.decibels:
+            psd = 10.0 * np.log10(np.maximum(psd, 1e-30))
+        yield SensorDataBatch(
+            timestamps_ns=end_ts,
+            sensor_id=batch.sensor_id,
+            data_type='spectrogram',
+            values={name: np.ascontiguousarray(psd[:, :, j]) for j, name in enumerate(channels)},
+            units={name: 'dB' if self.decibels else self.output_unit(unit) for name, unit in units.items()},
+            metadata={
+                'frequencies': self.frequencies,
+                'source_data_type': batch.data_type,
+                'nperseg': self.nperseg,
+                'scaling': self.scaling,
+            },
+        )
@@ -0,0 +1,190 @@
+# src/plugins/processors/statistics_processor.py
+from typing import Any, Dict, Generator, List, Optional, Tuple
+
+import numpy as np
+
+from src.data.models import SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor, select_channels
+
+STATISTICS = ('mean', 'std', 'rms', 'min', 'max', 'ptp')
+
+class _SlidingWindow:
+    """
+    Thống kê cửa sổ trượt W mẫu cho k kênh với chi phí O(1) khấu hao mỗi mẫu.
+
+    Chuỗi mẫu được chia thành các khối W mẫu theo chỉ số toàn cục. Cửa sổ kết thúc tại
+    offset `o` của khối b gồm phần [o+1, W) của khối b-1 và phần [0, o] của khối b, nên:
+    - tổng và tổng bình phương: cộng dồn mẫu mới, trừ mẫu cùng offset của khối trước
+      (tính lại chính xác mỗi khi hết một khối, nên không tích lũy sai số);
+    - min/max: max(suffix-max của khối trước tại o+1, prefix-max của khối hiện tại)
+      (thuật toán van Herk/Gil-Werman) - thay cho deque đơn điệu, vì vector hóa được.
+    Mỗi batch chỉ lặp Python theo số khối mà nó chạm tới, không theo số mẫu.
+    """
+
+    def __init__(self, size: int, n_channels: int):
+        self.size = size
+        self.current = np.zeros((size, n_channels))
+        self.previous = np.zeros((size, n_channels))
+        self.has_previous = False
+        # Hàng cuối là lính canh cho offset o = W - 1 (cửa sổ nằm trọn trong khối hiện tại)
+        self.suffix_max = np.full((size + 1, n_channels), -np.inf)
+        self.suffix_min = np.full((size + 1, n_channels), np.inf)
+        self.prefix_max = np.full(n_channels, -np.inf)
+        self.prefix_min = np.full(n_channels, np.inf)
+        self.sum = np.zeros(n_channels)
+        self.sum_sq = np.zeros(n_channels)
+
+    def update(self, y: np.ndarray, start: int) -> Tuple[np.ndarray, ...]:
+        """
+        Thêm các mẫu y (n, k) có chỉ số toàn cục bắt đầu từ `start`.
+
+        Returns:
+            Tuple (sum, sum_sq, count, max, min) của cửa sổ kết thúc tại từng mẫu.
+        """
+        n, k = y.shape
+        size = self.size
+        sums, sums_sq = np.empty((n, k)), np.empty((n, k))
+        highs, lows = np.empty((n, k)), np.empty((n, k))
+        pos = 0
+        while pos < n:
+            offset = (start + pos) % size
+            length = min(size - offset, n - pos)
+            seg = y[pos:pos + length]
+            out = slice(pos, pos + length)
+            self.current[offset:offset + length] = seg
+
+            if self.has_previous:
+                leaving = self.previous[offset:offset + length]
+                sums[out] = self.sum + np.cumsum(seg - leaving, axis=0)
+                sums_sq[out] = self.sum_sq + np.cumsum(seg * seg - leaving * leaving, axis=0)
+            else:
+                sums[out] = self.sum + np.cumsum(seg, axis=0)
+                sums_sq[out] = self.sum_sq + np.cumsum(seg * seg, axis=0)
+            prefix_max = np.maximum(np.maximum.accumulate(seg, axis=0), self.prefix_max)
+            prefix_min = np.minimum(np.minimum.accumulate(seg, axis=0), self.prefix_min)
+            highs[out] = np.maximum(prefix_max, self.suffix_max[offset + 1:offset + length + 1])
+            lows[out] = np.minimum(prefix_min, self.suffix_min[offset + 1:offset + length + 1])
+            self.sum, self.sum_sq = sums[pos + length - 1], sums_sq[pos + length - 1]
+            self.prefix_max, self.prefix_min = prefix_max[-1], prefix_min[-1]
+
+            if offset + length == size:
+                # Hết một khối: cửa sổ hiện tại đúng bằng khối này -> tính lại tổng chính xác
+                self.previous, self.current = self.current, self.previous
+                self.has_previous = True
+                self.suffix_max[:size] = np.maximum.accumulate(self.previous[::-1], axis=0)[::-1]
+                self.suffix_min[:size] = np.minimum.accumulate(self.previous[::-1], axis=0)[::-1]
+                self.prefix_max = np.full(k, -np.inf)
+                self.prefix_min = np.full(k, np.inf)
+                self.sum = self.previous.sum(axis=0)
+                self.sum_sq = np.square(self.previous).sum(axis=0)
+            pos += length
+
+        count = np.minimum(np.arange(start + 1, start + n + 1), size).astype(np.float64)
+        return sums, sums_sq, count, highs, lows
+
+class _StatsStream:
+    """Trạng thái thống kê của một luồng (sensor_id, data_type)."""
+
+    def __init__(self, channels: List[str], units: Dict[str, str], reference: np.ndarray,
+                 sizes: List[int]):
+        self.channels = channels
+        self.units = units
+        # Dữ liệu được trừ đi giá trị tham chiếu (mẫu đầu tiên) để tổng bình phương không mất chính xác
+        self.reference = reference
+        self.windows = [_SlidingWindow(size, len(channels)) for size in sizes]
+        self.count = 0
+
+class RollingStatisticsProcessor(BaseProcessor):
+    """
+    Thống kê cửa sổ trượt (mean, std, RMS, min, max, peak-to-peak) cho nhiều kênh và nhiều độ dài cửa sổ.
+
+    Mọi kênh của một batch được xử lý cùng lúc; mỗi cửa sổ dùng tổng cộng dồn theo khối
+    và min/max theo khối (xem _SlidingWindow) nên chi phí là O(1) khấu hao mỗi mẫu,
+    không phụ thuộc độ dài cửa sổ. Đầu ra là một SensorDataBatch với các kênh
+    '<kênh>_<thống kê>_<cửa sổ>' (ví dụ 'accX_rms_10s') mà TimeSeriesPlot có thể vẽ trực tiếp.
+
+    Cửa sổ tính theo số mẫu (`window * sample_rate`); ở đầu luồng thống kê dùng các mẫu đã có.
+
+    Config:
+        windows (List[float]): Độ dài cửa sổ (giây), mặc định [1.0, 10.0, 60.0].
+        sample_rate (float): Tần số lấy mẫu (Hz) để đổi cửa sổ sang số mẫu, mặc định 100.0.
+        statistics (List[str]): Các thống kê cần xuất, mặc định tất cả: mean, std, rms, min, max, ptp.
+        channels (List[str]): (Tùy chọn) Các kênh cần tính; mặc định mọi kênh số thực.
+        decimate (int): Chỉ xuất mỗi mẫu thứ N (theo chỉ số toàn cục), mặc định 1.
+        output_data_type (str): data_type của batch thống kê, mặc định 'statistics'.
+        passthrough (bool): Chuyển tiếp dữ liệu đầu vào cùng với thống kê, mặc định True.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.sample_rate = float(config.get('sample_rate', 100.0))
+        self.windows: List[float] = [float(w) for w in config.get('windows', [1.0, 10.0, 60.0])]
+        self.sizes = [max(1, int(round(w * self.sample_rate))) for w in self.windows]
+        self.labels = [f"{w:g}s" for w in self.windows]
+        self.statistics: List[str] = list(config.get('statistics', STATISTICS))
+        unknown = set(self.statistics) - set(STATISTICS)
+        if unknown:
+            raise ValueError(f"Unsupported statistics: {sorted(unknown)}")
+        self.channels: Optional[List[str]] = config.get('channels')
+        self.decimate = max(1, int(config.get('decimate', 1)))
+        self.output_data_type = config.get('output_data_type', 'statistics')
+        self.passthrough = bool(config.get('passthrough', True))
+        self.streams: Dict[Tuple[str, str], _StatsStream] = {}
+
+    def reset(self):
+        self.streams = {}
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        if self.passthrough:
+            yield data
+        batch = as_batch(data)
+        if batch is None or len(batch) == 0 or batch.data_type == self.output_data_type:
+            return
+        key = (batch.sensor_id, batch.data_type)
+        stream = self.streams.get(key)
+        channels = select_channels(batch, self.channels)
+        if not channels:
+            return
+        if self.channels_changed(key, stream.channels if stream is not None else None, channels):
+            units = {name: batch.units.get(name, '') for name in channels}
+            reference = batch.to_array(channels)[0].copy()
+            stream = self.streams[key] = _StatsStream(channels, units, reference, self.sizes)
+
+        y = batch.to_array(stream.channels) - stream.reference
+        start = stream.count
+        stream.count += len(batch)
+        # Chỉ số (trong batch) của các mẫu cần xuất
+        rows = np.arange((-start) % self.decimate, len(batch), self.decimate)
+
+        values: Dict[str, np.ndarray] = {}
+        units: Dict[str, str] = {}
+        for window, label in zip(stream.windows, self.labels):
+            sums, sums_sq, count, highs, lows = window.update(y, start)
+            if rows.size == 0:
+                continue
+            count = count[rows, np.newaxis]
+            mean = sums[rows] / count
+            variance = np.maximum(sums_sq[rows] / count - mean * mean, 0.0)
+            columns = {
+                'mean': lambda: mean + stream.reference,
+                'std': lambda: np.sqrt(variance),
+                'rms': lambda: np.sqrt(variance + np.square(mean + stream.reference)),
+                'min': lambda: lows[rows] + stream.reference,
+                'max': lambda: highs[rows] + stream.reference,
+                'ptp': lambda: highs[rows] - lows[rows],
+            }
+            for stat in self.statistics:
+                result = columns[stat]()
+                for j, name in enumerate(stream.channels):
+                    target = f"{name}_{stat}_{label}"
+                    values[target] = result[:, j]
+                    units[target] = stream.units[name]
+
+        if rows.size:
+            yield SensorDataBatch(
+                timestamps_ns=batch.timestamps_ns[rows],
+                sensor_id=batch.sensor_id,
+                data_type=self.output_data_type,
+                values=values,
+                units=units,
+                metadata={'source_data_type': batch.data_type, 'windows': list(self.windows)},
+            )
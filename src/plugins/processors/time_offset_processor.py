@@ -0,0 +1,191 @@
+# src/plugins/processors/time_offset_processor.py
+from typing import Any, Dict, Generator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor
+from src.plugins.processors.fusion_processor import ACC_CHANNELS
+from src.utils.time_offset import estimate_lags, solve_offsets
+from src.utils.timestamp_utils import NS_PER_SECOND
+
+class _OffsetGroup:
+    """Bộ đệm tín hiệu (S, n) của một batch nhóm nhiều cảm biến."""
+
+    def __init__(self, prefixes: List[str], sensor_ids: List[str], reference: int):
+        self.prefixes = prefixes
+        self.sensor_ids = sensor_ids
+        self.reference = reference
+        self.buffer = np.empty((len(prefixes), 0))
+        self.pending = 0          # Số mẫu mới từ lần ước lượng trước
+
+class TimeOffsetProcessor(BaseProcessor):
+    """
+    Ước lượng độ lệch thời gian giữa các cảm biến từ chính tín hiệu (cùng chịu một kích thích).
+
+    Đầu vào là batch gộp nhiều cảm biến trên cùng lưới thời gian (ResamplingProcessor với
+    `group_by: all`, kênh '<sensor_id>.<kênh>'). Mỗi `hop` giây, trên cửa sổ `window` giây gần
+    nhất: một rfft cho mỗi cảm biến (một lệnh 2-D), tích chéo phổ cho mọi cặp cùng lúc và một
+    irfft 2-D (xem estimate_lags) - thay cho tương quan trực tiếp O(n·lag) từng cặp. Các cặp có hệ
+    số tương quan >= `min_correlation` được gộp thành độ lệch của từng cảm biến so với cảm biến
+    tham chiếu (bình phương tối thiểu có trọng số).
+
+    Phản hồi: nếu `feedback` bật và phía trước trong Pipeline có processor hỗ trợ
+    `set_time_offset` (ResamplingProcessor), độ lệch được cộng dồn (hệ số `gain` cho mỗi lần
+    ước lượng) và đẩy ngược lại để căn thời gian; sau mỗi lần cập nhật bộ đệm được xóa để lần
+    ước lượng sau chỉ dùng dữ liệu đã hiệu chỉnh. Nếu không, độ lệch được làm trơn theo `gain`.
+
+    Mỗi lần ước lượng phát ra một SensorData data_type 'time_offset' với giá trị là độ lệch
+    (giây) của từng sensor_id; metadata chứa phần dư và hệ số tương quan.
+
+    Config:
+        input_data_types (List[str]): Các data_type được xét, mặc định ['imu'].
+        signal (str): Kênh dùng để tương quan (ví dụ 'accZ') hoặc 'magnitude' (mặc định,
+                      độ lớn gia tốc accX/accY/accZ).
+        window (float): Độ dài cửa sổ (giây), mặc định 10.0.
+        hop (float): Khoảng cách giữa hai lần ước lượng (giây), mặc định bằng window / 2.
+        max_lag (float): Độ lệch lớn nhất cần tìm (giây), mặc định 0.5.
+        min_correlation (float): Hệ số tương quan tối thiểu để dùng một cặp, mặc định 0.5.
+        pairs (str): 'reference' (mặc định, mỗi cảm biến với cảm biến tham chiếu) hoặc 'all'.
+        reference (str): sensor_id tham chiếu, mặc định cảm biến đầu tiên.
+        sample_rate (float): Tần số lấy mẫu nếu batch không có metadata 'rate', mặc định 100.0.
+        gain (float): Tỉ lệ phần dư được áp dụng mỗi lần, mặc định 0.5.
+        feedback (bool): Đẩy độ lệch về processor căn thời gian phía trước, mặc định True.
+        passthrough (bool): Chuyển tiếp dữ liệu đầu vào, mặc định True.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.input_data_types = list(config.get('input_data_types', ['imu']))
+        self.signal = config.get('signal', 'magnitude')
+        self.window = float(config.get('window', 10.0))
+        self.hop = float(config.get('hop', self.window / 2.0))
+        self.max_lag = float(config.get('max_lag', 0.5))
+        self.min_correlation = float(config.get('min_correlation', 0.5))
+        self.pairs = config.get('pairs', 'reference')
+        if self.pairs not in ('reference', 'all'):
+            raise ValueError(f"Unsupported pairs mode: {self.pairs}")
+        self.reference: Optional[str] = config.get('reference')
+        self.sample_rate = float(config.get('sample_rate', 100.0))
+        self.gain = float(config.get('gain', 0.5))
+        self.feedback = bool(config.get('feedback', True))
+        self.passthrough = bool(config.get('passthrough', True))
+        self.targets: List[Any] = []
+        self.offsets_ns: Dict[str, float] = {}
+        self.groups: Dict[Tuple[str, str], _OffsetGroup] = {}
+
+    def reset(self):
+        self.groups = {}
+        self.offsets_ns = {}
+
+    def attach(self, target: Any) -> None:
+        """Đăng ký một đối tượng có `set_time_offset(sensor_id, offset_ns)` để nhận độ lệch."""
+        self.targets.append(target)
+
+    def bind_upstream(self, processors: Sequence[Any]) -> List[Any]:
+        """
+        Pipeline gọi với các processor phía trước: gắn processor căn thời gian gần nhất.
+
+        Returns:
+            List[Any]: Các processor đã được gắn (nhận phản hồi), để Pipeline tính khóa cache.
+        """
+        if not self.feedback:
+            return []
+        for processor in reversed(list(processors)):
+            if hasattr(processor, 'set_time_offset'):
+                self.attach(processor)
+                return [processor]
+        return []
+
+    def _find_sensors(self, batch: SensorDataBatch) -> Optional[_OffsetGroup]:
+        channels = ACC_CHANNELS if self.signal == 'magnitude' else (self.signal,)
+        prefixes, sensor_ids = [], []
+        for name in batch.values:
+            if not name.endswith(channels[0]):
+                continue
+            prefix = name[:-len(channels[0])]
+            if all(prefix + c in batch.values for c in channels):
+                prefixes.append(prefix)
+                sensor_ids.append(prefix.rstrip('.') or batch.sensor_id)
+        if len(prefixes) < 2:
+            return None
+        reference = sensor_ids.index(self.reference) if self.reference in sensor_ids else 0
+        return _OffsetGroup(prefixes, sensor_ids, reference)
+
+    def _signals(self, batch: SensorDataBatch, group: _OffsetGroup) -> np.ndarray:
+        """Tín hiệu (S, n) dùng để tương quan."""
+        if self.signal == 'magnitude':
+            out = np.empty((len(group.prefixes), len(batch)))
+            for s, prefix in enumerate(group.prefixes):
+                acc = batch.to_array([prefix + c for c in ACC_CHANNELS])
+                out[s] = np.sqrt(np.einsum('ij,ij->i', acc, acc))
+            return out
+        return np.stack([batch.values[prefix + self.signal] for prefix in group.prefixes]).astype(np.float64)
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        if self.passthrough:
+            yield data
+        batch = as_batch(data)
+        if batch is None or len(batch) == 0 or batch.data_type not in self.input_data_types:
+            return
+        key = (batch.sensor_id, batch.data_type)
+        group = self.groups.get(key)
+        if group is None:
+            group = self._find_sensors(batch)
+            if group is None:
+                return
+            self.groups[key] = group
+
+        rate = float(batch.metadata.get('rate', self.sample_rate))
+        size = int(round(self.window * rate))
+        group.buffer = np.concatenate([group.buffer, self._signals(batch, group)], axis=1)[:, -size:]
+        group.pending += len(batch)
+        if group.buffer.shape[1] < size or group.pending < int(round(self.hop * rate)):
+            return
+        group.pending = 0
+        yield from self._estimate(batch, group, rate)
+
+    def _estimate(self, batch: SensorDataBatch, group: _OffsetGroup, rate: float) -> Generator[SensorData, None, None]:
+        signals = group.buffer
+        # Mẫu NaN (luồng đến trễ) được thay bằng trung bình của chính tín hiệu đó
+        if np.isnan(signals).any():
+            means = np.nanmean(signals, axis=1, keepdims=True)
+            signals = np.where(np.isnan(signals), np.nan_to_num(means), signals)
+        count = len(group.prefixes)
+        if self.pairs == 'all':
+            pairs = np.array([(a, b) for a in range(count) for b in range(a + 1, count)])
+        else:
+            pairs = np.array([(group.reference, s) for s in range(count) if s != group.reference])
+        lags, coefficients = estimate_lags(signals, pairs, int(round(self.max_lag * rate)))
+        weights = np.where(coefficients >= self.min_correlation, coefficients, 0.0)
+        residual = solve_offsets(count, pairs, lags, weights, group.reference) * NS_PER_SECOND / rate
+
+        updated = False
+        for s, sensor_id in enumerate(group.sensor_ids):
+            if s == group.reference or not np.isfinite(residual[s]):
+                continue
+            current = self.offsets_ns.get(sensor_id, 0.0)
+            if self.feedback and self.targets:
+                self.offsets_ns[sensor_id] = current + self.gain * residual[s]
+            else:
+                self.offsets_ns[sensor_id] = current + self.gain * (residual[s] - current)
+            updated = True
+        if updated and self.feedback and self.targets:
+            for target in self.targets:
+                for sensor_id, offset in self.offsets_ns.items():
+                    target.set_time_offset(sensor_id, int(round(offset)))
+            # Dữ liệu cũ chưa được hiệu chỉnh: ước lượng lại từ đầu
+            group.buffer = group.buffer[:, :0]
+
+        yield SensorData(
+            timestamp_ns=int(batch.timestamps_ns[-1]),
+            sensor_id=batch.sensor_id,
+            data_type='time_offset',
+            values={sid: self.offsets_ns.get(sid, 0.0) / NS_PER_SECOND for sid in group.sensor_ids},
+            units={sid: 's' for sid in group.sensor_ids},
+            metadata={
+                'reference': group.sensor_ids[group.reference],
+                'residual_s': {sid: float(residual[s]) / NS_PER_SECOND for s, sid in enumerate(group.sensor_ids)},
+                'correlation': {f"{group.sensor_ids[a]}/{group.sensor_ids[b]}": float(c)
+                                for (a, b), c in zip(pairs, coefficients)},
+            },
+        )
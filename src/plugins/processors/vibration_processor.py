@@ -0,0 +1,199 @@
+# src/plugins/processors/vibration_processor.py
+from typing import Any, Dict, Generator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.data.models import SensorDataBatch, as_batch
+from src.plugins.processors.base_processor import BaseProcessor, select_channels
+from src.utils.sos_filter import SOSFilterBank, butter_sos
+from src.utils.timestamp_utils import NS_PER_SECOND
+
+# Tỉ số octave cơ số 10 (IEC 61260): G = 10^(3/10)
+OCTAVE_RATIO = 10.0 ** 0.3
+
+def octave_bands(fraction: int, f_min: float, f_max: float) -> List[Tuple[float, float, float]]:
+    """
+    Các dải 1/`fraction` octave (tần số giữa theo IEC 61260, quanh 1 kHz) có tần số giữa >= f_min
+    và biên trên <= f_max.
+
+    Returns:
+        Danh sách (tần số giữa, biên dưới, biên trên) Hz, tăng dần.
+    """
+    if fraction < 1:
+        raise ValueError(f"fraction must be >= 1, got {fraction}")
+    half = OCTAVE_RATIO ** (1.0 / (2 * fraction))
+    # Chỉ số x: f_m = 1000 * G^(x / fraction) với fraction lẻ; fraction chẵn lệch nửa bước
+    shift = 0.0 if fraction % 2 else 0.5
+    lowest = int(np.ceil(fraction * np.log(f_min / 1000.0) / np.log(OCTAVE_RATIO) - shift - 1e-9))
+    highest = int(np.floor(fraction * np.log(f_max / half / 1000.0) / np.log(OCTAVE_RATIO) - shift + 1e-9))
+    bands = []
+    for x in range(lowest, highest + 1):
+        center = 1000.0 * OCTAVE_RATIO ** ((x + shift) / fraction)
+        bands.append((center, center / half, center * half))
+    return bands
+
+class _VibrationStream:
+    """Trạng thái bộ lọc và các tổng cộng dồn của khoảng thời gian hiện tại."""
+
+    def __init__(self, channels: List[str], units: Dict[str, str], reference: np.ndarray,
+                 zi: np.ndarray, n_bands: int):
+        self.channels = channels
+        self.units = units
+        # Trừ mẫu đầu tiên để các tổng lũy thừa bậc cao không mất chính xác (ví dụ accZ ~ 1 g)
+        self.reference = reference
+        self.zi = zi
+        self.interval: Optional[int] = None
+        self.last_ns = 0
+        k = len(channels)
+        self.count = 0
+        self.band_energy = np.zeros((n_bands, k))
+        self.sums = np.zeros((4, k))            # tổng x, x^2, x^3, x^4
+        self.high = np.full(k, -np.inf)
+        self.low = np.full(k, np.inf)
+
+    def clear(self):
+        self.count = 0
+        self.band_energy[:] = 0.0
+        self.sums[:] = 0.0
+        self.high[:] = -np.inf
+        self.low[:] = np.inf
+
+class VibrationMetricsProcessor(BaseProcessor):
+    """
+    Chỉ số rung cho giám sát tình trạng máy: RMS theo dải octave, peak, crest factor và kurtosis.
+
+    Mỗi batch đi qua một bank bộ lọc thông dải Butterworth (1/1 hoặc 1/3 octave, hoặc dải tự
+    chọn) dạng SOS nối tầng: hệ số của mọi dải được xếp chồng (SOSFilterBank) nên mỗi bước
+    lọc là một phép nhân ma trận theo lô cho mọi dải và mọi kênh cùng lúc. Trạng thái bộ lọc
+    được giữ giữa các batch. Các tổng (năng lượng từng dải, tổng lũy thừa 1..4, min/max) được
+    cộng dồn và chỉ số được xuất một lần cho mỗi khoảng `interval` giây (căn theo timestamp).
+
+    Chỉ số dải rộng tính trên tín hiệu đã trừ trung bình của khoảng: 'rms', 'peak'
+    (|x - mean| lớn nhất), 'crest' (peak / rms) và 'kurtosis' (= 3 với nhiễu Gauss).
+    Kênh đầu ra: '<kênh>_rms', '<kênh>_peak', '<kênh>_crest', '<kênh>_kurtosis' và
+    '<kênh>_rms_<tần số giữa>Hz' cho mỗi dải.
+
+    Config:
+        sample_rate (float): Tần số lấy mẫu (Hz), mặc định 100.0.
+        bands (str | List[List[float]]): 'octave', 'third_octave' (mặc định) hoặc danh sách [lo, hi] (Hz).
+        f_min (float): Tần số giữa nhỏ nhất khi dùng dải octave, mặc định 1.0.
+        f_max (float): Biên trên lớn nhất của dải, mặc định 0.45 * sample_rate.
+        order (int): Bậc Butterworth của mỗi dải (số section SOS), mặc định 3.
+        interval (float): Chu kỳ xuất chỉ số (giây), mặc định 1.0.
+        channels (List[str]): (Tùy chọn) Các kênh cần tính; mặc định mọi kênh số thực.
+        data_types (List[str]): (Tùy chọn) Chỉ xử lý các data_type này.
+        output_data_type (str): data_type của kết quả, mặc định 'vibration'.
+        passthrough (bool): Chuyển tiếp dữ liệu đầu vào, mặc định True.
+    """
+    def __init__(self, config: Dict[str, Any]):
+        super().__init__(config)
+        self.sample_rate = float(config.get('sample_rate', 100.0))
+        self.order = int(config.get('order', 3))
+        bands = config.get('bands', 'third_octave')
+        f_min = float(config.get('f_min', 1.0))
+        f_max = float(config.get('f_max', 0.45 * self.sample_rate))
+        if bands in ('octave', 'third_octave'):
+            self.bands = octave_bands(1 if bands == 'octave' else 3, f_min, f_max)
+        else:
+            self.bands = [(float(np.sqrt(lo * hi)), float(lo), float(hi)) for lo, hi in bands]
+        if not self.bands:
+            raise ValueError(f"No bands between {f_min} and {f_max} Hz")
+        self.labels = [f"{center:.3g}Hz" for center, _, _ in self.bands]
+        self.bank = SOSFilterBank(np.stack([
+            butter_sos(self.order, (lo, hi), self.sample_rate, 'bandpass') for _, lo, hi in self.bands]))
+        self.interval_ns = max(1, int(float(config.get('interval', 1.0)) * NS_PER_SECOND))
+        self.channels: Optional[List[str]] = config.get('channels')
+        self.data_types: Optional[List[str]] = config.get('data_types')
+        self.output_data_type = config.get('output_data_type', 'vibration')
+        self.passthrough = bool(config.get('passthrough', True))
+        self.streams: Dict[Tuple[str, str], _VibrationStream] = {}
+
+    def reset(self):
+        self.streams = {}
+
+    def process(self, data: Any) -> Generator[Any, None, None]:
+        if self.passthrough:
+            yield data
+        batch = as_batch(data)
+        if batch is None or len(batch) == 0 or batch.data_type == self.output_data_type:
+            return
+        if self.data_types is not None and batch.data_type not in self.data_types:
+            return
+        key = (batch.sensor_id, batch.data_type)
+        stream = self.streams.get(key)
+        channels = select_channels(batch, self.channels)
+        if not channels:
+            return
+        if self.channels_changed(key, stream.channels if stream is not None else None, channels):
+            if stream is not None and stream.count:
+                # Xuất khoảng đang tích lũy với bố cục cũ trước khi bắt đầu lại
+                yield self._output(batch.sensor_id, batch.data_type, stream,
+                                   [stream.last_ns], [self._metrics(stream)])
+            stream = self.streams[key] = _VibrationStream(
+                channels, {name: batch.units.get(name, '') for name in channels},
+                batch.to_array(channels)[0].copy(), self.bank.initial_state(len(channels)), len(self.bands))
+
+        x = batch.to_array(stream.channels) - stream.reference
+        y, stream.zi = self.bank.filter(x, stream.zi)
+        ts = batch.timestamps_ns
+        ids = ts // self.interval_ns
+        bounds = np.flatnonzero(np.diff(ids)) + 1
+        rows: List[Dict[str, np.ndarray]] = []
+        stamps: List[int] = []
+        for start, stop in zip(np.concatenate([[0], bounds]), np.concatenate([bounds, [len(ts)]])):
+            if stream.interval is not None and stream.interval != ids[start] and stream.count:
+                stamps.append(stream.last_ns)
+                rows.append(self._metrics(stream))
+                stream.clear()
+            stream.interval = int(ids[start])
+            self._accumulate(stream, x[start:stop], y[start:stop])
+            stream.last_ns = int(ts[stop - 1])
+        if rows:
+            yield self._output(batch.sensor_id, batch.data_type, stream, stamps, rows)
+
+    def flush(self) -> Generator[Any, None, None]:
+        """Xuất chỉ số của khoảng thời gian chưa kết thúc."""
+        for (sensor_id, data_type), stream in self.streams.items():
+            if stream.count:
+                yield self._output(sensor_id, data_type, stream, [stream.last_ns], [self._metrics(stream)])
+                stream.clear()
+
+    def _accumulate(self, stream: _VibrationStream, x: np.ndarray, y: np.ndarray) -> None:
+        stream.count += x.shape[0]
+        stream.band_energy += np.einsum('nbk,nbk->bk', y, y)
+        square = x * x
+        stream.sums += [x.sum(axis=0), square.sum(axis=0), (square * x).sum(axis=0), (square * square).sum(axis=0)]
+        stream.high = np.maximum(stream.high, x.max(axis=0))
+        stream.low = np.minimum(stream.low, x.min(axis=0))
+
+    def _metrics(self, stream: _VibrationStream) -> Dict[str, np.ndarray]:
+        n = float(stream.count)
+        s1, s2, s3, s4 = stream.sums / n
+        mean = s1
+        variance = np.maximum(s2 - mean * mean, 0.0)
+        m4 = s4 - 4.0 * mean * s3 + 6.0 * mean * mean * s2 - 3.0 * mean ** 4
+        rms = np.sqrt(variance)
+        peak = np.maximum(stream.high - mean, mean - stream.low)
+        with np.errstate(invalid='ignore', divide='ignore'):
+            crest = np.where(rms > 0, peak / rms, np.nan)
+            kurtosis = np.where(variance > 0, m4 / (variance * variance), np.nan)
+        metrics = {'rms': rms, 'peak': peak, 'crest': crest, 'kurtosis': kurtosis}
+        band_rms = np.sqrt(stream.band_energy / n)
+        for b, label in enumerate(self.labels):
+            metrics[f"rms_{label}"] = band_rms[b]
+        return metrics
+
+    def _output(self, sensor_id: str, data_type: str, stream: _VibrationStream,
+                stamps: Sequence[int], rows: Sequence[Dict[str, np.ndarray]]) -> SensorDataBatch:
+        values: Dict[str, np.ndarray] = {}
+        units: Dict[str, str] = {}
+        for metric in rows[0]:
+            stacked = np.stack([row[metric] for row in rows])
+            for j, name in enumerate(stream.channels):
+                target = f"{name}_{metric}"
+                values[target] = stacked[:, j]
+                units[target] = '' if metric in ('crest', 'kurtosis') else stream.units[name]
+        return SensorDataBatch(np.asarray(stamps, dtype=np.int64), sensor_id, self.output_data_type,
+                               values=values, units=units,
+                               metadata={'source_data_type': data_type,
+                                         'bands': [(lo, hi) for _, lo, hi in self.bands]})
@@ -0,0 +1,114 @@
+# src/tools/allan.py
+"""
+Phân tích Allan deviation (chồng lấn) cho các file ghi tĩnh dài của HWT905.
+
+File được đọc qua CachedRecordingReader (iter_recordings): lần đầu giải mã theo batch và
+lưu cache giải mã, các lần sau phát lại các cột đã memory-map. Từng batch được cộng dồn vào
+OverlappingAllan của từng loại cảm biến, nên bộ nhớ chỉ phụ thuộc vào tau lớn nhất,
+không phụ thuộc độ dài file. Cả 9 kênh (acc, gyro, mag) được tính trong một lần đọc.
+
+Ví dụ:
+    python -m src.tools.allan static_3h.bin --data-rate 200 --max-tau 2000 --output allan.csv
+"""
+import argparse
+import csv
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.tools.recording import iter_recordings
+from src.utils.allan import OverlappingAllan, log_spaced_clusters, noise_parameters
+from src.utils.calibration import TRIPLETS
+
+def allan_deviation(paths: Sequence[str], decoder_params: Optional[Dict[str, Any]] = None,
+                    max_tau: float = 1000.0, points_per_decade: int = 10,
+                    data_types: Optional[Sequence[str]] = None,
+                    chunk_size: int = 65536,
+                    use_cache: bool = True) -> Dict[str, Tuple[List[str], np.ndarray, np.ndarray]]:
+    """
+    Tính Allan deviation chồng lấn cho các file ghi (nối tiếp nhau như một bản ghi).
+
+    Args:
+        paths: Các file ghi nhị phân.
+        decoder_params: Tham số cho WitMotionDecoder; `data_rate` là tần số lấy mẫu (Hz).
+        max_tau: Tau lớn nhất cần tính (giây).
+        points_per_decade: Số điểm tau trên mỗi decade (thang log).
+        data_types: Các loại cảm biến, mặc định accelerometer, gyroscope, magnetometer.
+        use_cache: Đọc qua cache giải mã (xem iter_recording).
+
+    Returns:
+        Dict data_type -> (tên kênh, taus (c,), adev (c, 3)). Chỉ gồm các tau có dữ liệu.
+    """
+    decoder_params = dict(decoder_params or {})
+    rate = float(decoder_params.get('data_rate', 100.0))
+    clusters = log_spaced_clusters(int(max_tau * rate), points_per_decade)
+    data_types = list(data_types or TRIPLETS.keys())
+    accumulators: Dict[str, OverlappingAllan] = {}
+    for batch in iter_recordings(paths, decoder_params, chunk_size, use_cache):
+        if batch.data_type not in data_types:
+            continue
+        accumulator = accumulators.get(batch.data_type)
+        if accumulator is None:
+            accumulator = accumulators[batch.data_type] = OverlappingAllan(clusters, 3)
+        accumulator.update(batch.to_array(TRIPLETS[batch.data_type]))
+
+    result = {}
+    for data_type in data_types:
+        if data_type in accumulators:
+            taus, adev, _ = accumulators[data_type].deviation(rate)
+            result[data_type] = (list(TRIPLETS[data_type]), taus, adev)
+    return result
+
+def write_csv(path: str, result: Dict[str, Tuple[List[str], np.ndarray, np.ndarray]]) -> None:
+    """Ghi mọi đường cong vào một file CSV: cột tau_s và một cột cho mỗi kênh (trống nếu không có)."""
+    taus = np.unique(np.concatenate([taus for _, taus, _ in result.values()]))
+    columns = []
+    for channels, curve_taus, adev in result.values():
+        index = {float(t): i for i, t in enumerate(curve_taus)}
+        for j, name in enumerate(channels):
+            columns.append((name, index, adev[:, j]))
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['tau_s'] + [name for name, _, _ in columns])
+        for tau in taus:
+            row = [f"{tau:.6g}"]
+            for _, index, values in columns:
+                i = index.get(float(tau))
+                row.append('' if i is None else f"{values[i]:.6e}")
+            writer.writerow(row)
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Overlapping Allan deviation of HWT905 recordings")
+    parser.add_argument("files", nargs="+", help="Static recordings (.bin), processed as one sequence")
+    parser.add_argument("--data-rate", type=float, default=100.0, help="Sensor output rate (Hz)")
+    parser.add_argument("--acc-range", type=float, default=16.0, help="Accelerometer range (g)")
+    parser.add_argument("--gyro-range", type=float, default=2000.0, help="Gyroscope range (deg/s)")
+    parser.add_argument("--max-tau", type=float, default=1000.0, help="Largest cluster time (s)")
+    parser.add_argument("--points-per-decade", type=int, default=10, help="Cluster times per decade")
+    parser.add_argument("--output", "-o", help="CSV file for the curves")
+    parser.add_argument("--no-cache", action="store_true", help="Always decode instead of using/creating the decoded-recording cache")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_arguments(argv)
+    decoder_params = {'acc_range': args.acc_range, 'gyro_range': args.gyro_range, 'data_rate': args.data_rate}
+    result = allan_deviation(args.files, decoder_params, args.max_tau, args.points_per_decade,
+                             use_cache=not args.no_cache)
+    if not result:
+        print("No accelerometer/gyroscope/magnetometer data found")
+        return 1
+    for data_type, (channels, taus, adev) in result.items():
+        params = noise_parameters(taus, adev)
+        print(f"{data_type}: tau {taus[0]:.3g}..{taus[-1]:.3g} s ({len(taus)} points)")
+        for j, name in enumerate(channels):
+            print(f"  {name}: random walk (tau=1s) {params['random_walk'][j]:.4g}, "
+                  f"bias instability {params['bias_instability'][j]:.4g} at {params['tau_min'][j]:.3g} s")
+    if args.output:
+        write_csv(args.output, result)
+        print(f"Saved Allan deviation curves to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,128 @@
+# src/tools/calibrate.py
+"""
+Ước lượng hiệu chuẩn HWT905 từ các file ghi offline.
+
+- Gyroscope: bias = trung bình các cửa sổ đứng yên (ma trận đơn vị - tư thế tĩnh không cho
+  biết hệ số tỉ lệ của gyro).
+- Accelerometer: fit ellipsoid trên trung bình các cửa sổ đứng yên ở nhiều tư thế
+  (model 'axis' cho bài 6 tư thế cổ điển, 'full' khi có >= 9 tư thế khác nhau).
+- Magnetometer: fit ellipsoid (hard/soft-iron) trên mọi mẫu, thường từ một file xoay cảm biến
+  theo mọi hướng.
+
+Mọi bước đều tích lũy theo từng chunk nên bộ nhớ không phụ thuộc độ dài file.
+
+Ví dụ:
+    python -m src.tools.calibrate poses.bin --mag-files rotation.bin --sensor-id imu1 \\
+        --output config/calibration.yaml
+"""
+import argparse
+import sys
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from src.tools.recording import iter_recordings
+from src.utils.calibration import (
+    TRIPLETS, AxisCalibration, EllipsoidFit, StaticWindowAccumulator, save_calibrations)
+
+def estimate_calibration(paths: Sequence[str], mag_paths: Optional[Sequence[str]] = None,
+                         decoder_params: Optional[Dict[str, Any]] = None, window: float = 1.0,
+                         accel_threshold: float = 0.01, gyro_threshold: float = 0.5,
+                         accel_model: str = 'axis', mag_model: str = 'full', gravity: float = 1.0,
+                         mag_radius: float = 1.0, mag_unit: Optional[str] = None,
+                         chunk_size: int = 65536, use_cache: bool = True) -> Dict[str, AxisCalibration]:
+    """
+    Ước lượng hiệu chuẩn cho một cảm biến.
+
+    Args:
+        paths: Các file ghi tư thế tĩnh (accelerometer + gyroscope).
+        mag_paths: Các file cho magnetometer (mặc định dùng `paths`).
+        decoder_params: Tham số cho WitMotionDecoder (acc_range, gyro_range, data_rate...).
+        window: Độ dài cửa sổ kiểm tra đứng yên (giây).
+        accel_threshold: Độ lệch chuẩn tối đa (g) của accelerometer trong cửa sổ tĩnh.
+        gyro_threshold: Độ lệch chuẩn tối đa (deg/s) của gyroscope trong cửa sổ tĩnh.
+        accel_model, mag_model: Model ellipsoid ('axis' hoặc 'full').
+        gravity: Độ lớn trọng lực sau hiệu chuẩn (đơn vị của accelerometer).
+        mag_radius, mag_unit: Độ lớn và đơn vị từ trường sau hiệu chuẩn.
+        use_cache: Đọc qua cache giải mã (xem iter_recording).
+
+    Returns:
+        Dict data_type -> AxisCalibration cho các loại ước lượng được.
+        Loại nào thiếu dữ liệu thì được bỏ qua (kèm cảnh báo).
+    """
+    decoder_params = dict(decoder_params or {})
+    samples = max(2, int(round(window * float(decoder_params.get('data_rate', 100.0)))))
+    accel_windows = StaticWindowAccumulator(samples, accel_threshold)
+    gyro_windows = StaticWindowAccumulator(samples, gyro_threshold)
+    accel_fit = EllipsoidFit(accel_model)
+    mag_fit = EllipsoidFit(mag_model)
+    mag_paths = list(paths) if mag_paths is None else list(mag_paths)
+    separate_mag = list(mag_paths) != list(paths)
+
+    for batch in iter_recordings(paths, decoder_params, chunk_size, use_cache):
+        if batch.data_type == 'accelerometer':
+            accel_fit.update(accel_windows.update(batch.to_array(TRIPLETS['accelerometer'])))
+        elif batch.data_type == 'gyroscope':
+            gyro_windows.update(batch.to_array(TRIPLETS['gyroscope']))
+        elif batch.data_type == 'magnetometer' and not separate_mag:
+            mag_fit.update(batch.to_array(TRIPLETS['magnetometer']))
+    if separate_mag:
+        for batch in iter_recordings(mag_paths, decoder_params, chunk_size, use_cache):
+            if batch.data_type == 'magnetometer':
+                mag_fit.update(batch.to_array(TRIPLETS['magnetometer']))
+
+    result: Dict[str, AxisCalibration] = {}
+    if gyro_windows.windows:
+        result['gyroscope'] = AxisCalibration(offset=gyro_windows.mean)
+    else:
+        print("Warning: no static gyroscope windows found; gyroscope bias not estimated")
+    for data_type, fit, radius, unit in (('accelerometer', accel_fit, gravity, None),
+                                         ('magnetometer', mag_fit, mag_radius, mag_unit)):
+        try:
+            result[data_type] = fit.solve(radius, unit)
+        except ValueError as e:
+            print(f"Warning: {data_type} calibration not estimated: {e}")
+    return result
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Estimate HWT905 calibration from recordings")
+    parser.add_argument("files", nargs="+", help="Static-pose recordings (.bin)")
+    parser.add_argument("--sensor-id", required=True, help="sensor_id the calibration belongs to")
+    parser.add_argument("--output", "-o", default="config/calibration.yaml", help="Calibration file to create/update")
+    parser.add_argument("--mag-files", nargs="+", help="Magnetometer rotation recordings (default: files)")
+    parser.add_argument("--acc-range", type=float, default=16.0, help="Accelerometer range (g)")
+    parser.add_argument("--gyro-range", type=float, default=2000.0, help="Gyroscope range (deg/s)")
+    parser.add_argument("--data-rate", type=float, default=100.0, help="Sensor output rate (Hz)")
+    parser.add_argument("--window", type=float, default=1.0, help="Static detection window (s)")
+    parser.add_argument("--accel-threshold", type=float, default=0.01, help="Static accel std limit (g)")
+    parser.add_argument("--gyro-threshold", type=float, default=0.5, help="Static gyro std limit (deg/s)")
+    parser.add_argument("--accel-model", choices=["axis", "full"], default="axis")
+    parser.add_argument("--mag-model", choices=["axis", "full"], default="full")
+    parser.add_argument("--mag-radius", type=float, default=1.0, help="Field magnitude after calibration")
+    parser.add_argument("--mag-unit", help="Unit of the calibrated magnetic field (e.g. uT)")
+    parser.add_argument("--no-cache", action="store_true", help="Always decode instead of using/creating the decoded-recording cache")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_arguments(argv)
+    decoder_params = {'sensor_id': args.sensor_id, 'acc_range': args.acc_range,
+                      'gyro_range': args.gyro_range, 'data_rate': args.data_rate}
+    result = estimate_calibration(
+        args.files, args.mag_files, decoder_params, window=args.window,
+        accel_threshold=args.accel_threshold, gyro_threshold=args.gyro_threshold,
+        accel_model=args.accel_model, mag_model=args.mag_model,
+        mag_radius=args.mag_radius, mag_unit=args.mag_unit, use_cache=not args.no_cache)
+    if not result:
+        print("No calibration could be estimated")
+        return 1
+    for data_type, calibration in result.items():
+        print(f"{args.sensor_id} {data_type}:")
+        print(f"  offset: {np.array2string(calibration.offset, precision=6)}")
+        print(f"  matrix: {np.array2string(calibration.matrix, precision=6, prefix='          ')}")
+    save_calibrations(args.output, {args.sensor_id: result})
+    print(f"Saved calibration to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
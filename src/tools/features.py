@@ -0,0 +1,153 @@
+# src/tools/features.py
+"""
+Trích xuất đặc trưng theo cửa sổ trượt từ các file ghi HWT905 để tạo tập dữ liệu ML.
+
+Mỗi file được đọc theo từng chunk, giải mã theo batch và đưa qua FeatureProcessor
+(cửa sổ là view strided, đặc trưng tính vector hóa trên mọi cửa sổ và kênh). Các loại
+cảm biến được ghép theo timestamp cuối cửa sổ thành một ma trận đặc trưng: mỗi hàng là
+một cửa sổ, kèm chỉ số file và nhãn (tùy chọn). Cửa sổ không vắt qua hai file.
+
+Ví dụ:
+    python -m src.tools.features walk_*.bin --data-rate 200 --window 2 --step 1 \\
+        --features mean std rms dominant_freq --bands 0.5-3 3-10 --label walk -o walk.csv
+"""
+import argparse
+import csv
+import sys
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.data.models import SensorDataBatch
+from src.plugins.processors.feature_processor import FeatureProcessor
+from src.tools.recording import iter_recording
+from src.utils.calibration import TRIPLETS
+from src.utils.features import FEATURES
+
+def extract_features(paths: Sequence[str], decoder_params: Optional[Dict[str, Any]] = None,
+                     window: float = 2.0, step: Optional[float] = None,
+                     features: Optional[Sequence[str]] = None,
+                     bands: Optional[Sequence[Tuple[float, float]]] = None,
+                     data_types: Sequence[str] = ('accelerometer', 'gyroscope'),
+                     chunk_size: int = 65536,
+                     use_cache: bool = True) -> Tuple[List[str], np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Tính ma trận đặc trưng cho các file ghi.
+
+    Args:
+        paths: Các file ghi nhị phân (mỗi file xử lý độc lập).
+        decoder_params: Tham số cho WitMotionDecoder; `data_rate` là tần số lấy mẫu (Hz).
+        window: Độ dài cửa sổ (giây).
+        step: Khoảng cách giữa hai cửa sổ (giây), mặc định window / 2.
+        features: Các đặc trưng (xem src/utils/features.py).
+        bands: Các dải tần (lo, hi) Hz cho công suất dải.
+        data_types: Các loại cảm biến được ghép vào ma trận.
+        use_cache: Đọc qua cache giải mã (xem iter_recording).
+
+    Returns:
+        Tuple (tên cột, timestamps_ns (r,), chỉ số file (r,), ma trận (r, c)).
+    """
+    decoder_params = dict(decoder_params or {})
+    config = {
+        'sample_rate': float(decoder_params.get('data_rate', 100.0)),
+        'window': window,
+        'data_types': list(data_types),
+        'bands': [list(band) for band in bands or []],
+    }
+    if step is not None:
+        config['step'] = step
+    if features is not None:
+        config['features'] = list(features)
+
+    names: Optional[List[str]] = None
+    blocks, stamps, files = [], [], []
+    for index, path in enumerate(paths):
+        processor = FeatureProcessor(config)
+        outputs: Dict[str, List[SensorDataBatch]] = {data_type: [] for data_type in data_types}
+        for batch in iter_recording(path, decoder_params, chunk_size, use_cache):
+            if batch.data_type in TRIPLETS:
+                # Chỉ các kênh trục (bỏ nhiệt độ, ...) để các file có cùng bố cục cột
+                batch = SensorDataBatch(batch.timestamps_ns, batch.sensor_id, batch.data_type,
+                                        {c: batch.values[c] for c in TRIPLETS[batch.data_type] if c in batch.values},
+                                        batch.units, batch.metadata)
+            for out in processor.process(batch):
+                outputs[out.metadata['source_data_type']].append(out)
+        joined = [SensorDataBatch.concatenate(outputs[dt]) for dt in data_types if outputs[dt]]
+        if not joined:
+            continue
+        # Ghép các loại cảm biến theo timestamp cuối cửa sổ (chỉ giữ các cửa sổ có đủ mọi loại)
+        common = joined[0].timestamps_ns
+        for batch in joined[1:]:
+            common = np.intersect1d(common, batch.timestamps_ns)
+        columns = []
+        for batch in joined:
+            rows = np.searchsorted(batch.timestamps_ns, common)
+            columns.append(batch.to_array()[rows])
+        file_names = [name for batch in joined for name in batch.channels]
+        if names is None:
+            names = file_names
+        elif file_names != names:
+            raise ValueError(f"{path}: feature columns differ from the first recording")
+        blocks.append(np.concatenate(columns, axis=1))
+        stamps.append(common)
+        files.append(np.full(common.shape, index, dtype=np.int64))
+
+    if names is None:
+        return [], np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64), np.empty((0, 0))
+    return names, np.concatenate(stamps), np.concatenate(files), np.concatenate(blocks)
+
+def write_features(path: str, names: List[str], timestamps_ns: np.ndarray, files: np.ndarray,
+                   matrix: np.ndarray, label: Optional[str] = None) -> None:
+    """Ghi ma trận đặc trưng ra .npz (nếu đuôi file là .npz) hoặc CSV."""
+    if path.endswith('.npz'):
+        extra = {'label': np.full(len(matrix), label)} if label is not None else {}
+        np.savez_compressed(path, features=matrix, names=np.array(names), timestamps_ns=timestamps_ns,
+                            file_index=files, **extra)
+        return
+    with open(path, 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['file', 'timestamp_ns'] + names + (['label'] if label is not None else []))
+        tail = [label] if label is not None else []
+        for index, ts, row in zip(files.tolist(), timestamps_ns.tolist(), matrix):
+            writer.writerow([index, ts] + [f"{v:.7g}" for v in row] + tail)
+
+def _band(text: str) -> Tuple[float, float]:
+    lo, _, hi = text.partition('-')
+    try:
+        return float(lo), float(hi)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Band must look like LO-HI (Hz), got '{text}'")
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Sliding-window feature extraction from HWT905 recordings")
+    parser.add_argument("files", nargs="+", help="Recordings (.bin); windows never span two files")
+    parser.add_argument("--data-rate", type=float, default=100.0, help="Sensor output rate (Hz)")
+    parser.add_argument("--acc-range", type=float, default=16.0, help="Accelerometer range (g)")
+    parser.add_argument("--gyro-range", type=float, default=2000.0, help="Gyroscope range (deg/s)")
+    parser.add_argument("--window", type=float, default=2.0, help="Window length (s)")
+    parser.add_argument("--step", type=float, help="Window step (s), default window/2")
+    parser.add_argument("--features", nargs="+", choices=FEATURES, help="Features (default: time-domain set)")
+    parser.add_argument("--bands", nargs="+", type=_band, default=[], help="Band powers, e.g. 0.5-3 3-10")
+    parser.add_argument("--data-types", nargs="+", choices=sorted(TRIPLETS), default=['accelerometer', 'gyroscope'],
+                        help="Sensor data types to include")
+    parser.add_argument("--label", help="Label column value for every row")
+    parser.add_argument("--output", "-o", required=True, help="Output file (.csv or .npz)")
+    parser.add_argument("--no-cache", action="store_true", help="Always decode instead of using/creating the decoded-recording cache")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_arguments(argv)
+    decoder_params = {'acc_range': args.acc_range, 'gyro_range': args.gyro_range, 'data_rate': args.data_rate}
+    names, timestamps_ns, files, matrix = extract_features(
+        args.files, decoder_params, args.window, args.step, args.features, args.bands, args.data_types,
+        use_cache=not args.no_cache)
+    if not names:
+        print("No complete windows found")
+        return 1
+    write_features(args.output, names, timestamps_ns, files, matrix, args.label)
+    print(f"Saved {matrix.shape[0]} windows x {matrix.shape[1]} features to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+# src/tools/recording.py
+from typing import Any, Dict, Generator, Iterable, Optional
+
+from src.data.models import SensorDataBatch
+from src.io.readers.cached_reader import CachedRecordingReader
+
+def iter_recording(path: str, decoder_params: Optional[Dict[str, Any]] = None,
+                   chunk_size: int = 65536, use_cache: bool = True,
+                   cache_dir: Optional[str] = None) -> Generator[SensorDataBatch, None, None]:
+    """
+    Đọc và giải mã một file ghi HWT905 theo từng chunk, trả về các SensorDataBatch.
+
+    Đọc qua CachedRecordingReader: lần đầu giải mã và lưu cache (cạnh file ghi hoặc trong
+    `cache_dir`), các lần sau phát lại từ cache đã memory-map. `use_cache=False` luôn giải mã.
+    Bộ nhớ chỉ phụ thuộc vào `chunk_size`, không phụ thuộc độ dài file.
+    """
+    reader = CachedRecordingReader({'file_path': path, 'decoder_params': dict(decoder_params or {}),
+                                    'chunk_size': chunk_size, 'use_cache': use_cache, 'cache_dir': cache_dir})
+    try:
+        yield from reader.read()
+    finally:
+        reader.close()
+
+def iter_recordings(paths: Iterable[str], decoder_params: Optional[Dict[str, Any]] = None,
+                    chunk_size: int = 65536, use_cache: bool = True,
+                    cache_dir: Optional[str] = None) -> Generator[SensorDataBatch, None, None]:
+    """Nối tiếp `iter_recording` cho nhiều file (mỗi file một decoder mới)."""
+    for path in paths:
+        yield from iter_recording(path, decoder_params, chunk_size, use_cache, cache_dir)
@@ -0,0 +1,311 @@
+# src/tools/sweep.py
+"""
+Chạy song song nhiều biến thể cấu hình của một chuỗi processor trên cùng một bộ dữ liệu.
+
+Dữ liệu được giải mã một lần và chép vào shared memory (mỗi cột của từng luồng
+(sensor_id, data_type) là một vùng liên tiếp, kèm danh sách đoạn theo đúng thứ tự các batch
+đã giải mã). Mỗi tiến trình trong process pool chỉ gắn vào vùng nhớ đó và dựng các batch dưới
+dạng view không sao chép, rồi chạy chuỗi processor qua Pipeline (decoder=None) với một tổ hợp
+tham số. Kết quả mỗi biến thể là một dict số (mặc định thống kê các kênh đầu ra), được gộp
+thành một pandas DataFrame có index là các giá trị tham số.
+
+File cấu hình (YAML):
+    chain:
+      - class: src.plugins.processors.filter_processor.LowPassFilterProcessor
+        config: {sample_rate: 100, cutoff_freq: 5}
+    grid:
+      0.cutoff_freq: [1, 2, 5, 10]     # '<vị trí processor>.<khóa config>'
+
+Ví dụ:
+    python -m src.tools.sweep walk.bin --sweep sweep.yaml --data-rate 200 --workers 8 -o sweep.csv
+"""
+import argparse
+import copy
+import importlib
+import itertools
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+import yaml
+
+from src.core.pipeline import Pipeline
+from src.data.models import SensorDataBatch, as_batch
+from src.tools.recording import iter_recordings
+
+class SharedDataset:
+    """
+    Bộ dữ liệu đã giải mã nằm trong một khối shared memory.
+
+    `spec` (dict nhỏ, pickle được) mô tả bố cục; tiến trình khác dùng `SharedDataset.attach(spec)`.
+    """
+
+    def __init__(self, memory: shared_memory.SharedMemory, spec: Dict[str, Any], owner: bool):
+        self.memory = memory
+        self.spec = spec
+        self.owner = owner
+        buffer = memory.buf
+        self.segments = np.ndarray((spec['n_segments'], 3), dtype=np.int64, buffer=buffer,
+                                   offset=spec['segments_offset'])
+        self.streams = []
+        for stream in spec['streams']:
+            length = stream['length']
+            timestamps = np.ndarray((length,), dtype=np.int64, buffer=buffer, offset=stream['offset'])
+            values = {name: np.ndarray((length,), dtype=np.dtype(dtype), buffer=buffer, offset=offset)
+                      for name, dtype, offset in stream['channels']}
+            self.streams.append((stream, timestamps, values))
+
+    @classmethod
+    def from_batches(cls, batches: Iterable[SensorDataBatch]) -> "SharedDataset":
+        """Gom các batch (theo thứ tự) thành các cột liên tiếp trong shared memory."""
+        index: Dict[Tuple[str, str], int] = {}
+        parts: List[List[SensorDataBatch]] = []
+        lengths: List[int] = []
+        segments: List[Tuple[int, int, int]] = []
+        for batch in batches:
+            if len(batch) == 0:
+                continue
+            key = (batch.sensor_id, batch.data_type)
+            s = index.get(key)
+            if s is None:
+                s = index[key] = len(parts)
+                parts.append([])
+                lengths.append(0)
+            elif list(batch.values) != list(parts[s][0].values):
+                raise ValueError(f"Channel layout of {key} changes between batches")
+            parts[s].append(batch)
+            segments.append((s, lengths[s], lengths[s] + len(batch)))
+            lengths[s] += len(batch)
+
+        # Bố cục: bảng đoạn rồi từng luồng (timestamps, các kênh), căn 8 byte
+        offset = 8 * 3 * len(segments)
+        streams = []
+        for s, batches_of_stream in enumerate(parts):
+            first = batches_of_stream[0]
+            stream = {'sensor_id': first.sensor_id, 'data_type': first.data_type, 'units': dict(first.units),
+                      'length': lengths[s], 'offset': offset, 'channels': []}
+            offset += 8 * lengths[s]
+            for name, column in first.values.items():
+                dtype = np.asarray(column).dtype
+                if dtype.kind == 'O':
+                    raise ValueError(f"Channel '{name}' of {first.sensor_id}/{first.data_type} is not numeric")
+                stream['channels'].append((name, dtype.str, offset))
+                offset += -(-dtype.itemsize * lengths[s] // 8) * 8
+            streams.append(stream)
+        memory = shared_memory.SharedMemory(create=True, size=max(offset, 1))
+        spec = {'name': memory.name, 'n_segments': len(segments), 'segments_offset': 0, 'streams': streams}
+        dataset = cls(memory, spec, owner=True)
+        if segments:
+            dataset.segments[:] = segments
+        for (stream, timestamps, values), batches_of_stream in zip(dataset.streams, parts):
+            timestamps[:] = np.concatenate([b.timestamps_ns for b in batches_of_stream])
+            for name in values:
+                values[name][:] = np.concatenate([b.values[name] for b in batches_of_stream])
+        dataset._freeze()
+        return dataset
+
+    @classmethod
+    def attach(cls, spec: Dict[str, Any]) -> "SharedDataset":
+        try:
+            # Python >= 3.13: không để resource tracker của tiến trình con xóa vùng nhớ
+            memory = shared_memory.SharedMemory(name=spec['name'], track=False)
+        except TypeError:
+            memory = shared_memory.SharedMemory(name=spec['name'])
+        dataset = cls(memory, spec, owner=False)
+        dataset._freeze()
+        return dataset
+
+    def _freeze(self) -> None:
+        # Các biến thể dùng chung dữ liệu: processor ghi đè tại chỗ sẽ báo lỗi thay vì làm hỏng dữ liệu
+        self.segments.flags.writeable = False
+        for _, timestamps, values in self.streams:
+            timestamps.flags.writeable = False
+            for column in values.values():
+                column.flags.writeable = False
+
+    def __len__(self) -> int:
+        return int(self.segments.shape[0])
+
+    def iter_batches(self) -> Iterable[SensorDataBatch]:
+        """Các batch theo thứ tự ban đầu, dưới dạng view vào shared memory."""
+        for s, start, stop in self.segments.tolist():
+            stream, timestamps, values = self.streams[s]
+            yield SensorDataBatch(timestamps[start:stop], stream['sensor_id'], stream['data_type'],
+                                  values={name: column[start:stop] for name, column in values.items()},
+                                  units=dict(stream['units']))
+
+    def close(self) -> None:
+        # Bỏ mọi view trước khi đóng (memoryview còn tham chiếu sẽ làm close() lỗi)
+        self.segments = None
+        self.streams = []
+        self.memory.close()
+        if self.owner:
+            self.memory.unlink()
+
+class _DatasetReader:
+    """Reader tối giản phát lại các batch của SharedDataset (dùng với Pipeline(decoder=None))."""
+
+    def __init__(self, dataset: SharedDataset):
+        self.config: Dict[str, Any] = {}
+        self.dataset = dataset
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def read(self):
+        return self.dataset.iter_batches()
+
+class _Collector:
+    def __init__(self):
+        self.items: List[Any] = []
+
+    def visualize(self, data):
+        self.items.append(data)
+
+    def setup(self):
+        pass
+
+    def teardown(self):
+        pass
+
+def load_class(path: Any) -> type:
+    """Lớp processor từ đường dẫn 'module.Class' (hoặc chính lớp đó)."""
+    if isinstance(path, type):
+        return path
+    module, _, name = str(path).rpartition('.')
+    if not module:
+        raise ValueError(f"Processor class must be given as 'module.Class', got '{path}'")
+    return getattr(importlib.import_module(module), name)
+
+def summarize_outputs(outputs: List[Any]) -> Dict[str, float]:
+    """
+    Metric mặc định: số mẫu đầu ra và mean/std/rms của từng kênh số thực.
+
+    Khóa: '<sensor_id>.<kênh>_<thống kê>' (các data_type khác nhau của cùng cảm biến có tên
+    kênh khác nhau trong dữ liệu HWT905).
+    """
+    groups: Dict[Tuple[str, str], List[SensorDataBatch]] = {}
+    for item in outputs:
+        batch = as_batch(item)
+        if batch is not None and len(batch):
+            groups.setdefault((batch.sensor_id, batch.data_type), []).append(batch)
+    result: Dict[str, float] = {'output_samples': float(sum(len(b) for g in groups.values() for b in g))}
+    for (sensor_id, _), batches in groups.items():
+        names = [n for n in batches[0].values if np.asarray(batches[0].values[n]).dtype.kind == 'f'
+                 and all(n in b.values for b in batches)]
+        for name in names:
+            column = np.concatenate([b.values[name] for b in batches])
+            with np.errstate(invalid='ignore'):
+                result[f"{sensor_id}.{name}_mean"] = float(np.nanmean(column)) if column.size else np.nan
+                result[f"{sensor_id}.{name}_std"] = float(np.nanstd(column)) if column.size else np.nan
+                result[f"{sensor_id}.{name}_rms"] = float(np.sqrt(np.nanmean(column * column))) if column.size else np.nan
+    return result
+
+def expand_grid(grid: Dict[str, Sequence[Any]], chain_length: int) -> List[Dict[str, Any]]:
+    """Mọi tổ hợp tham số. Khóa '<vị trí>.<khóa config>'; chuỗi một processor cho phép chỉ '<khóa>'."""
+    names = list(grid)
+    for name in names:
+        stage, _, key = name.partition('.')
+        if not key and chain_length != 1:
+            raise ValueError(f"Grid key '{name}' must look like '<stage index>.<config key>'")
+        if key and not (stage.isdigit() and int(stage) < chain_length):
+            raise ValueError(f"Grid key '{name}' refers to a processor outside the chain")
+    return [dict(zip(names, values)) for values in itertools.product(*(list(grid[n]) for n in names))]
+
+def _variant_chain(chain: Sequence[Dict[str, Any]], params: Dict[str, Any]) -> List[Dict[str, Any]]:
+    chain = copy.deepcopy(list(chain))
+    for name, value in params.items():
+        stage, _, key = name.partition('.')
+        if key:
+            chain[int(stage)].setdefault('config', {})[key] = value
+        else:
+            chain[0].setdefault('config', {})[stage] = value
+    return chain
+
+_WORKER_DATASET: Optional[SharedDataset] = None
+
+def _init_worker(spec: Dict[str, Any]) -> None:
+    global _WORKER_DATASET
+    _WORKER_DATASET = SharedDataset.attach(spec)
+
+def _run_variant(chain: Sequence[Dict[str, Any]], metric: Callable[[List[Any]], Dict[str, float]],
+                 dataset: Optional[SharedDataset] = None) -> Dict[str, float]:
+    dataset = dataset or _WORKER_DATASET
+    processors = [load_class(stage['class'])(dict(stage.get('config') or {})) for stage in chain]
+    collector = _Collector()
+    pipeline = Pipeline(_DatasetReader(dataset), processors=processors, visualizers=[collector])
+    pipeline.run()
+    result = dict(metric(collector.items))
+    result['elapsed'] = pipeline.metrics['elapsed']
+    return result
+
+def run_sweep(batches: Iterable[SensorDataBatch], chain: Sequence[Dict[str, Any]],
+              grid: Dict[str, Sequence[Any]], metric: Callable[[List[Any]], Dict[str, float]] = summarize_outputs,
+              workers: Optional[int] = None) -> pd.DataFrame:
+    """
+    Chạy mọi tổ hợp tham số của `grid` trên cùng một bộ dữ liệu.
+
+    Args:
+        batches: Dữ liệu đã giải mã (ví dụ iter_recordings(...)), đọc hết một lần.
+        chain: Chuỗi processor: mỗi phần tử {'class': 'module.Class' hoặc lớp, 'config': dict}.
+        grid: Tên tham số -> danh sách giá trị (xem expand_grid).
+        metric: Hàm (pickle được, cấp module) từ danh sách đầu ra tới dict số.
+        workers: Số tiến trình; mặc định os.cpu_count(); 0 chạy tuần tự trong tiến trình hiện tại.
+
+    Returns:
+        DataFrame mỗi hàng một biến thể, index là các tham số của grid.
+    """
+    variants = expand_grid(grid, len(chain))
+    chains = [_variant_chain(chain, params) for params in variants]
+    dataset = SharedDataset.from_batches(batches)
+    try:
+        if workers == 0:
+            results = [_run_variant(c, metric, dataset) for c in chains]
+        else:
+            workers = min(workers or os.cpu_count() or 1, len(chains))
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(dataset.spec,)) as pool:
+                results = list(pool.map(_run_variant, chains, itertools.repeat(metric)))
+    finally:
+        dataset.close()
+    frame = pd.DataFrame([dict(params, **result) for params, result in zip(variants, results)])
+    return frame.set_index(list(grid)) if grid else frame
+
+def parse_arguments(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Parse command line arguments."""
+    parser = argparse.ArgumentParser(description="Parallel parameter sweep of a processor chain over HWT905 recordings")
+    parser.add_argument("files", nargs="+", help="Recordings (.bin), decoded once and shared by all variants")
+    parser.add_argument("--sweep", required=True, help="YAML file with 'chain' and 'grid'")
+    parser.add_argument("--data-rate", type=float, default=100.0, help="Sensor output rate (Hz)")
+    parser.add_argument("--acc-range", type=float, default=16.0, help="Accelerometer range (g)")
+    parser.add_argument("--gyro-range", type=float, default=2000.0, help="Gyroscope range (deg/s)")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count, 0: run in-process)")
+    parser.add_argument("--output", "-o", help="CSV file for the results table")
+    parser.add_argument("--no-cache", action="store_true", help="Always decode instead of using/creating the decoded-recording cache")
+    return parser.parse_args(argv)
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = parse_arguments(argv)
+    with open(args.sweep) as f:
+        sweep = yaml.safe_load(f) or {}
+    if not sweep.get('chain'):
+        print(f"{args.sweep}: 'chain' is empty")
+        return 1
+    decoder_params = {'acc_range': args.acc_range, 'gyro_range': args.gyro_range, 'data_rate': args.data_rate}
+    frame = run_sweep(iter_recordings(args.files, decoder_params, use_cache=not args.no_cache), sweep['chain'], sweep.get('grid') or {},
+                      workers=args.workers)
+    print(frame.to_string())
+    if args.output:
+        frame.to_csv(args.output)
+        print(f"Saved {len(frame)} variants to {args.output}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -192,4 +192,8 @@ class MainWindow(QMainWindow):
     @pyqtSlot(dict)
     def _on_connection_changed(self, connection_info):
         """Handle connection changes."""
+        if connection_info.get("type") == "file":
+            self.engine_adapter.set_recording(connection_info["path"])
+        else:
+            self.engine_adapter.set_recording(None)
         self.status_bar.showMessage(f"Connection changed: {connection_info}")
\ No newline at end of file
@@ -4,6 +4,7 @@ from PyQt6.QtCore import Qt, pyqtSlot, pyqtSignal
 
 from src.ui.visualizers.time_series_plot import TimeSeriesPlot
 from src.ui.visualizers.fft_plot import FFTPlot
+from src.ui.visualizers.spectrogram_plot import SpectrogramPlot
 from src.ui.visualizers.orientation_3d import Orientation3D
 
 class Dashboard(QWidget):
@@ -52,6 +53,9 @@ class Dashboard(QWidget):
         self.add_fft_btn = QPushButton("Add FFT")
         button_layout.addWidget(self.add_fft_btn)
         
+        self.add_spectrogram_btn = QPushButton("Add Spectrogram")
+        button_layout.addWidget(self.add_spectrogram_btn)
+        
         self.add_3d_btn = QPushButton("Add 3D View")
         button_layout.addWidget(self.add_3d_btn)
         
@@ -66,6 +70,7 @@ class Dashboard(QWidget):
         # Tab buttons
         self.add_time_series_btn.clicked.connect(self._on_add_time_series)
         self.add_fft_btn.clicked.connect(self._on_add_fft)
+        self.add_spectrogram_btn.clicked.connect(self._on_add_spectrogram)
         self.add_3d_btn.clicked.connect(self._on_add_3d)
         
         # Tab closing
@@ -99,6 +104,20 @@ class Dashboard(QWidget):
         
         return fft_plot
     
+    def _create_spectrogram_tab(self):
+        """Create a new spectrogram (waterfall) tab."""
+        # Create spectrogram widget
+        spectrogram = SpectrogramPlot()
+        
+        # Add to tabs
+        tab_index = self.tab_widget.addTab(spectrogram, "Spectrogram")
+        
+        # Store reference
+        widget_id = f"spectrogram_{tab_index}"
+        self.visualizers[widget_id] = spectrogram
+        
+        return spectrogram
+    
     def _create_3d_tab(self):
         """Create a new 3D orientation tab."""
         # Create 3D widget
@@ -125,6 +144,12 @@ class Dashboard(QWidget):
         fft_plot = self._create_fft_tab()
         self.tab_widget.setCurrentWidget(fft_plot)
     
+    @pyqtSlot()
+    def _on_add_spectrogram(self):
+        """Handle add spectrogram button click."""
+        spectrogram = self._create_spectrogram_tab()
+        self.tab_widget.setCurrentWidget(spectrogram)
+    
     @pyqtSlot()
     def _on_add_3d(self):
         """Handle add 3D view button click."""
@@ -165,6 +190,12 @@ class Dashboard(QWidget):
             if widget_id.startswith("fft_") and isinstance(widget, FFTPlot):
                 widget.update_data(channel_name, frequencies, amplitudes, units)
     
+    def update_spectrogram(self, data_dict):
+        """Update all spectrogram plots with new STFT columns."""
+        for widget_id, widget in self.visualizers.items():
+            if widget_id.startswith("spectrogram_") and isinstance(widget, SpectrogramPlot):
+                widget.update_batch(data_dict)
+    
     def update_orientation(self, roll, pitch, yaw):
         """Update all 3D orientation visualizers with new data."""
         for widget_id, widget in self.visualizers.items():
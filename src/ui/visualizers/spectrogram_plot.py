@@ -0,0 +1,186 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QComboBox, QLabel, QCheckBox
+from PyQt6.QtCore import QRectF, QTimer, pyqtSlot
+import pyqtgraph as pg
+import numpy as np
+
+class SpectrogramPlot(QWidget):
+    """Widget for displaying a scrolling spectrogram (waterfall) of STFT columns."""
+
+    def __init__(self, parent=None, history=600, refresh_ms=33):
+        """Initialize the spectrogram widget.
+
+        Args:
+            history: Number of spectral columns kept on screen
+            refresh_ms: Redraw interval; incoming columns are only copied into the ring
+        """
+        super().__init__(parent)
+
+        # Data storage: one preallocated ring per (sensor_id, data_type, channel),
+        # rows stored twice (at i and i + history) so the newest `history` rows are
+        # always the contiguous view ring[pos:pos + history] and can be drawn without copying.
+        self.history = history
+        self.rings = {}  # {(sensor_id, data_type, channel): {'image': ndarray, 'pos': int, 'f': ndarray, 'dt': float}}
+        self.units = {}
+        self.labels = {}  # {combo label: ring key}
+        self.current_channel = None
+        self._dirty = False
+
+        # Setup UI
+        self._setup_ui()
+
+        # Redraw at a fixed frame rate instead of once per incoming batch
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.timeout.connect(self._refresh)
+        self.refresh_timer.start(refresh_ms)
+
+    def _setup_ui(self):
+        """Setup the UI components."""
+        # Main layout
+        main_layout = QVBoxLayout()
+        self.setLayout(main_layout)
+
+        # Plot widget with a single image item
+        self.plot_widget = pg.PlotWidget()
+        self.plot_widget.setBackground("w")
+        self.plot_widget.setLabel("bottom", "Time", "s")
+        self.plot_widget.setLabel("left", "Frequency", "Hz")
+        self.image_item = pg.ImageItem(axisOrder="row-major")
+        self.image_item.setLookupTable(pg.colormap.get("viridis").getLookupTable(nPts=256))
+        self.plot_widget.addItem(self.image_item)
+
+        # Add to layout
+        main_layout.addWidget(self.plot_widget)
+
+        # Controls layout
+        controls_layout = QHBoxLayout()
+
+        # Channel selector
+        controls_layout.addWidget(QLabel("Channel:"))
+        self.channel_combo = QComboBox()
+        self.channel_combo.currentTextChanged.connect(self._on_channel_changed)
+        controls_layout.addWidget(self.channel_combo)
+
+        # Auto-levels checkbox
+        self.auto_levels_cb = QCheckBox("Auto Levels")
+        self.auto_levels_cb.setChecked(True)
+        controls_layout.addWidget(self.auto_levels_cb)
+
+        # Scale selector (applied when columns are written into the ring)
+        controls_layout.addWidget(QLabel("Scale:"))
+        self.scale_combo = QComboBox()
+        self.scale_combo.addItems(["dB", "Linear"])
+        self.scale_combo.currentTextChanged.connect(self._on_scale_changed)
+        controls_layout.addWidget(self.scale_combo)
+
+        # Add stretch to push controls to the left
+        controls_layout.addStretch(1)
+
+        # Add controls to main layout
+        main_layout.addLayout(controls_layout)
+
+    @staticmethod
+    def _label(key):
+        """Combo box label for a ring key."""
+        return "/".join(str(part) for part in key) if isinstance(key, tuple) else str(key)
+
+    def add_channel(self, key, frequencies, dt, units=None):
+        """Add a new channel (key: (sensor_id, data_type, channel)) and allocate its image ring."""
+        frequencies = np.asarray(frequencies, dtype=float)
+        self.rings[key] = {
+            "image": np.zeros((2 * self.history, frequencies.size), dtype=np.float32),
+            "pos": 0,
+            "f": frequencies,
+            "dt": dt,
+        }
+        self.units[key] = units
+        self.labels[self._label(key)] = key
+        self.channel_combo.addItem(self._label(key))
+
+    def clear_channel(self, key):
+        """Clear data for a specific channel."""
+        if key in self.rings:
+            self.rings[key]["image"].fill(0.0)
+            self.rings[key]["pos"] = 0
+            self._dirty = True
+
+    def clear_all(self):
+        """Clear all data from the plot."""
+        for channel in self.rings:
+            self.clear_channel(channel)
+
+    def update_data(self, key, timestamps, frequencies, columns, units=None):
+        """Append spectral columns (shape: n_columns x n_frequencies) for a channel.
+
+        Columns whose units are 'dB' (STFTProcessor with `decibels: True`) are already
+        logarithmic and are not converted again.
+        """
+        columns = np.asarray(columns, dtype=np.float32)
+        if columns.ndim == 1:
+            columns = columns[np.newaxis, :]
+        ring = self.rings.get(key)
+        if ring is None or ring["f"].size != columns.shape[1]:
+            timestamps = np.asarray(timestamps, dtype=float)
+            dt = float(np.median(np.diff(timestamps))) if timestamps.size > 1 else 1.0
+            if ring is None:
+                self.add_channel(key, frequencies, dt, units)
+            else:
+                ring.update(image=np.zeros((2 * self.history, columns.shape[1]), dtype=np.float32),
+                            pos=0, f=np.asarray(frequencies, dtype=float), dt=dt)
+            ring = self.rings[key]
+
+        in_db = (units or self.units.get(key)) == "dB"
+        if self.scale_combo.currentText() == "dB" and not in_db:
+            columns = 10.0 * np.log10(np.maximum(columns, 1e-20))
+        elif self.scale_combo.currentText() == "Linear" and in_db:
+            columns = np.power(10.0, columns / 10.0, dtype=np.float32)
+        columns = columns[-self.history:]
+
+        # Write each row into both halves of the ring
+        rows = (ring["pos"] + np.arange(columns.shape[0])) % self.history
+        ring["image"][rows] = columns
+        ring["image"][rows + self.history] = columns
+        ring["pos"] = (ring["pos"] + columns.shape[0]) % self.history
+
+        if self.current_channel is None:
+            self.current_channel = key
+        if key == self.current_channel:
+            self._dirty = True
+
+    def update_batch(self, data_dict):
+        """Update from a spectrogram dictionary emitted by DataBridge."""
+        sensor_id, data_type = data_dict.get("sensor_id"), data_dict.get("data_type")
+        for channel, columns in data_dict["values"].items():
+            self.update_data((sensor_id, data_type, channel), data_dict["timestamps"],
+                             data_dict["frequencies"], columns, data_dict.get("units", {}).get(channel))
+
+    @pyqtSlot()
+    def _refresh(self):
+        """Push the current ring view to the image item (one update per frame)."""
+        if not self._dirty or self.current_channel not in self.rings:
+            return
+        self._dirty = False
+        ring = self.rings[self.current_channel]
+        view = ring["image"][ring["pos"]:ring["pos"] + self.history]
+
+        # Image rows are time (oldest first), columns are frequency
+        if self.auto_levels_cb.isChecked():
+            levels = (float(view.min()), float(view.max()) or 1.0)
+            self.image_item.setImage(view.T, autoLevels=False, levels=levels)
+        else:
+            self.image_item.setImage(view.T, autoLevels=False)
+
+        f = ring["f"]
+        df = f[1] - f[0] if f.size > 1 else 1.0
+        width = self.history * ring["dt"]
+        self.image_item.setRect(QRectF(-width, f[0] - df / 2, width, f.size * df))
+
+    @pyqtSlot(str)
+    def _on_channel_changed(self, text):
+        """Handle channel selection change."""
+        self.current_channel = self.labels.get(text)
+        self._dirty = True
+
+    @pyqtSlot(str)
+    def _on_scale_changed(self, text):
+        """Handle scale type change (existing history is in the old scale, so clear it)."""
+        self.clear_all()
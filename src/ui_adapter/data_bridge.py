@@ -1,12 +1,15 @@
 from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
 from typing import Dict, List, Any, Callable
 
+from src.data.models import SensorData, SensorDataBatch
+
 class DataBridge(QObject):
     """Bridge for data transfer between core engine and UI components."""
     
     # Custom signals
     sensor_data_received = pyqtSignal(dict)  # Emitted when new sensor data is received
     fft_data_received = pyqtSignal(dict)     # Emitted when new FFT data is received
+    spectrogram_data_received = pyqtSignal(dict)  # Emitted when new STFT columns are received
     orientation_data_received = pyqtSignal(float, float, float)  # roll, pitch, yaw
     
     def __init__(self, parent=None):
@@ -70,9 +73,15 @@ class DataBridge(QObject):
                 self._process_sensor_data(data)
             elif data.data_type == "magnetometer":
                 self._process_sensor_data(data)
+            elif data.data_type == "statistics":
+                self._process_sensor_data(data)
+            elif data.data_type == "motion":
+                self._process_sensor_data(data)
             elif data.data_type == "fft":
                 self._process_fft_data(data)
-            elif data.data_type == "angle":
+            elif data.data_type == "spectrogram":
+                self._process_spectrogram_data(data)
+            elif data.data_type in ("angle", "orientation"):
                 self._process_orientation_data(data)
     
     def _process_sensor_data(self, data):
@@ -80,13 +89,15 @@ class DataBridge(QObject):
         Process sensor data.
         
         Args:
-            data: SensorData object
+            data: SensorData object, or SensorDataBatch (timestamps and values are then arrays)
         """
         # Create data dictionary
+        is_batch = isinstance(data, SensorDataBatch)
         sensor_data = {
             "sensor_id": data.sensor_id,
             "data_type": data.data_type,
-            "timestamp": data.timestamp,
+            "timestamp": data.timestamps if is_batch else data.timestamp,
+            "timestamp_ns": data.timestamps_ns if is_batch else data.timestamp_ns,
             "values": data.values,
             "units": data.units
         }
@@ -114,17 +125,43 @@ class DataBridge(QObject):
         # Emit signal
         self.fft_data_received.emit(fft_data)
     
+    def _process_spectrogram_data(self, data):
+        """
+        Process spectrogram (STFT) data.
+        
+        Args:
+            data: SensorDataBatch with one spectral column per timestamp
+        """
+        # Create data dictionary
+        spectrogram_data = {
+            "sensor_id": data.sensor_id,
+            "data_type": data.data_type,
+            "timestamps": data.timestamps,
+            "timestamps_ns": data.timestamps_ns,
+            "values": data.values,
+            "frequencies": data.metadata.get("frequencies", []),
+            "units": data.units
+        }
+        
+        # Emit signal
+        self.spectrogram_data_received.emit(spectrogram_data)
+    
     def _process_orientation_data(self, data):
         """
         Process orientation data.
         
         Args:
-            data: SensorData object with orientation data
+            data: SensorData object (or SensorDataBatch, e.g. from the fusion processor) with orientation data
         """
-        # Extract Euler angles
-        roll = data.values.get("roll", 0.0)
-        pitch = data.values.get("pitch", 0.0)
-        yaw = data.values.get("yaw", 0.0)
+        # Extract Euler angles (latest sample of a batch)
+        if isinstance(data, SensorDataBatch):
+            if len(data) == 0:
+                return
+            data = SensorData(data.timestamps_ns[-1], data.sensor_id, data.data_type,
+                              {name: arr[-1] for name, arr in data.values.items()})
+        roll = float(data.values.get("roll", 0.0))
+        pitch = float(data.values.get("pitch", 0.0))
+        yaw = float(data.values.get("yaw", 0.0))
         
         # Emit signal
         self.orientation_data_received.emit(roll, pitch, yaw)
\ No newline at end of file
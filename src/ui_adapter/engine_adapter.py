@@ -29,6 +29,17 @@ class EngineAdapter(QObject):
     def set_engine(self, engine):
         """Set the engine reference."""
         self.engine = engine
+
+    def set_recording(self, file_path):
+        """
+        Use a recording file as the data source of the next pipeline run.
+
+        Args:
+            file_path: Recording to open (decoded once, then replayed from its cache), or None
+                       to use the readers of the configuration
+        """
+        if self.engine:
+            self.engine.set_recording(file_path)
     
     def start_pipeline(self, config_path):
         """
@@ -0,0 +1,105 @@
+"""
+Streaming overlapping Allan deviation.
+
+For cluster size ``m`` (tau = m / sample_rate) the overlapping Allan variance
+of samples ``x`` is
+
+    AVAR(tau) = sum_k (theta[k+2m] - 2 theta[k+m] + theta[k])^2 / (2 m^2 (N - 2m))
+
+with ``theta`` the cumulative sum of ``x``. Each term needs only three values
+of ``theta``, so every cluster size costs O(n) and ``OverlappingAllan``
+processes a recording chunk by chunk, keeping just the last ``2 * max(m)``
+cumulative sums. All channels are handled together as columns.
+"""
+# allan.py
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+def log_spaced_clusters(max_cluster: int, points_per_decade: int = 10) -> np.ndarray:
+    """Unique integer cluster sizes from 1 to ``max_cluster``, evenly spaced in log scale."""
+    max_cluster = max(1, int(max_cluster))
+    count = int(np.ceil(np.log10(max_cluster) * points_per_decade)) + 1
+    return np.unique(np.round(np.logspace(0, np.log10(max_cluster), count)).astype(np.int64))
+
+class OverlappingAllan:
+    """Accumulates the overlapping Allan variance of k channels for a set of cluster sizes."""
+
+    def __init__(self, clusters: np.ndarray, n_channels: int):
+        self.clusters = np.unique(np.asarray(clusters, dtype=np.int64))
+        if self.clusters.size == 0 or self.clusters[0] < 1:
+            raise ValueError("Cluster sizes must be positive integers")
+        self.span = 2 * int(self.clusters[-1])
+        # Bộ đệm theta: giữ `span` giá trị cuối, nén lại về đầu khi đầy
+        self.buffer = np.zeros((2 * self.span + 1, n_channels))
+        self.end = 1                       # buffer[0] = theta_0 = 0
+        self.reference: Optional[np.ndarray] = None
+        self.sums = np.zeros((self.clusters.size, n_channels))
+        self.counts = np.zeros(self.clusters.size, dtype=np.int64)
+        self.samples = 0
+
+    def update(self, x: np.ndarray) -> None:
+        """Add consecutive samples of shape (n, k)."""
+        x = np.asarray(x, dtype=np.float64)
+        n = x.shape[0]
+        if n == 0:
+            return
+        if self.reference is None:
+            # Hiệu bậc hai không đổi khi trừ hằng số; trừ đi để theta không lớn dần
+            self.reference = x[0].copy()
+        keep = min(self.end, self.span)
+        if self.end + n > self.buffer.shape[0]:
+            if keep + n > self.buffer.shape[0]:
+                grown = np.empty((keep + n + self.span, self.buffer.shape[1]))
+                grown[:keep] = self.buffer[self.end - keep:self.end]
+                self.buffer = grown
+            else:
+                self.buffer[:keep] = self.buffer[self.end - keep:self.end]
+            self.end = keep
+        start = self.end
+        self.buffer[start:start + n] = self.buffer[start - 1] + np.cumsum(x - self.reference, axis=0)
+        self.end += n
+        self.samples += n
+
+        theta = self.buffer[:self.end]
+        for i, m in enumerate(self.clusters):
+            m = int(m)
+            # Chỉ các hiệu có điểm cuối k + 2m là mẫu mới
+            first = max(start - 2 * m, 0)
+            if first + 2 * m >= self.end:
+                continue
+            d = theta[first + 2 * m:] - 2.0 * theta[first + m:self.end - m] + theta[first:self.end - 2 * m]
+            self.sums[i] += np.einsum('ij,ij->j', d, d)
+            self.counts[i] += d.shape[0]
+
+    def deviation(self, sample_rate: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Allan deviation of the cluster sizes that have at least one term.
+
+        Returns:
+            Tuple (taus (c,), adev (c, k), counts (c,))
+        """
+        valid = self.counts > 0
+        m = self.clusters[valid].astype(np.float64)
+        avar = self.sums[valid] / (2.0 * m[:, None] ** 2 * self.counts[valid, None])
+        return m / sample_rate, np.sqrt(avar), self.counts[valid]
+
+def noise_parameters(taus: np.ndarray, adev: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Standard noise terms read off an Allan deviation curve (per channel).
+
+    - ``random_walk``: deviation at tau = 1 s (angle/velocity random walk,
+      interpolated in log-log scale), NaN if 1 s is outside the curve.
+    - ``bias_instability``: minimum of the curve divided by 0.664.
+    - ``tau_min``: tau at which the minimum occurs.
+    """
+    log_taus = np.log(taus)
+    with np.errstate(divide='ignore'):
+        log_adev = np.log(adev)
+    random_walk = np.exp([np.interp(0.0, log_taus, col, left=np.nan, right=np.nan) for col in log_adev.T])
+    lowest = np.argmin(adev, axis=0)
+    return {
+        'random_walk': random_walk,
+        'bias_instability': adev[lowest, np.arange(adev.shape[1])] / 0.664,
+        'tau_min': taus[lowest],
+    }
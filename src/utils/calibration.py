@@ -0,0 +1,193 @@
+"""
+Sensor calibration models, storage and streaming estimation.
+
+A calibration maps raw triaxial readings ``x`` to corrected values
+``y = M @ (x - offset)``, where ``M`` combines scale, misalignment and (for
+the magnetometer) soft-iron correction and ``offset`` is the bias / hard-iron
+vector. Calibration files are YAML (or JSON) keyed by sensor_id and data_type::
+
+    imu1:
+      accelerometer: {matrix: [[...], [...], [...]], offset: [...]}
+      magnetometer: {matrix: ..., offset: ..., unit: uT}
+
+Estimation works in constant memory over arbitrarily long recordings:
+``EllipsoidFit`` accumulates the 9x9 (or 6x6) normal equations of an
+ellipsoid fit, and ``StaticWindowAccumulator`` reduces a stream to the means
+of its motionless windows.
+"""
+# calibration.py
+import json
+import os
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+import yaml
+
+# data_type -> tên ba kênh trục X/Y/Z
+TRIPLETS: Dict[str, Tuple[str, str, str]] = {
+    'accelerometer': ('accX', 'accY', 'accZ'),
+    'gyroscope': ('gyroX', 'gyroY', 'gyroZ'),
+    'magnetometer': ('magX', 'magY', 'magZ'),
+}
+
+class AxisCalibration:
+    """Affine correction ``y = matrix @ (x - offset)`` for one triaxial sensor."""
+
+    def __init__(self, matrix: Optional[Sequence] = None, offset: Optional[Sequence] = None,
+                 unit: Optional[str] = None):
+        self.matrix = np.eye(3) if matrix is None else np.asarray(matrix, dtype=np.float64).reshape(3, 3)
+        self.offset = np.zeros(3) if offset is None else np.asarray(offset, dtype=np.float64).reshape(3)
+        self.unit = unit
+
+    def apply(self, x: np.ndarray) -> np.ndarray:
+        """Correct readings of shape (n, 3)."""
+        return (x - self.offset) @ self.matrix.T
+
+    def to_dict(self) -> Dict:
+        out = {'matrix': self.matrix.tolist(), 'offset': self.offset.tolist()}
+        if self.unit is not None:
+            out['unit'] = self.unit
+        return out
+
+    @classmethod
+    def from_dict(cls, data: Dict) -> "AxisCalibration":
+        return cls(data.get('matrix'), data.get('offset'), data.get('unit'))
+
+def load_calibrations(path: str) -> Dict[str, Dict[str, AxisCalibration]]:
+    """Read a calibration file (YAML or JSON) into {sensor_id: {data_type: AxisCalibration}}."""
+    with open(path, 'r') as f:
+        data = json.load(f) if path.endswith('.json') else yaml.safe_load(f)
+    return parse_calibrations(data or {})
+
+def parse_calibrations(data: Dict) -> Dict[str, Dict[str, AxisCalibration]]:
+    """Build calibration objects from a plain dictionary (as stored in files or inline config)."""
+    result: Dict[str, Dict[str, AxisCalibration]] = {}
+    for sensor_id, kinds in data.items():
+        for data_type, values in (kinds or {}).items():
+            if data_type not in TRIPLETS:
+                raise ValueError(f"Unknown calibration data_type '{data_type}' for sensor '{sensor_id}'")
+            result.setdefault(str(sensor_id), {})[data_type] = AxisCalibration.from_dict(values)
+    return result
+
+def save_calibrations(path: str, calibrations: Dict[str, Dict[str, AxisCalibration]]) -> None:
+    """Write calibrations; entries already in the file for other sensors are kept."""
+    merged = {}
+    if os.path.exists(path):
+        merged = {sid: {kind: cal.to_dict() for kind, cal in kinds.items()}
+                  for sid, kinds in load_calibrations(path).items()}
+    for sensor_id, kinds in calibrations.items():
+        merged.setdefault(sensor_id, {}).update({kind: cal.to_dict() for kind, cal in kinds.items()})
+    with open(path, 'w') as f:
+        if path.endswith('.json'):
+            json.dump(merged, f, indent=2)
+        else:
+            yaml.safe_dump(merged, f, default_flow_style=None, sort_keys=True)
+
+class EllipsoidFit:
+    """
+    Streaming least-squares ellipsoid fit (hard/soft-iron or accelerometer bias/scale).
+
+    Fits ``x^T A x + 2 b^T x = 1`` by accumulating the normal equations of the
+    design matrix ``D`` (one row per point), so memory is constant no matter how many
+    points are added. Model 'full' has 9 parameters (rotated ellipsoid, needs
+    well-spread orientations); 'axis' has 6 (axis-aligned: bias and per-axis scale,
+    enough for a classic 6-position accelerometer calibration).
+
+    Points are divided by a fixed scale (taken from the first batch) before
+    accumulation to keep the normal equations well conditioned for raw LSB input.
+    """
+
+    def __init__(self, model: str = 'full'):
+        if model not in ('full', 'axis'):
+            raise ValueError(f"Unsupported ellipsoid model: {model}")
+        self.model = model
+        size = 9 if model == 'full' else 6
+        self.normal = np.zeros((size, size))
+        self.rhs = np.zeros(size)
+        self.count = 0
+        self.scale: Optional[float] = None
+
+    def _design(self, p: np.ndarray) -> np.ndarray:
+        x, y, z = p[:, 0], p[:, 1], p[:, 2]
+        if self.model == 'axis':
+            return np.stack([x * x, y * y, z * z, 2 * x, 2 * y, 2 * z], axis=1)
+        return np.stack([x * x, y * y, z * z, 2 * y * z, 2 * x * z, 2 * x * y, 2 * x, 2 * y, 2 * z], axis=1)
+
+    def update(self, points: np.ndarray) -> None:
+        """Add points of shape (n, 3); rows with non-finite values are ignored."""
+        points = np.asarray(points, dtype=np.float64).reshape(-1, 3)
+        points = points[np.isfinite(points).all(axis=1)]
+        if points.shape[0] == 0:
+            return
+        if self.scale is None:
+            self.scale = float(np.median(np.linalg.norm(points, axis=1))) or 1.0
+        design = self._design(points / self.scale)
+        self.normal += design.T @ design
+        self.rhs += design.sum(axis=0)
+        self.count += points.shape[0]
+
+    def solve(self, radius: float = 1.0, unit: Optional[str] = None) -> AxisCalibration:
+        """
+        Calibration that maps the fitted ellipsoid onto a sphere of the given radius.
+
+        Raises:
+            ValueError: Not enough points, or the fit is not an ellipsoid (orientations too similar).
+        """
+        if self.count < self.normal.shape[0]:
+            raise ValueError(f"Ellipsoid fit needs at least {self.normal.shape[0]} points, got {self.count}")
+        try:
+            v = np.linalg.solve(self.normal, self.rhs)
+        except np.linalg.LinAlgError as e:
+            raise ValueError(f"Ellipsoid fit is singular: {e}")
+        if self.model == 'axis':
+            a = np.diag(v[:3])
+            b = v[3:6]
+        else:
+            a = np.array([[v[0], v[5], v[4]], [v[5], v[1], v[3]], [v[4], v[3], v[2]]])
+            b = v[6:9]
+        center = -np.linalg.solve(a, b)
+        # (x - c)^T A (x - c) = 1 + c^T A c
+        shape = a / (1.0 + center @ a @ center)
+        eigval, eigvec = np.linalg.eigh(shape)
+        if np.any(eigval <= 0):
+            raise ValueError("Ellipsoid fit is not positive definite; record more varied orientations")
+        # Căn bậc hai đối xứng: W^T W = shape, nên |W (x - c)| = 1 trên ellipsoid
+        matrix = radius * (eigvec * np.sqrt(eigval)) @ eigvec.T
+        return AxisCalibration(matrix / self.scale, center * self.scale, unit)
+
+class StaticWindowAccumulator:
+    """
+    Cut a stream of triaxial samples into fixed windows and keep the means of the motionless ones.
+
+    A window is static when the standard deviation of every axis is below
+    ``threshold``. Partial windows are carried over between ``update`` calls.
+    """
+
+    def __init__(self, window: int, threshold: float):
+        self.window = max(2, int(window))
+        self.threshold = float(threshold)
+        self.pending = np.empty((0, 3))
+        self.total = np.zeros(3)
+        self.windows = 0
+
+    def update(self, samples: np.ndarray) -> np.ndarray:
+        """
+        Add samples (n, 3).
+
+        Returns:
+            Means of the static windows completed by these samples, shape (m, 3).
+        """
+        data = np.concatenate([self.pending, np.asarray(samples, dtype=np.float64).reshape(-1, 3)])
+        full = data.shape[0] // self.window * self.window
+        self.pending = data[full:].copy()
+        blocks = data[:full].reshape(-1, self.window, 3)
+        static = blocks.std(axis=1).max(axis=1) < self.threshold
+        means = blocks[static].mean(axis=1)
+        self.total += means.sum(axis=0)
+        self.windows += means.shape[0]
+        return means
+
+    @property
+    def mean(self) -> np.ndarray:
+        """Mean over every static window seen so far (NaN if none)."""
+        return self.total / self.windows if self.windows else np.full(3, np.nan)
@@ -0,0 +1,209 @@
+"""
+Streaming clock synchronization between device (chip) time and host time.
+
+Each IMU reports its own chip time, which drifts relative to the host clock
+over long captures. This module fits a per-sensor linear clock model
+
+    host_ns = device_ns + offset + skew * (device_ns - ref)
+
+online with exponentially-weighted least squares (equivalent to recursive
+least squares with a forgetting factor), using O(1) work per time packet, and
+maps device timestamps onto the common host timeline in batch form.
+"""
+# clock_sync.py
+from typing import Dict, Optional, Union
+
+import numpy as np
+
+from src.utils.timestamp_utils import NS_PER_SECOND
+
+class ClockSynchronizer:
+    """
+    Online offset/skew estimator for a single sensor clock.
+
+    The model is kept as weighted sufficient statistics (S0, Sx, Sy, Sxx, Sxy)
+    of x = device time and y = host - device, both in float seconds relative to
+    integer nanosecond references. The x reference is moved to the newest
+    sample on every update so the statistics never lose precision, no matter
+    how long the capture runs.
+    """
+
+    def __init__(self, forgetting_factor: float = 0.999):
+        """
+        Args:
+            forgetting_factor: Per-sample weight decay in (0, 1]. 1.0 weights all
+                history equally; 0.999 gives an effective memory of ~1000 time packets.
+        """
+        if not 0.0 < forgetting_factor <= 1.0:
+            raise ValueError(f"forgetting_factor must be in (0, 1], got {forgetting_factor}")
+        self.forgetting_factor = forgetting_factor
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget all observations."""
+        self.count = 0
+        self._ref_ns: Optional[int] = None         # x origin (device ns)
+        self._offset_ref_ns: Optional[int] = None  # y origin (host - device ns)
+        self._s0 = self._sx = self._sy = self._sxx = self._sxy = 0.0
+        self._a = 0.0  # offset correction at x = 0 (seconds)
+        self._b = 0.0  # skew (dimensionless, seconds per second)
+
+    @property
+    def ready(self) -> bool:
+        """True once at least one observation has been seen."""
+        return self.count > 0
+
+    @property
+    def skew_ppm(self) -> float:
+        """Estimated host-vs-device rate difference in parts per million."""
+        return self._b * 1e6
+
+    @property
+    def offset_ns(self) -> int:
+        """Estimated host - device offset at the most recent observation."""
+        if self._offset_ref_ns is None:
+            return 0
+        return self._offset_ref_ns + int(round(self._a * NS_PER_SECOND))
+
+    def _recenter(self, new_ref_ns: int) -> None:
+        # Shift x origin: x' = x - c, applied to the sums in O(1)
+        c = (new_ref_ns - self._ref_ns) / NS_PER_SECOND
+        if c != 0.0:
+            self._sxx = self._sxx - 2.0 * c * self._sx + c * c * self._s0
+            self._sxy = self._sxy - c * self._sy
+            self._sx = self._sx - c * self._s0
+            self._ref_ns = new_ref_ns
+
+    def _solve(self) -> None:
+        det = self._s0 * self._sxx - self._sx * self._sx
+        # A single point (or a degenerate spread) only determines the offset
+        if self._s0 <= 0.0 or det <= 1e-12 * self._s0 * self._s0:
+            self._b = 0.0
+            self._a = self._sy / self._s0 if self._s0 > 0.0 else 0.0
+            return
+        self._b = (self._s0 * self._sxy - self._sx * self._sy) / det
+        self._a = (self._sy - self._b * self._sx) / self._s0
+
+    def update(self, device_ns: int, host_ns: int) -> None:
+        """
+        Add one (device time, host time) observation, e.g. from a time packet.
+
+        Args:
+            device_ns: Chip time of the packet in nanoseconds
+            host_ns: Host receive time of the packet in nanoseconds
+        """
+        device_ns = int(device_ns)
+        host_ns = int(host_ns)
+        if self._ref_ns is None:
+            self._ref_ns = device_ns
+            self._offset_ref_ns = host_ns - device_ns
+        self._recenter(device_ns)
+        y = (host_ns - device_ns - self._offset_ref_ns) / NS_PER_SECOND
+        lam = self.forgetting_factor
+        # x == 0 for the newest sample after recentering
+        self._s0 = lam * self._s0 + 1.0
+        self._sx = lam * self._sx
+        self._sy = lam * self._sy + y
+        self._sxx = lam * self._sxx
+        self._sxy = lam * self._sxy
+        self.count += 1
+        self._solve()
+
+    def update_batch(self, device_ns: np.ndarray, host_ns: np.ndarray) -> None:
+        """
+        Add many observations at once (vectorized, same result as repeated `update`).
+
+        Args:
+            device_ns: int64 array of chip times, in arrival order
+            host_ns: int64 array of matching host receive times
+        """
+        device_ns = np.asarray(device_ns, dtype=np.int64)
+        host_ns = np.asarray(host_ns, dtype=np.int64)
+        n = device_ns.shape[0]
+        if n == 0:
+            return
+        if host_ns.shape[0] != n:
+            raise ValueError("device_ns and host_ns must have the same length")
+        if self._ref_ns is None:
+            self._ref_ns = int(device_ns[0])
+            self._offset_ref_ns = int(host_ns[0] - device_ns[0])
+        self._recenter(int(device_ns[-1]))
+
+        x = (device_ns - self._ref_ns) / NS_PER_SECOND
+        y = ((host_ns - device_ns) - self._offset_ref_ns) / NS_PER_SECOND
+        lam = self.forgetting_factor
+        w = lam ** np.arange(n - 1, -1, -1, dtype=np.float64)
+        decay = lam ** n
+        wx = w * x
+        self._s0 = decay * self._s0 + w.sum()
+        self._sx = decay * self._sx + wx.sum()
+        self._sy = decay * self._sy + np.dot(w, y)
+        self._sxx = decay * self._sxx + np.dot(wx, x)
+        self._sxy = decay * self._sxy + np.dot(wx, y)
+        self.count += n
+        self._solve()
+
+    def to_host(self, device_ns: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """
+        Map device timestamps onto the host timeline.
+
+        Args:
+            device_ns: Scalar or int64 array of chip times in nanoseconds
+
+        Returns:
+            Host-timeline timestamps in nanoseconds (same shape as input)
+
+        Raises:
+            RuntimeError: If no observation has been seen yet
+        """
+        if not self.ready:
+            raise RuntimeError("ClockSynchronizer has no observations yet")
+        if isinstance(device_ns, np.ndarray):
+            device_ns = device_ns.astype(np.int64, copy=False)
+            x = (device_ns - self._ref_ns) / NS_PER_SECOND
+            correction = np.rint((self._a + self._b * x) * NS_PER_SECOND).astype(np.int64)
+            return device_ns + self._offset_ref_ns + correction
+        device_ns = int(device_ns)
+        x = (device_ns - self._ref_ns) / NS_PER_SECOND
+        return device_ns + self._offset_ref_ns + int(round((self._a + self._b * x) * NS_PER_SECOND))
+
+class MultiClockSynchronizer:
+    """
+    One ClockSynchronizer per sensor_id, mapping every sensor onto the host timeline.
+    """
+
+    def __init__(self, forgetting_factor: float = 0.999):
+        self.forgetting_factor = forgetting_factor
+        self.clocks: Dict[str, ClockSynchronizer] = {}
+
+    def get_clock(self, sensor_id: str) -> ClockSynchronizer:
+        """Return (creating if needed) the clock model of a sensor."""
+        clock = self.clocks.get(sensor_id)
+        if clock is None:
+            clock = self.clocks[sensor_id] = ClockSynchronizer(self.forgetting_factor)
+        return clock
+
+    def update(self, sensor_id: str, device_ns: int, host_ns: int) -> None:
+        """Add one observation for a sensor."""
+        self.get_clock(sensor_id).update(device_ns, host_ns)
+
+    def update_batch(self, sensor_id: str, device_ns: np.ndarray, host_ns: np.ndarray) -> None:
+        """Add many observations for a sensor."""
+        self.get_clock(sensor_id).update_batch(device_ns, host_ns)
+
+    def to_host(self, sensor_id: str, device_ns: Union[int, np.ndarray]) -> Union[int, np.ndarray]:
+        """Map device timestamps of a sensor onto the host timeline."""
+        return self.get_clock(sensor_id).to_host(device_ns)
+
+    def map_batch(self, batch):
+        """
+        Return a copy of a SensorDataBatch whose timestamps_ns are on the host timeline.
+
+        Batches from sensors without observations are returned unchanged.
+        """
+        clock = self.clocks.get(batch.sensor_id)
+        if clock is None or not clock.ready:
+            return batch
+        mapped = batch.slice()
+        mapped.timestamps_ns = clock.to_host(batch.timestamps_ns)
+        return mapped
@@ -0,0 +1,193 @@
+"""
+Safe arithmetic expressions over channel arrays, compiled to NumPy ufunc calls.
+
+``compile_expression('sqrt(accX**2 + accY**2 + accZ**2)')`` parses the text
+once with ``ast`` and accepts only numbers, channel names, arithmetic
+operators and a whitelist of NumPy ufuncs, so configuration files can never
+execute arbitrary code. The tree is flattened into a linear program of
+``ufunc(*operands, out=register)`` steps: constant sub-expressions are folded
+at compile time and registers are recycled as soon as their value has been
+consumed, so ``a*b + c*d`` needs two temporaries however long the expression
+is. Register arrays are kept between calls and only reallocated when a longer
+batch arrives, which makes evaluation allocation-free apart from the result.
+
+Channel names may be dotted (``a.accX`` as produced by resampling with
+``group_by: all``); ``pi`` and ``e`` are constants.
+"""
+# expressions.py
+import ast
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+# Tên hàm được phép -> ufunc
+FUNCTIONS: Dict[str, np.ufunc] = {
+    'abs': np.absolute, 'sqrt': np.sqrt, 'square': np.square, 'exp': np.exp,
+    'log': np.log, 'log10': np.log10, 'log2': np.log2,
+    'sin': np.sin, 'cos': np.cos, 'tan': np.tan,
+    'arcsin': np.arcsin, 'arccos': np.arccos, 'arctan': np.arctan, 'arctan2': np.arctan2,
+    'asin': np.arcsin, 'acos': np.arccos, 'atan': np.arctan, 'atan2': np.arctan2,
+    'hypot': np.hypot, 'degrees': np.degrees, 'radians': np.radians,
+    'minimum': np.minimum, 'maximum': np.maximum, 'min': np.minimum, 'max': np.maximum,
+    'sign': np.sign, 'floor': np.floor, 'ceil': np.ceil,
+}
+
+CONSTANTS: Dict[str, float] = {'pi': float(np.pi), 'e': float(np.e)}
+
+_BINARY = {
+    ast.Add: np.add, ast.Sub: np.subtract, ast.Mult: np.multiply, ast.Div: np.true_divide,
+    ast.Pow: np.power, ast.Mod: np.remainder, ast.FloorDiv: np.floor_divide,
+}
+
+# Toán hạng trong chương trình: ('var', tên) | ('const', giá trị) | ('reg', chỉ số)
+_Operand = Tuple[str, Any]
+
+class Expression:
+    """A compiled expression; evaluate it with a mapping of channel name -> (n,) array."""
+
+    def __init__(self, source: str, program: List[Tuple[np.ufunc, Tuple[_Operand, ...], int]],
+                 result: _Operand, registers: int, variables: Tuple[str, ...]):
+        self.source = source
+        self.program = program
+        self.result = result
+        self.variables = variables
+        self._registers: List[np.ndarray] = [np.empty(0) for _ in range(registers)]
+
+    def __repr__(self) -> str:
+        return f"Expression({self.source!r})"
+
+    def _resolve(self, operand: _Operand, env: Mapping[str, np.ndarray], n: int):
+        kind, value = operand
+        if kind == 'var':
+            return env[value]
+        if kind == 'const':
+            return value
+        return self._registers[value][:n]
+
+    def evaluate(self, env: Mapping[str, np.ndarray], out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Evaluate over whole arrays.
+
+        Args:
+            env: Channel name -> (n,) array; must contain every name in ``variables``
+            out: Optional float64 (n,) array receiving the result
+
+        Returns:
+            The (n,) float64 result (``out`` if given)
+        """
+        n = len(env[self.variables[0]]) if self.variables else (len(out) if out is not None else 1)
+        if out is None:
+            out = np.empty(n)
+        if not self.program:
+            out[...] = self._resolve(self.result, env, n)
+            return out
+        for i, register in enumerate(self._registers):
+            if register.shape[0] < n:
+                self._registers[i] = np.empty(n)
+        last = len(self.program) - 1
+        for step, (func, operands, target) in enumerate(self.program):
+            args = [self._resolve(op, env, n) for op in operands]
+            func(*args, out=out if step == last else self._registers[target][:n])
+        return out
+
+class _Compiler(ast.NodeVisitor):
+    def __init__(self, source: str):
+        self.source = source
+        self.program: List[Tuple[np.ufunc, Tuple[_Operand, ...], int]] = []
+        self.free: List[int] = []
+        self.registers = 0
+        self.variables: List[str] = []
+
+    def _error(self, node: ast.AST, what: str) -> ValueError:
+        return ValueError(f"{what} is not allowed in expression {self.source!r}")
+
+    def _emit(self, func: np.ufunc, operands: List[_Operand]) -> _Operand:
+        if all(kind == 'const' for kind, _ in operands):
+            return ('const', float(func(*[value for _, value in operands])))
+        # Giải phóng thanh ghi của toán hạng trước khi cấp thanh ghi đích (ufunc cho phép ghi đè tại chỗ)
+        for kind, value in operands:
+            if kind == 'reg':
+                self.free.append(value)
+        if self.free:
+            target = self.free.pop()
+        else:
+            target = self.registers
+            self.registers += 1
+        self.program.append((func, tuple(operands), target))
+        return ('reg', target)
+
+    def _name(self, node: ast.AST) -> Optional[str]:
+        if isinstance(node, ast.Name):
+            return node.id
+        if isinstance(node, ast.Attribute):
+            base = self._name(node.value)
+            return None if base is None else f"{base}.{node.attr}"
+        return None
+
+    def visit_Expression(self, node: ast.Expression) -> _Operand:
+        return self.visit(node.body)
+
+    def visit_Constant(self, node: ast.Constant) -> _Operand:
+        if isinstance(node.value, bool) or not isinstance(node.value, (int, float)):
+            raise self._error(node, f"Constant {node.value!r}")
+        return ('const', float(node.value))
+
+    def visit_Name(self, node: ast.AST) -> _Operand:
+        name = self._name(node)
+        if name is None:
+            raise self._error(node, type(node).__name__)
+        if name in CONSTANTS:
+            return ('const', CONSTANTS[name])
+        if name not in self.variables:
+            self.variables.append(name)
+        return ('var', name)
+
+    visit_Attribute = visit_Name
+
+    def visit_UnaryOp(self, node: ast.UnaryOp) -> _Operand:
+        operand = self.visit(node.operand)
+        if isinstance(node.op, ast.UAdd):
+            return operand
+        if isinstance(node.op, ast.USub):
+            return self._emit(np.negative, [operand])
+        raise self._error(node, type(node.op).__name__)
+
+    def visit_BinOp(self, node: ast.BinOp) -> _Operand:
+        func = _BINARY.get(type(node.op))
+        if func is None:
+            raise self._error(node, type(node.op).__name__)
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        if func is np.power and right[0] == 'const' and left[0] != 'const':
+            # Các lũy thừa thường gặp dùng ufunc rẻ hơn np.power
+            if right[1] == 2.0:
+                return self._emit(np.square, [left])
+            if right[1] == 0.5:
+                return self._emit(np.sqrt, [left])
+        return self._emit(func, [left, right])
+
+    def visit_Call(self, node: ast.Call) -> _Operand:
+        func = FUNCTIONS.get(node.func.id) if isinstance(node.func, ast.Name) else None
+        if func is None or node.keywords:
+            raise self._error(node, f"Call to {ast.dump(node.func)}")
+        if len(node.args) != func.nin:
+            raise ValueError(f"{node.func.id}() takes {func.nin} argument(s) in expression {self.source!r}")
+        return self._emit(func, [self.visit(arg) for arg in node.args])
+
+    def generic_visit(self, node: ast.AST):
+        raise self._error(node, type(node).__name__)
+
+def compile_expression(source: str) -> Expression:
+    """
+    Parse and compile an arithmetic expression.
+
+    Raises:
+        ValueError: If the text is not valid syntax or uses anything outside the whitelist
+    """
+    try:
+        tree = ast.parse(source.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid expression {source!r}: {e.msg}") from e
+    compiler = _Compiler(source)
+    result = compiler.visit(tree)
+    return Expression(source, compiler.program, result, compiler.registers, tuple(compiler.variables))
@@ -0,0 +1,156 @@
+"""
+Vectorized sliding-window features for building ML datasets.
+
+``window_view`` exposes the windows of an (n, k) array as a zero-copy strided
+view of shape (w, k, size) (``numpy.lib.stride_tricks.sliding_window_view``
+followed by a step slice). ``FeatureExtractor`` reduces that view along its
+last axis, so every feature is computed for all windows and all channels in
+one NumPy call; intermediate results (centered windows, the power spectrum)
+are computed once and shared by the features that need them, and only when
+one of them is requested.
+
+Spectral features use a Hann-windowed ``rfft`` of each window. Band powers
+are scaled so that they add up to the mean square of the (windowed) signal,
+i.e. they are the mean-square contribution of each frequency band.
+"""
+# features.py
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+TIME_FEATURES = ('mean', 'std', 'rms', 'min', 'max', 'ptp', 'skewness', 'kurtosis',
+                 'zero_crossings', 'mean_crossings', 'energy')
+SPECTRAL_FEATURES = ('dominant_freq', 'spectral_centroid')
+FEATURES = TIME_FEATURES + SPECTRAL_FEATURES
+
+def window_view(x: np.ndarray, size: int, step: int = 1) -> np.ndarray:
+    """
+    Zero-copy view of the windows of ``x``.
+
+    Args:
+        x: (n, k) samples
+        size: Window length in samples
+        step: Distance between window starts in samples
+
+    Returns:
+        (w, k, size) view with ``w = (n - size) // step + 1`` (0 if n < size)
+    """
+    x = np.asarray(x)
+    if x.shape[0] < size:
+        return np.empty((0, x.shape[1], size), dtype=x.dtype)
+    return sliding_window_view(x, size, axis=0)[::step]
+
+def band_name(band: Tuple[float, float]) -> str:
+    """Feature name of a frequency band, e.g. 'band_0.5_3'."""
+    return f"band_{band[0]:g}_{band[1]:g}"
+
+class FeatureExtractor:
+    """Computes a fixed set of features over (w, k, size) window views."""
+
+    def __init__(self, size: int, sample_rate: float, features: Optional[Sequence[str]] = None,
+                 bands: Optional[Sequence[Tuple[float, float]]] = None):
+        self.size = int(size)
+        if self.size < 2:
+            raise ValueError(f"Window must contain at least 2 samples, got {size}")
+        self.sample_rate = float(sample_rate)
+        self.features = list(features if features is not None else TIME_FEATURES)
+        unknown = set(self.features) - set(FEATURES)
+        if unknown:
+            raise ValueError(f"Unsupported features: {sorted(unknown)}")
+        self.bands = [(float(lo), float(hi)) for lo, hi in (bands or [])]
+        self.freqs = np.fft.rfftfreq(self.size, 1.0 / self.sample_rate)
+        self.taper = np.hanning(self.size)
+        # Hệ số để tổng công suất phổ một phía bằng trung bình bình phương của tín hiệu đã nhân cửa sổ
+        scale = np.full(self.freqs.shape, 2.0 / (self.size * self.size))
+        scale[0] /= 2.0
+        if self.size % 2 == 0:
+            scale[-1] /= 2.0
+        self.power_scale = scale
+        # Ma trận (nfreq, nbands) gom công suất theo dải [lo, hi)
+        self.band_matrix = np.stack(
+            [(self.freqs >= lo) & (self.freqs < hi) for lo, hi in self.bands], axis=1
+        ).astype(np.float64) if self.bands else np.zeros((self.freqs.size, 0))
+
+    @property
+    def names(self) -> List[str]:
+        """Feature names in output order."""
+        return self.features + [band_name(band) for band in self.bands]
+
+    def compute(self, windows: np.ndarray) -> np.ndarray:
+        """
+        Features of every window and channel.
+
+        Args:
+            windows: (w, k, size) array or view (see ``window_view``)
+
+        Returns:
+            (w, k, F) float64 array, F = len(names)
+        """
+        w, k, _ = windows.shape
+        out = np.empty((w, k, len(self.names)))
+        if w == 0:
+            return out
+        cache: Dict[str, np.ndarray] = {}
+
+        def mean():
+            if 'mean' not in cache:
+                cache['mean'] = windows.mean(axis=-1)
+            return cache['mean']
+
+        def centered():
+            if 'centered' not in cache:
+                cache['centered'] = windows - mean()[..., np.newaxis]
+            return cache['centered']
+
+        def moment(order):
+            key = f"m{order}"
+            if key not in cache:
+                c = centered()
+                cache[key] = np.einsum('...i,...i->...', c, c) / self.size if order == 2 \
+                    else np.mean(c ** order, axis=-1)
+            return cache[key]
+
+        def mean_square():
+            if 'ms' not in cache:
+                cache['ms'] = np.einsum('...i,...i->...', windows, windows) / self.size
+            return cache['ms']
+
+        def power():
+            if 'power' not in cache:
+                spectrum = np.fft.rfft(windows * self.taper, axis=-1)
+                cache['power'] = (spectrum.real ** 2 + spectrum.imag ** 2) * self.power_scale
+            return cache['power']
+
+        def crossings(values):
+            negative = np.signbit(values)
+            return np.count_nonzero(negative[..., 1:] != negative[..., :-1], axis=-1)
+
+        def standardized(order):
+            variance = moment(2)
+            with np.errstate(invalid='ignore', divide='ignore'):
+                result = moment(order) / variance ** (order / 2.0)
+            return np.where(variance > 0, result, 0.0)
+
+        computations = {
+            'mean': mean,
+            'std': lambda: np.sqrt(moment(2)),
+            'rms': lambda: np.sqrt(mean_square()),
+            'min': lambda: windows.min(axis=-1),
+            'max': lambda: windows.max(axis=-1),
+            'ptp': lambda: np.ptp(windows, axis=-1),
+            'skewness': lambda: standardized(3),
+            'kurtosis': lambda: standardized(4) - 3.0,
+            'zero_crossings': lambda: crossings(windows),
+            'mean_crossings': lambda: crossings(centered()),
+            'energy': lambda: mean_square() * self.size,
+            'dominant_freq': lambda: self.freqs[1:][np.argmax(power()[..., 1:], axis=-1)],
+            'spectral_centroid': lambda: np.divide(
+                power() @ self.freqs, power().sum(axis=-1),
+                out=np.zeros((w, k)), where=power().sum(axis=-1) > 0),
+        }
+        for i, feature in enumerate(self.features):
+            out[..., i] = computations[feature]()
+        if self.bands:
+            out[..., len(self.features):] = power() @ self.band_matrix
+        return out
@@ -0,0 +1,207 @@
+"""
+Vectorized quaternion attitude estimation (Madgwick and Mahony filters).
+
+All functions operate on many sensors at once: a quaternion state has shape
+``(S, 4)`` in ``[w, x, y, z]`` order and sensor vectors have shape ``(S, 3)``.
+Quaternions rotate sensor-frame vectors into the earth frame (z up), so the
+estimated gravity direction in the sensor frame is the third row of ``R(q)``.
+
+The attitude recurrence is inherently sequential in time, but one step for all
+sensors is a few small batched matrix products (the rotation matrix, the
+Madgwick gradient and the quaternion derivative are all linear in outer
+products of the state, see ``_rotation_tensors``). Everything
+that does not depend on the state (vector normalization, unit conversion,
+quaternion to Euler) is done for a whole batch at once by the callers.
+"""
+# orientation_fusion.py
+from typing import Optional, Tuple
+
+import numpy as np
+
+def normalize_rows(v: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Normalize vectors along the last axis.
+
+    Returns:
+        Tuple (unit vectors, valid mask). Zero or non-finite vectors become 0 and are marked invalid.
+    """
+    norm = np.sqrt(np.sum(v * v, axis=-1))
+    valid = np.isfinite(norm) & (norm > 0.0)
+    safe = np.where(valid, norm, 1.0)
+    unit = np.where(valid[..., np.newaxis], v / safe[..., np.newaxis], 0.0)
+    return unit, valid
+
+def quat_multiply(p: np.ndarray, q: np.ndarray) -> np.ndarray:
+    """Hamilton product p ⊗ q over the last axis."""
+    pw, px, py, pz = np.moveaxis(p, -1, 0)
+    qw, qx, qy, qz = np.moveaxis(q, -1, 0)
+    return np.stack([
+        pw * qw - px * qx - py * qy - pz * qz,
+        pw * qx + px * qw + py * qz - pz * qy,
+        pw * qy - px * qz + py * qw + pz * qx,
+        pw * qz + px * qy - py * qx + pz * qw,
+    ], axis=-1)
+
+def quat_from_euler(roll: np.ndarray, pitch: np.ndarray, yaw: np.ndarray) -> np.ndarray:
+    """Quaternion for intrinsic Z-Y-X (yaw, pitch, roll) angles in radians."""
+    cr, sr = np.cos(roll / 2), np.sin(roll / 2)
+    cp, sp = np.cos(pitch / 2), np.sin(pitch / 2)
+    cy, sy = np.cos(yaw / 2), np.sin(yaw / 2)
+    return np.stack([
+        cr * cp * cy + sr * sp * sy,
+        sr * cp * cy - cr * sp * sy,
+        cr * sp * cy + sr * cp * sy,
+        cr * cp * sy - sr * sp * cy,
+    ], axis=-1)
+
+def quat_to_euler(q: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Roll, pitch, yaw (radians, Z-Y-X convention) of quaternions ``(..., 4)``."""
+    w, x, y, z = np.moveaxis(q, -1, 0)
+    roll = np.arctan2(2.0 * (w * x + y * z), 1.0 - 2.0 * (x * x + y * y))
+    pitch = np.arcsin(np.clip(2.0 * (w * y - z * x), -1.0, 1.0))
+    yaw = np.arctan2(2.0 * (w * z + x * y), 1.0 - 2.0 * (y * y + z * z))
+    return roll, pitch, yaw
+
+def initial_attitude(acc: np.ndarray, mag: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Attitude from a single accelerometer (and optional magnetometer) reading per sensor.
+
+    Roll/pitch come from gravity; yaw from the tilt-compensated magnetic field,
+    or 0 where no valid magnetometer reading is available.
+    """
+    ax, ay, az = acc[:, 0], acc[:, 1], acc[:, 2]
+    roll = np.arctan2(ay, az)
+    pitch = np.arctan2(-ax, np.sqrt(ay * ay + az * az))
+    yaw = np.zeros_like(roll)
+    if mag is not None:
+        mx, my, mz = mag[:, 0], mag[:, 1], mag[:, 2]
+        lx = mx * np.cos(pitch) + np.sin(pitch) * (my * np.sin(roll) + mz * np.cos(roll))
+        ly = my * np.cos(roll) - mz * np.sin(roll)
+        valid = np.isfinite(lx) & np.isfinite(ly) & ((lx != 0.0) | (ly != 0.0))
+        yaw = np.where(valid, np.arctan2(-ly, lx), 0.0)
+    return quat_from_euler(roll, pitch, yaw)
+
+def _rotation_tensors() -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Constant tensors that turn the per-step math into a few batched matrix products.
+
+    Returns:
+        Tuple (R0 (9,), RQ (16, 9), H (16, 4)) such that for quaternions q (S, 4):
+        ``R(q).reshape(S, 9) = R0 + outer(q, q).reshape(S, 16) @ RQ`` and
+        ``q ⊗ p = outer(q, p).reshape(S, 16) @ H``.
+    """
+    # R(q) = I + quadratic terms, using the same forms as Madgwick's derivation
+    # (e.g. R22 = 1 - 2 q1^2 - 2 q2^2), so the gradient matches his Jacobian.
+    terms = {
+        (0, 0): [(2, 2, -2.0), (3, 3, -2.0)],
+        (0, 1): [(1, 2, 2.0), (0, 3, -2.0)],
+        (0, 2): [(1, 3, 2.0), (0, 2, 2.0)],
+        (1, 0): [(1, 2, 2.0), (0, 3, 2.0)],
+        (1, 1): [(1, 1, -2.0), (3, 3, -2.0)],
+        (1, 2): [(2, 3, 2.0), (0, 1, -2.0)],
+        (2, 0): [(1, 3, 2.0), (0, 2, -2.0)],
+        (2, 1): [(2, 3, 2.0), (0, 1, 2.0)],
+        (2, 2): [(1, 1, -2.0), (2, 2, -2.0)],
+    }
+    rq = np.zeros((4, 4, 9))
+    for (i, j), products in terms.items():
+        for a, b, c in products:
+            # Symmetric split so that d(q^T C q)/dq = 2 C q
+            rq[a, b, 3 * i + j] += c / 2.0
+            rq[b, a, 3 * i + j] += c / 2.0
+    basis = np.eye(4)
+    hamilton = quat_multiply(basis[:, np.newaxis, :], basis[np.newaxis, :, :])
+    return np.eye(3).reshape(9), rq.reshape(16, 9), hamilton.reshape(16, 4)
+
+_R0, _RQ, _HAMILTON = _rotation_tensors()
+
+def rotation_matrices(q: np.ndarray) -> np.ndarray:
+    """Rotation matrices (S, 3, 3) mapping sensor-frame vectors to the earth frame."""
+    qq = (q[:, :, np.newaxis] * q[:, np.newaxis, :]).reshape(-1, 16)
+    return (_R0 + qq @ _RQ).reshape(-1, 3, 3)
+
+def _integrate(q: np.ndarray, rate: np.ndarray, dt: float, correction: Optional[np.ndarray] = None) -> np.ndarray:
+    """q + (0.5 q ⊗ (0, ω) - correction) * dt, renormalized."""
+    p = np.zeros((q.shape[0], 4))
+    p[:, 1:] = rate
+    qdot = 0.5 * ((q[:, :, np.newaxis] * p[:, np.newaxis, :]).reshape(-1, 16) @ _HAMILTON)
+    if correction is not None:
+        qdot -= correction
+    out = q + qdot * dt
+    return out / np.sqrt(np.sum(out * out, axis=1, keepdims=True))
+
+def _cross(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """Row-wise cross product of (S, 3) arrays (cheaper than np.cross for small S)."""
+    return a[:, _NEXT] * b[:, _PREV] - a[:, _PREV] * b[:, _NEXT]
+
+_NEXT = np.array([1, 2, 0])
+_PREV = np.array([2, 0, 1])
+
+def _reference_field(rot: np.ndarray, mag: np.ndarray) -> np.ndarray:
+    """
+    Earth-frame reference [bx, 0, bz] for each sensor: the measured field rotated to the earth
+    frame with its horizontal part folded onto the x axis.
+    """
+    h = np.matmul(rot, mag[:, :, np.newaxis])[:, :, 0]
+    ref = np.zeros_like(h)
+    ref[:, 0] = np.sqrt(h[:, 0] * h[:, 0] + h[:, 1] * h[:, 1])
+    ref[:, 2] = h[:, 2]
+    return ref
+
+def madgwick_step(q: np.ndarray, gyro: np.ndarray, acc: np.ndarray, acc_valid: np.ndarray,
+                  mag: np.ndarray, mag_valid: np.ndarray, beta: float, dt: float) -> np.ndarray:
+    """
+    One Madgwick gradient-descent update for all sensors.
+
+    The objective is ``f = R(q)^T d - s`` for the gravity (d = [0, 0, 1]) and magnetic
+    (d = [bx, 0, bz]) references. Because every entry of ``R`` is a quadratic form
+    ``q^T C q``, the gradient ``J^T f`` is ``2 (Σ d_i f_j C_ij) q``: one matrix product.
+
+    Args:
+        q: Current quaternions (S, 4), unit norm.
+        gyro: Angular rate (S, 3) in rad/s.
+        acc, mag: Unit accelerometer / magnetometer vectors (S, 3).
+        acc_valid, mag_valid: (S,) masks; invalid readings skip that correction term.
+        beta: Gradient step gain.
+        dt: Time step in seconds.
+
+    Returns:
+        Updated, normalized quaternions (S, 4).
+    """
+    rot = rotation_matrices(q)
+    weights = np.zeros((q.shape[0], 3, 3))
+    weights[:, 2, :] = (rot[:, 2, :] - acc) * acc_valid[:, np.newaxis]
+    if mag_valid.any():
+        ref = _reference_field(rot, mag)
+        f_mag = np.matmul(ref[:, np.newaxis, :], rot)[:, 0, :] - mag
+        f_mag *= (mag_valid & acc_valid)[:, np.newaxis]
+        weights += ref[:, :, np.newaxis] * f_mag[:, np.newaxis, :]
+    m = (weights.reshape(-1, 9) @ _RQ.T).reshape(-1, 4, 4)
+    grad = 2.0 * np.matmul(m, q[:, :, np.newaxis])[:, :, 0]
+    norm = np.sqrt(np.sum(grad * grad, axis=1, keepdims=True))
+    grad *= beta / np.where(norm > 0.0, norm, 1.0)
+    return _integrate(q, gyro, dt, grad)
+
+def mahony_step(q: np.ndarray, integral: np.ndarray, gyro: np.ndarray, acc: np.ndarray,
+                acc_valid: np.ndarray, mag: np.ndarray, mag_valid: np.ndarray,
+                kp: float, ki: float, dt: float) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    One Mahony complementary-filter update for all sensors.
+
+    The error is the cross product between measured and estimated reference
+    directions; it corrects the gyro rate through a PI controller.
+
+    Returns:
+        Tuple (updated quaternions (S, 4), updated integral error (S, 3)).
+    """
+    rot = rotation_matrices(q)
+    error = _cross(acc, rot[:, 2, :])
+    if mag_valid.any():
+        ref = _reference_field(rot, mag)
+        estimated = np.matmul(ref[:, np.newaxis, :], rot)[:, 0, :]
+        error += _cross(mag, estimated) * mag_valid[:, np.newaxis]
+    error *= acc_valid[:, np.newaxis]
+
+    if ki > 0.0:
+        integral = integral + ki * error * dt
+    return _integrate(q, gyro + kp * error + integral, dt), integral
@@ -0,0 +1,198 @@
+"""
+Anti-aliasing FIR design and streaming polyphase rational resampling.
+
+``PolyphaseResampler`` changes the sample rate by ``up / down`` with a
+linear-phase low-pass FIR, computing only the output samples that are kept:
+output ``m`` is the dot product of ``ceil(numtaps / up)`` input samples with
+one polyphase branch of the filter, so the cost per output sample is
+independent of the decimation factor and no zero-stuffed or full-rate
+intermediate signal is ever built. All channels are handled at once as the
+columns of an ``(n, k)`` array, and the input history needed by the next call
+is carried over, so feeding consecutive chunks gives the same result as
+resampling the whole signal in one call.
+
+The filter delay is compensated: output ``m`` is aligned with input position
+``m * down / up``. The signal is extended with its first value before the
+start (and with its last value on ``flush``) instead of zeros, which avoids a
+start-up ramp on signals with a large DC component such as accelerometer
+axes.
+"""
+# polyphase.py
+from fractions import Fraction
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+def kaiser_lowpass(cutoff: float, transition: float, attenuation: float = 80.0,
+                   gain: float = 1.0) -> np.ndarray:
+    """
+    Kaiser-window linear-phase low-pass FIR with an odd number of taps.
+
+    Args:
+        cutoff: Centre of the transition band, in cycles/sample (0 < cutoff < 0.5)
+        transition: Transition band width, in cycles/sample
+        attenuation: Stop-band attenuation in dB
+        gain: Pass-band gain
+
+    Returns:
+        Filter taps, shape (numtaps,)
+    """
+    if not 0.0 < cutoff < 0.5:
+        raise ValueError(f"FIR cutoff must be in (0, 0.5) cycles/sample, got {cutoff}")
+    if transition <= 0.0:
+        raise ValueError("FIR transition width must be positive")
+    if attenuation > 50.0:
+        beta = 0.1102 * (attenuation - 8.7)
+    elif attenuation > 21.0:
+        beta = 0.5842 * (attenuation - 21.0) ** 0.4 + 0.07886 * (attenuation - 21.0)
+    else:
+        beta = 0.0
+    numtaps = int(np.ceil((attenuation - 7.95) / (2.285 * 2.0 * np.pi * transition))) + 1
+    half = max(1, numtaps // 2)
+    n = np.arange(-half, half + 1)
+    taps = 2.0 * cutoff * np.sinc(2.0 * cutoff * n) * np.kaiser(2 * half + 1, beta)
+    return taps * (gain / taps.sum())
+
+def rational_factors(sample_rate: float, output_rate: float, max_denominator: int = 1000) -> Tuple[int, int]:
+    """(up, down) such that sample_rate * up / down ~= output_rate."""
+    ratio = Fraction(output_rate / sample_rate).limit_denominator(max_denominator)
+    if ratio <= 0:
+        raise ValueError(f"Invalid output rate {output_rate} for sample rate {sample_rate}")
+    return ratio.numerator, ratio.denominator
+
+class PolyphaseResampler:
+    """
+    Streaming rational resampler for multi-channel signals.
+
+    Call ``process(x, t)`` with consecutive chunks and ``flush()`` at the end;
+    the outputs concatenate to the resampled signal. Each instance holds the
+    state of one stream.
+    """
+
+    def __init__(self, up: int, down: int, cutoff: float = 0.8, attenuation: float = 80.0,
+                 taps: Optional[np.ndarray] = None):
+        """
+        Args:
+            up, down: Resampling factor up/down (reduced by their gcd)
+            cutoff: Pass-band edge as a fraction of the lower of the input/output Nyquist
+                    frequencies; the stop band starts at that Nyquist frequency
+            attenuation: Stop-band attenuation in dB
+            taps: Custom filter at the upsampled rate (odd length, gain ``up``); overrides
+                  cutoff/attenuation
+        """
+        ratio = Fraction(int(up), int(down))
+        if ratio <= 0:
+            raise ValueError("Resampling factors must be positive integers")
+        self.up, self.down = ratio.numerator, ratio.denominator
+        if taps is None:
+            nyquist = 0.5 / max(self.up, self.down)
+            if not 0.0 < cutoff < 1.0:
+                raise ValueError(f"cutoff must be in (0, 1), got {cutoff}")
+            taps = kaiser_lowpass(0.5 * (1.0 + cutoff) * nyquist, (1.0 - cutoff) * nyquist,
+                                  attenuation, gain=float(self.up))
+        taps = np.asarray(taps, dtype=np.float64)
+        if taps.ndim != 1 or taps.shape[0] % 2 == 0:
+            raise ValueError("FIR taps must be a 1-D array of odd length")
+        self.taps = taps
+        # Độ trễ (mẫu ở tần số đã nâng); >= up để luôn có mẫu kế tiếp khi nội suy timestamp
+        self.delay = max((taps.shape[0] - 1) // 2, self.up)
+        branches = -(-(taps.shape[0] + self.delay - (taps.shape[0] - 1) // 2) // self.up)
+        padded = np.zeros(branches * self.up)
+        padded[self.delay - (taps.shape[0] - 1) // 2:][:taps.shape[0]] = taps
+        # phases[p, i] = h[p + i * up], đảo ngược để nhân trực tiếp với cửa sổ đầu vào tăng dần
+        self.phases = np.ascontiguousarray(padded.reshape(branches, self.up).T[:, ::-1])
+        self.branches = branches
+        self.reset()
+
+    def reset(self) -> None:
+        self.buffer: Optional[np.ndarray] = None   # Mẫu đầu vào còn cần, (len, k)
+        self.times: Optional[np.ndarray] = None    # Timestamp tương ứng (int64)
+        self.buffer_start = 0                      # Chỉ số toàn cục của buffer[0]
+        self.received = 0                          # Số mẫu đầu vào đã nhận
+        self.next_output = 0                       # Chỉ số đầu ra kế tiếp
+
+    def _append(self, x: np.ndarray, t: np.ndarray) -> None:
+        if self.buffer is None:
+            # Kéo dài tín hiệu bằng mẫu đầu tiên trước thời điểm bắt đầu
+            pad = self.branches - 1
+            self.buffer = np.concatenate([np.repeat(x[:1], pad, axis=0), x])
+            self.times = np.concatenate([np.full(pad, t[0], dtype=np.int64), t])
+            self.buffer_start = -pad
+        else:
+            self.buffer = np.concatenate([self.buffer, x])
+            self.times = np.concatenate([self.times, t])
+        self.received += x.shape[0]
+
+    def _emit(self, limit: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Tính các đầu ra m < limit có đủ mẫu đầu vào."""
+        up, down = self.up, self.down
+        # Đầu ra m cần mẫu tới chỉ số (m * down + delay) // up <= received - 1
+        last = (self.received * up - 1 - self.delay) // down
+        outputs = np.arange(self.next_output, min(last + 1, limit), dtype=np.int64)
+        k = self.buffer.shape[1]
+        if outputs.size == 0:
+            return np.empty((0, k)), np.empty(0, dtype=np.int64)
+        position = outputs * down + self.delay
+        ends, phase = position // up, position % up
+        windows = sliding_window_view(self.buffer, self.branches, axis=0)   # (N, k, branches)
+        rows = ends - self.buffer_start - self.branches + 1
+        if up == 1:
+            y = windows[rows] @ self.phases[0]
+        else:
+            y = np.einsum('mkb,mb->mk', windows[rows], self.phases[phase])
+
+        # Timestamp tại vị trí đầu vào m * down / up (nội suy tuyến tính giữa hai mẫu)
+        index, frac = np.divmod(outputs * down, up)
+        local = index - self.buffer_start
+        t = self.times[local]
+        if up > 1:
+            step = self.times[np.minimum(local + 1, self.times.shape[0] - 1)] - t
+            t = t + (step * frac) // up
+
+        self.next_output = int(outputs[-1]) + 1
+        # Bỏ các mẫu mà đầu ra kế tiếp (cả cửa sổ lẫn timestamp) không còn dùng tới
+        position = self.next_output * down
+        start = min((position + self.delay) // up - self.branches + 1, position // up, self.received)
+        drop = start - self.buffer_start
+        if drop > 0:
+            self.buffer = self.buffer[drop:]
+            self.times = self.times[drop:]
+            self.buffer_start += drop
+        return y, t
+
+    def process(self, x: np.ndarray, t: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Resample a chunk.
+
+        Args:
+            x: (n, k) samples
+            t: (n,) int64 timestamps of the samples
+
+        Returns:
+            Tuple (y, t_out): (m, k) output samples and their int64 timestamps
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if x.shape[0] == 0:
+            k = x.shape[1] if x.ndim == 2 else 0
+            return np.empty((0, k)), np.empty(0, dtype=np.int64)
+        self._append(x, np.asarray(t, dtype=np.int64))
+        return self._emit(np.iinfo(np.int64).max)
+
+    def flush(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Emit the remaining outputs up to the last input sample, extending the signal with
+        its last value, then reset.
+        """
+        if self.buffer is None:
+            return np.empty((0, 0)), np.empty(0, dtype=np.int64)
+        # Các đầu ra có vị trí <= mẫu cuối cùng
+        limit = ((self.received - 1) * self.up) // self.down + 1
+        need = max(0, ((limit - 1) * self.down + self.delay) // self.up - self.received + 1)
+        times = self.times
+        step = int(times[-1] - times[-2]) if times.shape[0] > 1 else 0
+        pad_t = times[-1] + step * np.arange(1, need + 1, dtype=np.int64)
+        self._append(np.repeat(self.buffer[-1:], need, axis=0), pad_t)
+        y, t = self._emit(limit)
+        self.reset()
+        return y, t
@@ -0,0 +1,161 @@
+"""
+Constant-memory distribution summaries: fixed-bin histograms and t-digests.
+
+``FixedHistogram`` counts k channels into the same bins with a single
+``np.bincount`` per update: each sample's bin index is offset by
+``channel * (bins + 2)`` (one underflow and one overflow bin per channel), so
+the whole (n, k) block is binned without a Python loop.
+
+``TDigest`` is a merging t-digest (Dunning): samples are appended to a
+buffer and, when it fills up, buffer and centroids are sorted together and
+merged into clusters whose size is bounded by the k1 scale function
+``k(q) = compression / (2 pi) * asin(2q - 1)``. Clusters are assigned with a
+vectorized ``floor(k(q))`` of each point's cumulative-weight midpoint and
+reduced with ``np.bincount``, so compression is a sort plus a few array
+operations. Clusters are small near q = 0 and q = 1, which keeps tail
+quantiles (p95, p99) accurate. Digests and histograms merge by adding their
+contents, so summaries of different sensors or time buckets can be combined
+cheaply.
+"""
+# quantiles.py
+from typing import Iterable, Optional
+
+import numpy as np
+
+class FixedHistogram:
+    """Histogram of k channels over the same ``bins`` equal bins in [low, high)."""
+
+    def __init__(self, low: float, high: float, bins: int, n_channels: int = 1):
+        if not high > low or bins < 1:
+            raise ValueError(f"Invalid histogram range [{low}, {high}) with {bins} bins")
+        self.low = float(low)
+        self.high = float(high)
+        self.bins = int(bins)
+        self.width = (self.high - self.low) / self.bins
+        # Cột 0 là underflow, cột bins + 1 là overflow
+        self.counts = np.zeros((n_channels, self.bins + 2), dtype=np.int64)
+
+    @property
+    def edges(self) -> np.ndarray:
+        return np.linspace(self.low, self.high, self.bins + 1)
+
+    def update(self, x: np.ndarray) -> None:
+        """Add samples of shape (n, k); NaN samples are ignored."""
+        x = np.asarray(x, dtype=np.float64).reshape(-1, self.counts.shape[0])
+        channels = np.broadcast_to(np.arange(x.shape[1]), x.shape)
+        valid = ~np.isnan(x)
+        index = np.floor((x[valid] - self.low) / self.width)
+        index = np.clip(index, -1, self.bins).astype(np.int64) + 1
+        flat = index + channels[valid] * (self.bins + 2)
+        self.counts += np.bincount(flat, minlength=self.counts.size).reshape(self.counts.shape)
+
+    def merge(self, other: "FixedHistogram") -> None:
+        if (other.low, other.high, other.bins) != (self.low, self.high, self.bins):
+            raise ValueError("Histograms with different bins cannot be merged")
+        self.counts += other.counts
+
+    def quantile(self, q) -> np.ndarray:
+        """
+        Quantiles per channel, interpolated linearly inside bins.
+
+        Out-of-range samples are clamped to ``low``/``high``. Returns (k, len(q)),
+        NaN for channels without samples.
+        """
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        cumulative = np.cumsum(self.counts, axis=1)
+        total = cumulative[:, -1]
+        # Vị trí biên: underflow dồn về low, overflow dồn về high
+        positions = np.concatenate([[self.low], self.edges, [self.high]])
+        out = np.full((self.counts.shape[0], q.size), np.nan)
+        for c in np.flatnonzero(total):
+            ranks = np.concatenate([[0], cumulative[c]]) / total[c]
+            out[c] = np.interp(q, ranks, positions)
+        return out
+
+class TDigest:
+    """Mergeable quantile sketch of one stream of values."""
+
+    def __init__(self, compression: float = 100.0, buffer_size: Optional[int] = None):
+        self.compression = float(compression)
+        self.buffer_size = int(buffer_size or 5 * self.compression)
+        self.means = np.empty(0)
+        self.weights = np.empty(0)
+        self._buffer = np.empty(self.buffer_size)
+        self._buffered = 0
+        self.count = 0.0
+        self.min = np.inf
+        self.max = -np.inf
+
+    def update(self, values: np.ndarray) -> None:
+        """Add samples; NaN values are ignored."""
+        values = np.asarray(values, dtype=np.float64).ravel()
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        self.count += values.size
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        pos = 0
+        while pos < values.size:
+            take = min(self.buffer_size - self._buffered, values.size - pos)
+            self._buffer[self._buffered:self._buffered + take] = values[pos:pos + take]
+            self._buffered += take
+            pos += take
+            if self._buffered == self.buffer_size:
+                self._compress()
+
+    def merge(self, other: "TDigest") -> None:
+        """Add the contents of another digest."""
+        other._compress()
+        if other.count == 0:
+            return
+        self._compress(other.means, other.weights)
+        self.count += other.count
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @classmethod
+    def merged(cls, digests: Iterable["TDigest"], compression: Optional[float] = None) -> "TDigest":
+        """New digest holding the union of ``digests``."""
+        digests = list(digests)
+        result = cls(compression or (digests[0].compression if digests else 100.0))
+        for digest in digests:
+            result.merge(digest)
+        return result
+
+    def _compress(self, means: Optional[np.ndarray] = None, weights: Optional[np.ndarray] = None) -> None:
+        parts_m = [self.means, self._buffer[:self._buffered]]
+        parts_w = [self.weights, np.ones(self._buffered)]
+        if means is not None:
+            parts_m.append(means)
+            parts_w.append(weights)
+        self._buffered = 0
+        m = np.concatenate(parts_m)
+        if m.size == 0:
+            return
+        w = np.concatenate(parts_w)
+        order = np.argsort(m, kind='stable')
+        m, w = m[order], w[order]
+        total = w.sum()
+        # Nhóm theo floor(k(q)) tại trung điểm trọng số tích lũy của mỗi điểm
+        q = (np.cumsum(w) - 0.5 * w) / total
+        k = self.compression / (2.0 * np.pi) * np.arcsin(2.0 * q - 1.0)
+        group = np.floor(k - k[0]).astype(np.int64)
+        group = np.unique(group, return_inverse=True)[1]
+        weights = np.bincount(group, weights=w)
+        self.means = np.bincount(group, weights=w * m) / weights
+        self.weights = weights
+
+    def quantile(self, q) -> np.ndarray:
+        """Approximate quantiles (NaN if the digest is empty)."""
+        q = np.atleast_1d(np.asarray(q, dtype=np.float64))
+        self._compress()
+        if self.count == 0:
+            return np.full(q.shape, np.nan)
+        if self.means.size == 1:
+            return np.full(q.shape, self.means[0])
+        # Trọng số của mỗi centroid trải đều quanh trung bình; hai đầu là min/max chính xác
+        centers = (np.cumsum(self.weights) - 0.5 * self.weights) / self.weights.sum()
+        ranks = np.concatenate([[0.0], centers, [1.0]])
+        positions = np.concatenate([[self.min], self.means, [self.max]])
+        return np.interp(q, ranks, positions)
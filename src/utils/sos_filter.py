@@ -0,0 +1,359 @@
+"""
+IIR filter design and streaming filtering with second-order sections (SOS).
+
+This module provides Butterworth (low/high/band-pass) and notch designs in
+the same SOS layout as ``scipy.signal`` (rows of ``[b0, b1, b2, a0, a1, a2]``)
+and a NumPy-only streaming filter that carries its state between calls.
+
+Filtering uses the state-space form of each direct-form-II-transposed section
+and processes blocks of ``L`` samples with matrix products: for a block,
+``y = T @ x + O @ s`` and ``s' = A^L @ s + Bf @ x``, where ``T`` is the
+Toeplitz matrix of the section's impulse response. The only Python loop left
+is one tiny 2x2 state update per block, so whole batches of many channels are
+filtered at BLAS speed while matching the sample-by-sample recursion.
+"""
+# sos_filter.py
+from typing import Optional, Tuple
+
+import numpy as np
+
+def _bilinear_zpk(zeros: np.ndarray, poles: np.ndarray, fs: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Map analog zeros/poles to the z-plane; zeros at infinity map to z = -1."""
+    fs2 = 2.0 * fs
+    z_d = (fs2 + zeros) / (fs2 - zeros)
+    p_d = (fs2 + poles) / (fs2 - poles)
+    z_d = np.concatenate([z_d, -np.ones(len(poles) - len(zeros))])
+    return z_d, p_d
+
+def _poly_pairs(roots: np.ndarray, spread: bool = False) -> list:
+    """
+    Group roots into conjugate/real pairs and return quadratic coefficient rows.
+
+    Real roots are paired with their neighbour, or smallest with largest when
+    ``spread`` is set (so band-pass zeros at +1 and -1 share a section).
+    """
+    roots = np.asarray(roots, dtype=complex)
+    tol = 1e-10
+    upper = sorted((r for r in roots if r.imag > tol), key=lambda r: abs(r))
+    real = sorted(r.real for r in roots if abs(r.imag) <= tol)
+    rows = [[1.0, -2.0 * r.real, abs(r) ** 2] for r in upper]
+    while len(real) >= 2:
+        r1, r2 = real.pop(), real.pop(0 if spread else -1)
+        rows.append([1.0, -(r1 + r2), r1 * r2])
+    if real:
+        rows.append([1.0, -real.pop(), 0.0])
+    return rows
+
+def _zpk_to_sos(zeros: np.ndarray, poles: np.ndarray) -> np.ndarray:
+    a_rows = _poly_pairs(poles)
+    b_rows = _poly_pairs(zeros, spread=True)
+    if len(b_rows) != len(a_rows):
+        raise ValueError("Zero and pole counts do not pair into the same number of sections")
+    # Ghép section bậc 1 của tử với section bậc 1 của mẫu
+    a_rows.sort(key=lambda row: row[2] == 0.0)
+    b_rows.sort(key=lambda row: row[2] == 0.0)
+    return np.array([b + a for b, a in zip(b_rows, a_rows)], dtype=np.float64)
+
+def sos_frequency_response(sos: np.ndarray, freqs: np.ndarray, fs: float) -> np.ndarray:
+    """
+    Complex frequency response of an SOS filter.
+
+    Args:
+        sos: (n_sections, 6) coefficients
+        freqs: Frequencies in Hz
+        fs: Sample rate in Hz
+
+    Returns:
+        Complex response at each frequency
+    """
+    z = np.exp(-1j * 2.0 * np.pi * np.asarray(freqs, dtype=np.float64) / fs)
+    h = np.ones_like(z)
+    for b0, b1, b2, a0, a1, a2 in sos:
+        h *= (b0 + b1 * z + b2 * z * z) / (a0 + a1 * z + a2 * z * z)
+    return h
+
+def _normalize_gain(sos: np.ndarray, ref_freq: float, fs: float) -> np.ndarray:
+    gain = abs(sos_frequency_response(sos, np.array([ref_freq]), fs)[0])
+    sos = sos.copy()
+    sos[0, :3] /= gain
+    return sos
+
+def butter_sos(order: int, cutoff, fs: float, btype: str = 'lowpass') -> np.ndarray:
+    """
+    Design a digital Butterworth filter as second-order sections.
+
+    Args:
+        order: Filter order (band-pass filters get 2 * order poles)
+        cutoff: Cutoff frequency in Hz, or (low, high) for 'bandpass'
+        fs: Sample rate in Hz
+        btype: 'lowpass', 'highpass' or 'bandpass'
+
+    Returns:
+        (n_sections, 6) SOS coefficient array
+
+    Raises:
+        ValueError: If the parameters are out of range
+    """
+    if order < 1:
+        raise ValueError(f"order must be >= 1, got {order}")
+    nyquist = fs / 2.0
+    # Nguyên mẫu analog chuẩn hóa (cutoff 1 rad/s)
+    m = np.arange(-order + 1, order, 2)
+    proto = -np.exp(1j * np.pi * m / (2 * order))
+
+    if btype in ('lowpass', 'highpass'):
+        if not 0.0 < cutoff < nyquist:
+            raise ValueError(f"cutoff must be in (0, {nyquist}) Hz, got {cutoff}")
+        warped = 2.0 * fs * np.tan(np.pi * cutoff / fs)
+        if btype == 'lowpass':
+            zeros, poles = np.array([], dtype=complex), warped * proto
+            ref = 0.0
+        else:
+            zeros, poles = np.zeros(order, dtype=complex), warped / proto
+            ref = nyquist
+    elif btype == 'bandpass':
+        low, high = cutoff
+        if not 0.0 < low < high < nyquist:
+            raise ValueError(f"band edges must satisfy 0 < low < high < {nyquist} Hz, got {cutoff}")
+        w1 = 2.0 * fs * np.tan(np.pi * low / fs)
+        w2 = 2.0 * fs * np.tan(np.pi * high / fs)
+        w0, bw = np.sqrt(w1 * w2), w2 - w1
+        half = proto * bw / 2.0
+        disc = np.sqrt(half * half - w0 * w0)
+        poles = np.concatenate([half + disc, half - disc])
+        zeros = np.zeros(order, dtype=complex)
+        ref = fs / np.pi * np.arctan(w0 / (2.0 * fs))
+    else:
+        raise ValueError(f"Unsupported filter type: {btype}")
+
+    z_d, p_d = _bilinear_zpk(zeros, poles, fs)
+    return _normalize_gain(_zpk_to_sos(z_d, p_d), ref, fs)
+
+def notch_sos(freq: float, fs: float, quality: float = 30.0) -> np.ndarray:
+    """
+    Design a second-order IIR notch filter.
+
+    Args:
+        freq: Frequency to remove in Hz
+        fs: Sample rate in Hz
+        quality: Quality factor (center frequency / -3 dB bandwidth)
+
+    Returns:
+        (1, 6) SOS coefficient array
+    """
+    if not 0.0 < freq < fs / 2.0:
+        raise ValueError(f"notch frequency must be in (0, {fs / 2.0}) Hz, got {freq}")
+    w0 = 2.0 * np.pi * freq / fs
+    # -3 dB bandwidth = freq / quality (cùng quy ước với scipy.signal.iirnotch)
+    beta = np.tan(np.pi * freq / (quality * fs))
+    gain = 1.0 / (1.0 + beta)
+    b = gain * np.array([1.0, -2.0 * np.cos(w0), 1.0])
+    a = np.array([1.0, -2.0 * gain * np.cos(w0), 2.0 * gain - 1.0])
+    return np.concatenate([b, a])[None, :]
+
+class SOSFilter:
+    """
+    Streaming SOS filter with block matrices cached per section.
+
+    Call ``filter(x, zi)`` repeatedly with consecutive chunks of a signal and
+    the returned state; the concatenated output equals filtering the whole
+    signal at once (up to floating-point rounding).
+    """
+
+    def __init__(self, sos: np.ndarray, block_size: int = 64):
+        """
+        Args:
+            sos: (n_sections, 6) coefficients with a0 == 1 (normalized if not)
+            block_size: Samples per block in the matrix formulation
+        """
+        sos = np.atleast_2d(np.asarray(sos, dtype=np.float64)).copy()
+        sos[:, :3] /= sos[:, 3:4]
+        sos[:, 3:] /= sos[:, 3:4]
+        self.sos = sos
+        self.block_size = int(block_size)
+        self._sections = [self._block_matrices(row) for row in sos]
+
+    @property
+    def n_sections(self) -> int:
+        return self.sos.shape[0]
+
+    def initial_state(self, n_channels: int) -> np.ndarray:
+        """Zero state of shape (n_sections, 2, n_channels)."""
+        return np.zeros((self.n_sections, 2, n_channels))
+
+    def _block_matrices(self, row: np.ndarray):
+        b0, b1, b2, _, a1, a2 = row
+        A = np.array([[-a1, 1.0], [-a2, 0.0]])
+        B = np.array([b1 - a1 * b0, b2 - a2 * b0])
+        L = self.block_size
+        apow = np.empty((L + 1, 2, 2))
+        apow[0] = np.eye(2)
+        for k in range(1, L + 1):
+            apow[k] = A @ apow[k - 1]
+        # O[k] = C A^k với C = [1, 0]; bcols[m] = A^m B
+        O = np.ascontiguousarray(apow[:L, 0, :])
+        bcols = apow[:L] @ B
+        h = np.concatenate([[b0], bcols[:L - 1, 0]])
+        idx = np.arange(L)
+        diff = idx[:, None] - idx[None, :]
+        T = np.where(diff >= 0, h[np.clip(diff, 0, L - 1)], 0.0)
+        # Cấp thứ hai: trạng thái đầu mỗi block trong một nhóm L block,
+        # states = Q s0 + G u, cũng là một phép nhân ma trận
+        qpow = np.empty((L + 1, 2, 2))
+        qpow[0] = np.eye(2)
+        for k in range(1, L + 1):
+            qpow[k] = apow[L] @ qpow[k - 1]
+        G = np.zeros((L, 2, L, 2))
+        for b in range(1, L):
+            G[b, :, :b, :] = qpow[b - 1::-1].transpose(1, 0, 2)
+        return T, O, apow, np.ascontiguousarray(bcols[::-1].T), qpow, G.reshape(2 * L, 2 * L)
+
+    def _block_states(self, section, s: np.ndarray, u: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """Trạng thái đầu mỗi block (full, 2, k) và trạng thái cuối, từ s và đóng góp u (full, 2, k)."""
+        _, _, apow, _, qpow, G = section
+        L = self.block_size
+        full, _, k = u.shape
+        states = np.empty_like(u)
+        for start in range(0, full, L):
+            m = min(L, full - start)
+            ug = u[start:start + m]
+            states[start:start + m] = (np.einsum('bij,jk->bik', qpow[:m], s)
+                                       + (G[:2 * m, :2 * m] @ ug.reshape(2 * m, k)).reshape(m, 2, k))
+            s = apow[L] @ states[start + m - 1] + ug[m - 1]
+        return states, s
+
+    def _filter_section(self, section, x: np.ndarray, s: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        T, O, apow, bmat, _, _ = section
+        L = self.block_size
+        n, k = x.shape
+        y = np.empty_like(x)
+        full = n // L
+        if full:
+            # (L, full * k): mỗi cột là một block của một kênh
+            xb = x[:full * L].reshape(full, L, k).transpose(1, 0, 2).reshape(L, full * k)
+            # Đáp ứng do đầu vào trong block và đóng góp của block vào trạng thái cuối
+            y_in = T @ xb
+            u = (bmat @ xb).reshape(2, full, k).transpose(1, 0, 2)
+            states, s = self._block_states(section, s, u)
+            y_in += O @ states.transpose(1, 0, 2).reshape(2, full * k)
+            y[:full * L] = y_in.reshape(L, full, k).transpose(1, 0, 2).reshape(full * L, k)
+        r = n - full * L
+        if r:
+            xr = x[full * L:]
+            y[full * L:] = T[:r, :r] @ xr + O[:r] @ s
+            s = apow[r] @ s + bmat[:, L - r:] @ xr
+        return y, s
+
+    def filter(self, x: np.ndarray, zi: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Filter a chunk along axis 0.
+
+        Args:
+            x: (n,) or (n, k) samples (k channels filtered independently)
+            zi: State from the previous call, shape (n_sections, 2, k); zeros if None
+
+        Returns:
+            Tuple (y, zf) with y shaped like x and the final state zf
+        """
+        x = np.asarray(x, dtype=np.float64)
+        squeeze = x.ndim == 1
+        if squeeze:
+            x = x[:, None]
+        if zi is None:
+            zi = self.initial_state(x.shape[1])
+        zf = np.empty_like(zi)
+        y = x
+        for i, section in enumerate(self._sections):
+            y, zf[i] = self._filter_section(section, y, zi[i])
+        return (y[:, 0] if squeeze else y), zf
+
+class SOSFilterBank:
+    """
+    Streaming bank of B SOS filters applied to the same k channels.
+
+    Every band must have the same number of sections. The block matrices of
+    section ``i`` of all bands are stacked along a leading band axis, so each
+    step of ``SOSFilter``'s block algorithm becomes one batched ``matmul``
+    over bands x channels instead of a Python loop over bands.
+    """
+
+    def __init__(self, sos_bank: np.ndarray, block_size: int = 64):
+        """
+        Args:
+            sos_bank: (n_bands, n_sections, 6) coefficients
+            block_size: Samples per block in the matrix formulation
+        """
+        sos_bank = np.asarray(sos_bank, dtype=np.float64)
+        if sos_bank.ndim != 3 or sos_bank.shape[2] != 6:
+            raise ValueError(f"sos_bank must have shape (n_bands, n_sections, 6), got {sos_bank.shape}")
+        filters = [SOSFilter(sos, block_size) for sos in sos_bank]
+        self.sos = np.stack([f.sos for f in filters])
+        self.block_size = int(block_size)
+        self._sections = [
+            tuple(np.stack([f._sections[i][j] for f in filters]) for j in range(6))
+            for i in range(sos_bank.shape[1])
+        ]
+
+    @property
+    def n_bands(self) -> int:
+        return self.sos.shape[0]
+
+    @property
+    def n_sections(self) -> int:
+        return self.sos.shape[1]
+
+    def initial_state(self, n_channels: int) -> np.ndarray:
+        """Zero state of shape (n_sections, n_bands, 2, n_channels)."""
+        return np.zeros((self.n_sections, self.n_bands, 2, n_channels))
+
+    def _filter_section(self, section, x: np.ndarray, s: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """x: (n, B or 1, k) -> y (n, B, k); s: (B, 2, k). Cùng thuật toán với SOSFilter._filter_section."""
+        T, O, apow, bmat, qpow, G = section
+        L = self.block_size
+        n, _, k = x.shape
+        bands = T.shape[0]
+        y = np.empty((n, bands, k))
+        full = n // L
+        if full:
+            # (B, L, full * k): mỗi cột là một block của một kênh
+            xb = x[:full * L].reshape(full, L, -1, k).transpose(2, 1, 0, 3).reshape(-1, L, full * k)
+            y_in = T @ xb
+            u = (bmat @ xb).reshape(bands, 2, full, k).transpose(0, 2, 1, 3)
+            states = np.empty_like(u)
+            for start in range(0, full, L):
+                m = min(L, full - start)
+                ug = u[:, start:start + m]
+                states[:, start:start + m] = (
+                    np.einsum('bmij,bjk->bmik', qpow[:, :m], s)
+                    + (G[:, :2 * m, :2 * m] @ ug.reshape(bands, 2 * m, k)).reshape(bands, m, 2, k))
+                s = apow[:, L] @ states[:, start + m - 1] + ug[:, m - 1]
+            y_in += O @ states.transpose(0, 2, 1, 3).reshape(bands, 2, full * k)
+            y[:full * L] = y_in.reshape(bands, L, full, k).transpose(2, 1, 0, 3).reshape(full * L, bands, k)
+        r = n - full * L
+        if r:
+            xr = x[full * L:].transpose(1, 0, 2)
+            y[full * L:] = (T[:, :r, :r] @ xr + O[:, :r] @ s).transpose(1, 0, 2)
+            s = apow[:, r] @ s + bmat[:, :, L - r:] @ xr
+        return y, s
+
+    def filter(self, x: np.ndarray, zi: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Filter a chunk of k channels through every band.
+
+        Args:
+            x: (n, k) samples
+            zi: State from the previous call, shape (n_sections, n_bands, 2, k); zeros if None
+
+        Returns:
+            Tuple (y (n, n_bands, k), zf)
+        """
+        x = np.asarray(x, dtype=np.float64)
+        if x.ndim == 1:
+            x = x[:, None]
+        if zi is None:
+            zi = self.initial_state(x.shape[1])
+        zf = np.empty_like(zi)
+        y = x[:, None, :]
+        for i, section in enumerate(self._sections):
+            y, zf[i] = self._filter_section(section, y, zi[i])
+        return y, zf
@@ -9,6 +9,10 @@ import time
 from datetime import datetime, timezone, timedelta
 from typing import Union, Optional, Dict, Any
 
+import numpy as np
+
+NS_PER_SECOND = 1_000_000_000
+
 def generate_timestamp(mode: str = 'realtime', 
                        packet_count: Optional[int] = None,
                        time_step: float = 0.01,
@@ -249,4 +253,57 @@ def get_timestamp_from_packet(packet_data: bytes, byte_offset: int,
     if tz:
         return datetime.now(tz)
     else:
-        return datetime.now()
\ No newline at end of file
+        return datetime.now()
+
+def seconds_to_ns(seconds: Union[float, int, np.ndarray]) -> Union[int, np.ndarray]:
+    """
+    Convert UNIX seconds to integer nanoseconds since epoch.
+
+    The whole and fractional parts are converted separately, so epoch-sized
+    values keep nanosecond resolution instead of the ~256 ns steps that
+    ``seconds * 1e9`` would produce in float64.
+
+    Args:
+        seconds: Scalar or array of UNIX timestamps in seconds
+
+    Returns:
+        Python int for scalar input, int64 array for array input
+    """
+    if isinstance(seconds, np.ndarray):
+        whole = np.floor(seconds)
+        frac_ns = np.rint((seconds - whole) * NS_PER_SECOND)
+        return whole.astype(np.int64) * NS_PER_SECOND + frac_ns.astype(np.int64)
+    if isinstance(seconds, int):
+        return seconds * NS_PER_SECOND
+    whole = int(seconds // 1)
+    return whole * NS_PER_SECOND + int(round((seconds - whole) * NS_PER_SECOND))
+
+def ns_to_seconds(timestamp_ns: Union[int, np.ndarray]) -> Union[float, np.ndarray]:
+    """
+    Convert integer nanoseconds since epoch to UNIX seconds as float.
+
+    Args:
+        timestamp_ns: Scalar or int64 array of nanosecond timestamps
+
+    Returns:
+        Float seconds (float64 array for array input)
+    """
+    if isinstance(timestamp_ns, np.ndarray):
+        whole, frac = np.divmod(timestamp_ns.astype(np.int64, copy=False), NS_PER_SECOND)
+        return whole.astype(np.float64) + frac / NS_PER_SECOND
+    return timestamp_ns / NS_PER_SECOND
+
+def datetime_to_ns(dt: datetime) -> int:
+    """
+    Convert a datetime to integer nanoseconds since epoch without float rounding.
+
+    Naive datetimes are interpreted in local time, like ``datetime.timestamp()``.
+
+    Args:
+        dt: Datetime to convert
+
+    Returns:
+        Nanoseconds since epoch
+    """
+    whole = int(dt.replace(microsecond=0).timestamp())
+    return whole * NS_PER_SECOND + dt.microsecond * 1000
@@ -0,0 +1,99 @@
+# tests/core/test_engine.py
+import os
+import tempfile
+import unittest
+
+import yaml
+
+from src.core.config_loader import ConfigLoader, parse_bytes
+from src.core.engine import Engine
+from src.core.plugin_manager import PluginManager
+from src.io.readers.cached_reader import CachedRecordingReader
+from src.plugins.processors.filter_processor import LowPassFilterProcessor
+from tests.core.test_pipeline import _Collector
+from tests.plugins.test_witmotion_decoder import accel_packet
+
+class TestEngine(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = os.path.join(self.tmp.name, 'imu.bin')
+        with open(self.data, 'wb') as f:
+            f.write(b''.join(accel_packet(0.0, 0.0, 1.0) for _ in range(1000)))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def write_config(self, config):
+        path = os.path.join(self.tmp.name, 'pipeline.yaml')
+        with open(path, 'w') as f:
+            yaml.safe_dump(config, f)
+        return path
+
+    def test_parse_bytes(self):
+        self.assertEqual(parse_bytes('512MB'), 512 * 1024 ** 2)
+        self.assertEqual(parse_bytes('1.5 GiB'), int(1.5 * 1024 ** 3))
+        self.assertEqual(parse_bytes('64k'), 65536)
+        self.assertEqual(parse_bytes(1000), 1000)
+        self.assertIsNone(parse_bytes(None))
+        with self.assertRaises(ValueError):
+            parse_bytes('lots')
+
+    def test_config_validation(self):
+        for config in ({}, {'pipelines': []}, {'pipelines': [{'decoder': {'type': 'WitMotionDecoder'}}]},
+                       {'pipelines': [{'reader': {'type': 'FileReader'}, 'processors': {'type': 'x'}}]},
+                       {'pipelines': [{'reader': {'type': 'FileReader'}, 'offline': {'memory_limit': 'x'}}]}):
+            with self.assertRaises(ValueError):
+                ConfigLoader(self.write_config(config)).load()
+
+    def test_plugin_lookup(self):
+        manager = PluginManager()
+        self.assertIs(manager.load_plugin('processors', 'LowPassFilterProcessor'), LowPassFilterProcessor)
+        self.assertIs(manager.load_plugin('processor', LowPassFilterProcessor.__module__ + '.LowPassFilterProcessor'),
+                      LowPassFilterProcessor)
+        with self.assertRaises(ValueError):
+            manager.load_plugin('processor', 'NoSuchProcessor')
+        with self.assertRaises(ValueError):
+            manager.load_plugin('writer', 'FileReader')
+
+    def test_engine_runs_offline_pipeline(self):
+        path = self.write_config({'pipelines': [{
+            'name': 'offline',
+            'reader': {'type': 'FileReader', 'params': {'file_path': self.data, 'chunk_size': 1 << 20}},
+            'decoder': {'type': 'WitMotionDecoder', 'params': {'sensor_id': 'imu1'}},
+            'processors': [{'type': 'LowPassFilterProcessor', 'params': {'cutoff_freq': 5.0}}],
+            'offline': {'memory_limit': '64KB', 'chunk_samples': 100},
+        }]})
+        engine = Engine()
+        pipelines = engine.setup(path)
+        self.assertEqual(len(pipelines), 1)
+        collector = _Collector()
+        pipelines[0].visualizers.append(collector)
+        engine.run()
+        self.assertFalse(engine.running)
+        self.assertEqual(pipelines[0].reader.chunk_size, 4096)
+        self.assertEqual(sum(len(b) for b in collector.items), 1000)
+        self.assertLessEqual(max(len(b) for b in collector.items), 100)
+        self.assertAlmostEqual(float(collector.items[-1].values['accZ'][-1]), 1.0, places=3)
+
+    def test_recording_override_uses_decoded_cache(self):
+        path = self.write_config({'pipelines': [{
+            'reader': {'type': 'FileReader', 'params': {'file_path': 'missing.bin', 'chunk_size': 4096}},
+            'decoder': {'type': 'WitMotionDecoder', 'params': {'sensor_id': 'imu1'}},
+        }]})
+        engine = Engine()
+        engine.set_recording(self.data)
+        for from_cache in (False, True):
+            pipeline = engine.setup(path)[0]
+            self.assertIsInstance(pipeline.reader, CachedRecordingReader)
+            self.assertIsNone(pipeline.decoder)
+            collector = _Collector()
+            pipeline.visualizers.append(collector)
+            engine.run()
+            self.assertEqual(pipeline.reader.from_cache, from_cache)
+            self.assertEqual(sum(len(b) for b in collector.items), 1000)
+            self.assertEqual({b.sensor_id for b in collector.items}, {'imu1'})
+        engine.set_recording(None)
+        self.assertEqual(engine.setup(path)[0].reader.__class__.__name__, 'FileReader')
+
+if __name__ == '__main__':
+    unittest.main()
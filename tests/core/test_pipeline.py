@@ -0,0 +1,184 @@
+# tests/core/test_pipeline.py
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.core.pipeline import Pipeline
+from src.data.models import SensorDataBatch, as_batch
+from src.io.readers.file_reader import FileReader
+from src.plugins.decoders.witmotion_hwt905_decoder import WitMotionDecoder
+from src.plugins.processors.base_processor import BaseProcessor
+from src.plugins.processors.decimation_processor import DecimationProcessor
+from src.plugins.processors.event_processor import EventDetectorProcessor
+from src.plugins.processors.feature_processor import FeatureProcessor
+from src.plugins.processors.filter_processor import LowPassFilterProcessor
+from src.plugins.processors.fusion_processor import OrientationFusionProcessor
+from src.plugins.processors.integration_processor import IntegrationProcessor
+from src.plugins.processors.quality_processor import DataQualityProcessor
+from src.plugins.processors.spectral_processor import STFTProcessor
+from src.plugins.processors.statistics_processor import RollingStatisticsProcessor
+from src.plugins.processors.vibration_processor import VibrationMetricsProcessor
+from tests.plugins.test_witmotion_decoder import accel_packet
+
+class _HoldLast(BaseProcessor):
+    """Giữ lại batch cuối cùng cho tới khi flush."""
+    def __init__(self):
+        super().__init__({})
+        self.held = None
+
+    def process(self, data):
+        if self.held is not None:
+            yield self.held
+        self.held = data
+
+    def flush(self):
+        if self.held is not None:
+            yield self.held
+            self.held = None
+
+class _Collector:
+    def __init__(self):
+        self.items = []
+
+    def visualize(self, data):
+        self.items.append(data)
+
+    def setup(self):
+        pass
+
+    def teardown(self):
+        pass
+
+class _BatchReader:
+    """Reader trả về các batch đã giải mã (dùng với decoder=None)."""
+    def __init__(self, batches):
+        self.config = {}
+        self.batches = batches
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def read(self):
+        return iter(self.batches)
+
+def _windowed_chain():
+    return [
+        DataQualityProcessor({'outlier_action': 'replace', 'flag_channel': 'quality', 'channels': ['accX'],
+                              'data_types': ['imu']}),
+        LowPassFilterProcessor({'cutoff_freq': 10.0, 'output_suffix': '_lp'}),
+        RollingStatisticsProcessor({'windows': [1.0], 'statistics': ['mean', 'std'], 'channels': ['accX_lp']}),
+        EventDetectorProcessor({'threshold': 4.0, 'mode': 'channels', 'channels': ['accZ'], 'pre_trigger': 0.2,
+                                'post_trigger': 0.3, 'max_duration': 1.0, 'data_types': ['imu']}),
+        IntegrationProcessor({'input_data_types': ['imu'], 'sample_rate': 100.0}),
+        STFTProcessor({'nperseg': 64, 'channels': ['accY'], 'decibels': True, 'data_types': ['imu']}),
+        OrientationFusionProcessor({'sample_rate': 100.0}),
+        DecimationProcessor({'factor': 3, 'data_types': ['imu']}),
+        VibrationMetricsProcessor({'sample_rate': 100.0 / 3, 'bands': 'octave', 'f_min': 2.0,
+                                   'channels': ['accY'], 'data_types': ['imu']}),
+        FeatureProcessor({'window': 2.0, 'step': 0.5, 'features': ['rms', 'kurtosis'], 'data_types': ['imu'],
+                          'passthrough': True}),
+    ]
+
+def _by_stream(items):
+    streams = {}
+    for item in map(as_batch, items):
+        streams.setdefault((item.sensor_id, item.data_type), []).append(item)
+    return {key: SensorDataBatch.concatenate(parts) for key, parts in streams.items()}
+
+class TestPipeline(unittest.TestCase):
+    def test_run_decodes_processes_and_flushes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'imu.bin')
+            with open(path, 'wb') as f:
+                f.write(b''.join(accel_packet(1.0, 0.0, 0.0) for _ in range(100)))
+            collector = _Collector()
+            pipeline = Pipeline(
+                FileReader({'file_path': path, 'chunk_size': 64}),
+                WitMotionDecoder({'sensor_id': 'imu1'}),
+                processors=[_HoldLast()],
+                visualizers=[collector],
+            )
+            pipeline.run()
+        self.assertEqual(sum(len(b) for b in collector.items), 100)
+        self.assertEqual(pipeline.metrics['bytes'], 1100)
+        self.assertEqual(pipeline.metrics['samples'], 100)
+
+    def test_processor_metrics_are_collected(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'imu.bin')
+            with open(path, 'wb') as f:
+                f.write(b''.join(accel_packet(1.0, 0.0, 0.0) for _ in range(50)))
+            pipeline = Pipeline(
+                FileReader({'file_path': path, 'chunk_size': 64}),
+                WitMotionDecoder({'sensor_id': 'imu1'}),
+                processors=[DataQualityProcessor({'data_rate': 100.0})],
+            )
+            pipeline.run()
+        counters = pipeline.metrics['quality']['imu1']['accelerometer']
+        self.assertEqual(counters['samples'], 50)
+        self.assertEqual(counters['gaps'], 0)
+
+    def test_chunked_mode_matches_in_memory(self):
+        rng = np.random.default_rng(3)
+        n = 5000
+        values = {name: rng.standard_normal(n) for name in ('accX', 'accY', 'accZ', 'gyroX', 'gyroY', 'gyroZ')}
+        values['accX'][[700, 1400, 1401, 2994, 2995, 2996]] += 25.0     # outlier, cả ở cuối lát 333 mẫu
+        values['accZ'][2000:2150] += 8.0                               # sự kiện dài hơn max_duration
+        values['accZ'][4000:4030] += 8.0
+        whole = SensorDataBatch(np.arange(n, dtype=np.int64) * 10_000_000, 'imu1', 'imu', values)
+
+        results = {}
+        for label, options in (('memory', {}), ('chunks', {'chunk_samples': 333}),
+                               ('limit', {'memory_limit': 200_000})):
+            collector = _Collector()
+            pipeline = Pipeline(_BatchReader([whole]), processors=_windowed_chain(), visualizers=[collector],
+                                **options)
+            pipeline.run()
+            results[label] = (_by_stream(collector.items), pipeline)
+
+        reference = results['memory'][0]
+        self.assertEqual(sorted(data_type for _, data_type in reference),
+                         ['event', 'event_capture', 'features', 'imu', 'motion', 'orientation', 'spectrogram',
+                          'statistics', 'vibration'])
+        self.assertEqual(len(reference[('imu1', 'event')]), 2)
+        # Dữ liệu thực sự đi qua pipeline thành nhiều lát
+        for label in ('chunks', 'limit'):
+            self.assertGreater(results[label][1].metrics['outputs'], 2 * results['memory'][1].metrics['outputs'])
+        outliers = {label: pipeline.metrics['quality']['imu1']['imu']['outliers'] for label, (_, pipeline) in results.items()}
+        self.assertGreaterEqual(outliers['memory'], 6)
+        self.assertEqual(set(outliers.values()), {outliers['memory']})
+        for label in ('chunks', 'limit'):
+            streams = results[label][0]
+            self.assertEqual(sorted(streams), sorted(reference))
+            for key, batch in reference.items():
+                other = streams[key]
+                np.testing.assert_array_equal(other.timestamps_ns, batch.timestamps_ns)
+                # Bộ lọc thông cao SOS theo block của IntegrationProcessor chỉ bằng nhau tới sai số làm tròn
+                atol = 1e-8 if key[1] == 'motion' else 1e-12
+                for name, column in batch.values.items():
+                    np.testing.assert_allclose(other.values[name], column, rtol=1e-9, atol=atol, err_msg=name)
+        limited = results['limit'][1]
+        self.assertGreater(limited.metrics['peak_bytes'], 0)
+        self.assertLessEqual(limited.metrics['peak_bytes'], 200_000)
+
+    def test_memory_limit_bounds_reader_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'imu.bin')
+            with open(path, 'wb') as f:
+                f.write(b''.join(accel_packet(1.0, 0.0, 0.0) for _ in range(2000)))
+            reader = FileReader({'file_path': path, 'chunk_size': 1 << 20})
+            collector = _Collector()
+            pipeline = Pipeline(reader, WitMotionDecoder({'sensor_id': 'imu1'}), visualizers=[collector],
+                                memory_limit=64 * 1024)
+            pipeline.run()
+        self.assertEqual(reader.chunk_size, 4096)
+        self.assertEqual(pipeline.metrics['chunks'], 6)
+        self.assertEqual(sum(len(b) for b in collector.items), 2000)
+
+if __name__ == '__main__':
+    unittest.main()
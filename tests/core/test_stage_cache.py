@@ -0,0 +1,177 @@
+# tests/core/test_stage_cache.py
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.core.pipeline import Pipeline
+from src.core.stage_cache import StageCache
+from src.data.models import SensorData, SensorDataBatch, as_batch
+from src.io.readers.file_reader import FileReader
+from src.plugins.decoders.witmotion_hwt905_decoder import WitMotionDecoder
+from src.plugins.processors.base_processor import BaseProcessor
+from src.plugins.processors.quality_processor import DataQualityProcessor
+from src.plugins.processors.resampling_processor import ResamplingProcessor
+from src.plugins.processors.time_offset_processor import TimeOffsetProcessor
+from tests.core.test_pipeline import _Collector
+from tests.plugins.test_time_offset_processor import _streams
+from tests.plugins.test_witmotion_decoder import accel_packet
+
+class _Scale(BaseProcessor):
+    """Nhân mọi kênh với `factor` và đếm số lần được gọi."""
+    def __init__(self, config):
+        super().__init__(config)
+        self.calls = 0
+
+    def process(self, data):
+        self.calls += 1
+        batch = as_batch(data)
+        out = batch.slice()
+        for name in out.values:
+            out.values[name] = out.values[name] * self.config['factor']
+        out.metadata['scale'] = np.array([self.config['factor']])
+        yield out
+
+class _RecordingReader:
+    """Reader trả về các batch đã giải mã nhưng có `file_path` để dùng được cache."""
+    def __init__(self, path, batches, chunk=50):
+        self.config = {'file_path': path}
+        self.pieces = [batch.slice(start, start + chunk)
+                       for start in range(0, len(batches[0]), chunk) for batch in batches]
+
+    def open(self):
+        pass
+
+    def close(self):
+        pass
+
+    def read(self):
+        return iter(self.pieces)
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'imu.bin')
+        with open(self.path, 'wb') as f:
+            f.write(b''.join(accel_packet(0.01 * i, 0.0, 1.0) for i in range(200)))
+        self.cache = StageCache(os.path.join(self.tmp.name, 'cache'))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, first=2.0, second=3.0):
+        collector = _Collector()
+        processors = [_Scale({'factor': first}), _Scale({'factor': second})]
+        pipeline = Pipeline(FileReader({'file_path': self.path, 'chunk_size': 256}),
+                            WitMotionDecoder({'sensor_id': 'imu1'}), processors=processors,
+                            visualizers=[collector], cache=self.cache)
+        pipeline.run()
+        joined = SensorDataBatch.concatenate([as_batch(item) for item in collector.items])
+        return pipeline, processors, joined
+
+    def test_resumes_from_deepest_cached_stage(self):
+        pipeline, processors, first = self._run()
+        self.assertIsNone(pipeline.metrics['cached_stage'])
+        self.assertEqual(len(self.cache.entries()), 3)
+        np.testing.assert_allclose(first.values['accX'], 6.0 * 0.01 * np.arange(200), atol=1e-2)
+
+        # Chỉ đổi processor cuối: đọc tiếp từ đầu ra của processor đầu tiên
+        pipeline, processors, changed = self._run(second=5.0)
+        self.assertEqual(pipeline.metrics['cached_stage'], 1)
+        self.assertEqual(pipeline.metrics['bytes'], 0)
+        self.assertEqual(processors[0].calls, 0)
+        self.assertGreater(processors[1].calls, 0)
+        np.testing.assert_allclose(changed.values['accX'], first.values['accX'] * 5.0 / 3.0)
+        np.testing.assert_array_equal(changed.timestamps_ns, first.timestamps_ns)
+        self.assertEqual(changed.metadata['scale'][0], 5.0)
+
+        # Không đổi gì: dùng thẳng đầu ra của tầng cuối
+        pipeline, processors, same = self._run()
+        self.assertEqual(pipeline.metrics['cached_stage'], 2)
+        self.assertEqual(processors[1].calls, 0)
+        np.testing.assert_array_equal(same.values['accX'], first.values['accX'])
+        self.assertEqual(same.units, first.units)
+
+        # File thay đổi: khóa mới, chạy lại từ đầu
+        os.utime(self.path, ns=(0, 0))
+        pipeline, processors, _ = self._run()
+        self.assertIsNone(pipeline.metrics['cached_stage'])
+
+    def test_feedback_config_invalidates_upstream_stage(self):
+        batches = _streams(60.0, {'a': 0, 'b': 30_000_000})
+
+        def run(gain, cache):
+            collector = _Collector()
+            estimator = TimeOffsetProcessor({'window': 4.0, 'max_lag': 0.2, 'gain': gain})
+            pipeline = Pipeline(_RecordingReader(self.path, batches),
+                                processors=[ResamplingProcessor({'rate': 100.0, 'group_by': 'all', 'warmup': 0.5}),
+                                            estimator],
+                                visualizers=[collector], cache=cache)
+            pipeline.run()
+            estimates = [o for o in collector.items if isinstance(o, SensorData) and o.data_type == 'time_offset']
+            return pipeline, estimates[-1].values['b']
+
+        run(0.5, self.cache)
+        # Đầu ra của resampler phụ thuộc vào phản hồi của estimator: đổi `gain` phải chạy lại resampler
+        pipeline, cached = run(0.3, self.cache)
+        self.assertEqual(pipeline.metrics['cached_stage'], 0)
+        _, fresh = run(0.3, None)
+        self.assertAlmostEqual(cached, fresh)
+        self.assertAlmostEqual(cached, 0.030, delta=0.002)
+
+        pipeline, _ = run(0.3, self.cache)
+        self.assertEqual(pipeline.metrics['cached_stage'], 2)
+
+    def test_metrics_of_skipped_processors_are_restored(self):
+        def run(factor):
+            pipeline = Pipeline(FileReader({'file_path': self.path, 'chunk_size': 256}),
+                                WitMotionDecoder({'sensor_id': 'imu1'}),
+                                processors=[DataQualityProcessor({'data_rate': 100.0}), _Scale({'factor': factor})],
+                                cache=self.cache)
+            pipeline.run()
+            return pipeline
+
+        first = run(2.0)
+        resumed = run(3.0)
+        self.assertEqual(resumed.metrics['cached_stage'], 1)
+        self.assertEqual(resumed.metrics['quality'], first.metrics['quality'])
+        self.assertEqual(resumed.metrics['quality']['imu1']['accelerometer']['samples'], 200)
+        self.assertEqual(run(3.0).metrics['quality'], first.metrics['quality'])
+
+    def test_incomplete_run_is_not_cached(self):
+        pipeline = Pipeline(FileReader({'file_path': self.path, 'chunk_size': 256}),
+                            WitMotionDecoder({'sensor_id': 'imu1'}), processors=[_Scale({'factor': 1.0})],
+                            cache=self.cache)
+        pipeline.open()
+        pipeline.run_step()
+        pipeline.close()
+        self.assertEqual(self.cache.entries(), [])
+        self.assertEqual([e for e in os.listdir(self.cache.directory)], [])
+
+    def test_samples_roundtrip_and_lru_eviction(self):
+        sample = SensorData(timestamp_ns=5, sensor_id='s', data_type='angle', values={'roll': 1.5},
+                            units={'roll': 'deg'}, metadata={'nested': {'bands': [(1.0, 2.0)]}})
+        for index in range(3):
+            writer = self.cache.writer(f"key{index}")
+            writer.append([sample, SensorDataBatch(np.arange(1000), 's', 'imu', {'x': np.zeros(1000)})])
+            self.assertTrue(writer.commit())
+            os.utime(os.path.join(self.cache.path(f"key{index}"), 'manifest.json'), (index, index))
+        chunks = list(self.cache.read('key0'))     # key0 trở thành mục dùng gần nhất
+        restored = chunks[0][0]
+        self.assertIsInstance(restored, SensorData)
+        self.assertEqual(restored.values, {'roll': 1.5})
+        self.assertEqual(restored.metadata, {'nested': {'bands': [[1.0, 2.0]]}})
+
+        size = max(e['bytes'] for e in self.cache.entries())
+        self.cache.max_bytes = 2 * size
+        self.cache.evict()
+        self.assertEqual(sorted(e['key'] for e in self.cache.entries()), ['key0', 'key2'])
+
+        writer = self.cache.writer('bad')
+        writer.append([object()])
+        self.assertFalse(writer.commit())
+        self.assertFalse(self.cache.has('bad'))
+
+if __name__ == '__main__':
+    unittest.main()
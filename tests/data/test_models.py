@@ -0,0 +1,78 @@
+# tests/data/test_models.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch, as_batch
+
+class TestSensorData(unittest.TestCase):
+    def test_timestamp_ns_is_primary(self):
+        """timestamp_ns là trường chính, timestamp (giây) được suy ra."""
+        data = SensorData(1_700_000_000_123_456_789, 'imu1', 'accelerometer', values={'accX': 1.0})
+        self.assertEqual(data.timestamp_ns, 1_700_000_000_123_456_789)
+        self.assertAlmostEqual(data.timestamp, 1_700_000_000.1234567, places=6)
+
+    def test_numpy_integer_is_converted(self):
+        data = SensorData(np.int64(42), 'imu1', 'accelerometer')
+        self.assertIs(type(data.timestamp_ns), int)
+        self.assertEqual(data.timestamp_ns, 42)
+
+    def test_float_seconds_are_rejected(self):
+        for value in (1.7e9, np.float64(1.7e9), '1700000000'):
+            with self.assertRaises(TypeError) as context:
+                SensorData(value, 'imu1', 'accelerometer')
+            self.assertIn('nanoseconds', str(context.exception))
+        with self.assertRaisesRegex(TypeError, 'from_seconds'):
+            SensorData(1.7e9, 'imu1', 'accelerometer')
+
+    def test_from_seconds_keeps_precision(self):
+        data = SensorData.from_seconds(1_700_000_000.5, 'imu1', 'gyroscope')
+        self.assertEqual(data.timestamp_ns, 1_700_000_000_500_000_000)
+
+class TestSensorDataBatch(unittest.TestCase):
+    def _make_batch(self, n=5):
+        return SensorDataBatch(
+            timestamps_ns=np.arange(n, dtype=np.int64) * 10_000_000,
+            sensor_id='imu1',
+            data_type='accelerometer',
+            values={'accX': np.arange(n, dtype=float), 'accY': -np.arange(n, dtype=float)},
+            units={'accX': 'g', 'accY': 'g'},
+        )
+
+    def test_roundtrip_samples(self):
+        batch = self._make_batch()
+        samples = list(batch.iter_samples())
+        self.assertEqual(len(samples), 5)
+        rebuilt = SensorDataBatch.from_samples(samples)
+        np.testing.assert_array_equal(rebuilt.timestamps_ns, batch.timestamps_ns)
+        np.testing.assert_array_equal(rebuilt.values['accY'], batch.values['accY'])
+
+    def test_to_array_and_slice(self):
+        batch = self._make_batch()
+        arr = batch.to_array(['accY', 'accX'])
+        self.assertEqual(arr.shape, (5, 2))
+        np.testing.assert_array_equal(arr[:, 1], batch.values['accX'])
+        part = batch.slice(1, 3)
+        self.assertEqual(len(part), 2)
+        self.assertTrue(np.shares_memory(part.values['accX'], batch.values['accX']))
+
+    def test_concatenate(self):
+        batch = self._make_batch()
+        joined = SensorDataBatch.concatenate([batch.slice(0, 2), batch.slice(2, None)])
+        np.testing.assert_array_equal(joined.timestamps_ns, batch.timestamps_ns)
+
+    def test_from_samples_rejects_mixed_sensors(self):
+        with self.assertRaises(ValueError):
+            SensorDataBatch.from_samples([
+                SensorData(0, 'a', 'accelerometer'),
+                SensorData(1, 'b', 'accelerometer'),
+            ])
+
+    def test_as_batch(self):
+        sample = SensorData(7, 'imu1', 'angle', values={'roll': 1.5})
+        batch = as_batch(sample)
+        self.assertEqual(len(batch), 1)
+        self.assertIsNone(as_batch("not sensor data"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+# tests/io/test_cached_reader.py
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from src.io.readers.cached_reader import CachedRecordingReader
+from src.plugins.decoders.witmotion_hwt905_decoder import WitMotionDecoder
+from tests.plugins.test_witmotion_decoder import accel_packet
+
+class TestCachedRecordingReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, 'imu.bin')
+        with open(self.path, 'wb') as f:
+            f.write(b''.join(accel_packet(0.001 * i, -0.5, 1.0) for i in range(500)))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _read(self, **config):
+        reader = CachedRecordingReader(dict({'file_path': self.path, 'chunk_size': 512,
+                                             'decoder_params': {'sensor_id': 'imu1'}}, **config))
+        return reader, list(reader.read())
+
+    def test_second_read_maps_cache_without_decoding(self):
+        reader, first = self._read()
+        self.assertFalse(reader.from_cache)
+        self.assertTrue(os.path.isdir(self.path + '.decoded'))
+        with mock.patch.object(WitMotionDecoder, 'decode_batch', side_effect=AssertionError('decoded')):
+            reader, second = self._read()
+        self.assertTrue(reader.from_cache)
+        self.assertEqual(len(second), len(first))
+        for a, b in zip(first, second):
+            self.assertEqual((a.sensor_id, a.data_type, a.units), (b.sensor_id, b.data_type, b.units))
+            np.testing.assert_array_equal(a.timestamps_ns, b.timestamps_ns)
+            for name in a.values:
+                np.testing.assert_array_equal(a.values[name], b.values[name])
+        self.assertIsInstance(second[0].values['accX'].base, np.memmap)
+
+    def test_key_changes_with_decoder_params_and_file(self):
+        self._read()
+        reader, _ = self._read(decoder_params={'sensor_id': 'other'})
+        self.assertFalse(reader.from_cache)
+        with open(self.path, 'ab') as f:
+            f.write(accel_packet(0.0, 0.0, 1.0))
+        reader, batches = self._read()
+        self.assertFalse(reader.from_cache)
+        self.assertEqual(sum(len(b) for b in batches), 501)
+        # Cache cạnh file chỉ giữ phiên bản mới nhất
+        self.assertEqual(len(os.listdir(self.path + '.decoded')), 1)
+
+    def test_partial_read_is_not_cached_and_cache_dir_limit(self):
+        reader = CachedRecordingReader({'file_path': self.path, 'chunk_size': 512})
+        source = reader.read()
+        next(source)
+        source.close()
+        self.assertFalse(os.path.exists(os.path.join(reader.cache_path(), 'manifest.json')))
+
+        cache_dir = os.path.join(self.tmp.name, 'cache')
+        self._read(cache_dir=cache_dir)
+        self.assertEqual(len(os.listdir(cache_dir)), 1)
+        reader, _ = self._read(cache_dir=cache_dir, decoder_params={'sensor_id': 'b'}, max_bytes=1)
+        # Vượt giới hạn: mục cũ nhất (kể cả mục vừa ghi) bị xóa
+        self.assertEqual(os.listdir(cache_dir), [])
+
+    def test_wall_clock_timestamp_modes_are_not_cached(self):
+        for params in ({'timestamp_mode': 'realtime'}, {'timestamp_mode': 'unix'}):
+            reader, first = self._read(decoder_params=dict(params, sensor_id='imu1'))
+            self.assertFalse(reader.from_cache)
+            self.assertFalse(os.path.exists(self.path + '.decoded'))
+            reader, second = self._read(decoder_params=dict(params, sensor_id='imu1'))
+            self.assertFalse(reader.from_cache)
+            # Timestamp mới từ đồng hồ host, không phải bản phát lại
+            self.assertGreater(int(second[0].timestamps_ns[0]), int(first[0].timestamps_ns[0]))
+        # 'unix' với start_time cố định là tất định nên vẫn được cache
+        self._read(decoder_params={'sensor_id': 'imu1', 'timestamp_mode': 'unix', 'start_time': 1.7e9})
+        reader, _ = self._read(decoder_params={'sensor_id': 'imu1', 'timestamp_mode': 'unix', 'start_time': 1.7e9})
+        self.assertTrue(reader.from_cache)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+# tests/io/test_file_io.py
+import csv
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch
+from src.io.readers.file_reader import FileReader
+from src.io.writers.csv_writer import CsvWriter
+
+class TestFileReader(unittest.TestCase):
+    def test_reads_in_chunks(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'data.bin')
+            payload = bytes(range(256)) * 10
+            with open(path, 'wb') as f:
+                f.write(payload)
+            with FileReader({'file_path': path, 'chunk_size': 100}) as reader:
+                chunks = list(reader.read())
+                status = reader.get_status()
+            self.assertEqual(b''.join(chunks), payload)
+            self.assertEqual(len(chunks), 26)
+            self.assertEqual(status['bytes_read'], len(payload))
+            self.assertIsInstance(status['last_read_ns'], int)
+
+class TestCsvWriter(unittest.TestCase):
+    def test_writes_integer_nanoseconds(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'out.csv')
+            batch = SensorDataBatch(
+                timestamps_ns=np.array([1_700_000_000_000_000_001, 1_700_000_000_000_000_002]),
+                sensor_id='imu1',
+                data_type='accelerometer',
+                values={'accX': np.array([0.5, 0.25])},
+            )
+            with CsvWriter({'file_path': path}) as writer:
+                writer.write(batch)
+                writer.write(SensorData(1_700_000_000_000_000_003, 'imu1', 'accelerometer', values={'accX': 1.0}))
+            with open(path, newline='') as f:
+                rows = list(csv.reader(f))
+            self.assertEqual(rows[0], ['timestamp_ns', 'sensor_id', 'data_type', 'accX'])
+            self.assertEqual([int(r[0]) for r in rows[1:]],
+                             [1_700_000_000_000_000_001, 1_700_000_000_000_000_002, 1_700_000_000_000_000_003])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+# tests/io/test_merge_reader.py
+import contextlib
+import io
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+
+from src.core.pipeline import Pipeline
+from src.io.readers.merge_reader import MergedRecordingReader
+from tests.plugins.test_witmotion_decoder import accel_packet, time_packet
+
+def _write_recording(path, start, n, step_ms):
+    """Ghi một file HWT905 giả lập: mỗi chu kỳ một gói thời gian và một gói gia tốc."""
+    with open(path, 'wb') as f:
+        for i in range(n):
+            f.write(time_packet(start + timedelta(milliseconds=i * step_ms)))
+            f.write(accel_packet(i % 7, 0.0, 1.0))
+
+class _Collector:
+    def __init__(self):
+        self.items = []
+
+    def visualize(self, data):
+        self.items.append(data)
+
+    def setup(self):
+        pass
+
+    def teardown(self):
+        pass
+
+class TestMergedRecordingReader(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+        # Ba cảm biến lệch pha và khác tần số
+        for k, step in enumerate((10, 10, 20)):
+            _write_recording(os.path.join(self.tmp.name, f'imu{k}.bin'),
+                             start + timedelta(milliseconds=3 * k), 300, step)
+        self.config = {
+            'pattern': os.path.join(self.tmp.name, '*.bin'),
+            'decoder_params': {'timestamp_mode': 'chiptime'},
+            'chunk_size': 512,
+        }
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _merged(self, **overrides):
+        reader = MergedRecordingReader(dict(self.config, **overrides))
+        return [b for b in reader.read() if b.data_type == 'accelerometer']
+
+    def test_strict_merge_is_time_ordered(self):
+        batches = self._merged(merge_window=0)
+        ts = np.concatenate([b.timestamps_ns for b in batches])
+        self.assertEqual(ts.shape[0], 900)
+        self.assertTrue(np.all(np.diff(ts) >= 0))
+        self.assertEqual({b.sensor_id for b in batches}, {'imu0', 'imu1', 'imu2'})
+
+    def test_windowed_merge_keeps_batches_large(self):
+        batches = self._merged(merge_window=0.1)
+        starts = [int(b.timestamps_ns[0]) for b in batches]
+        self.assertTrue(all(a <= b for a, b in zip(starts, starts[1:])))
+        self.assertEqual(sum(len(b) for b in batches), 900)
+        self.assertLess(len(batches), len(self._merged(merge_window=0)))
+
+    def test_feeds_pipeline_without_decoder(self):
+        collector = _Collector()
+        pipeline = Pipeline(MergedRecordingReader(self.config), decoder=None, visualizers=[collector])
+        pipeline.run()
+        self.assertEqual(sum(len(b) for b in collector.items if b.data_type == 'accelerometer'), 900)
+        self.assertGreater(pipeline.metrics['chunks'], 0)
+
+    def test_defaults_to_chiptime_and_warns_for_packet_mode(self):
+        config = {'pattern': self.config['pattern'], 'chunk_size': 512}
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            reader = MergedRecordingReader(config)
+        self.assertEqual(reader.decoder_params['timestamp_mode'], 'chiptime')
+        self.assertNotIn('Warning', output.getvalue())
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            MergedRecordingReader(dict(config, decoder_params={'timestamp_mode': 'packet'}))
+        self.assertIn("timestamp_mode 'packet'", output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# tests/plugins/test_calibration_processor.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch
+from src.plugins.processors.calibration_processor import CalibrationProcessor
+from src.utils.calibration import AxisCalibration
+
+MATRIX = [[1.02, 0.01, 0.0], [0.0, 0.98, -0.02], [0.01, 0.0, 1.01]]
+OFFSET = [0.05, -0.03, 0.02]
+
+class TestCalibrationProcessor(unittest.TestCase):
+    def setUp(self):
+        self.processor = CalibrationProcessor({'calibrations': {
+            'imu1': {'accelerometer': {'matrix': MATRIX, 'offset': OFFSET}},
+            'imu2': {'gyroscope': {'offset': [1.0, 2.0, 3.0]}},
+        }})
+        self.raw = np.random.default_rng(0).normal(size=(50, 3))
+        self.ts = np.arange(50, dtype=np.int64) * 10_000_000
+
+    def test_batch_matches_per_sample_apply(self):
+        batch = SensorDataBatch(self.ts, 'imu1', 'accelerometer',
+                                {'accX': self.raw[:, 0], 'accY': self.raw[:, 1], 'accZ': self.raw[:, 2],
+                                 'temperature': np.full(50, 25.0)})
+        out = list(self.processor.process(batch))
+        self.assertEqual(len(out), 1)
+        expected = AxisCalibration(MATRIX, OFFSET).apply(self.raw)
+        np.testing.assert_allclose(out[0].to_array(['accX', 'accY', 'accZ']), expected)
+        np.testing.assert_array_equal(out[0].values['temperature'], 25.0)
+        # Batch đầu vào không bị sửa
+        np.testing.assert_array_equal(batch.values['accX'], self.raw[:, 0])
+
+    def test_prefixed_multi_sensor_batch(self):
+        values = {}
+        for sid in ('imu1', 'imu2'):
+            for i, axis in enumerate('XYZ'):
+                values[f'{sid}.acc{axis}'] = self.raw[:, i]
+                values[f'{sid}.gyro{axis}'] = self.raw[:, i]
+        out = list(self.processor.process(SensorDataBatch(self.ts, 'all', 'imu', values)))[0]
+        acc1 = out.to_array(['imu1.accX', 'imu1.accY', 'imu1.accZ'])
+        np.testing.assert_allclose(acc1, AxisCalibration(MATRIX, OFFSET).apply(self.raw))
+        gyro2 = out.to_array(['imu2.gyroX', 'imu2.gyroY', 'imu2.gyroZ'])
+        np.testing.assert_allclose(gyro2, self.raw - [1.0, 2.0, 3.0])
+        # Không có hiệu chuẩn -> giữ nguyên
+        np.testing.assert_array_equal(out.values['imu2.accX'], self.raw[:, 0])
+        np.testing.assert_array_equal(out.values['imu1.gyroX'], self.raw[:, 0])
+
+    def test_sensor_data_and_unknown_sensor(self):
+        sample = SensorData(timestamp_ns=0, sensor_id='imu2', data_type='gyroscope',
+                            values={'gyroX': 1.5, 'gyroY': 2.0, 'gyroZ': 3.0})
+        out = list(self.processor.process(sample))
+        self.assertEqual(len(out), 1)
+        self.assertIsInstance(out[0], SensorData)
+        self.assertAlmostEqual(out[0].values['gyroX'], 0.5)
+        other = SensorData(timestamp_ns=0, sensor_id='imu9', data_type='gyroscope',
+                           values={'gyroX': 1.5, 'gyroY': 2.0, 'gyroZ': 3.0})
+        self.assertIs(list(self.processor.process(other))[0], other)
+
+if __name__ == '__main__':
+    unittest.main()
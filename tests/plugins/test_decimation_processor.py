@@ -0,0 +1,73 @@
+# tests/plugins/test_decimation_processor.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch
+from src.plugins.processors.decimation_processor import DecimationProcessor
+
+def _batch(signal, sensor_id='imu1', data_type='accelerometer'):
+    n = signal.shape[0]
+    return SensorDataBatch(np.arange(n) * 5_000_000, sensor_id, data_type,
+                           values={'accX': signal[:, 0], 'accY': signal[:, 1],
+                                   'count': np.arange(n, dtype=np.int64)},
+                           units={'accX': 'g', 'accY': 'g'})
+
+class TestDecimationProcessor(unittest.TestCase):
+    def test_streaming_equals_offline(self):
+        signal = np.random.default_rng(0).standard_normal((4000, 2))
+        config = {'sample_rate': 200.0, 'factor': 20}
+        offline = DecimationProcessor(config)
+        whole = list(offline.process(_batch(signal))) + list(offline.flush())
+        live = DecimationProcessor(config)
+        batch = _batch(signal)
+        parts = [b for start in range(0, 4000, 20) for b in live.process(batch.slice(start, start + 20))]
+        parts += list(live.flush())
+        merged = SensorDataBatch.concatenate(parts)
+        expected = SensorDataBatch.concatenate(whole)
+        self.assertEqual(len(expected), 200)
+        np.testing.assert_allclose(merged.values['accY'], expected.values['accY'], atol=1e-12)
+        np.testing.assert_array_equal(merged.timestamps_ns, np.arange(200) * 100_000_000)
+        self.assertEqual(set(merged.values), {'accX', 'accY'})
+        self.assertEqual(merged.units['accX'], 'g')
+        self.assertEqual(merged.metadata['rate'], 10.0)
+
+    def test_rational_rate_and_passthrough(self):
+        proc = DecimationProcessor({'sample_rate': 200.0, 'output_rate': 80.0, 'data_types': ['accelerometer']})
+        self.assertEqual((proc.up, proc.down), (2, 5))
+        ones = np.ones((1000, 2))
+        out = list(proc.process(_batch(ones))) + list(proc.flush())
+        self.assertEqual(sum(len(b) for b in out), 400)
+        for b in out:
+            np.testing.assert_allclose(b.values['accX'], 1.0, atol=1e-4)
+        other = _batch(ones, data_type='gyroscope')
+        self.assertIs(next(proc.process(other)), other)
+
+    def test_single_samples(self):
+        proc = DecimationProcessor({'sample_rate': 100.0, 'factor': 4, 'channels': ['accX']})
+        out = []
+        for i in range(400):
+            out += list(proc.process(SensorData(i * 10_000_000, 'imu1', 'accelerometer', values={'accX': 2.0})))
+        self.assertTrue(all(isinstance(s, SensorData) for s in out))
+        self.assertAlmostEqual(out[-1].values['accX'], 2.0)
+        # Phần còn lại (độ trễ của bộ lọc) được xuất khi flush
+        self.assertEqual(len(out) + sum(len(b) for b in proc.flush()), 100)
+
+    def test_missing_channel_restarts_stream(self):
+        proc = DecimationProcessor({'sample_rate': 200.0, 'factor': 4})
+        list(proc.process(_batch(np.ones((400, 2)))))
+        partial = SensorDataBatch(np.arange(400, 800) * 5_000_000, 'imu1', 'accelerometer',
+                                  values={'accY': np.ones(400)})
+        out = list(proc.process(partial))
+        self.assertEqual(list(out[0].values), ['accY'])
+        self.assertEqual(proc.streams[('imu1', 'accelerometer')].channels, ['accY'])
+
+    def test_overwrites_resampler_rate(self):
+        batch = _batch(np.ones((800, 2)))
+        batch.metadata['rate'] = 200.0
+        proc = DecimationProcessor({'sample_rate': 200.0, 'factor': 4})
+        out = list(proc.process(batch))
+        self.assertEqual(out[0].metadata, {'rate': 50.0})
+
+if __name__ == '__main__':
+    unittest.main()
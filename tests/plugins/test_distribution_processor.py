@@ -0,0 +1,65 @@
+# tests/plugins/test_distribution_processor.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorDataBatch
+from src.plugins.processors.distribution_processor import DistributionProcessor
+
+NS = 1_000_000_000
+
+def _batches(sensor_id, values, rate=100.0, chunk=250, start_s=0.0):
+    ts = int(start_s * NS) + (np.arange(len(values)) * (NS / rate)).astype(np.int64)
+    batch = SensorDataBatch(ts, sensor_id, 'accelerometer', values={'acc_mag': values}, units={'acc_mag': 'g'})
+    return [batch.slice(s, s + chunk) for s in range(0, len(batch), chunk)]
+
+class TestDistributionProcessor(unittest.TestCase):
+    def test_emits_quantiles_and_histogram(self):
+        rng = np.random.default_rng(0)
+        values = rng.uniform(0.0, 2.0, 6000)
+        proc = DistributionProcessor({'bucket': 0, 'emit_interval': 10.0, 'passthrough': False,
+                                      'histogram': {'low': 0.0, 'high': 2.0, 'bins': 20}})
+        out = [o for b in _batches('imu1', values) for o in proc.process(b)]
+        # Phát tại batch đầu tiên rồi mỗi 10 s: các batch kết thúc ở 2.49 s, 12.49 s, ..., 52.49 s
+        self.assertEqual(len(out), 6)
+        last = out[-1]
+        self.assertEqual(int(last.timestamps_ns[0]), 52_490_000_000)
+        self.assertEqual(last.data_type, 'distribution')
+        self.assertEqual(set(last.channels), {'acc_mag_p50', 'acc_mag_p95', 'acc_mag_p99'})
+        self.assertAlmostEqual(float(last.values['acc_mag_p95'][0]), 1.9, delta=0.02)
+        self.assertEqual(last.units['acc_mag_p99'], 'g')
+        counts = last.metadata['histogram']['acc_mag']
+        self.assertEqual(counts.sum(), 5250)
+        self.assertEqual(last.metadata['count']['acc_mag'], 5250)
+
+    def test_buckets_bound_horizon(self):
+        proc = DistributionProcessor({'bucket': 10.0, 'max_buckets': 2, 'emit_interval': 0.0, 'passthrough': False})
+        # 30 s giá trị 1.0 rồi 20 s giá trị 5.0: cửa sổ 2 khoảng cuối chỉ còn 5.0
+        values = np.concatenate([np.ones(3000), np.full(2000, 5.0)])
+        out = [o for b in _batches('imu1', values) for o in proc.process(b)]
+        self.assertEqual(len(proc.streams[('imu1', 'accelerometer')].buckets), 2)
+        self.assertEqual(float(out[-1].values['acc_mag_p50'][0]), 5.0)
+        self.assertEqual(out[-1].metadata['count']['acc_mag'], 2000)
+
+    def test_summary_merges_sensors(self):
+        proc = DistributionProcessor({'bucket': 0, 'passthrough': False})
+        for sensor_id, loc in (('a', 0.0), ('b', 10.0)):
+            for b in _batches(sensor_id, np.random.default_rng(1).normal(loc, 1.0, 5000)):
+                list(proc.process(b))
+        summary = proc.summary()
+        self.assertEqual(summary['acc_mag']['count'], 10_000)
+        self.assertAlmostEqual(summary['acc_mag']['quantiles']['p50'], 5.0, delta=1.0)
+        only_b = proc.summary(sensor_ids=['b'])
+        self.assertAlmostEqual(only_b['acc_mag']['quantiles']['p50'], 10.0, delta=0.1)
+
+    def test_channel_layout_change_restarts_stream(self):
+        proc = DistributionProcessor({'bucket': 0, 'emit_interval': 0.0, 'passthrough': False})
+        ts = np.arange(100, dtype=np.int64) * 10_000_000
+        list(proc.process(SensorDataBatch(ts, 'imu1', 'imu', {'accX': np.ones(100), 'accZ': np.ones(100)})))
+        out = list(proc.process(SensorDataBatch(ts + NS, 'imu1', 'imu', {'accX': np.full(100, 3.0)})))
+        self.assertEqual(set(out[0].channels), {'accX_p50', 'accX_p95', 'accX_p99'})
+        self.assertEqual(float(out[0].values['accX_p50'][0]), 3.0)
+        self.assertEqual(out[0].metadata['count']['accX'], 100)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+# tests/plugins/test_event_processor.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorDataBatch
+from src.plugins.processors.event_processor import EventDetectorProcessor
+
+FS = 100.0
+
+def _recording():
+    """20 giây nhiễu nhỏ quanh 1 g với hai cú va đập: 5.00 s (0.2 s) và 12.00 s (hai xung sát nhau)."""
+    rng = np.random.default_rng(0)
+    n = 2000
+    z = 1.0 + 0.01 * rng.standard_normal(n)
+    z[500:520] += 4.0
+    z[1200:1205] += 3.0
+    z[1230:1235] += 3.0
+    ts = (np.arange(n) * (1e9 / FS)).astype(np.int64)
+    return SensorDataBatch(ts, 'imu1', 'accelerometer', {'accX': np.zeros(n), 'accY': np.zeros(n), 'accZ': z},
+                           units={'accX': 'g', 'accY': 'g', 'accZ': 'g'})
+
+def _run(proc, whole, size):
+    outputs = [o for start in range(0, len(whole), size) for o in proc.process(whole.slice(start, start + size))]
+    return outputs + list(proc.flush())
+
+class TestEventDetectorProcessor(unittest.TestCase):
+    def test_events_and_captures(self):
+        config = {'threshold': 2.5, 'reset_threshold': 1.5, 'pre_trigger': 0.5, 'post_trigger': 1.0,
+                  'passthrough': False}
+        events = [o for o in _run(EventDetectorProcessor(config), _recording(), 25) if o.data_type == 'event']
+        captures = [o for o in _run(EventDetectorProcessor(config), _recording(), 25)
+                    if o.data_type == 'event_capture']
+        self.assertEqual(len(events), 2)
+        self.assertEqual(events[0].timestamp, 5.0)
+        self.assertAlmostEqual(events[0].values['duration'], 0.19)
+        self.assertGreater(events[0].values['peak'], 4.5)
+        # Xung thứ hai nằm trong post-trigger của xung đầu nên được gộp vào cùng sự kiện
+        self.assertEqual(events[1].timestamp, 12.0)
+        self.assertAlmostEqual(events[1].values['duration'], 0.34)
+        first = captures[0]
+        self.assertEqual(first.timestamps[0], 4.5)
+        self.assertAlmostEqual(first.timestamps[-1], 5.19 + 1.0)
+        self.assertEqual(first.metadata['event_id'], 1)
+        self.assertEqual(len(first), len(np.unique(first.timestamps_ns)))
+
+    def test_batch_size_does_not_change_result(self):
+        config = {'threshold': 2.5, 'reset_threshold': 1.5, 'passthrough': False}
+        whole = _recording()
+        reference = [o for o in _run(EventDetectorProcessor(config), whole, len(whole)) if o.data_type == 'event_capture']
+        for size in (1, 7, 64):
+            captures = [o for o in _run(EventDetectorProcessor(config), whole, size) if o.data_type == 'event_capture']
+            self.assertEqual(len(captures), len(reference))
+            for got, expected in zip(captures, reference):
+                np.testing.assert_array_equal(got.timestamps_ns, expected.timestamps_ns)
+                np.testing.assert_array_equal(got.values['accZ'], expected.values['accZ'])
+
+    def test_max_duration_is_exact_for_any_batch_size(self):
+        config = {'threshold': 2.5, 'reset_threshold': 1.5, 'pre_trigger': 0.5, 'post_trigger': 1.0,
+                  'max_duration': 10.0, 'passthrough': False}
+        n = 4000
+        ts = (np.arange(n) * (1e9 / FS)).astype(np.int64)
+        z = np.ones(n)
+        z[500:2000] = 4.0      # 15 s vượt ngưỡng
+        z[3000:3020] = 4.0     # va đập ngắn sau khi đã nhả
+        burst = SensorDataBatch(ts, 'imu1', 'accelerometer', {'accZ': z}, units={'accZ': 'g'})
+        always = SensorDataBatch(np.arange(6000, dtype=np.int64) * 10_000_000, 'imu1', 'accelerometer',
+                                 {'accZ': np.full(6000, 4.0)}, units={'accZ': 'g'})
+        for whole in (burst, always):
+            reference = _run(EventDetectorProcessor(config), whole, len(whole))
+            for size in (1, 7, 64):
+                outputs = _run(EventDetectorProcessor(config), whole, size)
+                self.assertEqual([o.data_type for o in outputs], [o.data_type for o in reference])
+                for got, expected in zip(outputs, reference):
+                    if got.data_type == 'event_capture':
+                        np.testing.assert_array_equal(got.timestamps_ns, expected.timestamps_ns)
+                    else:
+                        self.assertEqual(got.values, expected.values)
+
+        outputs = _run(EventDetectorProcessor(config), burst, 64)
+        events = [o for o in outputs if o.data_type == 'event']
+        captures = [o for o in outputs if o.data_type == 'event_capture']
+        # Sự kiện dài bị cắt tại 5 + 10 s; không kích hoạt lại khi chưa nhả; va đập ở 30 s là sự kiện mới
+        self.assertEqual([e.timestamp for e in events], [5.0, 30.0])
+        self.assertAlmostEqual(events[0].values['duration'], 10.0)
+        self.assertEqual(captures[0].timestamps[0], 4.5)
+        self.assertEqual(captures[0].timestamps[-1], 15.0)
+        self.assertEqual(len(captures[0]), 1051)
+        always_events = [o for o in _run(EventDetectorProcessor(config), always, 997) if o.data_type == 'event']
+        self.assertEqual(len(always_events), 1)
+        self.assertLessEqual(always_events[0].values['samples'], 1001)
+
+    def test_idle_passthrough_and_flush(self):
+        whole = _recording()
+        proc = EventDetectorProcessor({'threshold': 2.5, 'post_trigger': 5.0})
+        outputs = list(proc.process(whole.slice(0, 510)))
+        self.assertEqual(len(outputs), 1)
+        self.assertIs(outputs[0].values['accZ'].base, whole.values['accZ'])
+        flushed = list(proc.flush())
+        self.assertEqual([o.data_type for o in flushed], ['event', 'event_capture'])
+        self.assertEqual(flushed[1].timestamps[-1], 5.09)
+
+    def test_channel_layout_change_finishes_event_and_restarts(self):
+        whole = _recording()
+        proc = EventDetectorProcessor({'threshold': 2.5, 'post_trigger': 5.0, 'passthrough': False})
+        self.assertEqual(list(proc.process(whole.slice(0, 510))), [])
+        rest = whole.slice(510, 2000)
+        partial = SensorDataBatch(rest.timestamps_ns, 'imu1', 'accelerometer',
+                                  {'accX': rest.values['accX'], 'accZ': rest.values['accZ']})
+        outputs = list(proc.process(partial)) + list(proc.flush())
+        self.assertEqual([o.data_type for o in outputs][:2], ['event', 'event_capture'])
+        self.assertEqual(outputs[1].timestamps[-1], 5.09)
+        self.assertEqual(proc.streams[('imu1', 'accelerometer')].channels, ['accX', 'accZ'])
+        # Sự kiện thứ hai (12 s) được phát hiện trên bố cục mới
+        self.assertEqual(sorted(outputs[-1].values), ['accX', 'accZ'])
+
+    def test_magnitude_ignores_temperature(self):
+        whole = _recording()
+        # Batch accelerometer của HWT905 có thêm kênh temperature (°C)
+        whole.values['temperature'] = np.full(len(whole), 25.0)
+        whole.units['temperature'] = '°C'
+        proc = EventDetectorProcessor({'threshold': 2.5, 'passthrough': False})
+        outputs = _run(proc, whole, 100)
+        self.assertEqual(proc.streams[('imu1', 'accelerometer')].channels, ['accX', 'accY', 'accZ'])
+        events = [o for o in outputs if o.data_type == 'event']
+        self.assertEqual(len(events), 2)
+        self.assertAlmostEqual(events[0].values['peak'], 5.0, delta=0.1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# tests/plugins/test_expression_processor.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch
+from src.plugins.processors.expression_processor import ExpressionProcessor
+
+def _batch(n=20, data_type='accelerometer'):
+    ts = np.arange(n, dtype=np.int64) * 10_000_000
+    rng = np.random.default_rng(3)
+    values = {c: rng.standard_normal(n) for c in ('accX', 'accY', 'accZ')}
+    return SensorDataBatch(ts, 'imu1', data_type, values=values, units={c: 'g' for c in values})
+
+class TestExpressionProcessor(unittest.TestCase):
+    def setUp(self):
+        self.proc = ExpressionProcessor({
+            'expressions': {
+                'acc_mag': 'sqrt(accX**2 + accY**2 + accZ**2)',
+                'tilt': 'degrees(arccos(accZ / acc_mag))',
+                'yaw_rate': 'gyroZ * 2',
+            },
+            'units': {'acc_mag': 'g', 'tilt': 'deg'},
+            'data_types': ['accelerometer'],
+        })
+
+    def test_adds_channels_to_batch(self):
+        batch = _batch()
+        out = list(self.proc.process(batch))
+        self.assertEqual(len(out), 1)
+        result = out[0]
+        mag = np.sqrt(batch.values['accX'] ** 2 + batch.values['accY'] ** 2 + batch.values['accZ'] ** 2)
+        np.testing.assert_allclose(result.values['acc_mag'], mag)
+        np.testing.assert_allclose(result.values['tilt'], np.degrees(np.arccos(batch.values['accZ'] / mag)))
+        self.assertEqual(result.units['tilt'], 'deg')
+        self.assertNotIn('yaw_rate', result.values)
+        self.assertNotIn('acc_mag', batch.values)
+        np.testing.assert_array_equal(result.values['accX'], batch.values['accX'])
+
+    def test_sensor_data_and_other_types(self):
+        sample = SensorData(timestamp_ns=0, sensor_id='imu1', data_type='accelerometer',
+                            values={'accX': 0.0, 'accY': 3.0, 'accZ': 4.0})
+        out = list(self.proc.process(sample))
+        self.assertEqual(len(out), 1)
+        self.assertIsInstance(out[0], SensorData)
+        self.assertAlmostEqual(out[0].values['acc_mag'], 5.0)
+        other = _batch(data_type='gyroscope')
+        self.assertIs(next(self.proc.process(other)), other)
+
+    def test_keep_inputs_false(self):
+        proc = ExpressionProcessor({'expressions': {'sum': 'accX + accY'}, 'keep_inputs': False})
+        out = next(proc.process(_batch()))
+        self.assertEqual(out.channels, ['sum'])
+
+    def test_invalid_expression_rejected(self):
+        with self.assertRaises(ValueError):
+            ExpressionProcessor({'expressions': {'bad': 'eval("1")'}})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+# tests/plugins/test_feature_processor.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorDataBatch
+from src.plugins.processors.feature_processor import FeatureProcessor
+from src.utils.features import FeatureExtractor, window_view
+
+def _batch(n=1000):
+    rng = np.random.default_rng(2)
+    ts = 1_000_000_000 + np.arange(n, dtype=np.int64) * 10_000_000
+    values = {'accX': rng.standard_normal(n), 'accZ': 1.0 + rng.standard_normal(n)}
+    return SensorDataBatch(ts, 'imu1', 'accelerometer', values=values, units={'accX': 'g', 'accZ': 'g'})
+
+class TestFeatureProcessor(unittest.TestCase):
+    def test_streaming_matches_offline(self):
+        batch = _batch()
+        config = {'window': 1.0, 'step': 0.3, 'features': ['mean', 'std', 'zero_crossings'], 'bands': [[1, 5]]}
+        proc = FeatureProcessor(config)
+        out = [o for start in range(0, len(batch), 77) for o in proc.process(batch.slice(start, start + 77))]
+        joined = SensorDataBatch.concatenate(out)
+
+        expected = FeatureExtractor(100, 100.0, config['features'], [(1, 5)]).compute(
+            window_view(batch.to_array(['accX', 'accZ']), 100, 30))
+        self.assertEqual(len(joined), expected.shape[0])
+        np.testing.assert_array_equal(joined.timestamps_ns, batch.timestamps_ns[99::30][:len(joined)])
+        np.testing.assert_allclose(joined.values['accZ_std'], expected[:, 1, 1])
+        np.testing.assert_allclose(joined.values['accX_band_1_5'], expected[:, 0, 3])
+        self.assertEqual(joined.units['accX_mean'], 'g')
+        self.assertEqual(joined.units['accX_band_1_5'], 'g^2')
+        self.assertEqual(joined.metadata['source_data_type'], 'accelerometer')
+
+    def test_filters_data_types_and_passthrough(self):
+        proc = FeatureProcessor({'window': 0.5, 'data_types': ['gyroscope'], 'passthrough': True})
+        batch = _batch(200)
+        self.assertEqual(list(proc.process(batch)), [batch])
+
+    def test_channel_layout_change_restarts_windows(self):
+        proc = FeatureProcessor({'window': 1.0, 'features': ['mean']})
+        batch = _batch(150)
+        list(proc.process(batch))
+        partial = SensorDataBatch(batch.timestamps_ns + 1_500_000_000, 'imu1', 'accelerometer',
+                                  values={'accZ': np.full(150, 2.0)})
+        out = list(proc.process(partial))
+        self.assertEqual(list(out[0].values), ['accZ_mean'])
+        # Phần đuôi của bố cục cũ bị bỏ: cửa sổ đầu tiên chỉ gồm mẫu mới
+        np.testing.assert_allclose(out[0].values['accZ_mean'], 2.0)
+        self.assertEqual(out[0].timestamps_ns[0], partial.timestamps_ns[99])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,70 @@
+# tests/plugins/test_filter_processor.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch
+from src.plugins.processors.filter_processor import (
+    LowPassFilterProcessor, HighPassFilterProcessor, BandPassFilterProcessor, NotchFilterProcessor,
+    SOSFilterProcessor)
+
+def _batch(signal, sensor_id='imu1'):
+    n = signal.shape[0]
+    return SensorDataBatch(np.arange(n) * 5_000_000, sensor_id, 'accelerometer',
+                           values={'accX': signal[:, 0], 'accY': signal[:, 1]}, units={'accX': 'g', 'accY': 'g'})
+
+class TestFilterProcessors(unittest.TestCase):
+    def test_streaming_equals_offline(self):
+        rng = np.random.default_rng(0)
+        signal = rng.standard_normal((2000, 2))
+        config = {'cutoff_freq': 10.0, 'sample_rate': 200.0}
+        offline = next(LowPassFilterProcessor(config).process(_batch(signal)))
+        live = LowPassFilterProcessor(config)
+        whole = _batch(signal)
+        parts = [b for start in range(0, 2000, 150) for b in live.process(whole.slice(start, start + 150))]
+        np.testing.assert_allclose(np.concatenate([p.values['accY'] for p in parts]), offline.values['accY'], atol=1e-10)
+        self.assertEqual(offline.units['accX'], 'g')
+
+    def test_state_is_per_sensor(self):
+        proc = HighPassFilterProcessor({'cutoff_freq': 1.0, 'sample_rate': 200.0, 'output_suffix': '_hp'})
+        ones = np.ones((400, 2))
+        a = next(proc.process(_batch(ones, 'a')))
+        b = next(proc.process(_batch(ones * 2, 'b')))
+        self.assertIn('accX_hp', a.values)
+        np.testing.assert_allclose(b.values['accX_hp'], 2 * a.values['accX_hp'])
+        np.testing.assert_array_equal(a.values['accX'], 1.0)
+
+    def test_missing_channel_resets_state_instead_of_failing(self):
+        proc = LowPassFilterProcessor({'cutoff_freq': 10.0, 'sample_rate': 200.0})
+        next(proc.process(_batch(np.ones((100, 2)))))
+        partial = SensorDataBatch(np.arange(100, 200) * 5_000_000, 'imu1', 'accelerometer',
+                                  values={'accY': np.ones(100), 'flag': np.zeros(100, dtype=np.uint8)})
+        out = next(proc.process(partial))
+        self.assertEqual(sorted(out.values), ['accY', 'flag'])
+        self.assertEqual(proc.states[('imu1', 'accelerometer')][0], ['accY'])
+        # Trạng thái mới: đáp ứng bậc bắt đầu lại từ 0
+        self.assertLess(out.values['accY'][0], 0.1)
+
+    def test_base_class_is_abstract(self):
+        with self.assertRaises(TypeError):
+            SOSFilterProcessor({})
+
+    def test_band_and_notch_attenuate(self):
+        t = np.arange(4000) / 200.0
+        tone = np.sin(2 * np.pi * 50.0 * t)
+        signal = np.stack([tone, tone], axis=1)
+        notch = next(NotchFilterProcessor({'notch_freq': 50.0, 'sample_rate': 200.0}).process(_batch(signal)))
+        self.assertLess(np.abs(notch.values['accX'][-500:]).max(), 0.05)
+        band = next(BandPassFilterProcessor({'low_freq': 5.0, 'high_freq': 15.0, 'sample_rate': 200.0})
+                    .process(_batch(signal)))
+        self.assertLess(np.abs(band.values['accX'][-500:]).max(), 0.05)
+
+    def test_single_sample_input(self):
+        proc = LowPassFilterProcessor({'cutoff_freq': 10.0, 'sample_rate': 200.0, 'channels': ['accX']})
+        out = list(proc.process(SensorData(0, 'imu1', 'accelerometer', values={'accX': 1.0, 'accY': 2.0})))
+        self.assertEqual(len(out), 1)
+        self.assertIsInstance(out[0], SensorData)
+        self.assertEqual(out[0].values['accY'], 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
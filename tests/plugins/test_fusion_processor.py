@@ -0,0 +1,82 @@
+# tests/plugins/test_fusion_processor.py
+import unittest
+
+import numpy as np
+
+from src.core.pipeline import Pipeline
+from src.data.models import SensorDataBatch
+from src.plugins.processors.fusion_processor import OrientationFusionProcessor
+from src.plugins.processors.integration_processor import IntegrationProcessor
+from src.utils.orientation_fusion import quat_from_euler, rotation_matrices
+from tests.core.test_pipeline import _BatchReader, _Collector
+
+FS = 200.0
+
+def _motion(n):
+    """Cảm biến nghiêng 20 độ, quay quanh trục đứng 30 deg/s: trả về (roll, pitch, yaw, acc, gyro, mag)."""
+    t = np.arange(n) / FS
+    roll, pitch, yaw = np.radians(20.0) * np.ones(n), np.radians(10.0) * np.sin(0.5 * t), np.radians(30.0) * t
+    rot = rotation_matrices(quat_from_euler(roll, pitch, yaw))
+    acc = rot[:, 2, :]
+    mag = np.einsum('nji,j->ni', rot, [np.cos(1.0), 0.0, -np.sin(1.0)]) * 40.0
+    # Vận tốc góc trong hệ cảm biến: [ω]x = R^T dR/dt
+    skew = rot.transpose(0, 2, 1) @ np.gradient(rot, axis=0) * FS
+    gyro = np.degrees(np.stack([skew[:, 2, 1], skew[:, 0, 2], skew[:, 1, 0]], axis=1))
+    return t, np.degrees(roll), np.degrees(yaw), acc, gyro, mag
+
+def _values(prefix, acc, gyro, mag):
+    values = {}
+    for j, axis in enumerate('XYZ'):
+        values[f'{prefix}acc{axis}'] = acc[:, j]
+        values[f'{prefix}gyro{axis}'] = gyro[:, j]
+        values[f'{prefix}mag{axis}'] = mag[:, j]
+    return values
+
+class TestOrientationFusionProcessor(unittest.TestCase):
+    def test_tracks_rotation_for_many_sensors(self):
+        t, roll, yaw, acc, gyro, mag = _motion(3000)
+        values = {}
+        for s in range(4):
+            values.update(_values(f'imu{s}.', acc, gyro, mag))
+        batch = SensorDataBatch((t * 1e9).astype(np.int64), 'all', 'imu', values, units={'imu0.gyroX': 'deg/s'})
+        for algorithm in ('madgwick', 'mahony'):
+            proc = OrientationFusionProcessor({'algorithm': algorithm})
+            outputs = [o for start in range(0, 3000, 250) for o in proc.process(batch.slice(start, start + 250))
+                       if o.data_type == 'orientation']
+            self.assertEqual({o.sensor_id for o in outputs}, {'imu0', 'imu1', 'imu2', 'imu3'})
+            fused = SensorDataBatch.concatenate([o for o in outputs if o.sensor_id == 'imu2'])
+            self.assertEqual(fused.data_type, 'orientation')
+            yaw_error = (fused.values['yaw'] - yaw + 180.0) % 360.0 - 180.0
+            self.assertLess(np.abs(yaw_error[-200:]).max(), 1.0)
+            self.assertLess(np.abs(fused.values['roll'][-200:] - roll[-200:]).max(), 1.0)
+
+    def test_single_sensor_channels_and_passthrough(self):
+        t, _, _, acc, gyro, mag = _motion(400)
+        batch = SensorDataBatch((t * 1e9).astype(np.int64), 'imu7', 'imu', _values('', acc, gyro, mag))
+        proc = OrientationFusionProcessor({'use_magnetometer': False, 'passthrough': False})
+        out = list(proc.process(batch))
+        self.assertEqual(len(out), 1)
+        self.assertEqual(out[0].sensor_id, 'imu7')
+        np.testing.assert_allclose(out[0].to_array(['qw', 'qx', 'qy', 'qz']) ** 2 @ np.ones(4), 1.0)
+        other = SensorDataBatch(np.arange(3), 'imu7', 'accelerometer', {'accX': np.zeros(3)})
+        self.assertIs(next(proc.process(other)), other)
+
+    def test_input_flows_to_integration(self):
+        t, _, _, acc, gyro, mag = _motion(800)
+        batch = SensorDataBatch((t * 1e9).astype(np.int64), 'imu1', 'imu', _values('', acc, gyro, mag),
+                                units={'accX': 'g', 'accY': 'g', 'accZ': 'g'})
+        collector = _Collector()
+        Pipeline(_BatchReader([batch.slice(start, start + 100) for start in range(0, 800, 100)]),
+                 processors=[OrientationFusionProcessor({'sample_rate': FS}),
+                             IntegrationProcessor({'sample_rate': FS})],
+                 visualizers=[collector]).run()
+        counts = {}
+        for item in collector.items:
+            counts[item.data_type] = counts.get(item.data_type, 0) + len(item)
+        self.assertEqual(counts, {'orientation': 800, 'imu': 800, 'motion': 800})
+        # Hướng đi trước gia tốc: batch 'orientation' của mỗi lát đứng ngay trước batch 'imu'
+        types = [item.data_type for item in collector.items]
+        self.assertEqual(types[:3], ['orientation', 'imu', 'motion'])
+
+if __name__ == '__main__':
+    unittest.main()
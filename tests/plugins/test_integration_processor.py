@@ -0,0 +1,104 @@
+# tests/plugins/test_integration_processor.py
+import unittest
+
+import numpy as np
+
+from src.core.pipeline import Pipeline
+from src.data.models import SensorDataBatch
+from src.plugins.processors.fusion_processor import OrientationFusionProcessor
+from src.plugins.processors.integration_processor import (
+    STANDARD_GRAVITY, IntegrationProcessor, cumulative_trapezoid)
+from src.utils.orientation_fusion import quat_from_euler, rotation_matrices
+from tests.core.test_pipeline import _BatchReader, _Collector
+from tests.plugins.test_fusion_processor import _motion, _values
+
+FS = 200.0
+
+def sensor_batch(world_acc, roll=0.0, pitch=0.0, yaw=0.0, data_type='accelerometer'):
+    """Gia tốc (g) đo bởi cảm biến nghiêng (roll, pitch, yaw độ) khi hệ trái đất có gia tốc world_acc (m/s²)."""
+    q = quat_from_euler(*(np.radians([[roll], [pitch], [yaw]])))
+    rotation = rotation_matrices(q)[0]
+    sensor = (world_acc + [0.0, 0.0, STANDARD_GRAVITY]) @ rotation / STANDARD_GRAVITY
+    ts = np.arange(len(world_acc), dtype=np.int64) * int(1e9 / FS)
+    return SensorDataBatch(ts, 'imu1', data_type, {'accX': sensor[:, 0], 'accY': sensor[:, 1], 'accZ': sensor[:, 2]},
+                           {'accX': 'g', 'accY': 'g', 'accZ': 'g'})
+
+class TestIntegrationProcessor(unittest.TestCase):
+    def test_cumulative_trapezoid_chunks(self):
+        x = np.random.default_rng(0).standard_normal((100, 2))
+        dt = np.full(100, 0.01)
+        dt[0] = 0.0
+        whole = cumulative_trapezoid(x, dt, x[0], np.zeros(2))
+        first = cumulative_trapezoid(x[:37], dt[:37], x[0], np.zeros(2))
+        second = cumulative_trapezoid(x[37:], dt[37:], x[36], first[-1])
+        np.testing.assert_allclose(np.concatenate([first, second]), whole)
+        np.testing.assert_allclose(whole[-1], 0.01 * (x.sum(axis=0) - 0.5 * (x[0] + x[-1])))
+
+    def test_highpass_vibration_with_orientation(self):
+        t = np.arange(int(60 * FS)) / FS
+        displacement = 0.01 * np.sin(2 * np.pi * t)
+        world = np.zeros((t.size, 3))
+        world[:, 2] = -(2 * np.pi) ** 2 * displacement
+        acc = sensor_batch(world, 20.0, -10.0, 30.0)
+        angles = SensorDataBatch(acc.timestamps_ns, 'imu1', 'angle',
+                                 {'roll': np.full(t.size, 20.0), 'pitch': np.full(t.size, -10.0),
+                                  'yaw': np.full(t.size, 30.0)})
+        proc = IntegrationProcessor({'sample_rate': FS, 'highpass_cutoff': 0.05})
+        outputs = []
+        for start in range(0, t.size, 40):
+            self.assertIs(next(proc.process(angles.slice(start, start + 40))).data_type, 'angle')
+            outputs += list(proc.process(acc.slice(start, start + 40)))[1:]
+        motion = SensorDataBatch.concatenate(outputs)
+        self.assertEqual(motion.data_type, 'motion')
+        self.assertEqual(motion.units['dispZ'], 'm')
+        self.assertLess(np.abs(motion.values['linAccX']).max(), 1e-9)
+        tail = slice(-int(10 * FS), None)
+        self.assertAlmostEqual(np.abs(motion.values['dispZ'][tail]).max(), 0.01, delta=5e-4)
+        self.assertLess(np.abs(motion.values['dispX'][tail]).max(), 1e-6)
+
+    def test_zero_velocity_update(self):
+        # Đứng yên 1 s, tăng tốc rồi giảm tốc theo trục X (1 s mỗi pha), đứng yên 1 s; gia tốc kế lệch 0.02 m/s²
+        n = int(FS)
+        world = np.zeros((4 * n, 3))
+        world[n:2 * n, 0] = 1.0
+        world[2 * n:3 * n, 0] = -1.0
+        world[:, 0] += 0.02
+        batch = sensor_batch(world, 5.0, 5.0)
+        proc = IntegrationProcessor({'sample_rate': FS, 'drift_correction': 'zupt', 'zupt_acc_threshold': 0.02,
+                                     'passthrough': False})
+        motion = SensorDataBatch.concatenate([b for start in range(0, 4 * n, 50)
+                                              for b in proc.process(batch.slice(start, start + 50))])
+        np.testing.assert_allclose(motion.values['velX'][-n:], 0.0, atol=1e-12)
+        self.assertAlmostEqual(motion.values['velX'][2 * n], 1.0, delta=0.05)
+        self.assertAlmostEqual(motion.values['dispX'][-1], 1.0, delta=0.05)
+
+    def test_static_attitude_without_orientation_and_groups(self):
+        still = sensor_batch(np.zeros((400, 3)), 30.0, 15.0, data_type='imu')
+        values = {f'{sid}.{name}': arr for sid in ('a', 'b') for name, arr in still.values.items()}
+        grouped = SensorDataBatch(still.timestamps_ns, 'all', 'imu', values, {'a.accX': 'g'})
+        out = list(IntegrationProcessor({'sample_rate': FS, 'passthrough': False}).process(grouped))
+        self.assertEqual([b.sensor_id for b in out], ['a', 'b'])
+        for b in out:
+            self.assertLess(np.abs(b.to_array(['linAccX', 'linAccY', 'linAccZ'])).max(), 1e-9)
+            self.assertLess(np.abs(b.values['dispZ']).max(), 1e-9)
+
+    def test_orientation_from_fusion_earlier_in_chain(self):
+        # Cảm biến đổi tư thế (pitch dao động) khi đứng yên: chỉ trọng trường, gia tốc tuyến tính bằng 0
+        t, _, _, acc, gyro, mag = _motion(4000)
+        imu = SensorDataBatch((t * 1e9).astype(np.int64), 'imu1', 'imu', _values('', acc, gyro, mag),
+                              units={'accX': 'g', 'accY': 'g', 'accZ': 'g', 'gyroX': 'deg/s'})
+        integration = IntegrationProcessor({'sample_rate': FS, 'drift_correction': 'none'})
+        collector = _Collector()
+        Pipeline(_BatchReader([imu.slice(start, start + 100) for start in range(0, 4000, 100)]),
+                 processors=[OrientationFusionProcessor({'sample_rate': FS}), integration],
+                 visualizers=[collector]).run()
+        self.assertIn('imu1', integration.orientations)
+        self.assertIsNone(integration.streams[('imu1', 'imu')].static_q)
+        motion = SensorDataBatch.concatenate([b for b in collector.items if b.data_type == 'motion'])
+        self.assertEqual(len(motion), 4000)
+        # Tư thế tĩnh từ mẫu đầu tiên sẽ để lại sai số ~1.7 m/s² khi pitch đổi ±10 độ
+        linear = motion.to_array(['linAccX', 'linAccY', 'linAccZ'])[-1000:]
+        self.assertLess(np.abs(linear).max(), 0.3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+# tests/plugins/test_quality_processor.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorDataBatch
+from src.plugins.processors.quality_processor import (
+    DataQualityProcessor, FLAG_AFTER_GAP, FLAG_INTERPOLATED, FLAG_OUTLIER)
+
+PERIOD = 10_000_000  # 100 Hz
+
+def _batch(ts_index, x, sensor_id='imu1'):
+    return SensorDataBatch(np.asarray(ts_index, dtype=np.int64) * PERIOD, sensor_id, 'accelerometer',
+                           {'accX': x, 'count': np.arange(len(x), dtype=np.int64)}, {'accX': 'g'})
+
+class TestDataQualityProcessor(unittest.TestCase):
+    def test_gaps_across_batches_and_fill(self):
+        index = np.concatenate([np.arange(50), np.arange(53, 100), np.arange(150, 200)])
+        x = index * 0.1
+        proc = DataQualityProcessor({'data_rate': 100.0, 'max_fill_gap': 0.05, 'flag_channel': 'flags',
+                                     'outlier_threshold': 0})
+        out = [b for start in range(0, len(index), 30) for b in proc.process(_batch(index[start:start + 30], x[start:start + 30]))]
+        merged = SensorDataBatch.concatenate(out)
+        # Gap ngắn (3 mẫu) được nội suy, gap dài (50 mẫu) chỉ được đánh dấu
+        expected = np.concatenate([np.arange(100), np.arange(150, 200)])
+        np.testing.assert_array_equal(merged.timestamps_ns, expected * PERIOD)
+        np.testing.assert_allclose(merged.values['accX'], expected * 0.1, atol=1e-12)
+        np.testing.assert_array_equal(merged.values['flags'][50:54], [FLAG_INTERPOLATED] * 3 + [FLAG_AFTER_GAP])
+        self.assertEqual(merged.values['flags'][100], FLAG_AFTER_GAP)
+        np.testing.assert_array_equal(merged.values['count'][50:53], merged.values['count'][49])
+        counters = proc.get_metrics()['quality']['imu1']['accelerometer']
+        self.assertEqual((counters['samples'], counters['gaps'], counters['missing'], counters['filled']),
+                         (len(index), 2, 53, 3))
+        self.assertAlmostEqual(counters['max_gap_s'], 0.51)
+
+    def test_outliers_detected_and_replaced(self):
+        rng = np.random.default_rng(0)
+        x = np.sin(np.arange(600) * 0.05) + 0.01 * rng.standard_normal(600)
+        spikes = [100, 250, 251, 480]
+        raw = x.copy()
+        raw[spikes] += [5.0, -4.0, -4.0, 3.0]
+        proc = DataQualityProcessor({'outlier_action': 'replace', 'flag_channel': 'flags'})
+        out = SensorDataBatch.concatenate([b for start in range(0, 600, 64)
+                                           for b in proc.process(_batch(np.arange(start, min(start + 64, 600)),
+                                                                        raw[start:start + 64]))])
+        np.testing.assert_array_equal(np.flatnonzero(out.values['flags'] & FLAG_OUTLIER), spikes)
+        np.testing.assert_allclose(out.values['accX'][spikes], x[spikes], atol=0.05)
+        np.testing.assert_array_equal(np.delete(out.values['accX'], spikes), np.delete(raw, spikes))
+        self.assertEqual(proc.get_metrics()['quality']['imu1']['accelerometer']['outliers'], 4)
+
+    def test_replace_is_independent_of_batch_size(self):
+        rng = np.random.default_rng(0)
+        raw = np.sin(np.arange(400) * 0.05) + 0.01 * rng.standard_normal(400)
+        raw[200:210] += 5.0
+
+        def run(size):
+            proc = DataQualityProcessor({'outlier_action': 'replace', 'flag_channel': 'flags'})
+            out = [b for start in range(0, 400, size)
+                   for b in proc.process(_batch(np.arange(start, min(start + size, 400)), raw[start:start + size]))]
+            return SensorDataBatch.concatenate(out + list(proc.flush()))
+
+        whole = run(400)
+        np.testing.assert_array_equal(np.flatnonzero(whole.values['flags']), np.arange(200, 210))
+        for size in (1, 7, 64):
+            chunked = run(size)
+            np.testing.assert_array_equal(chunked.timestamps_ns, whole.timestamps_ns)
+            np.testing.assert_array_equal(chunked.values['accX'], whole.values['accX'])
+
+    def test_clean_data_passes_unchanged(self):
+        batch = _batch(np.arange(100), np.sin(np.arange(100) * 0.1))
+        proc = DataQualityProcessor({})
+        self.assertIs(next(proc.process(batch)), batch)
+        other = _batch(np.arange(100), np.zeros(100), 'imu2')
+        proc.process(other).__next__()
+        self.assertEqual(set(proc.get_metrics()['quality']), {'imu1', 'imu2'})
+
+    def test_channel_layout_change_restarts_stream(self):
+        x = np.sin(np.arange(100) * 0.1)
+        x[98] = 50.0
+        full = SensorDataBatch(np.arange(100) * PERIOD, 'imu1', 'accelerometer',
+                               {'accX': x, 'accY': x.copy(), 'accZ': x.copy()})
+        y = np.sin(np.arange(100, 200) * 0.1)
+        partial = SensorDataBatch(np.arange(100, 200) * PERIOD, 'imu1', 'accelerometer', {'accX': y, 'accY': y.copy()})
+        proc = DataQualityProcessor({'outlier_action': 'replace'})
+        out = list(proc.process(full)) + list(proc.process(partial))
+        merged = SensorDataBatch.concatenate([o for o in out if 'accZ' in o.values])
+        # Đuôi đang chờ được phát trước khi bắt đầu lại, outlier đã được thay
+        self.assertEqual(len(merged), 100)
+        self.assertLess(abs(merged.values['accZ'][98]), 1.5)
+        self.assertEqual(sorted(out[-1].values), ['accX', 'accY'])
+        self.assertEqual(proc.streams[('imu1', 'accelerometer')].channels, ['accX', 'accY'])
+        counters = proc.get_metrics()['quality']['imu1']['accelerometer']
+        self.assertEqual((counters['samples'], counters['gaps'], counters['outliers']), (200, 0, 3))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,73 @@
+# tests/plugins/test_resampling_processor.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorData, SensorDataBatch
+from src.plugins.processors.resampling_processor import ResamplingProcessor, interpolate_columns
+
+NS = 1_000_000_000
+T0 = 1_700_000_000 * NS + 3_000_000  # không trùng lưới
+
+def _stream(sensor_id, data_type, channel, rate, seconds, slope, offset_ns=0):
+    ts = T0 + offset_ns + (np.arange(int(rate * seconds)) * (NS / rate)).astype(np.int64)
+    t = (ts - T0) / NS
+    return SensorDataBatch(ts, sensor_id, data_type, values={channel: slope * t}, units={channel: 'u'})
+
+def _run(processor, batches, chunk=7):
+    """Đưa các luồng vào processor theo từng chunk, xen kẽ theo thời gian như dữ liệu thật."""
+    pieces = [batch.slice(start, start + chunk)
+              for batch in batches for start in range(0, len(batch), chunk)]
+    pieces.sort(key=lambda b: int(b.timestamps_ns[-1]))
+    out = []
+    for piece in pieces:
+        out.extend(processor.process(piece))
+    out.extend(processor.flush())
+    return out
+
+class TestInterpolateColumns(unittest.TestCase):
+    def test_linear_and_nearest(self):
+        ts = np.array([0, 10, 20], dtype=np.int64)
+        vals = np.array([[0.0], [1.0], [3.0]])
+        grid = np.array([-5, 0, 4, 15, 20, 25], dtype=np.int64)
+        lin = interpolate_columns(ts, vals, grid, 'linear')[:, 0]
+        np.testing.assert_allclose(lin[1:5], [0.0, 0.4, 2.0, 3.0])
+        self.assertTrue(np.isnan(lin[0]) and np.isnan(lin[5]))
+        near = interpolate_columns(ts, vals, grid, 'nearest')[:, 0]
+        np.testing.assert_allclose(near[1:5], [0.0, 0.0, 3.0, 3.0])
+
+class TestResamplingProcessor(unittest.TestCase):
+    def test_merges_data_types_onto_common_grid(self):
+        proc = ResamplingProcessor({'rate': 20.0, 'warmup': 0.3})
+        acc = _stream('imu1', 'accelerometer', 'accX', 200.0, 2.0, slope=2.0)
+        gyro = _stream('imu1', 'gyroscope', 'gyroZ', 50.0, 2.0, slope=-1.0, offset_ns=1_000_000)
+        out = _run(proc, [acc, gyro])
+        joined = SensorDataBatch.concatenate(out)
+        self.assertEqual(set(joined.channels), {'accX', 'gyroZ'})
+        self.assertTrue(np.all(joined.timestamps_ns % (NS // 20) == 0))
+        self.assertTrue(np.all(np.diff(joined.timestamps_ns) == NS // 20))
+        t = (joined.timestamps_ns - T0) / NS
+        ok = ~np.isnan(joined.values['gyroZ'])
+        np.testing.assert_allclose(joined.values['accX'][ok], 2.0 * t[ok], atol=1e-9)
+        np.testing.assert_allclose(joined.values['gyroZ'][ok], -1.0 * t[ok], atol=1e-9)
+        self.assertGreater(ok.sum(), 35)
+
+    def test_streaming_matches_offline(self):
+        acc = _stream('imu1', 'accelerometer', 'accX', 100.0, 3.0, slope=1.0)
+        offline = SensorDataBatch.concatenate(_run(ResamplingProcessor({'rate': 10.0}), [acc], chunk=10_000))
+        live = SensorDataBatch.concatenate(_run(ResamplingProcessor({'rate': 10.0}), [acc], chunk=3))
+        np.testing.assert_array_equal(live.timestamps_ns, offline.timestamps_ns)
+        np.testing.assert_allclose(live.values['accX'], offline.values['accX'])
+
+    def test_sensors_share_grid_and_others_pass_through(self):
+        proc = ResamplingProcessor({'rate': 10.0, 'sensor_ids': ['a', 'b']})
+        out = _run(proc, [_stream('a', 'accelerometer', 'accX', 100.0, 1.0, 1.0),
+                          _stream('b', 'accelerometer', 'accX', 90.0, 1.0, 1.0, offset_ns=7_000_000)])
+        a = SensorDataBatch.concatenate([b for b in out if b.sensor_id == 'a'])
+        b = SensorDataBatch.concatenate([b for b in out if b.sensor_id == 'b'])
+        self.assertEqual(len(set(a.timestamps_ns) & set(b.timestamps_ns)), min(len(a), len(b)))
+        sample = SensorData(T0, 'c', 'accelerometer', values={'accX': 1.0})
+        self.assertEqual(list(proc.process(sample)), [sample])
+
+if __name__ == '__main__':
+    unittest.main()
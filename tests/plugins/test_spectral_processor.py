@@ -0,0 +1,101 @@
+# tests/plugins/test_spectral_processor.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorDataBatch
+from src.plugins.processors.spectral_processor import STFTProcessor, WelchPSDProcessor
+
+def _batch(signal, fs=200.0, sensor_id='imu1'):
+    n = signal.shape[0]
+    return SensorDataBatch((np.arange(n) * (1e9 / fs)).astype(np.int64), sensor_id, 'accelerometer',
+                           values={'accX': signal[:, 0], 'accY': signal[:, 1]}, units={'accX': 'g', 'accY': 'g'})
+
+class TestWelchPSDProcessor(unittest.TestCase):
+    def test_tone_peak_and_variance(self):
+        fs = 200.0
+        t = np.arange(4096) / fs
+        rng = np.random.default_rng(1)
+        signal = np.stack([np.sin(2 * np.pi * 25.0 * t), rng.standard_normal(t.size)], axis=1)
+        proc = WelchPSDProcessor({'sample_rate': fs, 'nperseg': 256, 'averages': 64, 'passthrough': False})
+        out = list(proc.process(_batch(signal, fs)))
+        self.assertEqual(len(out), 1)
+        psd = out[0]
+        self.assertEqual(psd.data_type, 'fft')
+        self.assertEqual(psd.units['accX'], 'g²/Hz')
+        freqs = psd.metadata['frequencies']
+        self.assertAlmostEqual(freqs[np.argmax(psd.values['accX'])], 25.0)
+        # Tích phân PSD xấp xỉ phương sai (0.5 cho sin biên độ 1, ~1 cho nhiễu trắng)
+        df = freqs[1] - freqs[0]
+        self.assertAlmostEqual(psd.values['accX'].sum() * df, 0.5, delta=0.02)
+        self.assertAlmostEqual(psd.values['accY'].sum() * df, 1.0, delta=0.1)
+
+    def test_chunked_matches_whole(self):
+        rng = np.random.default_rng(2)
+        whole = _batch(rng.standard_normal((3000, 2)))
+        config = {'nperseg': 128, 'overlap': 0.75, 'averages': 4, 'update_rate': 0, 'passthrough': False}
+        offline = list(WelchPSDProcessor(config).process(whole))[-1]
+        live = WelchPSDProcessor(config)
+        parts = [o for start in range(0, 3000, 37) for o in live.process(whole.slice(start, start + 37))]
+        np.testing.assert_allclose(parts[-1].values['accY'], offline.values['accY'], rtol=1e-10)
+        self.assertEqual(parts[-1].metadata['segments'], 4)
+
+    def test_update_rate_limits_output(self):
+        proc = WelchPSDProcessor({'sample_rate': 200.0, 'nperseg': 64, 'update_rate': 1.0, 'passthrough': False})
+        whole = _batch(np.zeros((2000, 2)))
+        outputs = [o for start in range(0, 2000, 20) for o in proc.process(whole.slice(start, start + 20))]
+        # 10 giây dữ liệu -> khoảng 10 lần cập nhật, không phải mỗi batch một lần
+        self.assertTrue(9 <= len(outputs) <= 11)
+
+    def test_missing_channel_restarts_stream(self):
+        proc = WelchPSDProcessor({'nperseg': 64, 'update_rate': 0, 'passthrough': False})
+        list(proc.process(_batch(np.ones((200, 2)))))
+        partial = SensorDataBatch(np.arange(200, 400) * 5_000_000, 'imu1', 'accelerometer',
+                                  values={'accX': np.ones(200)})
+        out = list(proc.process(partial))
+        self.assertEqual(sorted(out[-1].values), ['accX'])
+        self.assertEqual(proc.streams[('imu1', 'accelerometer')].channels, ['accX'])
+
+    def test_passthrough_keeps_input_in_chain(self):
+        proc = WelchPSDProcessor({'nperseg': 64, 'update_rate': 0, 'data_types': ['imu']})
+        imu = SensorDataBatch(np.arange(200) * 5_000_000, 'imu1', 'imu', values={'accX': np.ones(200)})
+        out = list(proc.process(imu))
+        self.assertIs(out[0], imu)
+        self.assertEqual([o.data_type for o in out], ['imu', 'fft'])
+        # Đầu ra phổ và data_type khác chỉ được chuyển tiếp
+        self.assertEqual(list(proc.process(out[1])), [out[1]])
+        angle = SensorDataBatch(np.arange(200) * 5_000_000, 'imu1', 'angle', values={'roll': np.ones(200)})
+        self.assertEqual(list(proc.process(angle)), [angle])
+
+class TestSTFTProcessor(unittest.TestCase):
+    def test_columns_track_tone_and_stream(self):
+        fs = 200.0
+        t = np.arange(4000) / fs
+        # Tần số nhảy từ 20 Hz lên 60 Hz ở giữa tín hiệu
+        tone = np.where(t < 10.0, np.sin(2 * np.pi * 20.0 * t), np.sin(2 * np.pi * 60.0 * t))
+        whole = _batch(np.stack([tone, tone], axis=1), fs)
+        config = {'sample_rate': fs, 'nperseg': 128, 'overlap': 0.5, 'passthrough': False}
+        offline = next(STFTProcessor(config).process(whole))
+        self.assertEqual(offline.data_type, 'spectrogram')
+        self.assertEqual(offline.values['accX'].shape, (len(offline), 65))
+        freqs = offline.metadata['frequencies']
+        peaks = freqs[np.argmax(offline.values['accX'], axis=1)]
+        self.assertAlmostEqual(peaks[0], 20.3125)
+        self.assertAlmostEqual(peaks[-1], 59.375)
+
+        live = STFTProcessor(config)
+        parts = [o for start in range(0, 4000, 45) for o in live.process(whole.slice(start, start + 45))]
+        np.testing.assert_array_equal(np.concatenate([p.timestamps_ns for p in parts]), offline.timestamps_ns)
+        np.testing.assert_allclose(np.concatenate([p.values['accY'] for p in parts]), offline.values['accY'],
+                                   rtol=1e-10)
+
+    def test_missing_channel_restarts_stream(self):
+        proc = STFTProcessor({'nperseg': 64, 'passthrough': False})
+        list(proc.process(_batch(np.ones((200, 2)))))
+        partial = SensorDataBatch(np.arange(200, 400) * 5_000_000, 'imu1', 'accelerometer',
+                                  values={'accY': np.ones(200)})
+        out = list(proc.process(partial))
+        self.assertEqual(list(out[0].values), ['accY'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+# tests/plugins/test_statistics_processor.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorDataBatch
+from src.plugins.processors.statistics_processor import RollingStatisticsProcessor
+
+def _batch(signal, fs=100.0):
+    n = signal.shape[0]
+    return SensorDataBatch((np.arange(n) * (1e9 / fs)).astype(np.int64), 'imu1', 'accelerometer',
+                           values={'accX': signal[:, 0], 'accY': signal[:, 1]}, units={'accX': 'g', 'accY': 'g'})
+
+def _naive(x, size):
+    """Thống kê cửa sổ trượt tính trực tiếp cho từng mẫu."""
+    out = {stat: np.empty(len(x)) for stat in ('mean', 'std', 'rms', 'min', 'max', 'ptp')}
+    for i in range(len(x)):
+        w = x[max(0, i - size + 1):i + 1]
+        out['mean'][i], out['std'][i] = w.mean(), w.std()
+        out['rms'][i] = np.sqrt(np.mean(w * w))
+        out['min'][i], out['max'][i], out['ptp'][i] = w.min(), w.max(), np.ptp(w)
+    return out
+
+class TestRollingStatisticsProcessor(unittest.TestCase):
+    def test_matches_naive_windows_in_chunks(self):
+        rng = np.random.default_rng(0)
+        signal = 9.81 + rng.standard_normal((1500, 2)) + np.linspace(0, 3, 1500)[:, np.newaxis]
+        whole = _batch(signal)
+        proc = RollingStatisticsProcessor({'windows': [0.5, 2.0], 'passthrough': False})
+        outputs = [o for start in range(0, 1500, 37) for o in proc.process(whole.slice(start, start + 37))]
+        stats = SensorDataBatch.concatenate(outputs)
+        self.assertEqual(len(stats), 1500)
+        for size, label in ((50, '0.5s'), (200, '2s')):
+            expected = _naive(signal[:, 1], size)
+            for stat, values in expected.items():
+                np.testing.assert_allclose(stats.values[f'accY_{stat}_{label}'], values, rtol=1e-9, atol=1e-9,
+                                           err_msg=f'{stat} {label}')
+        self.assertEqual(stats.units['accX_rms_2s'], 'g')
+
+    def test_decimate_and_passthrough(self):
+        proc = RollingStatisticsProcessor({'windows': [1.0], 'statistics': ['max'], 'decimate': 10})
+        whole = _batch(np.arange(100.0)[:, np.newaxis].repeat(2, axis=1))
+        outputs = [o for start in range(0, 100, 15) for o in proc.process(whole.slice(start, start + 15))]
+        raw = [o for o in outputs if o.data_type == 'accelerometer']
+        stats = SensorDataBatch.concatenate([o for o in outputs if o.data_type == 'statistics'])
+        self.assertEqual(sum(len(o) for o in raw), 100)
+        np.testing.assert_array_equal(stats.values['accX_max_1s'], np.arange(0.0, 100.0, 10.0))
+        self.assertEqual(list(stats.values), ['accX_max_1s', 'accY_max_1s'])
+
+    def test_missing_channel_restarts_stream(self):
+        proc = RollingStatisticsProcessor({'windows': [1.0], 'statistics': ['mean'], 'passthrough': False})
+        list(proc.process(_batch(np.ones((50, 2)))))
+        partial = SensorDataBatch(np.arange(50, 100) * 10_000_000, 'imu1', 'accelerometer',
+                                  values={'accY': np.full(50, 3.0)})
+        out = next(proc.process(partial))
+        self.assertEqual(list(out.values), ['accY_mean_1s'])
+        # Cửa sổ bắt đầu lại: không trộn với các mẫu của bố cục cũ
+        np.testing.assert_allclose(out.values['accY_mean_1s'], 3.0)
+
+if __name__ == '__main__':
+    unittest.main()
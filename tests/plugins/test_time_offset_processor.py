@@ -0,0 +1,64 @@
+# tests/plugins/test_time_offset_processor.py
+import unittest
+
+import numpy as np
+
+from src.core.pipeline import Pipeline
+from src.data.models import SensorData, SensorDataBatch
+from src.plugins.processors.resampling_processor import ResamplingProcessor
+from src.plugins.processors.time_offset_processor import TimeOffsetProcessor
+
+NS = 1_000_000_000
+T0 = 1_700_000_000 * NS
+RATE = 200.0
+
+def _streams(seconds, offsets_ns):
+    """Các cảm biến cùng chịu một kích thích; timestamp của mỗi cảm biến lệch `offsets_ns`."""
+    n = int(seconds * RATE)
+    noise = np.random.default_rng(1).standard_normal(n)
+    shake = np.convolve(noise, np.hanning(15) / 4.0, mode='same')
+    ts = T0 + (np.arange(n) * (NS / RATE)).astype(np.int64)
+    return [SensorDataBatch(ts + offset, sid, 'accelerometer',
+                            values={'accX': 0.1 * shake, 'accY': np.zeros(n), 'accZ': 1.0 + shake})
+            for sid, offset in offsets_ns.items()]
+
+def _run(processors, batches, chunk=50):
+    pieces = [batch.slice(start, start + chunk)
+              for start in range(0, len(batches[0]), chunk) for batch in batches]
+    out = []
+    for piece in pieces:
+        items = [piece]
+        for processor in processors:
+            items = [o for item in items for o in processor.process(item)]
+        out.extend(items)
+    return out
+
+class TestTimeOffsetProcessor(unittest.TestCase):
+    def test_feedback_aligns_resampler(self):
+        resampler = ResamplingProcessor({'rate': 100.0, 'group_by': 'all', 'warmup': 0.5})
+        estimator = TimeOffsetProcessor({'window': 4.0, 'max_lag': 0.2})
+        Pipeline(None, processors=[resampler, estimator])
+        self.assertEqual(estimator.targets, [resampler])
+
+        out = _run([resampler, estimator], _streams(60.0, {'a': 0, 'b': 30_000_000}))
+        estimates = [o for o in out if isinstance(o, SensorData) and o.data_type == 'time_offset']
+        self.assertGreater(len(estimates), 5)
+        self.assertAlmostEqual(estimates[-1].values['b'], 0.030, delta=0.002)
+        self.assertAlmostEqual(resampler.time_offsets['b'] / NS, 0.030, delta=0.002)
+        self.assertEqual(resampler.time_offsets.get('a', 0), 0)
+        self.assertLess(abs(estimates[-1].metadata['residual_s']['b']), 0.003)
+
+    def test_estimate_without_feedback(self):
+        estimator = TimeOffsetProcessor({'window': 4.0, 'max_lag': 0.2, 'feedback': False,
+                                         'gain': 1.0, 'passthrough': False, 'pairs': 'all'})
+        resampler = ResamplingProcessor({'rate': 100.0, 'group_by': 'all', 'warmup': 0.5})
+        Pipeline(None, processors=[resampler, estimator])
+        self.assertEqual(estimator.targets, [])
+        out = _run([resampler, estimator], _streams(20.0, {'a': 0, 'b': -50_000_000, 'c': 20_000_000}))
+        self.assertTrue(out and all(o.data_type == 'time_offset' for o in out))
+        self.assertAlmostEqual(out[-1].values['b'], -0.050, delta=0.002)
+        self.assertAlmostEqual(out[-1].values['c'], 0.020, delta=0.002)
+        self.assertNotIn('b', resampler.time_offsets)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+# tests/plugins/test_vibration_processor.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorDataBatch
+from src.plugins.processors.vibration_processor import VibrationMetricsProcessor, octave_bands
+
+NS = 1_000_000_000
+RATE = 1000.0
+
+def _batch(values, start_s=0.0):
+    ts = int(start_s * NS) + (np.arange(len(values)) * (NS / RATE)).astype(np.int64)
+    return SensorDataBatch(ts, 'pump', 'accelerometer', values={'accX': values[:, 0], 'accZ': values[:, 1]},
+                           units={'accX': 'g', 'accZ': 'g'})
+
+class TestOctaveBands(unittest.TestCase):
+    def test_nominal_centers(self):
+        centers = [round(c, 1) for c, _, _ in octave_bands(1, 30.0, 1000.0)]
+        self.assertEqual(centers, [31.6, 63.1, 125.9, 251.2, 501.2])
+        third = octave_bands(3, 100.0, 200.0)
+        self.assertAlmostEqual(third[0][0], 100.0)
+        self.assertAlmostEqual(third[0][2], third[1][1])
+
+class TestVibrationMetricsProcessor(unittest.TestCase):
+    def test_band_rms_and_broadband_metrics(self):
+        t = np.arange(int(3 * RATE)) / RATE
+        x = np.stack([0.5 * np.sin(2 * np.pi * 63.1 * t), 1.0 + 0.2 * np.sin(2 * np.pi * 251.2 * t)], axis=1)
+        proc = VibrationMetricsProcessor({'sample_rate': RATE, 'bands': 'octave', 'f_min': 30.0,
+                                          'passthrough': False})
+        batch = _batch(x)
+        out = [o for s in range(0, len(batch), 128) for o in proc.process(batch.slice(s, s + 128))]
+        out.extend(proc.flush())
+        joined = SensorDataBatch.concatenate(out)
+        self.assertEqual(len(joined), 3)
+        self.assertIn('accX_rms_63.1Hz', joined.channels)
+        last = {name: float(values[-1]) for name, values in joined.values.items()}
+        sine_rms = 0.5 / np.sqrt(2)
+        self.assertAlmostEqual(last['accX_rms_63.1Hz'], sine_rms, delta=0.02)
+        self.assertLess(last['accX_rms_251Hz'], 0.02)
+        self.assertAlmostEqual(last['accZ_rms_251Hz'], 0.2 / np.sqrt(2), delta=0.01)
+        self.assertAlmostEqual(last['accX_rms'], sine_rms, places=3)
+        self.assertAlmostEqual(last['accX_peak'], 0.5, places=2)
+        self.assertAlmostEqual(last['accX_crest'], np.sqrt(2), places=2)
+        self.assertAlmostEqual(last['accX_kurtosis'], 1.5, places=2)
+        self.assertEqual(joined.units['accX_kurtosis'], '')
+        np.testing.assert_array_equal(joined.timestamps_ns[:2], [999_000_000, 1_999_000_000])
+
+    def test_gaussian_kurtosis_and_custom_bands(self):
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal((20_000, 2)) + [0.0, 1.0]
+        proc = VibrationMetricsProcessor({'sample_rate': RATE, 'bands': [[10, 100], [100, 400]],
+                                          'interval': 20.0, 'passthrough': False})
+        out = list(proc.process(_batch(x))) + list(proc.flush())
+        self.assertEqual(len(out), 1)
+        self.assertAlmostEqual(float(out[0].values['accZ_kurtosis'][0]), 3.0, delta=0.15)
+        # Nhiễu trắng: công suất tỉ lệ với bề rộng dải
+        ratio = out[0].values['accX_rms_200Hz'][0] ** 2 / out[0].values['accX_rms_31.6Hz'][0] ** 2
+        self.assertAlmostEqual(ratio, 300.0 / 90.0, delta=0.4)
+
+    def test_missing_channel_emits_pending_and_restarts(self):
+        proc = VibrationMetricsProcessor({'sample_rate': RATE, 'bands': 'octave', 'f_min': 30.0,
+                                          'passthrough': False})
+        list(proc.process(_batch(np.ones((500, 2)))))
+        ts = (np.arange(500, 1500) * (NS / RATE)).astype(np.int64)
+        partial = SensorDataBatch(ts, 'pump', 'accelerometer', values={'accZ': np.ones(1000)})
+        out = list(proc.process(partial)) + list(proc.flush())
+        self.assertIn('accX_rms', out[0].values)
+        self.assertEqual(out[0].timestamps_ns[0], 499_000_000)
+        self.assertNotIn('accX_rms', out[-1].values)
+        self.assertIn('accZ_rms', out[-1].values)
+
+if __name__ == '__main__':
+    unittest.main()
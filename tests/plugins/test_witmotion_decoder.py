@@ -0,0 +1,59 @@
+# tests/plugins/test_witmotion_decoder.py
+import struct
+import unittest
+from datetime import datetime, timezone
+
+import numpy as np
+
+from src.plugins.decoders.witmotion_hwt905_decoder import (
+    WitMotionDecoder, build_packet, find_packets, TIME_PACKET, ACCEL_PACKET, GYRO_PACKET)
+from src.utils.timestamp_utils import datetime_to_ns
+
+def accel_packet(ax, ay, az, acc_range=16.0):
+    raw = [int(round(v / acc_range * 32768)) for v in (ax, ay, az)]
+    return build_packet(ACCEL_PACKET, struct.pack('<hhhh', *raw, 2500))
+
+def time_packet(dt):
+    return build_packet(TIME_PACKET, struct.pack('<BBBBBBH', dt.year - 2000, dt.month, dt.day,
+                                                 dt.hour, dt.minute, dt.second, dt.microsecond // 1000))
+
+class TestWitMotionDecoder(unittest.TestCase):
+    def test_decode_batch_values(self):
+        decoder = WitMotionDecoder({'sensor_id': 'imu1', 'data_rate': 100.0})
+        raw = b''.join(accel_packet(0.5 * i, -1.0, 1.0) for i in range(10))
+        batches = list(decoder.decode_batch(raw))
+        self.assertEqual(len(batches), 1)
+        acc = batches[0]
+        self.assertEqual(acc.data_type, 'accelerometer')
+        np.testing.assert_allclose(acc.values['accX'], 0.5 * np.arange(10), atol=1e-3)
+        np.testing.assert_allclose(acc.values['temperature'], 25.0)
+        np.testing.assert_array_equal(acc.timestamps_ns, np.arange(10) * 10_000_000)
+
+    def test_split_chunks_and_garbage(self):
+        raw = b'\x55\x00garbage' + b''.join(accel_packet(1.0, 2.0, 3.0) for _ in range(20))
+        whole = WitMotionDecoder({'sensor_id': 'imu1'})
+        expected = list(whole.decode_batch(raw))[0]
+        chunked = WitMotionDecoder({'sensor_id': 'imu1'})
+        parts = [b for i in range(0, len(raw), 7) for b in chunked.decode_batch(raw[i:i + 7])]
+        self.assertEqual(sum(len(b) for b in parts), 20)
+        np.testing.assert_array_equal(np.concatenate([b.timestamps_ns for b in parts]), expected.timestamps_ns)
+
+    def test_find_packets_rejects_bad_checksum(self):
+        good = accel_packet(1.0, 1.0, 1.0)
+        bad = good[:-1] + bytes([(good[-1] + 1) & 0xFF])
+        pos = find_packets(np.frombuffer(bad + good, dtype=np.uint8))
+        np.testing.assert_array_equal(pos, [11])
+
+    def test_chiptime_mode(self):
+        dt = datetime(2024, 3, 1, 12, 0, 0, 250000, tzinfo=timezone.utc)
+        raw = time_packet(dt) + accel_packet(0, 0, 1) + build_packet(GYRO_PACKET, bytes(8))
+        decoder = WitMotionDecoder({'sensor_id': 'imu1', 'timestamp_mode': 'chiptime'})
+        batches = {b.data_type: b for b in decoder.decode_batch(raw)}
+        expected = datetime_to_ns(dt)
+        self.assertEqual(int(batches['accelerometer'].timestamps_ns[0]), expected)
+        self.assertEqual(int(batches['time'].values['chip_time_ns'][0]), expected)
+        samples = list(WitMotionDecoder({'sensor_id': 'imu1'}).decode(raw))
+        self.assertEqual([s.data_type for s in samples], ['time', 'accelerometer', 'gyroscope'])
+
+if __name__ == '__main__':
+    unittest.main()
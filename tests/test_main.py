@@ -0,0 +1,85 @@
+# tests/test_main.py
+import contextlib
+import csv
+import io
+import os
+import tempfile
+import unittest
+
+import yaml
+
+from src.main import find_recordings, main, process_file, run_batch
+from tests.plugins.test_witmotion_decoder import accel_packet
+
+class TestBatchMain(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.data = os.path.join(self.tmp.name, 'captures')
+        os.makedirs(os.path.join(self.data, 'day2'))
+        self.paths = []
+        for index, name in enumerate(('a.bin', 'b.bin', os.path.join('day2', 'c.bin'))):
+            path = os.path.join(self.data, name)
+            with open(path, 'wb') as f:
+                f.write(b''.join(accel_packet(0.0, 0.0, 1.0) for _ in range(200 * (index + 1))))
+            self.paths.append(path)
+        with open(os.path.join(self.data, 'notes.txt'), 'w') as f:
+            f.write('not a recording')
+        self.spec = {
+            'name': 'nightly',
+            'reader': {'type': 'FileReader', 'params': {'chunk_size': 1024}},
+            'decoder': {'type': 'WitMotionDecoder', 'params': {'sensor_id': 'imu1'}},
+            'processors': [{'type': 'DataQualityProcessor', 'params': {'data_rate': 100.0}}],
+            'visualizers': [{'type': 'NoSuchVisualizer'}],
+        }
+        self.config = os.path.join(self.tmp.name, 'batch.yaml')
+        with open(self.config, 'w') as f:
+            yaml.safe_dump({'pipelines': [self.spec]}, f)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_find_recordings(self):
+        self.assertEqual(find_recordings([self.data]), sorted(self.paths))
+        pattern = os.path.join(self.data, '*.bin')
+        self.assertEqual(find_recordings([pattern, self.paths[0]]), self.paths[:2])
+
+    def test_process_file_reports_stats_and_errors(self):
+        row = process_file(self.spec, self.paths[1], {'chunk_samples': 50})
+        self.assertEqual(row['status'], 'ok')
+        self.assertEqual(row['samples'], 400)
+        self.assertEqual(row['bytes'], 400 * 11)
+        self.assertEqual(row['quality.imu1.accelerometer.samples'], 400)
+        self.assertGreater(row['mb_per_s'], 0)
+
+        missing = process_file(self.spec, os.path.join(self.data, 'missing.bin'))
+        self.assertEqual(missing['status'], 'error')
+        self.assertIn('FileNotFoundError', missing['error'])
+        broken = process_file(self.spec, self.paths[0], keep_visualizers=True)
+        self.assertEqual(broken['status'], 'error')
+        self.assertIn('NoSuchVisualizer', broken['error'])
+
+    def test_run_batch_in_process_pool(self):
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            summary = run_batch(self.spec, self.paths, workers=2)
+        self.assertEqual(list(summary['file']), self.paths)
+        self.assertEqual(list(summary['samples']), [200, 400, 600])
+        self.assertTrue((summary['status'] == 'ok').all())
+        self.assertIn('[3/3]', output.getvalue())
+
+    def test_cli_writes_summary(self):
+        summary_path = os.path.join(self.tmp.name, 'summary.csv')
+        with contextlib.redirect_stdout(io.StringIO()) as output:
+            code = main([self.config, self.data, os.path.join(self.data, 'missing.bin'), '--workers', '0',
+                         '--memory-limit', '1MB', '--summary', summary_path])
+        self.assertEqual(code, 1)
+        self.assertIn('3/4 files ok', output.getvalue())
+        with open(summary_path) as f:
+            rows = list(csv.DictReader(f))
+        self.assertEqual([row['status'] for row in rows], ['ok', 'ok', 'ok', 'error'])
+        self.assertEqual(float(rows[2]['samples']), 600)
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main([self.config, self.data, '--pipeline', 'other']), 2)
+
+if __name__ == '__main__':
+    unittest.main()
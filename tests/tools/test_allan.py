@@ -0,0 +1,50 @@
+# tests/tools/test_allan.py
+import csv
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.plugins.decoders.witmotion_hwt905_decoder import build_packet, ACCEL_PACKET, GYRO_PACKET
+from src.tools.allan import allan_deviation, main
+from src.utils.allan import OverlappingAllan
+
+class TestAllanTool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.gyro = rng.integers(-200, 200, size=(3000, 3))
+        packets = []
+        for g in self.gyro:
+            packets.append(build_packet(ACCEL_PACKET, struct.pack('<hhhh', 0, 0, 2048, 2500)))
+            packets.append(build_packet(GYRO_PACKET, struct.pack('<hhhh', *g, 1200)))
+        self.path = os.path.join(self.tmp.name, 'static.bin')
+        with open(self.path, 'wb') as f:
+            f.write(b''.join(packets))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_chunked_recording_matches_in_memory(self):
+        result = allan_deviation([self.path], {'data_rate': 100.0}, max_tau=5.0, chunk_size=1000)
+        self.assertEqual(set(result), {'accelerometer', 'gyroscope'})
+        channels, taus, adev = result['gyroscope']
+        self.assertEqual(channels, ['gyroX', 'gyroY', 'gyroZ'])
+        reference = OverlappingAllan(np.round(taus * 100.0).astype(int), 3)
+        reference.update(self.gyro * (2000.0 / 32768))
+        np.testing.assert_allclose(adev, reference.deviation(100.0)[1], rtol=1e-9)
+        np.testing.assert_allclose(result['accelerometer'][2], 0.0)
+
+    def test_main_writes_csv(self):
+        output = os.path.join(self.tmp.name, 'allan.csv')
+        self.assertEqual(main([self.path, '--max-tau', '2', '--output', output]), 0)
+        with open(output) as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0], ['tau_s', 'accX', 'accY', 'accZ', 'gyroX', 'gyroY', 'gyroZ'])
+        self.assertEqual(float(rows[1][0]), 0.01)
+        self.assertEqual(float(rows[-1][0]), 2.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+# tests/tools/test_calibrate.py
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.plugins.decoders.witmotion_hwt905_decoder import (
+    build_packet, ACCEL_PACKET, GYRO_PACKET, MAGNETIC_PACKET)
+from src.tools.calibrate import estimate_calibration, main
+from src.utils.calibration import load_calibrations
+
+def triplet_packet(ptype, values, full_scale=None):
+    raw = [int(round(v / full_scale * 32768)) if full_scale else int(round(v)) for v in values]
+    return build_packet(ptype, struct.pack('<hhhh', *raw, 2500))
+
+def write_recording(path, packets):
+    with open(path, 'wb') as f:
+        f.write(b''.join(packets))
+
+class TestCalibrateTool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.acc_offset = np.array([0.03, -0.02, 0.05])
+        self.acc_scale = np.array([1.02, 0.97, 1.01])
+        self.gyro_bias = np.array([0.8, -1.2, 0.4])
+        # 6 tư thế, mỗi tư thế 2 giây đứng yên ở 100 Hz
+        packets = []
+        for axis in range(3):
+            for sign in (1.0, -1.0):
+                gravity = np.zeros(3)
+                gravity[axis] = sign
+                acc = gravity * self.acc_scale + self.acc_offset
+                for _ in range(200):
+                    packets.append(triplet_packet(ACCEL_PACKET, acc, 16.0))
+                    packets.append(triplet_packet(GYRO_PACKET, self.gyro_bias + 0.05 * rng.normal(size=3), 2000.0))
+        self.poses = os.path.join(self.tmp.name, 'poses.bin')
+        write_recording(self.poses, packets)
+
+        self.mag_center = np.array([150.0, -80.0, 40.0])
+        directions = rng.normal(size=(3000, 3))
+        directions /= np.linalg.norm(directions, axis=1, keepdims=True)
+        mag = directions @ np.diag([900.0, 1000.0, 1100.0]) + self.mag_center
+        self.rotation = os.path.join(self.tmp.name, 'rotation.bin')
+        write_recording(self.rotation, [triplet_packet(MAGNETIC_PACKET, m) for m in mag])
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_estimate_calibration(self):
+        result = estimate_calibration([self.poses], [self.rotation], {'sensor_id': 'imu1'})
+        self.assertEqual(set(result), {'accelerometer', 'gyroscope', 'magnetometer'})
+        np.testing.assert_allclose(result['gyroscope'].offset, self.gyro_bias, atol=0.02)
+        np.testing.assert_allclose(result['accelerometer'].offset, self.acc_offset, atol=1e-3)
+        np.testing.assert_allclose(np.diag(result['accelerometer'].matrix), 1.0 / self.acc_scale, atol=1e-3)
+        # Mag được lượng tử hóa về LSB nguyên nên sai số ~1 LSB
+        np.testing.assert_allclose(result['magnetometer'].offset, self.mag_center, atol=1.0)
+
+    def test_main_writes_calibration_file(self):
+        output = os.path.join(self.tmp.name, 'calibration.yaml')
+        code = main([self.poses, '--mag-files', self.rotation, '--sensor-id', 'imu1',
+                     '--output', output, '--mag-unit', 'uT', '--mag-radius', '50'])
+        self.assertEqual(code, 0)
+        loaded = load_calibrations(output)['imu1']
+        self.assertEqual(loaded['magnetometer'].unit, 'uT')
+        np.testing.assert_allclose(loaded['gyroscope'].offset, self.gyro_bias, atol=0.02)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+# tests/tools/test_features.py
+import csv
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.plugins.decoders.witmotion_hwt905_decoder import build_packet, ACCEL_PACKET, GYRO_PACKET
+from src.tools.features import extract_features, main
+
+class TestFeaturesTool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(0)
+        self.paths = []
+        for index in range(2):
+            acc = rng.integers(-3000, 3000, size=(600, 3))
+            packets = []
+            for a in acc:
+                packets.append(build_packet(ACCEL_PACKET, struct.pack('<hhhh', *a, 2500)))
+                packets.append(build_packet(GYRO_PACKET, struct.pack('<hhhh', *(a // 2), 1200)))
+            path = os.path.join(self.tmp.name, f'rec{index}.bin')
+            with open(path, 'wb') as f:
+                f.write(b''.join(packets))
+            self.paths.append(path)
+        self.acc = acc * (16.0 / 32768)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_feature_matrix(self):
+        names, ts, files, matrix = extract_features(self.paths, {'data_rate': 100.0}, window=1.0, step=0.5,
+                                                    features=['mean', 'rms'], chunk_size=1000)
+        self.assertEqual(names[:2], ['accX_mean', 'accY_mean'])
+        self.assertEqual(len(names), 2 * 3 * 2)
+        self.assertEqual(matrix.shape, (2 * 11, 12))
+        np.testing.assert_array_equal(files, np.repeat([0, 1], 11))
+        # Cửa sổ thứ 3 của file thứ 2
+        np.testing.assert_allclose(matrix[11 + 2, 0], self.acc[100:200, 0].mean())
+        self.assertTrue(np.all(np.diff(ts[:11]) > 0))
+
+    def test_main_writes_csv_and_npz(self):
+        output = os.path.join(self.tmp.name, 'features.csv')
+        self.assertEqual(main(self.paths[:1] + ['--window', '2', '--features', 'std', '--bands', '0-10',
+                                                '--label', 'walk', '-o', output]), 0)
+        with open(output) as f:
+            rows = list(csv.reader(f))
+        self.assertEqual(rows[0][:3], ['file', 'timestamp_ns', 'accX_std'])
+        self.assertEqual(rows[0][-1], 'label')
+        self.assertEqual(len(rows), 1 + 5)
+        self.assertEqual(rows[1][-1], 'walk')
+
+        npz = os.path.join(self.tmp.name, 'features.npz')
+        self.assertEqual(main(self.paths + ['--data-types', 'gyroscope', '-o', npz]), 0)
+        with np.load(npz) as data:
+            self.assertEqual(data['features'].shape[0], 2 * 5)
+            self.assertIn('gyroZ_kurtosis', list(data['names']))
+
+if __name__ == '__main__':
+    unittest.main()
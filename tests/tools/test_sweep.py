@@ -0,0 +1,107 @@
+# tests/tools/test_sweep.py
+import os
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+import yaml
+
+from src.plugins.decoders.witmotion_hwt905_decoder import build_packet, ACCEL_PACKET, GYRO_PACKET
+from src.tools.recording import iter_recordings
+from src.tools.sweep import SharedDataset, expand_grid, main, run_sweep
+
+LOWPASS = 'src.plugins.processors.filter_processor.LowPassFilterProcessor'
+
+class TestSweepTool(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        rng = np.random.default_rng(1)
+        acc = rng.integers(-3000, 3000, size=(800, 3))
+        packets = []
+        for a in acc:
+            packets.append(build_packet(ACCEL_PACKET, struct.pack('<hhhh', *a, 2500)))
+            packets.append(build_packet(GYRO_PACKET, struct.pack('<hhhh', *(a // 2), 1200)))
+        self.path = os.path.join(self.tmp.name, 'rec.bin')
+        with open(self.path, 'wb') as f:
+            f.write(b''.join(packets))
+        self.decoder_params = {'data_rate': 100.0}
+        self.chain = [{'class': LOWPASS, 'config': {'sample_rate': 100.0, 'cutoff_freq': 5.0}}]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def batches(self):
+        return iter_recordings([self.path], self.decoder_params, chunk_size=1000)
+
+    def test_shared_dataset_round_trip(self):
+        original = list(self.batches())
+        dataset = SharedDataset.from_batches(original)
+        try:
+            replayed = list(dataset.iter_batches())
+            self.assertEqual(len(replayed), len(original))
+            for a, b in zip(original, replayed):
+                self.assertEqual((a.sensor_id, a.data_type), (b.sensor_id, b.data_type))
+                np.testing.assert_array_equal(a.timestamps_ns, b.timestamps_ns)
+                for name in a.values:
+                    np.testing.assert_array_equal(a.values[name], b.values[name])
+            self.assertFalse(replayed[0].timestamps_ns.flags.writeable)
+            attached = SharedDataset.attach(dataset.spec)
+            first = next(attached.iter_batches())
+            np.testing.assert_array_equal(first.timestamps_ns, original[0].timestamps_ns)
+            del first
+            attached.close()
+        finally:
+            del replayed
+            dataset.close()
+
+    def test_recordings_are_read_through_decoded_cache(self):
+        list(iter_recordings([self.path], self.decoder_params, use_cache=False))
+        self.assertFalse(os.path.exists(self.path + '.decoded'))
+        decoded = list(self.batches())
+        self.assertTrue(os.path.isdir(self.path + '.decoded'))
+        replayed = list(self.batches())
+        self.assertFalse(replayed[0].timestamps_ns.flags.writeable)
+        self.assertEqual(len(replayed), len(decoded))
+        for a, b in zip(decoded, replayed):
+            np.testing.assert_array_equal(a.timestamps_ns, b.timestamps_ns)
+            for name in a.values:
+                np.testing.assert_array_equal(a.values[name], b.values[name])
+
+    def test_expand_grid(self):
+        variants = expand_grid({'0.cutoff_freq': [1, 2], '1.order': [2, 4, 6]}, 2)
+        self.assertEqual(len(variants), 6)
+        self.assertEqual(variants[0], {'0.cutoff_freq': 1, '1.order': 2})
+        self.assertEqual(expand_grid({'cutoff_freq': [1]}, 1), [{'cutoff_freq': 1}])
+        with self.assertRaises(ValueError):
+            expand_grid({'cutoff_freq': [1]}, 2)
+        with self.assertRaises(ValueError):
+            expand_grid({'3.order': [1]}, 2)
+
+    def test_serial_and_parallel_agree(self):
+        grid = {'0.cutoff_freq': [1.0, 10.0], '0.order': [2, 4]}
+        serial = run_sweep(self.batches(), self.chain, grid, workers=0)
+        parallel = run_sweep(self.batches(), self.chain, grid, workers=2)
+        self.assertEqual(serial.index.names, ['0.cutoff_freq', '0.order'])
+        self.assertEqual(len(serial), 4)
+        columns = [c for c in serial.columns if c != 'elapsed']
+        np.testing.assert_allclose(serial[columns].to_numpy(), parallel[columns].to_numpy())
+        # Lọc thông thấp mạnh hơn làm giảm độ lệch chuẩn của nhiễu trắng
+        std = serial.xs(4, level='0.order')
+        sensor = [c for c in serial.columns if c.endswith('.accX_std')][0]
+        self.assertLess(std.loc[1.0, sensor], 0.5 * std.loc[10.0, sensor])
+        self.assertEqual(serial['output_samples'].iloc[0], 2 * 800)
+
+    def test_cli(self):
+        sweep = os.path.join(self.tmp.name, 'sweep.yaml')
+        with open(sweep, 'w') as f:
+            yaml.safe_dump({'chain': self.chain, 'grid': {'cutoff_freq': [2.0, 4.0, 8.0]}}, f)
+        output = os.path.join(self.tmp.name, 'sweep.csv')
+        self.assertEqual(main([self.path, '--sweep', sweep, '--workers', '0', '-o', output]), 0)
+        with open(output) as f:
+            lines = f.read().splitlines()
+        self.assertEqual(len(lines), 4)
+        self.assertTrue(lines[0].startswith('cutoff_freq,'))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,50 @@
+# tests/utils/test_allan.py
+import unittest
+
+import numpy as np
+
+from src.utils.allan import OverlappingAllan, log_spaced_clusters, noise_parameters
+
+def naive_adev(x, m):
+    """Bản tham chiếu theo định nghĩa: trung bình các cụm chồng lấn liên tiếp."""
+    means = np.array([x[k:k + m].mean(axis=0) for k in range(len(x) - m + 1)])
+    diff = means[m:] - means[:-m]
+    return np.sqrt(0.5 * np.mean(diff ** 2, axis=0))
+
+class TestOverlappingAllan(unittest.TestCase):
+    def test_matches_definition_in_chunks(self):
+        x = np.random.default_rng(0).standard_normal((1500, 3)) + [5.0, -2.0, 100.0]
+        clusters = [1, 2, 7, 50, 300]
+        whole = OverlappingAllan(clusters, 3)
+        whole.update(x)
+        chunked = OverlappingAllan(clusters, 3)
+        for start in range(0, 1500, 23):
+            chunked.update(x[start:start + 23])
+        taus, adev, counts = whole.deviation(100.0)
+        _, adev_chunked, _ = chunked.deviation(100.0)
+        np.testing.assert_allclose(taus, np.array(clusters) / 100.0)
+        np.testing.assert_array_equal(counts, [1500 - 2 * m + 1 for m in clusters])
+        np.testing.assert_allclose(adev_chunked, adev, rtol=1e-9)
+        for i, m in enumerate(clusters):
+            np.testing.assert_allclose(adev[i], naive_adev(x, m), rtol=1e-9)
+
+    def test_white_noise_slope_and_parameters(self):
+        rng = np.random.default_rng(1)
+        x = rng.standard_normal((200_000, 2)) * [0.5, 2.0]
+        allan = OverlappingAllan(log_spaced_clusters(1000), 2)
+        allan.update(x)
+        taus, adev, _ = allan.deviation(100.0)
+        # Nhiễu trắng: adev(tau) = sigma / sqrt(m)
+        expected = np.array([0.5, 2.0]) / np.sqrt(taus[:, None] * 100.0)
+        np.testing.assert_allclose(adev[:20], expected[:20], rtol=0.05)
+        params = noise_parameters(taus, adev)
+        np.testing.assert_allclose(params['random_walk'], [0.05, 0.2], rtol=0.05)
+
+    def test_cluster_spacing(self):
+        clusters = log_spaced_clusters(1000, 10)
+        self.assertEqual(clusters[0], 1)
+        self.assertEqual(clusters[-1], 1000)
+        self.assertTrue(np.all(np.diff(clusters) > 0))
+
+if __name__ == '__main__':
+    unittest.main()
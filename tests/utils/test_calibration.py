@@ -0,0 +1,68 @@
+# tests/utils/test_calibration.py
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.utils.calibration import (
+    AxisCalibration, EllipsoidFit, StaticWindowAccumulator, load_calibrations, save_calibrations)
+
+def random_directions(n, seed=0):
+    v = np.random.default_rng(seed).normal(size=(n, 3))
+    return v / np.linalg.norm(v, axis=1, keepdims=True)
+
+class TestEllipsoidFit(unittest.TestCase):
+    def check_recovery(self, model, distortion):
+        center = np.array([120.0, -45.0, 300.0])
+        truth = random_directions(5000)
+        # Dữ liệu thô x = D u + c, hiệu chuẩn đúng phải đưa x về lại mặt cầu đơn vị
+        raw = truth @ distortion.T + center
+        fit = EllipsoidFit(model)
+        for chunk in np.array_split(raw, 7):
+            fit.update(chunk)
+        calibration = fit.solve()
+        np.testing.assert_allclose(calibration.offset, center, atol=1e-6)
+        np.testing.assert_allclose(np.linalg.norm(calibration.apply(raw), axis=1), 1.0, atol=1e-9)
+
+    def test_full_model(self):
+        distortion = np.array([[400.0, 30.0, -10.0], [30.0, 380.0, 20.0], [-10.0, 20.0, 420.0]])
+        self.check_recovery('full', distortion)
+
+    def test_axis_model(self):
+        self.check_recovery('axis', np.diag([400.0, 380.0, 420.0]))
+
+    def test_too_few_points(self):
+        fit = EllipsoidFit('full')
+        fit.update(random_directions(5))
+        with self.assertRaises(ValueError):
+            fit.solve()
+
+class TestStaticWindowAccumulator(unittest.TestCase):
+    def test_keeps_static_windows_across_updates(self):
+        rng = np.random.default_rng(1)
+        still = np.array([0.0, 0.0, 1.0]) + 1e-4 * rng.normal(size=(100, 3))
+        moving = rng.normal(size=(100, 3))
+        data = np.concatenate([still, moving, still + [1.0, 0.0, -1.0]])
+        acc = StaticWindowAccumulator(50, 0.01)
+        means = np.concatenate([acc.update(part) for part in np.array_split(data, 9)])
+        self.assertEqual(means.shape, (4, 3))
+        np.testing.assert_allclose(means[:2], [[0, 0, 1]] * 2, atol=1e-3)
+        np.testing.assert_allclose(means[2:], [[1, 0, 0]] * 2, atol=1e-3)
+
+class TestCalibrationFile(unittest.TestCase):
+    def test_save_merges_and_round_trips(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, 'calibration.yaml')
+            mag = AxisCalibration(2 * np.eye(3), [1.0, 2.0, 3.0], 'uT')
+            save_calibrations(path, {'imu1': {'magnetometer': mag}})
+            save_calibrations(path, {'imu2': {'gyroscope': AxisCalibration(offset=[0.1, 0.2, 0.3])}})
+            loaded = load_calibrations(path)
+            self.assertEqual(set(loaded), {'imu1', 'imu2'})
+            np.testing.assert_allclose(loaded['imu1']['magnetometer'].matrix, 2 * np.eye(3))
+            np.testing.assert_allclose(loaded['imu1']['magnetometer'].offset, [1.0, 2.0, 3.0])
+            self.assertEqual(loaded['imu1']['magnetometer'].unit, 'uT')
+            np.testing.assert_allclose(loaded['imu2']['gyroscope'].offset, [0.1, 0.2, 0.3])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+# tests/utils/test_clock_sync.py
+import unittest
+
+import numpy as np
+
+from src.data.models import SensorDataBatch
+from src.utils.clock_sync import ClockSynchronizer, MultiClockSynchronizer
+
+NS = 1_000_000_000
+
+def _drifting_clock(n=3600, skew_ppm=80.0, offset_s=12.5, noise_ns=200_000, seed=0):
+    """Tạo cặp (device, host) cho một đồng hồ trôi 80 ppm trong 1 giờ."""
+    rng = np.random.default_rng(seed)
+    device = 1_700_000_000 * NS + np.arange(n, dtype=np.int64) * NS
+    drift = np.rint((device - device[0]) * skew_ppm * 1e-6).astype(np.int64)
+    host = device + int(offset_s * NS) + drift + rng.integers(0, noise_ns, n)
+    return device, host
+
+class TestClockSynchronizer(unittest.TestCase):
+    def test_recovers_skew_and_maps_to_host(self):
+        device, host = _drifting_clock()
+        clock = ClockSynchronizer(forgetting_factor=1.0)
+        clock.update_batch(device, host)
+        self.assertAlmostEqual(clock.skew_ppm, 80.0, delta=1.0)
+        mapped = clock.to_host(device)
+        self.assertEqual(mapped.dtype, np.int64)
+        # Sai số ánh xạ nhỏ hơn nhiễu host (0.2 ms)
+        self.assertLess(np.abs(mapped - host).mean(), 200_000)
+
+    def test_batch_matches_scalar_updates(self):
+        device, host = _drifting_clock(n=500)
+        scalar = ClockSynchronizer(forgetting_factor=0.99)
+        for d, h in zip(device.tolist(), host.tolist()):
+            scalar.update(d, h)
+        batched = ClockSynchronizer(forgetting_factor=0.99)
+        batched.update_batch(device[:200], host[:200])
+        batched.update_batch(device[200:], host[200:])
+        probe = device[-1] + 10 * NS
+        self.assertAlmostEqual(scalar.skew_ppm, batched.skew_ppm, places=6)
+        self.assertLess(abs(scalar.to_host(int(probe)) - batched.to_host(int(probe))), 10)
+
+    def test_single_observation_gives_offset_only(self):
+        clock = ClockSynchronizer()
+        clock.update(100 * NS, 105 * NS)
+        self.assertEqual(clock.to_host(200 * NS), 205 * NS)
+        with self.assertRaises(RuntimeError):
+            ClockSynchronizer().to_host(0)
+
+class TestMultiClockSynchronizer(unittest.TestCase):
+    def test_map_batch_per_sensor(self):
+        sync = MultiClockSynchronizer(forgetting_factor=1.0)
+        sync.update_batch('imu1', np.array([0, NS]), np.array([5 * NS, 6 * NS]))
+        batch = SensorDataBatch(np.array([NS // 2]), 'imu1', 'accelerometer', values={'accX': np.zeros(1)})
+        self.assertEqual(sync.map_batch(batch).timestamps_ns[0], 5 * NS + NS // 2)
+        self.assertEqual(batch.timestamps_ns[0], NS // 2)
+        other = SensorDataBatch(np.array([1]), 'imu2', 'accelerometer')
+        self.assertIs(sync.map_batch(other), other)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,46 @@
+# tests/utils/test_expressions.py
+import unittest
+
+import numpy as np
+
+from src.utils.expressions import compile_expression
+
+class TestExpressions(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.env = {name: rng.standard_normal(50) for name in ('accX', 'accY', 'accZ', 'a.gyroZ')}
+
+    def test_matches_numpy(self):
+        env = self.env
+        cases = {
+            'sqrt(accX**2 + accY**2 + accZ**2)': np.sqrt(env['accX'] ** 2 + env['accY'] ** 2 + env['accZ'] ** 2),
+            'degrees(atan2(accY, accZ)) - 2 * pi': np.degrees(np.arctan2(env['accY'], env['accZ'])) - 2 * np.pi,
+            '-(accX * accY + accZ / 2) % 3': -(env['accX'] * env['accY'] + env['accZ'] / 2) % 3,
+            'max(abs(a.gyroZ), 0.5) ** 3': np.maximum(np.abs(env['a.gyroZ']), 0.5) ** 3,
+            'accX': env['accX'],
+        }
+        for source, expected in cases.items():
+            with self.subTest(source=source):
+                np.testing.assert_allclose(compile_expression(source).evaluate(env), expected)
+
+    def test_constants_folded_and_registers_reused(self):
+        expr = compile_expression('accX * (2 * pi) + accY * accZ + (1 + 2) * accX')
+        self.assertEqual(expr.variables, ('accX', 'accY', 'accZ'))
+        self.assertEqual(len(expr.program), 5)
+        self.assertEqual(len(expr._registers), 2)
+        env = self.env
+        expected = env['accX'] * 2 * np.pi + env['accY'] * env['accZ'] + 3 * env['accX']
+        np.testing.assert_allclose(expr.evaluate(env), expected)
+        # Batch ngắn hơn dùng lại thanh ghi đã cấp
+        short = {k: v[:10] for k, v in env.items()}
+        np.testing.assert_allclose(expr.evaluate(short), expected[:10])
+
+    def test_rejects_unsafe_syntax(self):
+        for source in ('__import__("os")', 'accX.__class__()', 'accX if accY else accZ',
+                       'accX < 1', 'sqrt(accX, accY)', 'accX +', "'text'", 'lambda: 1'):
+            with self.subTest(source=source):
+                with self.assertRaises(ValueError):
+                    compile_expression(source)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+# tests/utils/test_features.py
+import unittest
+
+import numpy as np
+
+from src.utils.features import FEATURES, FeatureExtractor, window_view
+
+class TestFeatures(unittest.TestCase):
+    def test_window_view_is_zero_copy(self):
+        x = np.arange(20.0).reshape(10, 2)
+        view = window_view(x, 4, 3)
+        self.assertEqual(view.shape, (3, 2, 4))
+        self.assertTrue(np.shares_memory(view, x))
+        np.testing.assert_array_equal(view[1, 0], x[3:7, 0])
+        self.assertEqual(window_view(x, 11).shape, (0, 2, 11))
+
+    def test_matches_per_window_loop(self):
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal((500, 3)) + [0.0, 1.0, -0.2]
+        extractor = FeatureExtractor(50, 100.0, FEATURES, bands=[(0.0, 10.0), (10.0, 50.1)])
+        result = extractor.compute(window_view(x, 50, 25))
+        self.assertEqual(result.shape, (19, 3, len(FEATURES) + 2))
+        names = extractor.names
+        for w in (0, 7, 18):
+            seg = x[w * 25:w * 25 + 50]
+            c = seg - seg.mean(axis=0)
+            sd = seg.std(axis=0)
+            expected = {
+                'mean': seg.mean(axis=0), 'std': sd, 'rms': np.sqrt(np.mean(seg ** 2, axis=0)),
+                'min': seg.min(axis=0), 'max': seg.max(axis=0), 'ptp': np.ptp(seg, axis=0),
+                'skewness': np.mean(c ** 3, axis=0) / sd ** 3,
+                'kurtosis': np.mean(c ** 4, axis=0) / sd ** 4 - 3.0,
+                'zero_crossings': np.sum(np.diff(np.signbit(seg), axis=0), axis=0),
+                'mean_crossings': np.sum(np.diff(np.signbit(c), axis=0), axis=0),
+                'energy': np.sum(seg ** 2, axis=0),
+            }
+            for name, value in expected.items():
+                np.testing.assert_allclose(result[w, :, names.index(name)], value, atol=1e-9, err_msg=name)
+            # Tổng công suất các dải bằng trung bình bình phương của tín hiệu đã nhân cửa sổ Hann
+            tapered = seg * np.hanning(50)[:, np.newaxis]
+            np.testing.assert_allclose(result[w, :, -2:].sum(axis=1), np.mean(tapered ** 2, axis=0))
+
+    def test_spectral_features_of_sine(self):
+        t = np.arange(400) / 100.0
+        x = np.sin(2 * np.pi * 12.5 * t)[:, np.newaxis]
+        extractor = FeatureExtractor(200, 100.0, ['dominant_freq', 'spectral_centroid'], bands=[(10, 15), (20, 30)])
+        result = extractor.compute(window_view(x, 200, 200))
+        np.testing.assert_allclose(result[:, 0, 0], 12.5)
+        np.testing.assert_allclose(result[:, 0, 1], 12.5, atol=0.1)
+        self.assertTrue(np.all(result[:, 0, 2] > 100 * result[:, 0, 3]))
+
+    def test_rejects_unknown_feature(self):
+        with self.assertRaises(ValueError):
+            FeatureExtractor(10, 100.0, ['median'])
+
+if __name__ == '__main__':
+    unittest.main()
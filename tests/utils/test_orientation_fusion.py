@@ -0,0 +1,56 @@
+# tests/utils/test_orientation_fusion.py
+import unittest
+
+import numpy as np
+
+from src.utils.orientation_fusion import (
+    initial_attitude, madgwick_step, mahony_step, normalize_rows, quat_from_euler,
+    quat_multiply, quat_to_euler, rotation_matrices)
+
+def madgwick_imu_reference(q, g, a, beta, dt):
+    """Madgwick IMU update viết tường minh cho một cảm biến (theo bài báo gốc)."""
+    q0, q1, q2, q3 = q
+    a = a / np.linalg.norm(a)
+    f = np.array([2 * (q1 * q3 - q0 * q2) - a[0], 2 * (q0 * q1 + q2 * q3) - a[1], 1 - 2 * (q1 * q1 + q2 * q2) - a[2]])
+    jac = np.array([[-2 * q2, 2 * q3, -2 * q0, 2 * q1], [2 * q1, 2 * q0, 2 * q3, 2 * q2], [0, -4 * q1, -4 * q2, 0]])
+    step = jac.T @ f
+    qdot = 0.5 * quat_multiply(np.asarray(q), np.array([0.0, *g])) - beta * step / np.linalg.norm(step)
+    out = np.asarray(q) + qdot * dt
+    return out / np.linalg.norm(out)
+
+class TestOrientationFusion(unittest.TestCase):
+    def test_rotation_matrix_and_euler_roundtrip(self):
+        angles = np.radians([[20.0, -10.0, 45.0], [-170.0, 60.0, -90.0]])
+        q = quat_from_euler(angles[:, 0], angles[:, 1], angles[:, 2])
+        np.testing.assert_allclose(np.stack(quat_to_euler(q), axis=1), angles, atol=1e-12)
+        rot = rotation_matrices(q)
+        np.testing.assert_allclose(rot @ rot.transpose(0, 2, 1), np.broadcast_to(np.eye(3), rot.shape), atol=1e-12)
+        # Trọng lực đo được trong hệ cảm biến dẫn lại đúng góc roll/pitch ban đầu
+        q0 = initial_attitude(rot[:, 2, :])
+        np.testing.assert_allclose(np.stack(quat_to_euler(q0), axis=1)[:, :2], angles[:, :2], atol=1e-12)
+
+    def test_madgwick_matches_explicit_update(self):
+        rng = np.random.default_rng(0)
+        q, _ = normalize_rows(rng.standard_normal((5, 4)))
+        gyro = rng.standard_normal((5, 3))
+        acc, valid = normalize_rows(rng.standard_normal((5, 3)))
+        out = madgwick_step(q, gyro, acc, valid, np.zeros((5, 3)), np.zeros(5, bool), 0.1, 0.01)
+        for s in range(5):
+            np.testing.assert_allclose(out[s], madgwick_imu_reference(q[s], gyro[s], acc[s], 0.1, 0.01), atol=1e-12)
+
+    def test_filters_converge_to_static_attitude(self):
+        truth = np.radians([25.0, -15.0, 70.0])
+        rot = rotation_matrices(quat_from_euler(*truth[:, np.newaxis]))[0]
+        acc = np.tile(rot[2], (3, 1))
+        mag = np.tile(rot.T @ np.array([np.cos(1.0), 0.0, -np.sin(1.0)]), (3, 1))
+        valid = np.ones(3, bool)
+        q_m = q_h = np.tile([1.0, 0.0, 0.0, 0.0], (3, 1))
+        integral = np.zeros((3, 3))
+        for _ in range(5000):
+            q_m = madgwick_step(q_m, np.zeros((3, 3)), acc, valid, mag, valid, 0.1, 0.01)
+            q_h, integral = mahony_step(q_h, integral, np.zeros((3, 3)), acc, valid, mag, valid, 2.0, 0.0, 0.01)
+        for q in (q_m, q_h):
+            np.testing.assert_allclose(np.stack(quat_to_euler(q), axis=1), np.tile(truth, (3, 1)), atol=2e-3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,56 @@
+# tests/utils/test_polyphase.py
+import unittest
+
+import numpy as np
+
+from src.utils.polyphase import PolyphaseResampler, kaiser_lowpass, rational_factors
+
+def reference_resample(x, up, down, taps):
+    """Bản tham chiếu: chèn 0, tích chập toàn bộ rồi lấy mỗi mẫu thứ `down` (đã bù độ trễ)."""
+    pad = len(taps)
+    extended = np.concatenate([np.repeat(x[:1], pad, 0), x, np.repeat(x[-1:], pad, 0)])
+    stuffed = np.zeros((len(extended) * up, x.shape[1]))
+    stuffed[::up] = extended
+    full = np.stack([np.convolve(stuffed[:, j], taps) for j in range(x.shape[1])], axis=1)
+    m = np.arange(((len(x) - 1) * up) // down + 1)
+    return full[pad * up + m * down + (len(taps) - 1) // 2]
+
+def run_chunked(resampler, x, t, size):
+    parts = [resampler.process(x[i:i + size], t[i:i + size]) for i in range(0, len(x), size)]
+    parts.append(resampler.flush())
+    return np.concatenate([p[0] for p in parts]), np.concatenate([p[1] for p in parts])
+
+class TestPolyphaseResampler(unittest.TestCase):
+    def test_matches_reference_and_chunking(self):
+        rng = np.random.default_rng(0)
+        x = rng.standard_normal((3000, 3))
+        t = np.arange(3000, dtype=np.int64) * 5_000_000
+        for up, down in [(1, 20), (2, 5), (3, 2)]:
+            whole, t_whole = run_chunked(PolyphaseResampler(up, down), x, t, 3000)
+            chunked, t_chunked = run_chunked(PolyphaseResampler(up, down), x, t, 37)
+            expected = reference_resample(x, up, down, PolyphaseResampler(up, down).taps)
+            np.testing.assert_allclose(whole, expected, atol=1e-12)
+            np.testing.assert_allclose(chunked, whole, atol=1e-12)
+            np.testing.assert_array_equal(t_chunked, t_whole)
+            np.testing.assert_array_equal(t_whole, (np.arange(len(whole)) * down * 5_000_000) // up)
+
+    def test_passband_and_stopband(self):
+        t = np.arange(40000) / 200.0
+        signal = np.stack([np.ones_like(t), np.sin(2 * np.pi * 2.5 * t), np.sin(2 * np.pi * 12.5 * t)], axis=1)
+        y, _ = PolyphaseResampler(1, 20).process(signal, np.arange(40000, dtype=np.int64))
+        np.testing.assert_allclose(y[:, 0], 1.0, atol=1e-9)
+        self.assertAlmostEqual(np.abs(y[100:, 1]).max(), 1.0, delta=1e-3)
+        # 12.5 Hz sẽ bị gập thành 2.5 Hz ở 10 Hz nếu không lọc
+        self.assertLess(np.abs(y[100:, 2]).max(), 1e-3)
+
+    def test_design_helpers(self):
+        self.assertEqual(rational_factors(200.0, 80.0), (2, 5))
+        self.assertEqual(rational_factors(200.0, 10.0), (1, 20))
+        taps = kaiser_lowpass(0.1, 0.02)
+        self.assertEqual(len(taps) % 2, 1)
+        self.assertAlmostEqual(taps.sum(), 1.0)
+        with self.assertRaises(ValueError):
+            kaiser_lowpass(0.6, 0.02)
+
+if __name__ == '__main__':
+    unittest.main()
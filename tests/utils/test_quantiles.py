@@ -0,0 +1,69 @@
+# tests/utils/test_quantiles.py
+import unittest
+
+import numpy as np
+
+from src.utils.quantiles import FixedHistogram, TDigest
+
+class TestFixedHistogram(unittest.TestCase):
+    def test_matches_numpy_histogram(self):
+        rng = np.random.default_rng(0)
+        x = rng.normal(size=(5000, 2)) * [1.0, 3.0]
+        x[10, 0] = np.nan
+        hist = FixedHistogram(-4.0, 4.0, 16, 2)
+        hist.update(x[:2000])
+        hist.update(x[2000:])
+        for j in range(2):
+            col = x[:, j][~np.isnan(x[:, j])]
+            expected, _ = np.histogram(col, bins=hist.edges)
+            # np.histogram gộp giá trị bằng biên phải vào bin cuối; dữ liệu liên tục nên không ảnh hưởng
+            np.testing.assert_array_equal(hist.counts[j, 1:-1], expected)
+            self.assertEqual(hist.counts[j, 0], np.sum(col < -4.0))
+            self.assertEqual(hist.counts[j, -1], np.sum(col >= 4.0))
+        median = hist.quantile([0.5])
+        self.assertAlmostEqual(median[0, 0], 0.0, delta=0.1)
+
+    def test_merge(self):
+        a, b = FixedHistogram(0, 1, 4), FixedHistogram(0, 1, 4)
+        a.update(np.array([0.1, 0.6]))
+        b.update(np.array([0.6, 2.0]))
+        a.merge(b)
+        np.testing.assert_array_equal(a.counts[0], [0, 1, 0, 2, 0, 1])
+        with self.assertRaises(ValueError):
+            a.merge(FixedHistogram(0, 1, 5))
+
+class TestTDigest(unittest.TestCase):
+    def test_quantiles_accuracy_and_size(self):
+        rng = np.random.default_rng(1)
+        x = rng.lognormal(size=200_000)
+        digest = TDigest(100)
+        for chunk in np.array_split(x, 37):
+            digest.update(chunk)
+        q = np.array([0.01, 0.5, 0.95, 0.99, 0.999])
+        estimates = digest.quantile(q)
+        # Sai số theo hạng (rank) nhỏ, đặc biệt ở hai đuôi
+        ranks = np.searchsorted(np.sort(x), estimates) / x.size
+        tolerance = np.array([0.002, 0.01, 0.005, 0.002, 0.0005])
+        self.assertTrue(np.all(np.abs(ranks - q) <= tolerance), ranks)
+        self.assertLess(digest.means.size, 100)
+        self.assertEqual(digest.count, x.size)
+        self.assertEqual(digest.quantile(0.0)[0], x.min())
+        self.assertEqual(digest.quantile(1.0)[0], x.max())
+
+    def test_merge_matches_single_digest(self):
+        rng = np.random.default_rng(2)
+        parts = [rng.normal(loc, 1.0, 20_000) for loc in (0.0, 5.0, 10.0)]
+        digests = []
+        for part in parts:
+            digest = TDigest(100)
+            digest.update(part)
+            digests.append(digest)
+        merged = TDigest.merged(digests)
+        x = np.concatenate(parts)
+        q = np.array([0.05, 0.5, 0.95])
+        np.testing.assert_allclose(merged.quantile(q), np.quantile(x, q), atol=0.05)
+        self.assertEqual(merged.count, x.size)
+        self.assertTrue(np.isnan(TDigest().quantile(0.5)[0]))
+
+if __name__ == '__main__':
+    unittest.main()
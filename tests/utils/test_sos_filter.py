@@ -0,0 +1,88 @@
+# tests/utils/test_sos_filter.py
+import unittest
+
+import numpy as np
+
+from src.utils.sos_filter import SOSFilter, SOSFilterBank, butter_sos, notch_sos, sos_frequency_response
+
+def direct_sosfilt(sos, x):
+    """Bản tham chiếu: đệ quy DF2T từng mẫu."""
+    y = np.array(x, dtype=float)
+    for b0, b1, b2, a0, a1, a2 in sos:
+        z0 = z1 = 0.0
+        out = np.empty_like(y)
+        for n, xn in enumerate(y):
+            yn = b0 * xn + z0
+            z0 = b1 * xn - a1 * yn + z1
+            z1 = b2 * xn - a2 * yn
+            out[n] = yn
+        y = out
+    return y
+
+class TestDesign(unittest.TestCase):
+    def test_butterworth_responses(self):
+        fs = 200.0
+        lp = butter_sos(4, 10.0, fs, 'lowpass')
+        self.assertEqual(lp.shape, (2, 6))
+        h = np.abs(sos_frequency_response(lp, np.array([0.0, 10.0, 50.0]), fs))
+        np.testing.assert_allclose(h[:2], [1.0, 1 / np.sqrt(2)], atol=1e-9)
+        self.assertLess(h[2], 1e-3)
+        hp = butter_sos(3, 1.0, fs, 'highpass')
+        h = np.abs(sos_frequency_response(hp, np.array([1.0, 100.0]), fs))
+        np.testing.assert_allclose(h, [1 / np.sqrt(2), 1.0], atol=1e-9)
+        bp = butter_sos(2, (5.0, 20.0), fs, 'bandpass')
+        h = np.abs(sos_frequency_response(bp, np.array([5.0, 20.0, 0.01, 99.0]), fs))
+        np.testing.assert_allclose(h[:2], 1 / np.sqrt(2), atol=1e-9)
+        self.assertTrue(np.all(h[2:] < 1e-2))
+
+    def test_notch_removes_frequency(self):
+        sos = notch_sos(50.0, 200.0, 30.0)
+        h = np.abs(sos_frequency_response(sos, np.array([50.0, 10.0]), 200.0))
+        self.assertLess(h[0], 1e-9)
+        self.assertAlmostEqual(h[1], 1.0, places=2)
+
+    def test_invalid_parameters(self):
+        with self.assertRaises(ValueError):
+            butter_sos(4, 120.0, 200.0)
+        with self.assertRaises(ValueError):
+            butter_sos(4, 10.0, 200.0, 'bandstop')
+
+class TestSOSFilter(unittest.TestCase):
+    def test_matches_direct_recursion_and_streaming(self):
+        rng = np.random.default_rng(1)
+        x = rng.standard_normal((1000, 3))
+        sos = butter_sos(4, 5.0, 200.0)
+        flt = SOSFilter(sos, block_size=16)
+        y, _ = flt.filter(x)
+        np.testing.assert_allclose(y[:, 1], direct_sosfilt(sos, x[:, 1]), atol=1e-10)
+        state, parts = None, []
+        for start in range(0, 1000, 37):
+            out, state = flt.filter(x[start:start + 37], state)
+            parts.append(out)
+        np.testing.assert_allclose(np.concatenate(parts), y, atol=1e-10)
+
+    def test_one_dimensional_input(self):
+        flt = SOSFilter(butter_sos(2, 10.0, 100.0))
+        y, zf = flt.filter(np.ones(500))
+        self.assertEqual(y.shape, (500,))
+        self.assertAlmostEqual(y[-1], 1.0, places=6)
+        self.assertEqual(zf.shape, (1, 2, 1))
+
+class TestSOSFilterBank(unittest.TestCase):
+    def test_matches_individual_filters_and_streaming(self):
+        rng = np.random.default_rng(2)
+        x = rng.standard_normal((700, 2))
+        bank = np.stack([butter_sos(2, band, 200.0, 'bandpass') for band in ((2, 5), (10, 20), (40, 80))])
+        flt = SOSFilterBank(bank, block_size=16)
+        state, parts = None, []
+        for start in range(0, 700, 53):
+            out, state = flt.filter(x[start:start + 53], state)
+            parts.append(out)
+        y = np.concatenate(parts)
+        self.assertEqual(y.shape, (700, 3, 2))
+        self.assertEqual(state.shape, (2, 3, 2, 2))
+        for b in range(3):
+            np.testing.assert_allclose(y[:, b, 0], direct_sosfilt(bank[b], x[:, 0]), atol=1e-10)
+
+if __name__ == '__main__':
+    unittest.main()
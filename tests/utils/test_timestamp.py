@@ -154,5 +154,18 @@ class TestSimpleTimestamp(unittest.TestCase):
         dt_unknown_utc = timestamp_utils.get_timestamp_from_packet(b'\x01\x02\x03\x04', 0, 4, 'unknown', utc_offset=0)
         self.assertEqual(dt_unknown_utc.tzinfo, timezone.utc)
 
+    def test_nanosecond_conversions(self):
+        """Test chuyển đổi giây <-> nanosecond không mất độ chính xác."""
+        import numpy as np
+        self.assertEqual(timestamp_utils.seconds_to_ns(1_700_000_000.25), 1_700_000_000_250_000_000)
+        self.assertEqual(timestamp_utils.seconds_to_ns(3), 3_000_000_000)
+        arr = timestamp_utils.seconds_to_ns(np.array([0.5, 1_700_000_000.375]))
+        self.assertEqual(arr.dtype, np.int64)
+        self.assertEqual(arr[1], 1_700_000_000_375_000_000)
+        secs = timestamp_utils.ns_to_seconds(np.array([1_500_000_000], dtype=np.int64))
+        self.assertAlmostEqual(secs[0], 1.5)
+        dt = datetime(2023, 5, 1, 14, 30, 45, 123456, tzinfo=timezone.utc)
+        self.assertEqual(timestamp_utils.datetime_to_ns(dt) % 1_000_000_000, 123_456_000)
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file